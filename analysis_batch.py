@@ -0,0 +1,128 @@
+"""
+Column-wise feature extraction for batch 9-module scoring.
+
+The portfolio re-score endpoint scores hundreds of companies per request.
+Rather than parsing and thresholding each company's numbers on its own,
+feature_contexts builds one NumPy matrix (companies x NUMERIC_FEATURES),
+derives the shared ratios and evaluates every SCORE_RULES ladder for all
+companies at once.  Each company then gets a FeatureContext carrying its
+precomputed row, so the registered scorers produce exactly the output of
+the single-company path.
+
+NumPy is optional: without it every company is scored with the scalar
+FeatureContext, with identical results.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from analysis_modules import (
+    DERIVED_FEATURES,
+    NUMERIC_FEATURES,
+    RULE_OPS,
+    SCORE_RULES,
+    FeatureContext,
+    numeric_features,
+)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def feature_columns(
+    extracted: Sequence[dict]
+) -> Tuple[Dict[str, "np.ndarray"], Dict[str, "np.ndarray"]]:
+    """NUMERIC_FEATURES + DERIVED_FEATURES as float64 columns.
+
+    Also returns, per derived feature, the mask of companies for which it
+    is defined (elsewhere the column holds NaN and the scalar path None).
+    """
+    matrix = np.array(
+        [[f[name] for name in NUMERIC_FEATURES]
+         for f in map(numeric_features, extracted)],
+        dtype=np.float64).reshape(len(extracted), len(NUMERIC_FEATURES))
+    columns = {name: matrix[:, i] for i, name in enumerate(NUMERIC_FEATURES)}
+    revenue, burn_rate = columns["revenue"], columns["burn_rate"]
+    mrr, customers = columns["mrr"], columns["customers"]
+    team_size = columns["team_size"]
+
+    with np.errstate(invalid="ignore"):
+        defined = {
+            "burn_multiple": (revenue > 0) & (burn_rate > 0),
+            "mrr_per_customer": (mrr > 0) & (customers > 0),
+            "revenue_per_head": (team_size > 0) & (revenue > 0),
+        }
+    columns["burn_multiple"] = _ratio(burn_rate, revenue / 12,
+                                      defined["burn_multiple"])
+    # round(x, 2) as the scalar path does; np.round rounds x * 100 instead
+    # and can differ in the last place.
+    burn_multiple = columns["burn_multiple"]
+    mask = defined["burn_multiple"]
+    burn_multiple[mask] = [round(v, 2) for v in burn_multiple[mask].tolist()]
+    columns["mrr_per_customer"] = _ratio(mrr, customers,
+                                         defined["mrr_per_customer"])
+    columns["revenue_per_head"] = _ratio(revenue, team_size,
+                                         defined["revenue_per_head"])
+    return columns, defined
+
+
+def _ratio(numerator, denominator, mask):
+    out = np.full(numerator.shape, np.nan)
+    with np.errstate(invalid="ignore", over="ignore"):
+        np.divide(numerator, denominator, out=out, where=mask)
+    return out
+
+
+def rule_score_column(name: str, columns: Dict[str, "np.ndarray"]):
+    """SCORE_RULES[name] for every company at once (see rule_score)"""
+    base, rungs = SCORE_RULES[name]
+    score = np.full(len(columns["revenue"]), base)
+    for feature, steps in rungs:
+        values = columns[feature]
+        # NaN compares false, so missing features add nothing
+        with np.errstate(invalid="ignore"):
+            conditions = [
+                np.logical_and.reduce(
+                    [RULE_OPS[op](values, limit) for op, limit in conds])
+                for _, *conds in steps
+            ]
+        score = score + np.select(conditions,
+                                  [points for points, *_ in steps],
+                                  default=0.0)
+    return score
+
+
+def feature_contexts(
+        companies: Sequence[Tuple[dict, dict]]) -> List[FeatureContext]:
+    """FeatureContext for each ``(company_data, extracted)`` pair"""
+    if not companies:
+        return []
+    if not NUMPY_AVAILABLE:
+        return [
+            FeatureContext(data, extracted) for data, extracted in companies
+        ]
+
+    columns, defined = feature_columns(
+        [extracted for _, extracted in companies])
+    names = NUMERIC_FEATURES + DERIVED_FEATURES
+    rows = np.column_stack([columns[name] for name in names]).tolist()
+    undefined = np.column_stack([~defined[name]
+                                 for name in DERIVED_FEATURES]).tolist()
+    rule_rows = np.column_stack(
+        [rule_score_column(rule, columns) for rule in SCORE_RULES]).tolist()
+
+    contexts = []
+    for (data, extracted), row, missing, scores in zip(companies, rows,
+                                                       undefined, rule_rows):
+        features: Dict[str, Optional[float]] = dict(zip(names, row))
+        for name, absent in zip(DERIVED_FEATURES, missing):
+            if absent:
+                features[name] = None
+        contexts.append(
+            FeatureContext(data,
+                           extracted,
+                           features=features,
+                           rule_scores=dict(zip(SCORE_RULES, scores))))
+    return contexts
@@ -0,0 +1,89 @@
+"""
+In-process LRU memo of 9-module results keyed by each module's inputs.
+
+Configuration (environment variables):
+  ANALYSIS_MODULE_MEMO_SIZE – cached module results (default 4096)
+"""
+
+import copy
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from analysis_modules import FeatureContext, module_fingerprint, run_module
+
+
+class ModuleMemo:
+    """LRU of module results keyed by their input fingerprint"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lru: "OrderedDict[str, dict]" = OrderedDict()
+        # The batch endpoint scores in a worker thread
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _get(self, key: str):
+        with self._lock:
+            result = self._lru.get(key)
+            if result is None:
+                self._misses += 1
+                return None
+            self._lru.move_to_end(key)
+            self._hits += 1
+        return copy.deepcopy(result)
+
+    def _put(self, key: str, result: dict):
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._lru[key] = result
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def run_modules(self,
+                    modules: Iterable[dict],
+                    ctx: FeatureContext,
+                    skip: Iterable[str] = ()
+                    ) -> Tuple[Dict[str, dict], List[str]]:
+        """analysis_modules.run_modules through the memo.
+
+        Returns ``(results, cached_ids)``; results are fresh copies the
+        caller may modify.
+        """
+        skipped = frozenset(skip)
+        results: Dict[str, dict] = {}
+        cached: List[str] = []
+        for mod in modules:
+            mid = mod["id"]
+            if mid in skipped:
+                continue
+            key = module_fingerprint(mid, ctx)
+            result = self._get(key)
+            if result is None:
+                result = run_module(mod, ctx)
+                self._put(key, result)
+            else:
+                cached.append(mid)
+            results[mid] = result
+        return results, cached
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._lru),
+            "max_entries": self.max_entries,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Global module memo instance
+module_memo = ModuleMemo(int(os.getenv("ANALYSIS_MODULE_MEMO_SIZE", "4096")))
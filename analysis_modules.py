@@ -0,0 +1,1480 @@
+"""
+Registry-based pipeline for the 9-module analysis scorers.
+
+Each module used to be one branch of a long ``if mid == ...`` chain in
+main._run_module, and every branch re-parsed the same numbers out of
+financial_data / key_metrics and re-searched the merged text.
+
+FeatureContext now does that work once per analysis: it parses the
+numerics, scans the text for every module keyword (one Aho–Corasick pass)
+and derives shared ratios such as the burn multiple.  Each module is a
+function registered with @module_scorer that only reads from the context,
+so modules are independent of each other: run_modules can skip any of
+them, and the scorers are safe to run concurrently over one context.
+
+@module_scorer also declares exactly which context inputs a module reads.
+Scorers only see those inputs (reading anything else raises
+UndeclaredInputError), so module_fingerprint(module_id, ctx) is a
+complete cache key for the module's result; analysis_memo relies on it.
+"""
+
+import hashlib
+import json
+import operator
+import re
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from keyword_matcher import KeywordMatcher
+
+
+def _clamp(val, lo=0.0, hi=10.0):
+    """Clamp a value between lo and hi."""
+    return max(lo, min(hi, val))
+
+
+def _flag_color(score):
+    """Return traffic-light flag from a 0-10 score."""
+    if score >= 7.0:
+        return "green"
+    elif score >= 5.0:
+        return "yellow"
+    return "red"
+
+
+# Text signals each module looks for (case-insensitive substring match)
+MODULE_KEYWORDS = {
+    "tca_technology": [
+        "patent", "proprietary", "AI", "ML", "NLP", "machine learning",
+        "SOC 2", "SOC2", "ISO 27001", "microservice", "cloud-native"
+    ],
+    "tca_team": [
+        "ex-Google", "ex-Meta", "ex-Amazon", "ex-Microsoft", "Stanford",
+        "MIT", "Harvard", "MBA", "PhD", "prior exit", "previous exit",
+        "co-founder", "CTO", "CEO", "VP"
+    ],
+    "tca_business_model":
+    ["SaaS", "subscription", "recurring", "ARR", "MRR", "enterprise"],
+    "risk_technology": [
+        "patent", "proprietary", "SOC 2", "SOC2", "cloud-native",
+        "microservice"
+    ],
+    "risk_regulatory":
+    ["SOC 2", "SOC2", "GDPR", "HIPAA", "ISO", "compliance", "certified"],
+    "risk_competitive": [
+        "first-mover", "moat", "network effect", "proprietary", "patent",
+        "barrier"
+    ],
+    "market_advantages": [
+        "proprietary", "patent", "first-mover", "network effect", "moat",
+        "AI-powered", "machine learning", "NLP", "unique", "barrier"
+    ],
+    "team_experience": [
+        "ex-Google", "ex-Meta", "ex-Amazon", "ex-Microsoft", "ex-Apple",
+        "Stanford", "MIT", "Harvard", "Wharton", "MBA", "PhD", "prior exit",
+        "previous exit", "years experience", "senior engineer"
+    ],
+    "team_key_roles": ["CEO", "CTO", "VP Sales", "CFO", "VP Engineering"],
+    "technology_innovation": [
+        "patent", "proprietary", "AI", "ML", "NLP", "machine learning",
+        "deep learning", "cloud-native", "microservice", "kubernetes",
+        "docker", "serverless", "API", "SDK"
+    ],
+    "technology_security": [
+        "SOC 2", "SOC2", "ISO 27001", "GDPR", "HIPAA", "encryption",
+        "certified"
+    ],
+    "technology_stack": [
+        "Python", "React", "Node", "TypeScript", "PostgreSQL", "MongoDB",
+        "Azure", "AWS", "GCP", "Terraform", "Redis", "Kafka"
+    ],
+    "business_model_type": [
+        "SaaS", "subscription", "B2B", "B2C", "marketplace", "platform",
+        "enterprise", "freemium", "usage-based", "transactional", "licensing"
+    ],
+    "business_model_recurring": ["subscription", "recurring"],
+    "business_positioning": [
+        "product-led", "enterprise sales", "channel partner", "self-serve",
+        "land and expand", "niche", "vertical", "horizontal"
+    ],
+    "growth_drivers": [
+        "network effect", "platform", "expansion", "partnership",
+        "integration"
+    ],
+    "growth_challenges": ["challenge", "risk", "limitation", "constraint"],
+}
+
+# One automaton over every module keyword, built once at import
+_MODULE_KEYWORD_MATCHER = KeywordMatcher(
+    k for keywords in MODULE_KEYWORDS.values() for k in keywords)
+
+
+def keyword_hits(text: str) -> frozenset:
+    """Scan text once for every MODULE_KEYWORDS entry (lowercased hits)."""
+    return _MODULE_KEYWORD_MATCHER.scan(text)
+
+
+def extract_text_mentions(text: str,
+                          keywords: list,
+                          hits: Optional[frozenset] = None) -> list:
+    """Return which keywords appear in the text (case-insensitive).
+
+    ``hits`` is a precomputed keyword_hits(text) and must cover
+    ``keywords``; without it the text is searched directly.
+    """
+    if hits is None:
+        lower = text.lower()
+        return [k for k in keywords if k.lower() in lower]
+    return [k for k in keywords if k.lower() in hits]
+
+
+def _number(dct: dict, key: str, default=0) -> float:
+    """Normalise an incoming numeric value (strings, None, junk) to float"""
+    v = dct.get(key, default)
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return float(default)
+
+
+def _section(extracted: dict, key: str) -> dict:
+    value = extracted.get(key)
+    return value if isinstance(value, dict) else {}
+
+
+# Numeric inputs shared by the scorers (the batch feature-matrix columns)
+NUMERIC_FEATURES = ("revenue", "burn_rate", "runway", "mrr", "gross_margin",
+                    "customers", "nrr", "mom_growth", "team_size")
+# Ratios derived from them; None where the inputs are missing
+DERIVED_FEATURES = ("burn_multiple", "mrr_per_customer", "revenue_per_head")
+
+
+def numeric_features(extracted: dict) -> Dict[str, float]:
+    """Parse NUMERIC_FEATURES out of merged extracted data"""
+    fin = _section(extracted, "financial_data")
+    met = _section(extracted, "key_metrics")
+    return {
+        "revenue": _number(fin, "revenue"),
+        "burn_rate": _number(fin, "burn_rate"),
+        "runway": _number(fin, "runway_months"),
+        "mrr": _number(fin, "mrr") or _number(met, "mrr"),
+        "gross_margin": _number(fin, "gross_margin"),
+        "customers": _number(met, "customers"),
+        "nrr": _number(met, "nrr"),
+        "mom_growth": _number(met, "mom_growth"),
+        "team_size": _number(met, "team_size"),
+    }
+
+
+def derived_features(f: Dict[str, float]) -> Dict[str, Optional[float]]:
+    """DERIVED_FEATURES for one company's numeric_features"""
+    derived: Dict[str, Optional[float]] = dict.fromkeys(DERIVED_FEATURES)
+    if f["revenue"] > 0 and f["burn_rate"] > 0:
+        # Monthly burn over monthly revenue (lower is better)
+        derived["burn_multiple"] = round(f["burn_rate"] / (f["revenue"] / 12),
+                                         2)
+    if f["mrr"] > 0 and f["customers"] > 0:
+        derived["mrr_per_customer"] = f["mrr"] / f["customers"]
+    if f["team_size"] > 0 and f["revenue"] > 0:
+        derived["revenue_per_head"] = f["revenue"] / f["team_size"]
+    return derived
+
+
+# Threshold ladders behind the purely numeric scores, kept as data so
+# analysis_batch can evaluate them column-wise for many companies with
+# exactly the result rule_score gives for one.
+#   name: (base, rungs); rung = (feature, steps); step = (points, *conditions)
+# For each rung the first step whose conditions all hold adds its points;
+# a missing (None) feature adds nothing.
+RULE_OPS = {">": operator.gt, ">=": operator.ge, "<": operator.lt}
+SCORE_RULES = {
+    "financial_analysis": (5.0, (
+        ("revenue", ((2.0, (">", 500_000)), (1.0, (">", 200_000)),
+                     (0.5, (">", 50_000)))),
+        ("runway", ((1.5, (">=", 18)), (1.0, (">=", 12)),
+                    (-1.0, ("<", 6), (">", 0)))),
+        ("gross_margin", ((1.0, (">=", 70)), (0.5, (">=", 50)))),
+        ("mom_growth", ((0.5, (">", 10)), )),
+        ("burn_multiple", ((1.0, ("<", 1.5)), (0.3, ("<", 3)))),
+    )),
+    "growth_assessment": (5.0, (
+        ("mom_growth", ((2.0, (">", 15)), (1.5, (">", 10)),
+                        (0.8, (">", 5)))),
+        ("nrr", ((1.5, (">", 120)), (0.8, (">", 100)))),
+        ("customers", ((0.5, (">=", 30)), )),
+        ("revenue", ((0.5, (">", 300_000)), )),
+    )),
+    "growth_scalability": (5.0, (
+        ("revenue_per_head", ((1.5, (">", 50_000)), (0.8, (">", 25_000)))),
+        ("nrr", ((1.0, (">", 100)), )),
+    )),
+    "investment_readiness": (5.0, (
+        ("revenue", ((1.0, (">", 300_000)), (0.5, (">", 100_000)))),
+        ("runway", ((0.8, (">=", 12)), )),
+        ("mom_growth", ((0.8, (">", 10)), )),
+        ("nrr", ((0.5, (">", 100)), )),
+        ("gross_margin", ((0.5, (">", 60)), )),
+        ("team_size", ((0.4, (">=", 8)), )),
+        ("customers", ((0.5, (">=", 20)), )),
+    )),
+}
+
+
+def rule_score(name: str, features: Dict[str, Optional[float]]) -> float:
+    """Unclamped SCORE_RULES[name] score for one company"""
+    base, rungs = SCORE_RULES[name]
+    score = base
+    for feature, steps in rungs:
+        value = features[feature]
+        if value is None:
+            continue
+        for points, *conditions in steps:
+            if all(RULE_OPS[op](value, limit) for op, limit in conditions):
+                score += points
+                break
+    return score
+
+
+# Plain attributes a scorer may declare as ``features``
+SCALAR_INPUTS = NUMERIC_FEATURES + DERIVED_FEATURES + (
+    "has_financial_data", "has_key_metrics", "has_text", "company_stage")
+
+
+class FeatureContext:
+    """Everything the module scorers read, computed once per analysis.
+
+    ``features`` (NUMERIC_FEATURES + DERIVED_FEATURES) and ``rule_scores``
+    may be supplied precomputed, as the batch path does.
+    """
+
+    __slots__ = ('financial_data', 'key_metrics', 'company_info', 'text',
+                 'keyword_hits', 'features', 'revenue', 'burn_rate', 'runway',
+                 'mrr', 'gross_margin', 'customers', 'nrr', 'mom_growth',
+                 'team_size', 'burn_multiple', 'mrr_per_customer',
+                 'revenue_per_head', 'has_financial_data', 'has_key_metrics',
+                 'has_text', 'company_stage', '_mentions', '_matches',
+                 '_rule_scores')
+
+    def __init__(self,
+                 company_data: dict,
+                 extracted: dict,
+                 hits: Optional[frozenset] = None,
+                 features: Optional[Dict[str, Optional[float]]] = None,
+                 rule_scores: Optional[Dict[str, float]] = None):
+        self.financial_data = _section(extracted, "financial_data")
+        self.key_metrics = _section(extracted, "key_metrics")
+        self.company_info = _section(extracted, "company_info")
+        self.text = company_data.get("extracted_text", "") or ""
+        self.keyword_hits = hits if hits is not None else keyword_hits(
+            self.text)
+        self.has_financial_data = bool(self.financial_data)
+        self.has_key_metrics = bool(self.key_metrics)
+        self.has_text = bool(self.text)
+        self.company_stage = self.company_info.get("stage", "Not specified")
+        self._mentions: Dict[str, list] = {}
+        self._matches: Dict[str, tuple] = {}
+        self._rule_scores: Dict[str, float] = dict(rule_scores or {})
+
+        if features is None:
+            features = numeric_features(extracted)
+            features.update(derived_features(features))
+        self.features = features
+        self.revenue = features["revenue"]
+        self.burn_rate = features["burn_rate"]
+        self.runway = features["runway"]
+        self.mrr = features["mrr"]
+        self.gross_margin = features["gross_margin"]
+        self.customers = features["customers"]
+        self.nrr = features["nrr"]
+        self.mom_growth = features["mom_growth"]
+        self.team_size = features["team_size"]
+        self.burn_multiple = features["burn_multiple"]
+        self.mrr_per_customer = features["mrr_per_customer"]
+        self.revenue_per_head = features["revenue_per_head"]
+
+    def rule_score(self, name: str) -> float:
+        """SCORE_RULES[name] for this company (unclamped)"""
+        score = self._rule_scores.get(name)
+        if score is None:
+            score = self._rule_scores[name] = rule_score(name, self.features)
+        return score
+
+    def mentions(self, signal: str) -> list:
+        """MODULE_KEYWORDS[signal] entries found in the text, in list order"""
+        found = self._mentions.get(signal)
+        if found is None:
+            found = self._mentions[signal] = extract_text_mentions(
+                self.text, MODULE_KEYWORDS[signal], self.keyword_hits)
+        return list(found)
+
+    def search(self, pattern: str):
+        """First match of TEXT_PATTERNS[pattern] in the text, or None"""
+        return TEXT_PATTERNS[pattern].search(self.text)
+
+    def findall(self, pattern: str) -> list:
+        """TEXT_PATTERNS[pattern].findall over the text"""
+        return TEXT_PATTERNS[pattern].findall(self.text)
+
+    def matches(self, pattern: str) -> tuple:
+        """(group(0), groups()) of every match; determines search/findall"""
+        found = self._matches.get(pattern)
+        if found is None:
+            found = self._matches[pattern] = tuple(
+                (m.group(0), m.groups())
+                for m in TEXT_PATTERNS[pattern].finditer(self.text))
+        return found
+
+
+class UndeclaredInputError(LookupError):
+    """A scorer read a context input its @module_scorer did not declare"""
+
+
+class ModuleInputs(NamedTuple):
+    """The FeatureContext inputs one module reads"""
+    features: Tuple[str, ...] = ()  # SCALAR_INPUTS
+    signals: Tuple[str, ...] = ()  # MODULE_KEYWORDS
+    patterns: Tuple[str, ...] = ()  # TEXT_PATTERNS
+    rules: Tuple[str, ...] = ()  # SCORE_RULES
+
+
+class _DeclaredView:
+    """A FeatureContext restricted to one module's declared inputs"""
+
+    __slots__ = ('_ctx', '_inputs', '_module_id')
+
+    def __init__(self, ctx: FeatureContext, inputs: ModuleInputs,
+                 module_id: str):
+        self._ctx = ctx
+        self._inputs = inputs
+        self._module_id = module_id
+
+    def _check(self, kind: str, name: str):
+        if name not in getattr(self._inputs, kind):
+            raise UndeclaredInputError(
+                f"module {self._module_id!r} reads {name!r}, which is not "
+                f"in its declared {kind}")
+
+    def __getattr__(self, name: str):
+        self._check("features", name)
+        return getattr(self._ctx, name)
+
+    def mentions(self, signal: str) -> list:
+        self._check("signals", signal)
+        return self._ctx.mentions(signal)
+
+    def search(self, pattern: str):
+        self._check("patterns", pattern)
+        return self._ctx.search(pattern)
+
+    def findall(self, pattern: str) -> list:
+        self._check("patterns", pattern)
+        return self._ctx.findall(pattern)
+
+    def rule_score(self, name: str) -> float:
+        self._check("rules", name)
+        return self._ctx.rule_score(name)
+
+
+ModuleScorer = Callable[[FeatureContext], Dict[str, Any]]
+
+# module id -> scorer / declared inputs; filled by @module_scorer below
+MODULE_SCORERS: Dict[str, ModuleScorer] = {}
+MODULE_INPUTS: Dict[str, ModuleInputs] = {}
+
+
+def module_scorer(
+        module_id: str,
+        features: Iterable[str] = (),
+        signals: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+        rules: Iterable[str] = ()) -> Callable[[ModuleScorer], ModuleScorer]:
+    """Register a scorer for ``module_id`` and the inputs it reads"""
+    inputs = ModuleInputs(tuple(features), tuple(signals), tuple(patterns),
+                          tuple(rules))
+    for kind, known in (("features", SCALAR_INPUTS),
+                        ("signals", MODULE_KEYWORDS),
+                        ("rules", SCORE_RULES)):
+        unknown = set(getattr(inputs, kind)) - set(known)
+        if unknown:
+            raise ValueError(
+                f"{module_id}: unknown {kind} {sorted(unknown)}")
+
+    def register(fn: ModuleScorer) -> ModuleScorer:
+        MODULE_SCORERS[module_id] = fn
+        MODULE_INPUTS[module_id] = inputs
+        return fn
+
+    return register
+
+
+def module_fingerprint(module_id: str, ctx: FeatureContext) -> str:
+    """SHA-256 over the values of exactly the inputs ``module_id`` reads.
+
+    Two contexts with the same fingerprint give the same module result.
+    Modules without a scorer read nothing (they return the fallback).
+    """
+    inputs = MODULE_INPUTS.get(module_id, ModuleInputs())
+    payload = [
+        module_id,
+        [getattr(ctx, name) for name in inputs.features],
+        [ctx.mentions(signal) for signal in inputs.signals],
+        [ctx.matches(pattern) for pattern in inputs.patterns],
+        [ctx.rule_score(name) for name in inputs.rules],
+    ]
+    return hashlib.sha256(
+        json.dumps(payload, default=str).encode("utf-8")).hexdigest()
+
+
+def run_module(module_cfg: dict, ctx: FeatureContext) -> dict:
+    """
+    Run a single analysis module.
+    ALL scores are derived from the actual uploaded / client-entered data.
+    No hardcoded mock scores.
+    """
+    mid = module_cfg["id"]
+    scorer = MODULE_SCORERS.get(mid)
+    if scorer is None:
+        return {
+            "module_id": mid,
+            "score": 5.0,
+            "confidence": 0.3,
+            "note": "Insufficient data for this module",
+            "data_sources": {}
+        }
+    return {
+        "module_id": mid,
+        **scorer(_DeclaredView(ctx, MODULE_INPUTS[mid], mid))
+    }
+
+
+def run_modules(modules: Iterable[dict],
+                ctx: FeatureContext,
+                skip: Iterable[str] = ()) -> Dict[str, dict]:
+    """Run every module config over ``ctx`` except ids in ``skip``"""
+    skipped = frozenset(skip)
+    return {
+        mod["id"]: run_module(mod, ctx)
+        for mod in modules if mod["id"] not in skipped
+    }
+
+
+# Text patterns the scorers read through FeatureContext.search / findall
+_TAM_RE = re.compile(r'TAM[:\s]*\$?([\d.]+)\s*(B|M|billion|million)',
+                     re.IGNORECASE)
+_SAM_RE = re.compile(r'SAM[:\s]*\$?([\d.]+)\s*(B|M|billion|million)',
+                     re.IGNORECASE)
+_SOM_RE = re.compile(r'SOM[:\s]*\$?([\d.]+)\s*(B|M|billion|million)',
+                     re.IGNORECASE)
+_GROWTH_RE = re.compile(r'(\d+)%?\s*(CAGR|month-over-month|MoM|annual)',
+                        re.IGNORECASE)
+# Founders and leadership
+_FOUNDER_RE = re.compile(
+    r'(?:CEO|CTO|Co-?founder|Founder|VP|Director)[:\s]+([A-Z][a-z]+ [A-Z][a-z]+)'
+)
+_CEO_RE = re.compile(r'CEO[:\s]+(.+?)(?:\n|$)')
+_CTO_RE = re.compile(r'CTO[:\s]+(.+?)(?:\n|$)')
+# IP
+_PATENT_RE = re.compile(r'(\d+)\s*patents?\s*(pending|granted|filed)?',
+                        re.IGNORECASE)
+# Funding round
+_ASK_RE = re.compile(
+    r'\$?([\d.]+)\s*[Mm](illion)?\s*(Series\s*[A-Z]|seed|raise|round)',
+    re.IGNORECASE)
+_VALUATION_RE = re.compile(
+    r'\$?([\d.]+)\s*[Mm](illion)?\s*(pre-money|post-money|valuation)',
+    re.IGNORECASE)
+_STAGE_RE = re.compile(r'(Series\s*[A-Z]|Seed|Pre-?seed|Bridge)',
+                       re.IGNORECASE)
+TEXT_PATTERNS = {
+    "tam": _TAM_RE,
+    "sam": _SAM_RE,
+    "som": _SOM_RE,
+    "growth": _GROWTH_RE,
+    "founders": _FOUNDER_RE,
+    "ceo": _CEO_RE,
+    "cto": _CTO_RE,
+    "patent": _PATENT_RE,
+    "ask": _ASK_RE,
+    "valuation": _VALUATION_RE,
+    "stage": _STAGE_RE,
+}
+
+
+# 1. TCA SCORECARD
+@module_scorer("tca_scorecard",
+               features=("revenue", "customers", "nrr", "team_size", "mrr",
+                         "gross_margin", "burn_rate", "runway",
+                         "has_financial_data", "has_key_metrics", "has_text"),
+               signals=("tca_technology", "tca_team", "tca_business_model"))
+def _score_tca_scorecard(ctx: FeatureContext) -> dict:
+    # --- Market Potential (weight 20) --------------------------
+    revenue = ctx.revenue
+    customers = ctx.customers
+    nrr = ctx.nrr
+    market_score = 5.0
+    if revenue > 0:
+        market_score += min(2.0, revenue / 500_000)  # up to +2 for $1M+
+    if customers >= 20:
+        market_score += 1.0
+    if nrr > 100:
+        market_score += min(1.0, (nrr - 100) / 30)
+    market_score = _clamp(round(market_score, 1))
+    market_strengths = []
+    market_concerns = []
+    if revenue >= 300_000:
+        market_strengths.append(
+            f"Revenue ${revenue:,.0f} shows product-market fit")
+    else:
+        market_concerns.append(
+            f"Revenue ${revenue:,.0f} â€” product-market fit not yet proven"
+        )
+    if customers >= 30:
+        market_strengths.append(f"{int(customers)} paying customers")
+    elif customers > 0:
+        market_concerns.append(
+            f"Only {int(customers)} customers â€” early traction")
+    if nrr > 100:
+        market_strengths.append(f"{nrr:.0f}% NRR â€” strong retention")
+
+    # --- Technology Innovation (weight 15) ---------------------
+    tech_mentions = ctx.mentions("tca_technology")
+    tech_score = _clamp(round(5.0 + min(3.0, len(tech_mentions) * 0.8), 1))
+    tech_strengths = tech_mentions[:3] if tech_mentions else [
+        "No specific tech differentiators identified"
+    ]
+    tech_concerns = []
+    if len(tech_mentions) < 2:
+        tech_concerns.append("Limited technology differentiation signals")
+    else:
+        tech_concerns.append("IP portfolio depth should be verified")
+
+    # --- Team Capability (weight 25) ---------------------------
+    team_size = ctx.team_size
+    team_mentions = ctx.mentions("tca_team")
+    team_score = 5.0
+    if team_size >= 10:
+        team_score += 1.5
+    elif team_size >= 5:
+        team_score += 0.8
+    team_score += min(2.5, len(team_mentions) * 0.5)
+    team_score = _clamp(round(team_score, 1))
+    team_strengths = f"Team of {int(team_size)}" if team_size else "Team size not provided"
+    if team_mentions:
+        team_strengths += f"; signals: {', '.join(team_mentions[:4])}"
+    team_concerns = "Detailed team background needs verification" if len(
+        team_mentions) < 3 else "Key-person dependency risk"
+
+    # --- Business Model (weight 20) ----------------------------
+    mrr = ctx.mrr
+    gross_margin = ctx.gross_margin
+    bm_score = 5.0
+    if mrr > 0:
+        bm_score += min(2.0, mrr / 30_000)
+    if gross_margin > 50:
+        bm_score += min(2.0, (gross_margin - 50) / 20)
+    bm_mentions = ctx.mentions("tca_business_model")
+    bm_score += min(1.0, len(bm_mentions) * 0.3)
+    bm_score = _clamp(round(bm_score, 1))
+    bm_strengths = f"MRR ${mrr:,.0f}" if mrr else "Revenue model data not provided"
+    if gross_margin:
+        bm_strengths += f"; Gross margin {gross_margin}%"
+    bm_concerns = "Unit economics at scale need validation"
+
+    # --- Financial Health (weight 20) --------------------------
+    burn_rate = ctx.burn_rate
+    runway = ctx.runway
+    fh_score = 5.0
+    if runway >= 18:
+        fh_score += 2.5
+    elif runway >= 12:
+        fh_score += 1.5
+    elif runway >= 6:
+        fh_score += 0.5
+    else:
+        fh_score -= 1.0
+    if revenue > 0 and burn_rate > 0:
+        burn_multiple = burn_rate / max(revenue / 12, 1)
+        if burn_multiple < 1.5:
+            fh_score += 1.5
+        elif burn_multiple < 3.0:
+            fh_score += 0.5
+    fh_score = _clamp(round(fh_score, 1))
+    fh_strengths = f"Runway {runway:.0f} months" if runway else "Runway not provided"
+    if burn_rate:
+        fh_strengths += f"; Burn ${burn_rate:,.0f}/mo"
+    fh_concerns = "Burn rate optimization needed" if burn_rate and revenue and burn_rate > revenue / 12 * 2 else "Monitor cash efficiency"
+
+    categories = [
+        {
+            "category":
+            "Market Potential",
+            "raw_score":
+            market_score,
+            "weight":
+            20,
+            "flag":
+            _flag_color(market_score),
+            "strengths":
+            "; ".join(market_strengths) if market_strengths else "N/A",
+            "concerns":
+            "; ".join(market_concerns)
+            if market_concerns else "None identified"
+        },
+        {
+            "category":
+            "Technology Innovation",
+            "raw_score":
+            tech_score,
+            "weight":
+            15,
+            "flag":
+            _flag_color(tech_score),
+            "strengths":
+            "; ".join(tech_strengths),
+            "concerns":
+            "; ".join(tech_concerns)
+            if tech_concerns else "None identified"
+        },
+        {
+            "category": "Team Capability",
+            "raw_score": team_score,
+            "weight": 25,
+            "flag": _flag_color(team_score),
+            "strengths": team_strengths,
+            "concerns": team_concerns
+        },
+        {
+            "category": "Business Model",
+            "raw_score": bm_score,
+            "weight": 20,
+            "flag": _flag_color(bm_score),
+            "strengths": bm_strengths,
+            "concerns": bm_concerns
+        },
+        {
+            "category": "Financial Health",
+            "raw_score": fh_score,
+            "weight": 20,
+            "flag": _flag_color(fh_score),
+            "strengths": fh_strengths,
+            "concerns": fh_concerns
+        },
+    ]
+    composite = round(
+        sum(c["raw_score"] * c["weight"] for c in categories) / 100, 2)
+    return {
+        "score":
+        composite,
+        "composite_score":
+        composite,
+        "categories":
+        categories,
+        "recommendation":
+        "Proceed with due diligence"
+        if composite >= 7 else "Further analysis needed",
+        "data_sources": {
+            "financial_data": ctx.has_financial_data,
+            "key_metrics": ctx.has_key_metrics,
+            "text_analysis": ctx.has_text
+        },
+        "confidence":
+        min(0.95, 0.5 + 0.15 *
+            sum([ctx.has_financial_data, ctx.has_key_metrics, ctx.has_text])),
+    }
+
+
+# 2. RISK ASSESSMENT
+@module_scorer("risk_assessment",
+               features=("burn_rate", "runway", "team_size", "customers",
+                         "mom_growth", "nrr",
+                         "has_financial_data", "has_key_metrics", "has_text"),
+               signals=("risk_technology", "risk_regulatory",
+                        "risk_competitive"))
+def _score_risk_assessment(ctx: FeatureContext) -> dict:
+    burn_rate = ctx.burn_rate
+    runway = ctx.runway
+    team_size = ctx.team_size
+    customers = ctx.customers
+
+    # Financial risk: high burn vs runway
+    if runway > 0 and burn_rate > 0:
+        fin_risk = _clamp(round(10 - runway / 2, 1), 1, 9)
+    elif burn_rate > 0:
+        fin_risk = 7.0
+    else:
+        fin_risk = 5.0
+    fin_trigger = f"Burn ${burn_rate:,.0f}/mo with {runway:.0f} months runway" if burn_rate else "Financial data incomplete"
+    fin_impact = "High â€” limited runway" if runway < 12 else "Medium â€” adequate runway" if runway < 18 else "Low â€” strong runway"
+    fin_mitigation = "Raise follow-on or cut burn" if runway < 12 else "Optimise spend; plan next raise" if runway < 18 else "Maintain current trajectory"
+
+    # Market risk: customer concentration
+    mkt_risk = _clamp(round(8 - min(4.0, customers / 15), 1), 1,
+                      9) if customers > 0 else 6.0
+    mkt_trigger = f"{int(customers)} customers â€” {'diversified' if customers >= 30 else 'concentration risk'}"
+    mkt_impact = "Low" if customers >= 50 else "Medium" if customers >= 20 else "High â€” customer concentration"
+    mkt_mitigation = "Expand customer base" if customers < 30 else "Continue customer acquisition"
+
+    # Team risk
+    team_risk = _clamp(round(7 - min(3.0, team_size / 5), 1), 1,
+                       9) if team_size > 0 else 6.0
+    team_trigger = f"Team of {int(team_size)}" if team_size else "Team size unknown"
+    team_impact = "Limited" if team_size >= 10 else "Medium â€” small team" if team_size >= 5 else "High â€” very small team"
+    team_mitigation = "Cross-train and hire for gaps" if team_size < 10 else "Ensure succession planning"
+
+    # Technology risk from text signals
+    tech_risk_signals = ctx.mentions("risk_technology")
+    tech_risk = _clamp(round(7 - len(tech_risk_signals) * 1.2, 1), 1, 9)
+    tech_trigger = f"{len(tech_risk_signals)} tech differentiators identified" if tech_risk_signals else "Limited tech differentiation signals"
+    tech_impact = "Low" if len(tech_risk_signals) >= 3 else "Medium"
+    tech_mitigation = "Continue R&D investment" if len(
+        tech_risk_signals
+    ) >= 2 else "Invest in IP protection and tech stack"
+
+    # Execution risk
+    mom_growth = ctx.mom_growth
+    nrr = ctx.nrr
+    exec_risk = 5.0
+    if mom_growth > 10:
+        exec_risk -= 1.5
+    elif mom_growth > 5:
+        exec_risk -= 0.5
+    if nrr > 100:
+        exec_risk -= 1.0
+    exec_risk = _clamp(round(exec_risk, 1), 1, 9)
+    exec_trigger = f"Growth {mom_growth}% MoM, NRR {nrr}%" if mom_growth or nrr else "Growth metrics not provided"
+    exec_impact = "Low" if exec_risk < 4 else "Medium" if exec_risk < 6 else "High"
+    exec_mitigation = "Maintain execution momentum" if exec_risk < 4 else "Improve delivery processes"
+
+    # Regulatory risk (baseline from text)
+    reg_signals = ctx.mentions("risk_regulatory")
+    reg_risk = _clamp(round(6 - len(reg_signals) * 1.5, 1), 1, 9)
+    reg_trigger = f"Compliance signals: {', '.join(reg_signals)}" if reg_signals else "No compliance certifications mentioned"
+    reg_impact = "Low" if reg_risk < 4 else "Medium"
+    reg_mitigation = "Maintain compliance posture" if reg_signals else "Pursue relevant compliance certifications"
+
+    # Competitive risk
+    comp_signals = ctx.mentions("risk_competitive")
+    comp_risk = _clamp(round(7 - len(comp_signals) * 1.5, 1), 1, 9)
+    comp_trigger = "Competitive moats identified" if comp_signals else "Limited competitive moats"
+    comp_impact = "Low" if comp_risk < 4 else "Medium-high"
+    comp_mitigation = "Build partnerships and strengthen moat" if comp_risk >= 5 else "Continue building competitive advantages"
+
+    risk_domains = {
+        "financial_risk": {
+            "score": fin_risk,
+            "level": _flag_color(10 - fin_risk),
+            "trigger": fin_trigger,
+            "impact": fin_impact,
+            "mitigation": fin_mitigation
+        },
+        "market_risk": {
+            "score": mkt_risk,
+            "level": _flag_color(10 - mkt_risk),
+            "trigger": mkt_trigger,
+            "impact": mkt_impact,
+            "mitigation": mkt_mitigation
+        },
+        "team_risk": {
+            "score": team_risk,
+            "level": _flag_color(10 - team_risk),
+            "trigger": team_trigger,
+            "impact": team_impact,
+            "mitigation": team_mitigation
+        },
+        "technology_risk": {
+            "score": tech_risk,
+            "level": _flag_color(10 - tech_risk),
+            "trigger": tech_trigger,
+            "impact": tech_impact,
+            "mitigation": tech_mitigation
+        },
+        "execution_risk": {
+            "score": exec_risk,
+            "level": _flag_color(10 - exec_risk),
+            "trigger": exec_trigger,
+            "impact": exec_impact,
+            "mitigation": exec_mitigation
+        },
+        "regulatory_risk": {
+            "score": reg_risk,
+            "level": _flag_color(10 - reg_risk),
+            "trigger": reg_trigger,
+            "impact": reg_impact,
+            "mitigation": reg_mitigation
+        },
+        "competitive_risk": {
+            "score": comp_risk,
+            "level": _flag_color(10 - comp_risk),
+            "trigger": comp_trigger,
+            "impact": comp_impact,
+            "mitigation": comp_mitigation
+        },
+    }
+    overall = round(
+        sum(d["score"] for d in risk_domains.values()) / len(risk_domains),
+        1)
+    flags = [{
+        "domain": k,
+        "flag": v["level"],
+        "severity": v["score"],
+        "trigger": v["trigger"],
+        "impact": v["impact"],
+        "mitigation": v["mitigation"]
+    } for k, v in risk_domains.items()]
+    return {
+        "score":
+        _clamp(round(10 - overall, 1)),
+        "overall_risk_score":
+        overall,
+        "risk_domains":
+        risk_domains,
+        "flags":
+        flags,
+        "data_sources": {
+            "financial_data": ctx.has_financial_data,
+            "key_metrics": ctx.has_key_metrics,
+            "text_analysis": ctx.has_text
+        },
+        "confidence":
+        min(0.90, 0.4 + 0.15 *
+            sum([ctx.has_financial_data, ctx.has_key_metrics, ctx.has_text]))
+    }
+
+
+# 3. MARKET ANALYSIS
+@module_scorer("market_analysis",
+               features=("revenue", "customers", "nrr", "mom_growth",
+                         "has_key_metrics", "has_text"),
+               signals=("market_advantages", ),
+               patterns=("tam", "sam", "som", "growth"))
+def _score_market_analysis(ctx: FeatureContext) -> dict:
+    revenue = ctx.revenue
+    customers = ctx.customers
+    nrr = ctx.nrr
+    mom_growth = ctx.mom_growth
+
+    # Extract market sizing from text or company_info
+    tam_match = ctx.search("tam")
+    sam_match = ctx.search("sam")
+    som_match = ctx.search("som")
+
+    def _fmt_market(m):
+        if not m:
+            return "Not provided"
+        val, unit = m.group(1), m.group(2).upper()
+        return f"${val}{'B' if unit.startswith('B') else 'M'}"
+
+    tam = _fmt_market(tam_match)
+    sam = _fmt_market(sam_match)
+    som = _fmt_market(som_match)
+
+    # Derive growth rate from text or metrics
+    growth_match = ctx.search("growth")
+    growth_rate = f"{mom_growth}% MoM" if mom_growth else (
+        growth_match.group(0) if growth_match else "Not provided")
+
+    # Score: based on actual market data availability + metrics
+    market_score = 5.0
+    if tam != "Not provided":
+        market_score += 1.5
+    if revenue > 200_000:
+        market_score += 1.0
+    if customers >= 20:
+        market_score += 0.8
+    if nrr > 100:
+        market_score += 0.7
+    if mom_growth > 10:
+        market_score += 1.0
+    elif mom_growth > 5:
+        market_score += 0.5
+    market_score = _clamp(round(market_score, 1))
+
+    # Competitive advantages from text
+    competitive_advantages = ctx.mentions("market_advantages") or [
+        "Not identified from submitted data"
+    ]
+
+    # Competitive position derived from score
+    if market_score >= 8:
+        competitive_position = "Leader"
+    elif market_score >= 6.5:
+        competitive_position = "Challenger"
+    elif market_score >= 5:
+        competitive_position = "Emerging"
+    else:
+        competitive_position = "Nascent"
+
+    return {
+        "score":
+        market_score,
+        "market_score":
+        market_score,
+        "tam":
+        tam,
+        "sam":
+        sam,
+        "som":
+        som,
+        "growth_rate":
+        growth_rate,
+        "competitive_position":
+        competitive_position,
+        "competitive_advantages":
+        competitive_advantages,
+        "data_sources": {
+            "text_analysis": ctx.has_text,
+            "key_metrics": ctx.has_key_metrics
+        },
+        "confidence":
+        min(
+            0.90, 0.4 + 0.1 * sum([
+                tam != "Not provided", sam != "Not provided", revenue > 0,
+                customers > 0, mom_growth > 0
+            ]))
+    }
+
+
+# 4. TEAM ASSESSMENT
+@module_scorer("team_assessment",
+               features=("team_size", "has_key_metrics", "has_text"),
+               signals=("team_experience", "team_key_roles"),
+               patterns=("founders", "ceo", "cto"))
+def _score_team_assessment(ctx: FeatureContext) -> dict:
+    team_size = ctx.team_size
+
+    # Parse founder/team info from text
+    founder_mentions = ctx.findall("founders")
+    experience_signals = ctx.mentions("team_experience")
+
+    # Build founder list from real text
+    founders = []
+    ceo_match = ctx.search("ceo")
+    cto_match = ctx.search("cto")
+    if ceo_match:
+        founders.append({
+            "role":
+            "CEO",
+            "description":
+            ceo_match.group(1).strip(),
+            "experience_score":
+            min(95, 60 + len(experience_signals) * 5)
+        })
+    if cto_match:
+        founders.append({
+            "role":
+            "CTO",
+            "description":
+            cto_match.group(1).strip(),
+            "experience_score":
+            min(95, 55 + len(experience_signals) * 5)
+        })
+    if not founders and founder_mentions:
+        for fm in founder_mentions[:3]:
+            founders.append({
+                "role": "Team member",
+                "description": fm,
+                "experience_score": 60
+            })
+
+    # Completeness: check key roles present
+    key_roles = MODULE_KEYWORDS["team_key_roles"]
+    present_roles = ctx.mentions("team_key_roles")
+    covered = len(present_roles)
+    team_completeness = round(covered / len(key_roles) * 100)
+
+    # Gaps: roles NOT found
+    gaps = [r for r in key_roles if r not in present_roles]
+
+    # Score
+    team_score = 5.0
+    if team_size >= 10:
+        team_score += 1.5
+    elif team_size >= 5:
+        team_score += 0.8
+    team_score += min(2.0, len(experience_signals) * 0.4)
+    team_score += min(1.0, len(founders) * 0.5)
+    if team_completeness >= 60:
+        team_score += 0.5
+    team_score = _clamp(round(team_score, 1))
+
+    return {
+        "score":
+        team_score,
+        "team_score":
+        team_score,
+        "team_completeness":
+        team_completeness,
+        "diversity_score":
+        min(100, 40 + len(set(experience_signals)) * 10),
+        "founder_experience":
+        min(95, 50 + len(experience_signals) * 7),
+        "leadership_strength":
+        min(95, 45 + covered * 10),
+        "gaps":
+        gaps if gaps else ["No major gaps identified"],
+        "founders":
+        founders if founders else [{
+            "role": "Unknown",
+            "description": "No founder data extracted",
+            "experience_score": 0
+        }],
+        "team_size":
+        int(team_size) if team_size else "Not provided",
+        "data_sources": {
+            "text_analysis": ctx.has_text,
+            "key_metrics": ctx.has_key_metrics
+        },
+        "confidence":
+        min(
+            0.90, 0.3 + 0.15 * sum([
+                team_size > 0,
+                bool(founders),
+                bool(experience_signals),
+                ctx.has_text
+            ]))
+    }
+
+
+# 5. FINANCIAL ANALYSIS
+@module_scorer("financial_analysis",
+               features=("revenue", "burn_rate", "runway", "mrr",
+                         "gross_margin", "mom_growth", "nrr", "customers",
+                         "burn_multiple", "mrr_per_customer",
+                         "has_financial_data", "has_key_metrics"),
+               rules=("financial_analysis", ))
+def _score_financial_analysis(ctx: FeatureContext) -> dict:
+    revenue = ctx.revenue
+    burn_rate = ctx.burn_rate
+    runway = ctx.runway
+    mrr = ctx.mrr
+    gross_margin = ctx.gross_margin
+    mom_growth = ctx.mom_growth
+
+    # Score built entirely from actual data (revenue, runway, margin,
+    # growth and burn multiple thresholds; see SCORE_RULES)
+    score = ctx.rule_score("financial_analysis")
+
+    # Burn multiple (lower is better)
+    burn_multiple = 0
+    if ctx.burn_multiple is not None:
+        burn_multiple = ctx.burn_multiple
+
+    # LTV/CAC proxy (if NRR and MRR available)
+    nrr = ctx.nrr
+    customers = ctx.customers
+    ltv_cac = 0
+    if ctx.mrr_per_customer is not None:
+        estimated_ltv = ctx.mrr_per_customer * 12 * (nrr / 100 if nrr > 0
+                                                     else 1.0)
+        estimated_cac = burn_rate * 0.4 / max(
+            customers / 12, 1) if burn_rate > 0 and customers > 0 else 0
+        ltv_cac = round(estimated_ltv /
+                        estimated_cac, 1) if estimated_cac > 0 else 0
+
+    score = _clamp(round(score, 1))
+
+    # Revenue projections based on actual growth rate
+    growth_multiplier = 1 + (mom_growth / 100) if mom_growth > 0 else 1.05
+    proj_12m = round(revenue *
+                     (growth_multiplier**12)) if revenue > 0 else 0
+    proj_24m = round(revenue *
+                     (growth_multiplier**24)) if revenue > 0 else 0
+
+    return {
+        "score":
+        score,
+        "financial_health_score":
+        score,
+        "revenue":
+        revenue,
+        "mrr":
+        mrr,
+        "burn_rate":
+        burn_rate,
+        "runway_months":
+        runway,
+        "ltv_cac_ratio":
+        ltv_cac,
+        "gross_margin":
+        gross_margin / 100 if gross_margin > 1 else gross_margin,
+        "revenue_growth_mom":
+        mom_growth / 100 if mom_growth > 1 else mom_growth,
+        "burn_multiple":
+        burn_multiple,
+        "projections": {
+            "12m_revenue": proj_12m,
+            "24m_revenue": proj_24m
+        },
+        "data_sources": {
+            "financial_data": ctx.has_financial_data,
+            "key_metrics": ctx.has_key_metrics
+        },
+        "confidence":
+        min(
+            0.95, 0.3 + 0.1 * sum([
+                revenue > 0, burn_rate > 0, runway > 0, mrr > 0,
+                gross_margin > 0, mom_growth > 0
+            ]))
+    }
+
+
+# 6. TECHNOLOGY ASSESSMENT
+@module_scorer("technology_assessment",
+               features=("customers", "revenue", "has_text"),
+               signals=("technology_innovation", "technology_security",
+                        "technology_stack"),
+               patterns=("patent", ))
+def _score_technology_assessment(ctx: FeatureContext) -> dict:
+    tech_found = ctx.mentions("technology_innovation")
+    security_found = ctx.mentions("technology_security")
+    stack_found = ctx.mentions("technology_stack")
+
+    # IP / patent signals
+    patent_match = ctx.search("patent")
+    patents_desc = patent_match.group(
+        0) if patent_match else "No patent data found"
+
+    # TRL (Technology Readiness Level) estimation
+    trl = 5  # base
+    if tech_found:
+        trl += 1
+    if security_found:
+        trl += 1
+    if ctx.customers >= 10:
+        trl = max(trl, 7)  # deployed with paying customers
+    if ctx.revenue > 100_000:
+        trl = max(trl, 8)
+
+    # Score
+    score = 5.0
+    score += min(2.0, len(tech_found) * 0.5)
+    score += min(1.0, len(security_found) * 0.5)
+    score += min(1.0, len(stack_found) * 0.3)
+    if patent_match:
+        score += 1.0
+    score = _clamp(round(score, 1))
+
+    # Risks derived from gaps
+    risks = []
+    if not security_found:
+        risks.append("No security certifications mentioned")
+    if len(stack_found) < 2:
+        risks.append("Limited tech stack information provided")
+    if not patent_match:
+        risks.append("No patent or IP protection mentioned")
+    if not risks:
+        risks.append(
+            "Monitor technology evolution and competitive responses")
+
+    ip_strength = "Strong" if patent_match and security_found else "Moderate" if patent_match or security_found else "Weak â€” no IP signals found"
+
+    return {
+        "score":
+        score,
+        "technology_score":
+        score,
+        "ip_strength":
+        f"{ip_strength} â€” {patents_desc}",
+        "trl":
+        min(trl, 9),
+        "scalability":
+        "Production-ready"
+        if trl >= 7 else "Scaling needed" if trl >= 5 else "Early stage",
+        "stack":
+        stack_found
+        if stack_found else ["Not identified from submitted data"],
+        "risks":
+        risks,
+        "tech_differentiators":
+        tech_found if tech_found else ["None identified"],
+        "security_compliance":
+        security_found if security_found else ["None identified"],
+        "data_sources": {
+            "text_analysis": ctx.has_text
+        },
+        "confidence":
+        min(
+            0.85, 0.3 + 0.1 * sum([
+                bool(tech_found),
+                bool(security_found),
+                bool(stack_found),
+                bool(patent_match)
+            ]))
+    }
+
+
+# 7. BUSINESS MODEL
+@module_scorer("business_model",
+               features=("revenue", "mrr", "burn_rate", "gross_margin",
+                         "customers", "nrr", "mrr_per_customer",
+                         "has_financial_data", "has_key_metrics", "has_text"),
+               signals=("business_model_type", "business_model_recurring",
+                        "business_positioning"))
+def _score_business_model(ctx: FeatureContext) -> dict:
+    revenue = ctx.revenue
+    mrr = ctx.mrr
+    burn_rate = ctx.burn_rate
+    gross_margin = ctx.gross_margin
+    customers = ctx.customers
+
+    # Detect model type from text
+    model_signals = ctx.mentions("business_model_type")
+    model_type = ", ".join(
+        model_signals[:3]) if model_signals else "Not identified"
+
+    # Revenue model strength
+    rev_strength = 5.0
+    if mrr > 0:
+        rev_strength += min(2.0, mrr / 30_000)
+    if gross_margin > 60:
+        rev_strength += 1.0
+    if ctx.mentions("business_model_recurring"):
+        rev_strength += 0.5  # recurring revenue models are stronger
+    rev_strength = _clamp(round(rev_strength, 1))
+
+    # Unit economics from real data
+    cac = 0
+    ltv = 0
+    payback_months = 0
+    if customers > 0 and burn_rate > 0:
+        cac = round(burn_rate * 0.4 * 12 / max(customers, 1))  # estimated
+    if ctx.mrr_per_customer is not None:
+        nrr = ctx.nrr
+        ltv = round(ctx.mrr_per_customer * 12 *
+                    (nrr / 100 if nrr > 0 else 1.0))
+    if cac > 0 and ctx.mrr_per_customer is not None:
+        payback_months = round(
+            cac / ctx.mrr_per_customer) if ctx.mrr_per_customer > 0 else 0
+
+    # Overall score
+    score = 5.0
+    if mrr > 20_000:
+        score += 1.0
+    if gross_margin > 60:
+        score += 1.0
+    if ltv > 0 and cac > 0 and ltv / cac > 3:
+        score += 1.0
+    elif ltv > 0 and cac > 0 and ltv / cac > 1.5:
+        score += 0.5
+    score += min(1.0, len(model_signals) * 0.3)
+    score = _clamp(round(score, 1))
+
+    # Strategic positioning from text
+    positioning_signals = ctx.mentions("business_positioning")
+    strategic_positioning = ", ".join(
+        positioning_signals
+    ) if positioning_signals else "Not clearly identified from data"
+
+    return {
+        "score":
+        score,
+        "business_model_score":
+        score,
+        "model_type":
+        model_type,
+        "revenue_model_strength":
+        rev_strength,
+        "strategic_positioning":
+        strategic_positioning,
+        "unit_economics": {
+            "cac": cac,
+            "ltv": ltv,
+            "payback_months": payback_months,
+            "ltv_cac_ratio": round(ltv / cac, 1) if cac > 0 else 0
+        },
+        "data_sources": {
+            "financial_data": ctx.has_financial_data,
+            "key_metrics": ctx.has_key_metrics,
+            "text_analysis": ctx.has_text
+        },
+        "confidence":
+        min(
+            0.90, 0.3 + 0.1 * sum([
+                revenue > 0, mrr > 0, customers > 0, gross_margin > 0,
+                bool(model_signals)
+            ]))
+    }
+
+
+# 8. GROWTH ASSESSMENT
+@module_scorer("growth_assessment",
+               features=("revenue", "mom_growth", "nrr", "customers",
+                         "team_size", "runway", "has_financial_data",
+                         "has_key_metrics", "has_text"),
+               signals=("growth_drivers", "growth_challenges"),
+               rules=("growth_assessment", "growth_scalability"))
+def _score_growth_assessment(ctx: FeatureContext) -> dict:
+    revenue = ctx.revenue
+    mom_growth = ctx.mom_growth
+    nrr = ctx.nrr
+    customers = ctx.customers
+    team_size = ctx.team_size
+
+    # Growth score from actual metrics
+    score = _clamp(round(ctx.rule_score("growth_assessment"), 1))
+
+    # Scalability index (revenue per head, NRR)
+    scalability = _clamp(round(ctx.rule_score("growth_scalability"), 1))
+
+    # Growth projections from actual growth rate
+    growth_multiplier = 1 + (mom_growth / 100) if mom_growth > 0 else 1.05
+    proj_y1 = round(
+        growth_multiplier**12,
+        1) if mom_growth > 0 else "N/A â€” growth data not provided"
+    proj_y2 = round(growth_multiplier**24, 1) if mom_growth > 0 else "N/A"
+    proj_y3 = round(growth_multiplier**36, 1) if mom_growth > 0 else "N/A"
+
+    # Drivers and challenges from actual data signals
+    growth_drivers = []
+    if nrr > 100:
+        growth_drivers.append(
+            f"Net revenue retention {nrr}% â€” expansion revenue")
+    if mom_growth > 10:
+        growth_drivers.append(
+            f"{mom_growth}% MoM growth â€” strong momentum")
+    if customers > 20:
+        growth_drivers.append(
+            f"{int(customers)} customers â€” expanding base")
+    text_drivers = ctx.mentions("growth_drivers")
+    growth_drivers.extend(text_drivers)
+    if not growth_drivers:
+        growth_drivers.append(
+            "Growth drivers not clearly identified from data")
+
+    scaling_challenges = []
+    if team_size < 10:
+        scaling_challenges.append(
+            f"Small team ({int(team_size)}) may limit scaling speed")
+    if ctx.runway < 12:
+        scaling_challenges.append(
+            f"Limited runway ({ctx.runway:.0f} months) constrains growth"
+        )
+    text_challenges = ctx.mentions("growth_challenges")
+    scaling_challenges.extend(text_challenges[:2])
+    if not scaling_challenges:
+        scaling_challenges.append("No major scaling challenges identified")
+
+    return {
+        "score":
+        score,
+        "growth_potential_score":
+        score,
+        "scalability_index":
+        scalability,
+        "growth_drivers":
+        growth_drivers,
+        "scaling_challenges":
+        scaling_challenges,
+        "growth_projections": {
+            "year1": f"{proj_y1}x",
+            "year2": f"{proj_y2}x",
+            "year3": f"{proj_y3}x"
+        },
+        "actual_growth_rate":
+        f"{mom_growth}% MoM" if mom_growth else "Not provided",
+        "nrr":
+        nrr if nrr else "Not provided",
+        "data_sources": {
+            "financial_data": ctx.has_financial_data,
+            "key_metrics": ctx.has_key_metrics,
+            "text_analysis": ctx.has_text
+        },
+        "confidence":
+        min(
+            0.90, 0.3 + 0.15 *
+            sum([mom_growth > 0, nrr > 0, customers > 0, revenue > 0]))
+    }
+
+
+# 9. INVESTMENT READINESS
+@module_scorer("investment_readiness",
+               features=("revenue", "mrr", "burn_rate", "runway", "customers",
+                         "mom_growth", "company_stage", "has_financial_data",
+                         "has_key_metrics", "has_text"),
+               patterns=("ask", "valuation", "stage"),
+               rules=("investment_readiness", ))
+def _score_investment_readiness(ctx: FeatureContext) -> dict:
+    revenue = ctx.revenue
+    mrr = ctx.mrr
+    burn_rate = ctx.burn_rate
+    runway = ctx.runway
+    customers = ctx.customers
+    mom_growth = ctx.mom_growth
+
+    # Readiness score from actual data
+    score = _clamp(round(ctx.rule_score("investment_readiness"), 1))
+
+    # Extract funding ask from text
+    ask_match = ctx.search("ask")
+    valuation_match = ctx.search("valuation")
+    stage_match = ctx.search("stage")
+
+    funding_ask = ask_match.group(0) if ask_match else "Not specified"
+    valuation = valuation_match.group(
+        0) if valuation_match else "Not specified"
+    stage = stage_match.group(0) if stage_match else ctx.company_stage
+
+    # Implied ARR multiple
+    arr = revenue if revenue > 0 else mrr * 12 if mrr > 0 else 0
+    val_num = 0
+    if valuation_match:
+        try:
+            val_num = float(valuation_match.group(1)) * 1_000_000
+        except ValueError:
+            val_num = 0
+    arr_multiple = round(val_num /
+                         arr, 1) if arr > 0 and val_num > 0 else "N/A"
+
+    # Exit potential from actual metrics
+    exit_timeline = "7+ years"
+    if revenue > 500_000 and mom_growth > 10:
+        exit_timeline = "4-6 years"
+    elif revenue > 200_000:
+        exit_timeline = "5-7 years"
+
+    return {
+        "score":
+        score,
+        "readiness_score":
+        score,
+        "exit_potential": {
+            "timeline":
+            exit_timeline,
+            "strategic_fit":
+            "High" if score >= 7 else "Moderate" if score >= 5 else "Low"
+        },
+        "funding_recommendation": {
+            "round":
+            stage,
+            "ask":
+            funding_ask,
+            "valuation":
+            valuation,
+            "arr_multiple":
+            arr_multiple,
+            "valuation_range":
+            valuation
+            if valuation != "Not specified" else "Insufficient data"
+        },
+        "investor_fit":
+        [],  # no mock investors; real matching requires external data
+        "actual_metrics_used": {
+            "revenue": revenue,
+            "mrr": mrr,
+            "burn_rate": burn_rate,
+            "runway_months": runway,
+            "customers": int(customers),
+            "growth_rate": f"{mom_growth}% MoM" if mom_growth else "N/A",
+        },
+        "data_sources": {
+            "financial_data": ctx.has_financial_data,
+            "key_metrics": ctx.has_key_metrics,
+            "text_analysis": ctx.has_text
+        },
+        "confidence":
+        min(
+            0.90, 0.3 + 0.1 * sum([
+                revenue > 0, mrr > 0, customers > 0, mom_growth > 0, runway
+                > 0,
+                bool(stage)
+            ]))
+    }
@@ -0,0 +1,108 @@
+"""
+Precomputed triage and DD reports.
+
+/api/reports/triage and /api/reports/dd rebuilt a large nested report
+(20+ sections for DD) from the stored analysis on every view.  Reports
+are now rendered once, when an analysis completes, and stored in
+analysis_reports (schema/analysis_reports.sql) as gzip-compressed JSON
+keyed by (analysis_id, report type, REPORT_VERSION).  The GET report
+endpoints serve those bytes as they are, with an ETag, so a repeat view is
+one indexed row read (or a 304) and no rendering or compression.
+"""
+
+import gzip
+import hashlib
+import json
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+# Bump whenever the report builders change: older stored reports are then
+# re-rendered on first view
+REPORT_VERSION = 1
+REPORT_TYPES = ("triage", "dd")
+
+
+class StoredReport(NamedTuple):
+    etag: str
+    content: Optional[bytes]  # gzip JSON; None when the client's ETag matched
+
+
+def encode_report(report: dict) -> Tuple[bytes, str, int]:
+    """(gzip JSON, quoted ETag, raw size) for a report dict.
+
+    The JSON is what FastAPI would have sent for the dict, and gzip
+    output is deterministic, so equal reports get equal bytes and ETags.
+    """
+    raw = json.dumps(report,
+                     ensure_ascii=False,
+                     allow_nan=False,
+                     separators=(",", ":"),
+                     default=str).encode("utf-8")
+    etag = f'"{hashlib.sha256(raw).hexdigest()[:32]}"'
+    return gzip.compress(raw, compresslevel=6, mtime=0), etag, len(raw)
+
+
+def if_none_match_tags(if_none_match: Optional[str]) -> List[str]:
+    """Entity tags of an If-None-Match header (weak tags compare equal)"""
+    if not if_none_match:
+        return []
+    return [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+
+
+class AnalysisReports:
+    """Read / write analysis_reports"""
+
+    async def ensure_schema(self):
+        """Create the analysis_reports table if it does not exist"""
+        from database_config import execute_sql_file
+        await execute_sql_file(
+            str(Path(__file__).parent / "schema" / "analysis_reports.sql"))
+
+    async def save(self, conn, reports: Iterable[Tuple[str, str, bytes, str,
+                                                       int]]):
+        """Store ``(analysis_id, report_type, content, etag, raw_size)``"""
+        rows = [(analysis_id, report_type, REPORT_VERSION, etag, content,
+                 raw_size)
+                for analysis_id, report_type, content, etag, raw_size in
+                reports]
+        if not rows:
+            return
+        await conn.executemany(
+            """INSERT INTO analysis_reports
+                   (analysis_id, report_type, report_version, etag, content,
+                    raw_size)
+               VALUES ($1, $2, $3, $4, $5, $6)
+               ON CONFLICT (analysis_id, report_type, report_version)
+               DO UPDATE SET etag = EXCLUDED.etag,
+                             content = EXCLUDED.content,
+                             raw_size = EXCLUDED.raw_size,
+                             created_at = NOW()""", rows)
+
+    async def get(self,
+                  conn,
+                  analysis_id: str,
+                  report_type: str,
+                  if_none_match: Optional[str] = None
+                  ) -> Optional[StoredReport]:
+        """
+        The stored report, or None.  The content is not even read from the
+        table when ``if_none_match`` already names the current version.
+        """
+        tags = if_none_match_tags(if_none_match)
+        row = await conn.fetchrow(
+            """SELECT etag,
+                      CASE WHEN $4 OR etag = ANY($5::text[]) THEN NULL
+                           ELSE content END AS content
+               FROM analysis_reports
+               WHERE analysis_id = $1 AND report_type = $2
+                 AND report_version = $3""", analysis_id, report_type,
+            REPORT_VERSION, "*" in tags, tags)
+        if row is None:
+            return None
+        content = row["content"]
+        return StoredReport(row["etag"],
+                            bytes(content) if content is not None else None)
+
+
+# Global analysis report instance
+analysis_reports = AnalysisReports()
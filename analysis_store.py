@@ -0,0 +1,114 @@
+"""
+Storage of 9-module analysis results (nine_module_analyses) linked to
+their source uploads
+"""
+
+import json
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+
+def new_analysis_id(prefix: str = "9mod") -> str:
+    """Unique analysis id, e.g. ``9mod_20250101_120000_1a2b3c4d``"""
+    return (f"{prefix}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_"
+            f"{uuid.uuid4().hex[:8]}")
+
+
+class AnalysisStore:
+    """Read / write nine_module_analyses and its upload links"""
+
+    async def ensure_schema(self):
+        """Create the analysis tables if they do not exist"""
+        from database_config import execute_sql_file
+        await execute_sql_file(
+            str(Path(__file__).parent / "schema" /
+                "nine_module_analyses.sql"))
+
+    async def save(self, conn, outputs: List[dict], **upload_columns):
+        """
+        Store analysis outputs (each carrying ``analysis_id`` and
+        ``source_upload_ids``) in one transaction and point the source
+        allupload rows at them, clearing any result embedded there by
+        earlier versions.  ``upload_columns`` are extra allupload columns
+        to set on those rows (e.g. processing_status).
+        """
+        analyses = []
+        links = []
+        for output in outputs:
+            analysis_id = output["analysis_id"]
+            analyses.append(
+                (analysis_id, output.get("company_name"),
+                 output.get("final_tca_score"),
+                 output.get("investment_recommendation"),
+                 json.dumps(output)))
+            links.extend((analysis_id, uuid.UUID(uid))
+                         for uid in output.get("source_upload_ids", []))
+        if not analyses:
+            return
+
+        extra_sets = "".join(f", {column} = ${i}"
+                             for i, column in enumerate(upload_columns, 3))
+        async with conn.transaction():
+            await conn.executemany(
+                """INSERT INTO nine_module_analyses
+                       (analysis_id, company_name, final_tca_score,
+                        recommendation, result)
+                   VALUES ($1, $2, $3, $4, $5)
+                   ON CONFLICT (analysis_id) DO UPDATE
+                   SET company_name = EXCLUDED.company_name,
+                       final_tca_score = EXCLUDED.final_tca_score,
+                       recommendation = EXCLUDED.recommendation,
+                       result = EXCLUDED.result,
+                       created_at = NOW()""", analyses)
+            if not links:
+                return
+            await conn.executemany(
+                """INSERT INTO nine_module_analysis_uploads
+                       (analysis_id, upload_id)
+                   VALUES ($1, $2)
+                   ON CONFLICT DO NOTHING""", links)
+            await conn.execute(
+                f"""UPDATE allupload AS a
+                    SET analysis_id = l.analysis_id,
+                        analysis_result = NULL,
+                        updated_at = NOW(){extra_sets}
+                    FROM unnest($1::text[], $2::uuid[])
+                         AS l(analysis_id, upload_id)
+                    WHERE a.upload_id = l.upload_id""",
+                [analysis_id for analysis_id, _ in links],
+                [upload_id for _, upload_id in links],
+                *upload_columns.values())
+
+    @staticmethod
+    def _decode(row) -> Optional[dict]:
+        if row is None:
+            return None
+        result = row["result"]
+        return json.loads(result) if isinstance(result, str) else result
+
+    async def get(self, conn, analysis_id: str) -> Optional[dict]:
+        """The stored analysis output for ``analysis_id`` or None"""
+        return self._decode(await conn.fetchrow(
+            "SELECT result FROM nine_module_analyses WHERE analysis_id = $1",
+            analysis_id))
+
+    async def latest_for_company(self, conn,
+                                 company_name: str) -> Optional[dict]:
+        """The most recent analysis output for ``company_name`` or None"""
+        return self._decode(await conn.fetchrow(
+            """SELECT result FROM nine_module_analyses
+               WHERE company_name = $1
+               ORDER BY created_at DESC LIMIT 1""", company_name))
+
+    async def resolve(self, conn, analysis_id: Optional[str],
+                      company_name: str) -> Optional[dict]:
+        """By ``analysis_id`` when given, else the company's latest"""
+        if analysis_id:
+            return await self.get(conn, analysis_id)
+        return await self.latest_for_company(conn, company_name)
+
+
+# Global analysis store instance
+analysis_store = AnalysisStore()
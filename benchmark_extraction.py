@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Extraction benchmark and regression check for DocumentExtractor.
+
+Usage:
+    python benchmark_extraction.py [--sizes small,medium,large] [--repeat N]
+                                   [--baseline FILE] [--threshold 0.3]
+                                   [--gate-timings] [--write-baseline]
+                                   [--corpus-dir DIR]
+
+A synthetic corpus (PDF, PPTX, DOCX, XLSX, CSV, JSON, RTF, ODT) is generated
+in memory at each requested size (or written to --corpus-dir).  For every
+document the format's extract_from_<fmt> method and extract_from_file are
+timed (fastest of --repeat runs, the least noisy statistic on a shared
+machine), throughput is reported in MB/s, and the peak Python heap of
+extract_from_file is measured with tracemalloc (native allocations inside
+MuPDF/lxml are not visible to tracemalloc).
+
+Against --baseline the run fails (exit 1) when any document uses more
+memory than the baseline by more than --threshold (0.3 = 30%) or extracts
+a different word count.  Timings are divided by a fixed pure-Python
+calibration loop, but native parsers (MuPDF, lxml) do not scale with it, so
+timing regressions against a baseline from another machine are only
+reported.  To gate on them, record a baseline on the same machine first
+(e.g. ``--write-baseline --baseline /tmp/base.json`` on the base commit)
+and compare with --gate-timings.  Timings under NOISE_FLOOR_MS are never
+gated.  --write-baseline stores the current run instead.
+"""
+
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+
+from benchmark_pattern_scanner import synthetic_deck
+from document_extractor import EXTRACTOR_VERSION, DocumentExtractor
+
+DEFAULT_BASELINE = Path(__file__).parent / "extraction_benchmark_baseline.json"
+NOISE_FLOOR_MS = 5.0
+
+# Units per size: pages, slides, paragraphs, rows, records
+SIZES = {
+    "small": {"pdf": 2, "pptx": 3, "docx": 40, "xlsx": 200, "csv": 500,
+              "json": 100, "rtf": 40, "odt": 40},
+    "medium": {"pdf": 20, "pptx": 30, "docx": 400, "xlsx": 5000,
+               "csv": 20000, "json": 2000, "rtf": 400, "odt": 400},
+    "large": {"pdf": 100, "pptx": 120, "docx": 2000, "xlsx": 50000,
+              "csv": 200000, "json": 20000, "rtf": 2000, "odt": 2000},
+}
+
+MIME_TYPES = {
+    "pdf": "application/pdf",
+    "pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "json": "application/json",
+    "rtf": "application/rtf",
+    "odt": "application/vnd.oasis.opendocument.text",
+}
+
+
+# ─── Synthetic corpus ───────────────────────────────────────────────────────
+
+
+def _lines(count: int, seed: int) -> list:
+    text = synthetic_deck(size=max(2000, count * 90), seed=seed)
+    lines = [line for line in text.split("\n") if line]
+    return (lines * (count // len(lines) + 1))[:count]
+
+
+def make_pdf(pages: int) -> bytes:
+    import fitz
+    doc = fitz.open()
+    lines = _lines(pages * 30, seed=11)
+    for page_num in range(pages):
+        page = doc.new_page()
+        y = 60
+        for line in lines[page_num * 30:(page_num + 1) * 30]:
+            page.insert_text((50, y), line[:90], fontsize=9)
+            y += 14
+        if page_num % 4 == 0:
+            # A ruled 5x4 financial table on every fourth page
+            for row in range(6):
+                page.draw_line((50, 520 + row * 18), (450, 520 + row * 18))
+                for col in range(4):
+                    if row < 5:
+                        page.insert_text((56 + col * 100, 533 + row * 18),
+                                         f"{(row + 1) * (col + 2) * 1250:,}",
+                                         fontsize=9)
+            for col in range(5):
+                page.draw_line((50 + col * 100, 520), (50 + col * 100, 610))
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_pptx(slides: int) -> bytes:
+    from pptx import Presentation
+    from pptx.util import Inches
+    prs = Presentation()
+    lines = _lines(slides * 6, seed=12)
+    for index in range(slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {index + 1}: Acme Robotics Inc"
+        body = slide.placeholders[1].text_frame
+        body.text = lines[index * 6]
+        for line in lines[index * 6 + 1:(index + 1) * 6]:
+            body.add_paragraph().text = line
+        box = slide.shapes.add_textbox(Inches(1), Inches(6), Inches(6),
+                                       Inches(1))
+        box.text_frame.text = "Revenue: $2.4M ARR, 35 employees"
+    out = io.BytesIO()
+    prs.save(out)
+    return out.getvalue()
+
+
+def make_docx(paragraphs: int) -> bytes:
+    from docx import Document
+    doc = Document()
+    for line in _lines(paragraphs, seed=13):
+        doc.add_paragraph(line)
+    table = doc.add_table(rows=6, cols=4)
+    for row_index, row in enumerate(table.rows):
+        for col_index, cell in enumerate(row.cells):
+            cell.text = f"{(row_index + 1) * (col_index + 1) * 1000}"
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def make_xlsx(rows: int) -> bytes:
+    import openpyxl
+    wb = openpyxl.Workbook(write_only=True)
+    sheet = wb.create_sheet("Model")
+    sheet.append(["Month", "Revenue", "COGS", "Opex", "Notes"])
+    for index in range(rows):
+        sheet.append([
+            f"2024-{index % 12 + 1:02d}", 120000 + index * 37.5,
+            48000 + index * 11.25, 65000 + index * 7, "forecast"
+        ])
+    summary = wb.create_sheet("Summary")
+    summary.append(["Company", "Acme Robotics Inc"])
+    summary.append(["Revenue", "$2.4M ARR"])
+    out = io.BytesIO()
+    wb.save(out)
+    return out.getvalue()
+
+
+def make_csv(rows: int) -> bytes:
+    out = io.StringIO()
+    out.write("month,revenue,customers,churn,comment\n")
+    for index in range(rows):
+        out.write(f"2024-{index % 12 + 1:02d},{120000 + index * 37.5},"
+                  f"{1200 + index},{3 + index % 4}%,\"steady, on plan\"\n")
+    return out.getvalue().encode()
+
+
+def make_json(records: int) -> bytes:
+    lines = _lines(records, seed=14)
+    return json.dumps({
+        "company": {"name": "Acme Robotics Inc", "founded": 2019},
+        "metrics": [{
+            "month": index % 12 + 1,
+            "revenue": 120000 + index * 37.5,
+            "note": lines[index]
+        } for index in range(records)]
+    }).encode()
+
+
+def make_rtf(paragraphs: int) -> bytes:
+    body = "".join(f"\\pard {line}\\par\n"
+                   for line in _lines(paragraphs, seed=15))
+    return ("{\\rtf1\\ansi\\deff0 {\\fonttbl {\\f0 Helvetica;}}\n" + body +
+            "}").encode()
+
+
+def make_odt(paragraphs: int) -> bytes:
+    from xml.sax.saxutils import escape
+    body = "".join(f"<text:p>{escape(line)}</text:p>"
+                   for line in _lines(paragraphs, seed=16))
+    content = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<office:document-content '
+        'xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+        'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">'
+        f'<office:body><office:text>{body}</office:text></office:body>'
+        '</office:document-content>')
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as odt:
+        odt.writestr("mimetype", MIME_TYPES["odt"])
+        odt.writestr("content.xml", content)
+    return out.getvalue()
+
+
+GENERATORS = {
+    "pdf": make_pdf,
+    "pptx": make_pptx,
+    "docx": make_docx,
+    "xlsx": make_xlsx,
+    "csv": make_csv,
+    "json": make_json,
+    "rtf": make_rtf,
+    "odt": make_odt,
+}
+
+
+def build_corpus(sizes: list) -> list:
+    """[(name, format, bytes)] for every format at every requested size"""
+    return [(f"{fmt}-{size}", fmt, GENERATORS[fmt](SIZES[size][fmt]))
+            for size in sizes for fmt in GENERATORS]
+
+
+# ─── Measurement ────────────────────────────────────────────────────────────
+
+
+def calibration_ms(repeat: int = 15) -> float:
+    """Fastest time of a fixed pure-Python workload on this machine"""
+
+    def workload():
+        total = 0
+        for i in range(300000):
+            total += i * i % 7
+        return total
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        workload()
+        samples.append((time.perf_counter() - start) * 1000)
+    return min(samples)
+
+
+def best_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return min(samples)
+
+
+def peak_kb(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def measure(name: str, fmt: str, data: bytes, repeat: int) -> dict:
+    raw = getattr(DocumentExtractor, f"extract_from_{fmt}")
+    file_name = f"{name}.{fmt}"
+
+    def end_to_end():
+        return DocumentExtractor.extract_from_file(data, MIME_TYPES[fmt],
+                                                   file_name)
+
+    result = end_to_end()
+    raw_ms = best_ms(lambda: raw(data), repeat)
+    file_ms = best_ms(end_to_end, repeat)
+    return {
+        "format": fmt,
+        "bytes": len(data),
+        "raw_ms": round(raw_ms, 2),
+        "file_ms": round(file_ms, 2),
+        "mb_per_s": round(len(data) / 1048576 / (file_ms / 1000), 2)
+        if file_ms else 0.0,
+        "peak_kb": round(peak_kb(end_to_end), 1),
+        "words": result["word_count"],
+    }
+
+
+def timing_regressions(current: dict, baseline: dict,
+                       threshold: float) -> list:
+    """Slowdowns of ``current`` against ``baseline`` beyond ``threshold``.
+
+    Times are compared after dividing by each run's calibration_ms.
+    """
+    scale = baseline["calibration_ms"] / current["calibration_ms"]
+    problems = []
+    for name, now in current["documents"].items():
+        before = baseline["documents"].get(name)
+        if before is None:
+            continue
+        for key in ("raw_ms", "file_ms"):
+            if max(before[key], now[key] * scale) < NOISE_FLOOR_MS:
+                continue
+            ratio = now[key] * scale / before[key] if before[key] else 0.0
+            if ratio > 1 + threshold:
+                problems.append(f"{name}: {key} {before[key]:.2f} -> "
+                                f"{now[key] * scale:.2f} (x{ratio:.2f})")
+    return problems
+
+
+def compare(current: dict, baseline: dict, threshold: float,
+            timings: bool = True) -> list:
+    """Regressions of ``current`` against ``baseline`` beyond ``threshold``:
+    memory and word counts, plus timing_regressions() with ``timings``."""
+    problems = (timing_regressions(current, baseline, threshold)
+                if timings else [])
+    for name, now in current["documents"].items():
+        before = baseline["documents"].get(name)
+        if before is None:
+            continue
+        if before["peak_kb"] and now["peak_kb"] > before["peak_kb"] * (
+                1 + threshold) and now["peak_kb"] - before["peak_kb"] > 256:
+            problems.append(f"{name}: peak_kb {before['peak_kb']:.0f} -> "
+                            f"{now['peak_kb']:.0f}")
+        if before["words"] != now["words"]:
+            problems.append(f"{name}: word count {before['words']} -> "
+                            f"{now['words']}")
+    return problems
+
+
+def run(sizes: list, repeat: int) -> dict:
+    calibration = calibration_ms()
+    documents = {}
+    for name, fmt, data in build_corpus(sizes):
+        documents[name] = measure(name, fmt, data, repeat)
+    return {
+        "extractor_version": EXTRACTOR_VERSION,
+        "python": platform.python_version(),
+        "calibration_ms": round(min(calibration, calibration_ms()), 3),
+        "documents": documents,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', default='small,medium',
+                        help='comma-separated subset of small,medium,large')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=0.3)
+    parser.add_argument('--gate-timings', action='store_true',
+                        help='fail on slowdowns too (baseline from this machine)')
+    parser.add_argument('--write-baseline', action='store_true')
+    parser.add_argument('--corpus-dir', type=Path,
+                        help='write the synthetic corpus here and exit')
+    args = parser.parse_args()
+    sizes = [s.strip() for s in args.sizes.split(',') if s.strip()]
+
+    if args.corpus_dir:
+        args.corpus_dir.mkdir(parents=True, exist_ok=True)
+        for name, fmt, data in build_corpus(sizes):
+            (args.corpus_dir / f"{name}.{fmt}").write_bytes(data)
+        print(f"Corpus written to {args.corpus_dir}")
+        return 0
+
+    current = run(sizes, args.repeat)
+    print(f"{'document':14s} {'bytes':>9s} {'raw ms':>9s} {'file ms':>9s} "
+          f"{'MB/s':>7s} {'peak KB':>9s}")
+    for name, doc in current["documents"].items():
+        print(f"{name:14s} {doc['bytes']:9d} {doc['raw_ms']:9.2f} "
+              f"{doc['file_ms']:9.2f} {doc['mb_per_s']:7.2f} "
+              f"{doc['peak_kb']:9.1f}")
+
+    if args.write_baseline:
+        args.baseline.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --write-baseline")
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    problems = compare(current, baseline, args.threshold, args.gate_timings)
+    if not args.gate_timings:
+        slower = timing_regressions(current, baseline, args.threshold)
+        if slower:
+            print(f"\n{len(slower)} slowdown(s) over {args.threshold:.0%} "
+                  f"(not gated; see --gate-timings):")
+            for problem in slower:
+                print(f"  {problem}")
+    if problems:
+        print(f"\n{len(problems)} regression(s) over "
+              f"{args.threshold:.0%} against {args.baseline.name}:")
+        for problem in problems:
+            print(f"  {problem}")
+        return 1
+    print(f"\nNo regressions over {args.threshold:.0%} against "
+          f"{args.baseline.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
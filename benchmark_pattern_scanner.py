@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: PatternScanner vs the per-pattern DocumentExtractor methods.
+
+Usage:
+    python benchmark_pattern_scanner.py [DECK_DIR_OR_FILE ...] [--repeat N]
+
+Every file given (directories are walked) is run through
+DocumentExtractor.extract_from_file to obtain its text.  The legacy path
+(extract_company_info + extract_financial_data + extract_key_metrics +
+enhance_extraction) and pattern_scanner.scan() are then timed on that text,
+and their outputs are compared field by field.  Without arguments a
+synthetic 50k-char pitch deck is used.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from document_extractor import DocumentExtractor
+from pattern_scanner import pattern_scanner
+
+DECK_SUFFIXES = {'.pdf', '.pptx', '.docx', '.xlsx', '.csv', '.json', '.txt',
+                 '.rtf', '.odt'}
+
+
+def legacy_scan(text: str) -> tuple:
+    D = DocumentExtractor
+    return D.enhance_extraction(text, D.extract_company_info(text),
+                                D.extract_financial_data(text),
+                                D.extract_key_metrics(text))
+
+
+def synthetic_deck(size: int = 50000, seed: int = 1) -> str:
+    """Pitch-deck-like filler with a few metric lines sprinkled in"""
+    rng = random.Random(seed)
+    words = ("the platform helps enterprise teams automate workflows with "
+             "our cloud product market strategy investors quarter pipeline "
+             "roadmap hiring partners pilot retention onboarding").split()
+    facts = [
+        "Revenue: $2.4M ARR", "35 employees", "founded 2019", "churn 3%",
+        "NRR 120%", "CAC $450 LTV $9,000", "1,200+ customers",
+        "Based in Austin, TX", "raised $5M seed", "gross margin 72%"
+    ]
+    lines = ["Acme Robotics Inc"]
+    while sum(len(line) + 1 for line in lines) < size:
+        line = " ".join(rng.choice(words) for _ in range(12))
+        if rng.random() < 0.02:
+            line += ". " + rng.choice(facts)
+        lines.append(line)
+    return "\n".join(lines)[:size]
+
+
+def load_corpus(paths: list) -> list:
+    docs = []
+    for root in paths:
+        root = Path(root)
+        files = [root] if root.is_file() else sorted(
+            p for p in root.rglob('*') if p.suffix.lower() in DECK_SUFFIXES)
+        for path in files:
+            extracted = DocumentExtractor.extract_from_file(
+                path.read_bytes(), '', path.name)
+            if extracted.get('text_content'):
+                docs.append((path.name, extracted['text_content']))
+    return docs
+
+
+def time_ms(fn, text: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('paths', nargs='*', help='deck files or directories')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    docs = load_corpus(args.paths) if args.paths else [
+        ('synthetic-50k', synthetic_deck())
+    ]
+    if not docs:
+        print("No extractable documents found")
+        return 1
+
+    print(f"{'document':40s} {'chars':>7s} {'legacy ms':>10s} "
+          f"{'scanner ms':>10s} {'speedup':>8s}  same")
+    mismatches = 0
+    total_legacy = total_scanner = 0.0
+    for name, text in docs:
+        same = legacy_scan(text) == pattern_scanner.scan(text)
+        mismatches += not same
+        legacy_ms = time_ms(legacy_scan, text, args.repeat)
+        scanner_ms = time_ms(pattern_scanner.scan, text, args.repeat)
+        total_legacy += legacy_ms
+        total_scanner += scanner_ms
+        print(f"{name[:40]:40s} {len(text):7d} {legacy_ms:10.2f} "
+              f"{scanner_ms:10.2f} {legacy_ms / max(scanner_ms, 1e-6):7.1f}x"
+              f"  {'yes' if same else 'NO'}")
+
+    print(f"\nTotal: legacy {total_legacy:.1f} ms, scanner "
+          f"{total_scanner:.1f} ms "
+          f"({total_legacy / max(total_scanner, 1e-6):.1f}x), "
+          f"{mismatches} mismatching document(s)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Claim / run / retry loop shared by the SSD job queue and callback outbox.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import uuid
+from typing import Any, Dict, Hashable, List, Optional
+
+from database_config import db_manager
+
+logger = logging.getLogger(__name__)
+
+
+class ClaimLoop:
+    """
+    Claims up to ``concurrency`` rows at a time with FOR UPDATE SKIP LOCKED
+    and runs each in its own task.  Subclasses implement _claim(), _key(),
+    _process() and _release(), and set ``label`` for log messages.
+    """
+
+    label = "item"
+
+    def __init__(self, concurrency: int, max_attempts: int,
+                 retry_base_s: float, retry_max_s: float,
+                 poll_interval_s: float):
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_base_s = retry_base_s
+        self.retry_max_s = retry_max_s
+        self.poll_interval_s = poll_interval_s
+        self.worker_id = (f"{socket.gethostname()}:{os.getpid()}:"
+                          f"{uuid.uuid4().hex[:6]}")
+        self._running: Dict[Hashable, asyncio.Task] = {}
+        self._wake = asyncio.Event()
+        self._poll_task: Optional[asyncio.Task] = None
+
+    # ─── Subclass hooks ─────────────────────────────────────────────────
+
+    async def _claim(self, conn, limit: int) -> List[Any]:
+        """Lock and return up to ``limit`` ready rows for this worker"""
+        raise NotImplementedError
+
+    def _key(self, item) -> Hashable:
+        """The id a claimed row is tracked (and released) by"""
+        raise NotImplementedError
+
+    async def _process(self, item):
+        """Run one claimed row and record its outcome"""
+        raise NotImplementedError
+
+    async def _release(self, conn, keys: List[Hashable]):
+        """Hand rows this worker still holds back to the queue"""
+        raise NotImplementedError
+
+    # ─── Lifecycle ──────────────────────────────────────────────────────
+
+    @property
+    def started(self) -> bool:
+        return self._poll_task is not None
+
+    def start(self):
+        """Start claiming rows"""
+        if self._poll_task is None:
+            self._poll_task = asyncio.create_task(self._poll())
+
+    async def stop(self):
+        """Stop claiming, cancel running rows and hand them back"""
+        tasks = [self._poll_task] if self._poll_task else []
+        self._poll_task = None
+        running = list(self._running)
+        tasks.extend(self._running.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if not running:
+            return
+        try:
+            async with db_manager.get_connection() as conn:
+                await self._release(conn, running)
+        except Exception as e:
+            # Their heartbeat / lease times out and another worker takes them
+            logger.warning(f"Could not release {self.label}s on shutdown: {e}")
+
+    # ─── Loop ───────────────────────────────────────────────────────────
+
+    async def _poll(self):
+        while True:
+            free = self.concurrency - len(self._running)
+            claimed = 0
+            if free > 0:
+                try:
+                    async with db_manager.get_connection() as conn:
+                        items = await self._claim(conn, free)
+                    for item in items:
+                        task = asyncio.create_task(self._run(item))
+                        self._running[self._key(item)] = task
+                    claimed = len(items)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"{self.label} claim failed: {e}")
+            if free > 0 and claimed == free:
+                continue  # more may be ready
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(),
+                                       self.poll_interval_s)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, item):
+        key = self._key(item)
+        try:
+            await self._process(item)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Bookkeeping failed: the heartbeat / lease timeout retries it
+            logger.error(f"{self.label} {key} bookkeeping failed: {e}")
+        finally:
+            self._running.pop(key, None)
+            self._wake.set()
+
+    def _backoff_s(self, attempt: int) -> float:
+        delay = min(self.retry_max_s, self.retry_base_s * 2**(attempt - 1))
+        # Jitter so rows that failed together do not retry together
+        return delay * random.uniform(0.8, 1.2)
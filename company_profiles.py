@@ -0,0 +1,191 @@
+"""
+Pre-merged company profiles (company_profiles) for the 9-module analysis
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Uploads merged per company (the analysis has always used the latest 20)
+PROFILE_UPLOADS = 20
+
+
+def merge_uploads(rows) -> Optional[dict]:
+    """
+    Merge allupload rows in the given order: extracted_text joined with
+    newlines, extracted_data shallow-merged so later rows override earlier
+    ones.  None when there are no rows.
+    """
+    if not rows:
+        return None
+    merged_text = []
+    merged_data = {}
+    field_sources = {}
+    source_ids = []
+    for r in rows:
+        upload_id = str(r["upload_id"])
+        source_ids.append(upload_id)
+        if r["extracted_text"]:
+            merged_text.append(r["extracted_text"])
+        ed = r["extracted_data"]
+        if isinstance(ed, str):
+            try:
+                ed = json.loads(ed)
+            except Exception:
+                ed = {}
+        if isinstance(ed, dict):
+            merged_data = {**merged_data, **ed}
+            field_sources.update(dict.fromkeys(ed, upload_id))
+    return {
+        "merged_text": "\n".join(merged_text),
+        "merged_data": merged_data,
+        "field_sources": field_sources,
+        "source_upload_ids": source_ids,
+    }
+
+
+def metric_sources(profile: dict) -> Dict[str, str]:
+    """``section.metric`` -> upload_id for every metric of a dict field"""
+    sources = profile["field_sources"]
+    return {
+        f"{field}.{metric}": sources[field]
+        for field, value in profile["merged_data"].items()
+        if isinstance(value, dict) and field in sources for metric in value
+    }
+
+
+class CompanyProfiles:
+    """Maintain and read the company_profiles table"""
+
+    async def ensure_schema(self):
+        """Create the company_profiles table if it does not exist"""
+        from database_config import execute_sql_file
+        await execute_sql_file(
+            str(Path(__file__).parent / "schema" / "company_profiles.sql"))
+
+    async def backfill(self, conn, batch_size: int = 200) -> int:
+        """Build missing profiles (companies uploaded before the table)"""
+        names = [
+            r["company_name"] for r in await conn.fetch(
+                """SELECT DISTINCT a.company_name
+                   FROM allupload a
+                   WHERE a.company_name IS NOT NULL
+                     AND NOT EXISTS (SELECT 1 FROM company_profiles p
+                                     WHERE p.company_name = a.company_name)""")
+        ]
+        for start in range(0, len(names), batch_size):
+            await self.refresh(conn, names[start:start + batch_size])
+        return len(names)
+
+    async def refresh(self, conn,
+                      company_names: Iterable[Optional[str]]) -> Dict[str, dict]:
+        """
+        Rebuild the profiles of ``company_names`` from their latest uploads
+        (dropping profiles of companies with none left) and return the new
+        profiles by name.  Call after any allupload insert, delete or
+        change of extracted data / company_name, on the same connection.
+        """
+        names = sorted({name for name in company_names if name})
+        if not names:
+            return {}
+        async with conn.transaction():
+            # Serialise refreshes of a company so the last one to commit
+            # has seen every upload committed before it
+            await conn.execute(
+                """SELECT pg_advisory_xact_lock(hashtext(name))
+                   FROM unnest($1::text[]) AS name""", names)
+            rows = await conn.fetch(
+                """SELECT upload_id, extracted_text, extracted_data,
+                          company_name
+                   FROM (SELECT upload_id, extracted_text, extracted_data,
+                                company_name, created_at,
+                                row_number() OVER (PARTITION BY company_name
+                                                   ORDER BY created_at DESC)
+                                    AS recent
+                         FROM allupload
+                         WHERE company_name = ANY($1::text[])) latest
+                   WHERE recent <= $2
+                   ORDER BY company_name, created_at DESC""", names,
+                PROFILE_UPLOADS)
+            grouped: Dict[str, list] = {}
+            for r in rows:
+                grouped.setdefault(r["company_name"], []).append(r)
+            profiles = {
+                name: merge_uploads(group)
+                for name, group in grouped.items()
+            }
+
+            if profiles:
+                await conn.executemany(
+                    """INSERT INTO company_profiles
+                           (company_name, merged_data, merged_text,
+                            field_sources, source_upload_ids, updated_at)
+                       VALUES ($1, $2, $3, $4, $5::uuid[], NOW())
+                       ON CONFLICT (company_name) DO UPDATE
+                       SET merged_data = EXCLUDED.merged_data,
+                           merged_text = EXCLUDED.merged_text,
+                           field_sources = EXCLUDED.field_sources,
+                           source_upload_ids = EXCLUDED.source_upload_ids,
+                           updated_at = NOW()""",
+                    [(name, json.dumps(p["merged_data"]), p["merged_text"],
+                      json.dumps(p["field_sources"]), p["source_upload_ids"])
+                     for name, p in profiles.items()])
+            gone = [name for name in names if name not in profiles]
+            if gone:
+                await conn.execute(
+                    """DELETE FROM company_profiles
+                       WHERE company_name = ANY($1::text[])""", gone)
+        return profiles
+
+    async def on_uploads_changed(self, conn,
+                                 company_names: Iterable[Optional[str]]):
+        """
+        refresh() for upload write paths: failures are logged, never
+        raised, so a profile problem cannot fail an upload.
+        """
+        try:
+            await self.refresh(conn, company_names)
+        except Exception as e:
+            logger.warning(f"Company profile refresh failed: {e}")
+
+    async def get_many(self, conn, company_names: List[str]) -> Dict[str, dict]:
+        """Stored profiles by name (companies without one are omitted)"""
+        rows = await conn.fetch(
+            """SELECT company_name, merged_data, merged_text, field_sources,
+                      source_upload_ids
+               FROM company_profiles
+               WHERE company_name = ANY($1::text[])""", list(company_names))
+        profiles = {}
+        for r in rows:
+            merged_data, field_sources = r["merged_data"], r["field_sources"]
+            profiles[r["company_name"]] = {
+                "merged_text": r["merged_text"],
+                "merged_data": json.loads(merged_data) if isinstance(
+                    merged_data, str) else merged_data,
+                "field_sources": json.loads(field_sources) if isinstance(
+                    field_sources, str) else field_sources,
+                "source_upload_ids": [str(u) for u in r["source_upload_ids"]],
+            }
+        return profiles
+
+    async def load_many(self, conn,
+                        company_names: Iterable[str]) -> Dict[str, dict]:
+        """
+        Profiles by name; companies whose profile is missing (e.g. rows
+        written by an older backend) are rebuilt on the spot.
+        """
+        names = sorted(set(company_names))
+        if not names:
+            return {}
+        profiles = await self.get_many(conn, names)
+        missing = [name for name in names if name not in profiles]
+        if missing:
+            profiles.update(await self.refresh(conn, missing))
+        return profiles
+
+
+# Global company profile instance
+company_profiles = CompanyProfiles()
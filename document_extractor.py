@@ -0,0 +1,1280 @@
+"""
+Document extraction utilities for the TCA IRR backend.
+
+Holds the parsers that turn uploaded bytes (PDF, DOCX, PPTX, XLSX, CSV,
+JSON, RTF, ODT, plain text) into text plus structured company, financial
+and metric fields.  Everything here is synchronous and free of FastAPI /
+database imports so it can run inside extraction worker processes
+(see extraction_service.py).
+"""
+
+import io
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import time
+from array import array
+from typing import BinaryIO, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever extraction output can change for the same input bytes; it is
+# part of the extraction cache key (see extraction_cache.py).
+EXTRACTOR_VERSION = "2.2"
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+    logger.warning("PyMuPDF not available - PDF extraction limited")
+
+try:
+    import pdfplumber
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+
+try:
+    from docx import Document as DocxDocument
+    DOCX_AVAILABLE = True
+except ImportError:
+    DOCX_AVAILABLE = False
+
+try:
+    from pptx import Presentation
+    PPTX_AVAILABLE = True
+except ImportError:
+    PPTX_AVAILABLE = False
+
+try:
+    import openpyxl
+    XLSX_AVAILABLE = True
+except ImportError:
+    XLSX_AVAILABLE = False
+
+# Per-document PDF budget; pages past either limit are skipped and the
+# extraction is flagged ``truncated``.  Running out of time (which depends
+# on server load, not on the document) also sets ``budget_exhausted``
+PDF_PAGE_BUDGET = int(os.getenv("PDF_PAGE_BUDGET", "300"))
+PDF_TIME_BUDGET = float(os.getenv("PDF_TIME_BUDGET", "30"))
+
+# A page is a table candidate with this many ruling lines (rectangle sides
+# count) or this many rows of three or more widely spaced text cells
+PDF_TABLE_MIN_RULINGS = 6
+PDF_TABLE_MIN_ROWS = 3
+_CELL_GAP_PT = 12.0
+
+# Spreadsheet / CSV streaming limits: rows read per file and characters of
+# cell text kept for pattern scanning
+SPREADSHEET_MAX_ROWS = int(os.getenv("SPREADSHEET_MAX_ROWS", "200000"))
+SPREADSHEET_TEXT_LIMIT = int(os.getenv("SPREADSHEET_TEXT_LIMIT", "200000"))
+
+# A column is numeric when at least this share of its non-empty cells (and
+# at least _NUMERIC_MIN_VALUES of them) parse as numbers
+_NUMERIC_SHARE = 0.8
+_NUMERIC_MIN_VALUES = 3
+_MAX_NUMERIC_SUMMARIES = 50
+_NUMBER_NOISE = re.compile(r'[\s$€£,%]')
+
+# Extractors take either the raw bytes or a binary file opened on a spooled
+# upload (see upload_spool.py); the latter is never read into memory whole.
+FileContent = Union[bytes, BinaryIO]
+
+
+def _as_stream(file_content: FileContent) -> BinaryIO:
+    """Seekable binary stream over bytes or an already open file"""
+    if hasattr(file_content, 'read'):
+        file_content.seek(0)
+        return file_content
+    return io.BytesIO(file_content)
+
+
+def _decode_utf8(file_content: FileContent) -> str:
+    """UTF-8 text of bytes or of an open file, decoded straight from an mmap"""
+    if not hasattr(file_content, 'read'):
+        return file_content.decode('utf-8', errors='ignore')
+    fileno = file_content.fileno()
+    if os.fstat(fileno).st_size == 0:
+        return ""
+    with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as view:
+        return str(view, 'utf-8', 'ignore')
+
+
+def _cell_number(value) -> Optional[float]:
+    """Float value of a numeric cell ("$1,200", "(35)", "12%"), else None"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if math.isfinite(value) else None
+    if not isinstance(value, str):
+        return None
+    text = _NUMBER_NOISE.sub('', value)
+    negative = text.startswith('(') and text.endswith(')')
+    if negative:
+        text = text[1:-1]
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    if not math.isfinite(number):
+        return None
+    return -number if negative else number
+
+
+class _TextBudget:
+    """Joined text pieces, capped at ``limit`` characters"""
+
+    def __init__(self, limit: int, sep: str = " "):
+        self.limit = limit
+        self.sep = sep
+        self.parts = []
+        self.size = 0
+        self.truncated = False
+
+    def extend(self, pieces):
+        if self.truncated:
+            return
+        for piece in pieces:
+            self.size += len(piece) + len(self.sep)
+            if self.size > self.limit:
+                self.truncated = True
+                return
+            self.parts.append(piece)
+
+    def value(self) -> str:
+        return self.sep.join(self.parts)
+
+
+class _ColumnStats:
+    """Streaming numeric-column detection for one sheet"""
+
+    def __init__(self, header):
+        self.header = list(header)
+        self.values = {}
+        self.non_empty = {}
+        self.text_columns = set()
+
+    def add_row(self, row):
+        for index, cell in enumerate(row):
+            if cell is None or cell == '' or index in self.text_columns:
+                continue
+            seen = self.non_empty[index] = self.non_empty.get(index, 0) + 1
+            number = _cell_number(cell)
+            if number is not None:
+                self.values.setdefault(index, array('d')).append(number)
+            elif seen >= 50 and len(self.values.get(index, ())) < seen / 2:
+                # Clearly a text column: stop collecting it
+                self.text_columns.add(index)
+                self.values.pop(index, None)
+
+    def numeric_columns(self, sheet: str) -> list:
+        columns = []
+        for index, values in sorted(self.values.items()):
+            if len(values) < max(_NUMERIC_MIN_VALUES,
+                                 _NUMERIC_SHARE * self.non_empty[index]):
+                continue
+            name = self.header[index] if index < len(self.header) else None
+            columns.append({
+                "sheet": sheet,
+                "column": str(name) if name not in (None, '') else
+                f"column_{index + 1}",
+                "values": values,
+            })
+        return columns
+
+
+def _numeric_summaries(columns: list) -> list:
+    """JSON-friendly count/min/max/sum/last of extracted numeric columns"""
+    return [{
+        "sheet": column["sheet"],
+        "column": column["column"],
+        "count": len(column["values"]),
+        "min": min(column["values"]),
+        "max": max(column["values"]),
+        "sum": sum(column["values"]),
+        "last": column["values"][-1],
+    } for column in columns[:_MAX_NUMERIC_SUMMARIES]]
+
+
+def _looks_like_table_page(page) -> bool:
+    """Cheap PyMuPDF check for ruling lines or column-aligned text rows"""
+    rulings = 0
+    for drawing in page.get_drawings():
+        for item in drawing["items"]:
+            if item[0] == "re":
+                rulings += 4
+            elif item[0] == "l":
+                start, end = item[1], item[2]
+                if abs(start.x - end.x) < 1 or abs(start.y - end.y) < 1:
+                    rulings += 1
+        if rulings >= PDF_TABLE_MIN_RULINGS:
+            return True
+
+    # Borderless tables: words sharing a baseline, split by wide gaps
+    rows = {}
+    for x0, _, x1, y1, *_ in page.get_text("words"):
+        rows.setdefault(round(y1), []).append((x0, x1))
+    tabular_rows = 0
+    for words in rows.values():
+        words.sort()
+        cells = 1 + sum(1 for (_, prev_end), (next_start, _) in zip(
+            words, words[1:]) if next_start - prev_end > _CELL_GAP_PT)
+        if cells >= 3:
+            tabular_rows += 1
+            if tabular_rows >= PDF_TABLE_MIN_ROWS:
+                return True
+    return False
+
+
+def extract_pdf_pages(source: Union[str, FileContent],
+                      page_numbers: Optional[List[int]] = None,
+                      deadline: Optional[float] = None,
+                      with_text: bool = False) -> dict:
+    """pdfplumber tables (and optionally text) for the given 0-based pages.
+
+    ``source`` is a path, bytes or an open file.  ``page_numbers=None`` means
+    every page within PDF_PAGE_BUDGET.  Stops at ``deadline`` (time.time())
+    and reports ``truncated`` and ``budget_exhausted``; tables found up to
+    then are kept.
+    """
+    result = {
+        "tables": [],
+        "text": "",
+        "truncated": False,
+        "budget_exhausted": False
+    }
+    try:
+        pdf = pdfplumber.open(
+            source if isinstance(source, str) else _as_stream(source))
+        try:
+            if page_numbers is None:
+                page_numbers = range(min(len(pdf.pages), PDF_PAGE_BUDGET))
+                result["truncated"] = len(pdf.pages) > PDF_PAGE_BUDGET
+            for page_num in page_numbers:
+                if deadline is not None and time.time() > deadline:
+                    result["truncated"] = True
+                    result["budget_exhausted"] = True
+                    break
+                page = pdf.pages[page_num]
+                result["tables"].extend(page.extract_tables())
+                if with_text:
+                    result["text"] += (page.extract_text() or "") + "\n"
+        finally:
+            pdf.close()
+    except Exception as e:
+        logger.error(f"pdfplumber extraction error: {e}")
+    return result
+
+
+class DocumentExtractor:
+    """Production-grade document extraction utility"""
+
+    # Company information patterns
+    COMPANY_PATTERNS = {
+        'company_name': [
+            r'(?:company|startup|business)\s*(?:name)?[:\s]+([A-Z][A-Za-z0-9\s&\'-]+)',
+            r'^([A-Z][A-Za-z0-9\s&\'-]+(?:Inc\.?|LLC|Ltd\.?|Corp\.?|Co\.?))',
+            r'(?:about|introducing|welcome to)\s+([A-Z][A-Za-z0-9\s&\'-]+)',
+        ],
+        'funding': [
+            r'\$\s*([\d,.]+)\s*([MBK](?:illion)?)?',
+            r'(?:raised?|funding|round|investment)[:\s]*\$?([\d,.]+)\s*([MBK])?',
+            r'(?:series\s*[A-Z]|seed|pre-seed)[:\s]*\$?([\d,.]+)\s*([MBK])?',
+        ],
+        'revenue': [
+            r'(?:revenue|arr|mrr|sales)[:\s]*\$?([\d,.]+)\s*([MBK])?',
+            r'\$\s*([\d,.]+)\s*([MBK])?\s*(?:revenue|arr|mrr|sales)',
+        ],
+        'employees': [
+            r'(\d+)\s*(?:\+)?\s*(?:employees?|team members?|staff|people)',
+            r'(?:team|employees?)\s*(?:size)?[:\s]*(\d+)',
+        ],
+        'founded': [
+            r'(?:founded|established|started|since)[:\s]*(\d{4})',
+            r'(\d{4})\s*(?:-\s*present)?$',
+        ],
+        'location': [
+            r'(?:headquarters?|based in|located in|hq)[:\s]+([A-Za-z\s,]+)',
+            r'([A-Z][a-z]+(?:\s*,\s*[A-Z]{2})?)',
+        ],
+        'website': [
+            r'(?:https?://)?(?:www\.)?([a-zA-Z0-9-]+\.[a-z]{2,})',
+        ],
+        'industry': [
+            r'(?:industry|sector|market|space)[:\s]+([A-Za-z\s&-]+)',
+            r'(?:fintech|healthtech|edtech|saas|b2b|b2c|ai|ml|blockchain)',
+        ],
+        'email': [
+            r'[\w\.-]+@[\w\.-]+\.\w+',
+        ],
+        'phone': [
+            r'\+?[\d\s\(\)\-]{10,}',
+        ],
+    }
+
+    FINANCIAL_PATTERNS = {
+        'revenue':
+        r'(?:revenue|arr|mrr|sales)[:\s]*\$?([\d,.]+)\s*([MBK])?(?:illion)?',
+        'burn_rate':
+        r'(?:burn|burn\s*rate|monthly\s*burn)[:\s]*\$?([\d,.]+)\s*([MBK])?',
+        'runway': r'(?:runway)[:\s]*(\d+)\s*(?:months?)?',
+        'valuation': r'(?:valuation)[:\s]*\$?([\d,.]+)\s*([MBK])?(?:illion)?',
+        'gross_margin': r'(?:gross\s*margin)[:\s]*([\d.]+)\s*%?',
+        'growth_rate': r'(?:growth|growth\s*rate|yoy)[:\s]*([\d.]+)\s*%?',
+        'cac': r'(?:cac|customer\s*acquisition\s*cost)[:\s]*\$?([\d,.]+)',
+        'ltv': r'(?:ltv|lifetime\s*value|clv)[:\s]*\$?([\d,.]+)',
+        'customers': r'(?:customers?|clients?|users?)[:\s]*([\d,]+)',
+        'churn': r'(?:churn|churn\s*rate)[:\s]*([\d.]+)\s*%?',
+    }
+
+    KEY_METRIC_PATTERNS = {
+        'team_size': r'(\d+)\s*(?:team|employees?|people|staff)',
+        'customers': r'(\d+(?:,\d{3})*(?:\+)?)\s*(?:customers?|clients?|users?)',
+        'mrr': r'(?:mrr|monthly recurring revenue)[:\s]*\$?([\d,.]+)\s*([MK])?',
+        'arr': r'(?:arr|annual recurring revenue)[:\s]*\$?([\d,.]+)\s*([MK])?',
+        'growth_rate': r'(\d+(?:\.\d+)?)\s*%\s*(?:growth|yoy|mom)',
+        'nrr': r'(?:nrr|net revenue retention)[:\s]*([\d.]+)\s*%?',
+        'cac': r'(?:cac|customer acquisition cost)[:\s]*\$?([\d,.]+)',
+        'ltv': r'(?:ltv|lifetime value|clv)[:\s]*\$?([\d,.]+)',
+        'churn': r'(?:churn|churn rate)[:\s]*([\d.]+)\s*%?',
+        'nps': r'(?:nps|net promoter score)[:\s]*([+-]?\d+)',
+    }
+
+    # Fallback patterns used by enhance_extraction, tried in order
+    ENHANCE_PATTERNS = {
+        'location': [
+            r'(?:San Francisco|New York|Los Angeles|Chicago|Boston|Seattle|Austin|Denver|Miami|Atlanta)',
+            r'(?:California|CA|NY|TX|FL|WA|MA|CO|IL|GA)\b',
+            r'(?:USA|US|United States|Canada|UK|Germany|France|Australia)',
+        ],
+        'founded_year': [
+            r'(?:since|founded in|established|started in)\s*(\d{4})',
+        ],
+        'revenue': [
+            r'\$\s*([\d,.]+)\s*(million|M|K|billion|B)?\s*(?:revenue|arr|annual)',
+            r'(?:revenue|arr)\s*(?:of|:)?\s*\$?\s*([\d,.]+)\s*(million|M|K|billion|B)?',
+            r'([\d,.]+)\s*(million|M|K|billion|B)?\s*(?:in revenue|annual revenue)',
+        ],
+        'cash': [
+            r'\$\s*([\d,.]+)\s*(million|M|K)?\s*(?:cash|bank|runway)',
+        ],
+        'team_size': [
+            r'team\s*(?:of)?\s*(\d+)',
+            r'(\d+)\s*(?:employees?|people|team members?)',
+            r'(\d+)\s*(?:full.?time|ft)',
+        ],
+        'customers': [
+            r'(\d+(?:,\d+)?(?:\+)?)\s*(?:customers?|clients?|users?|companies)',
+            r'(?:serving|reached?)\s*(\d+(?:,\d+)?(?:\+)?)\s*(?:customers?|clients?)',
+        ],
+    }
+
+    INDUSTRY_KEYWORDS = {
+        'fintech': ['fintech', 'financial technology', 'payments', 'banking', 'lending'],
+        'healthtech': ['healthtech', 'healthcare', 'medical', 'health tech', 'telehealth'],
+        'edtech': ['edtech', 'education', 'learning', 'ed tech', 'e-learning'],
+        'saas': ['saas', 'software as a service', 'cloud software', 'subscription software'],
+        'e-commerce': ['e-commerce', 'ecommerce', 'online retail', 'marketplace'],
+        'ai_ml': ['artificial intelligence', 'machine learning', 'ai', 'ml', 'deep learning'],
+        'biotech': ['biotech', 'biotechnology', 'pharma', 'life sciences'],
+        'cleantech': ['cleantech', 'clean energy', 'renewable', 'sustainability'],
+        'proptech': ['proptech', 'real estate tech', 'property technology'],
+        'insurtech': ['insurtech', 'insurance technology', 'insurance tech'],
+    }
+
+    # Broader keyword map used by enhance_extraction when no industry was found
+    INDUSTRY_FALLBACK_KEYWORDS = {
+        'fintech': ['fintech', 'payment', 'banking', 'financial'],
+        'healthtech': ['health', 'medical', 'hospital', 'patient', 'clinical'],
+        'edtech': ['education', 'learning', 'school', 'student', 'course'],
+        'saas': ['saas', 'software', 'cloud', 'platform', 'subscription'],
+        'e-commerce': ['shop', 'retail', 'commerce', 'marketplace', 'store'],
+        'ai_ml': ['ai', 'machine learning', 'artificial intelligence', 'neural'],
+        'logistics': ['logistics', 'shipping', 'delivery', 'supply chain', 'fleet'],
+        'real_estate': ['real estate', 'property', 'housing', 'rental'],
+        'media': ['media', 'content', 'streaming', 'entertainment'],
+        'gaming': ['game', 'gaming', 'esports', 'mobile game'],
+    }
+
+    @staticmethod
+    def parse_amount(value_str: str, multiplier: str = None) -> float:
+        """Parse financial amounts with K/M/B multipliers"""
+        try:
+            value = float(value_str.replace(',', ''))
+            if multiplier:
+                multiplier = multiplier.upper()
+                if multiplier.startswith('K'):
+                    value *= 1000
+                elif multiplier.startswith('M'):
+                    value *= 1000000
+                elif multiplier.startswith('B'):
+                    value *= 1000000000
+            return value
+        except:
+            return 0.0
+
+    @classmethod
+    def extract_from_pdf(cls,
+                         file_content: FileContent,
+                         defer_tables: bool = False) -> dict:
+        """Extract text and data from PDF.
+
+        PyMuPDF reads each page once for text and flags pages that look like
+        tables; pdfplumber's slow extract_tables() then runs only on those
+        pages.  With ``defer_tables`` the flagged pages are returned in
+        ``table_pages`` so the caller can spread them over the extraction
+        pool (see ExtractionService) instead.  Work stops at PDF_PAGE_BUDGET
+        pages or PDF_TIME_BUDGET seconds, setting ``truncated`` (and
+        ``budget_exhausted`` for the time limit).
+        """
+        result = {
+            "text_content": "",
+            "pages": [],
+            "tables": [],
+            "table_pages": [],
+            "images_count": 0,
+            "metadata": {},
+            "truncated": False,
+            "budget_exhausted": False,
+        }
+        deadline = time.time() + PDF_TIME_BUDGET
+        pymupdf_ok = False
+
+        # Try PyMuPDF first (better for images and complex PDFs)
+        if PYMUPDF_AVAILABLE:
+            try:
+                if hasattr(file_content, 'read'):
+                    # MuPDF reads the spool file itself: no Python-side copy
+                    doc = fitz.open(file_content.name, filetype="pdf")
+                else:
+                    doc = fitz.open(stream=file_content, filetype="pdf")
+                result["metadata"] = dict(doc.metadata)
+                result["page_count"] = len(doc)
+
+                full_text = []
+                for page_num, page in enumerate(doc):
+                    if page_num >= PDF_PAGE_BUDGET:
+                        result["truncated"] = True
+                        break
+                    if time.time() > deadline:
+                        result["truncated"] = True
+                        result["budget_exhausted"] = True
+                        break
+                    page_text = page.get_text()
+                    full_text.append(page_text)
+                    result["pages"].append({
+                        "page_number": page_num + 1,
+                        "text": page_text,
+                        "word_count": len(page_text.split())
+                    })
+                    result["images_count"] += len(page.get_images())
+                    if _looks_like_table_page(page):
+                        result["table_pages"].append(page_num)
+
+                result["text_content"] = "\n".join(full_text)
+                doc.close()
+                pymupdf_ok = True
+            except Exception as e:
+                logger.error(f"PyMuPDF extraction error: {e}")
+
+        if not PDFPLUMBER_AVAILABLE:
+            result["table_pages"] = []
+            return result
+
+        if not pymupdf_ok or not result["text_content"]:
+            # No usable text layer from PyMuPDF: pdfplumber reads every page
+            # in budget for text and tables, as the only pass
+            plumber = extract_pdf_pages(file_content, None, deadline,
+                                        with_text=True)
+            result["text_content"] = plumber["text"]
+            result["tables"] = plumber["tables"]
+            result["table_pages"] = []
+            result["truncated"] |= plumber["truncated"]
+            result["budget_exhausted"] |= plumber["budget_exhausted"]
+        elif result["table_pages"] and not defer_tables:
+            plumber = extract_pdf_pages(file_content, result["table_pages"],
+                                        deadline)
+            result["tables"] = plumber["tables"]
+            result["table_pages"] = []
+            result["truncated"] |= plumber["truncated"]
+            result["budget_exhausted"] |= plumber["budget_exhausted"]
+
+        return result
+
+    @classmethod
+    def extract_from_docx(cls, file_content: FileContent) -> dict:
+        """Extract text from DOCX files"""
+        result = {"text_content": "", "paragraphs": [], "tables": []}
+
+        if not DOCX_AVAILABLE:
+            return result
+
+        try:
+            doc = DocxDocument(_as_stream(file_content))
+            result["paragraphs"] = [para.text for para in doc.paragraphs if para.text.strip()]
+            result["text_content"] = "\n".join(result["paragraphs"])
+
+            for table in doc.tables:
+                table_data = []
+                for row in table.rows:
+                    row_data = [cell.text for cell in row.cells]
+                    table_data.append(row_data)
+                result["tables"].append(table_data)
+        except Exception as e:
+            logger.error(f"DOCX extraction error: {e}")
+
+        return result
+
+    @classmethod
+    def extract_from_pptx(cls, file_content: FileContent) -> dict:
+        """Extract text from PowerPoint files"""
+        result = {"text_content": "", "slides": [], "slide_count": 0}
+
+        if not PPTX_AVAILABLE:
+            return result
+
+        try:
+            prs = Presentation(_as_stream(file_content))
+            result["slide_count"] = len(prs.slides)
+
+            all_text = []
+            for slide_num, slide in enumerate(prs.slides):
+                slide_text = [shape.text for shape in slide.shapes if hasattr(shape, "text") and shape.text.strip()]
+
+                slide_content = "\n".join(slide_text)
+                all_text.append(slide_content)
+                result["slides"].append({
+                    "slide_number": slide_num + 1,
+                    "text": slide_content
+                })
+
+            result["text_content"] = "\n\n".join(all_text)
+        except Exception as e:
+            logger.error(f"PPTX extraction error: {e}")
+
+        return result
+
+    @classmethod
+    def extract_from_xlsx(cls, file_content: FileContent) -> dict:
+        """Extract data from Excel files.
+
+        Rows are streamed from a read-only workbook; cell text is kept up to
+        SPREADSHEET_TEXT_LIMIT characters and numeric columns are collected
+        into float arrays, over at most SPREADSHEET_MAX_ROWS rows.
+        """
+        result = {
+            "text_content": "",
+            "sheets": [],
+            "numeric_columns": [],
+            "metadata": {},
+            "truncated": False,
+        }
+
+        if not XLSX_AVAILABLE:
+            return result
+
+        try:
+            wb = openpyxl.load_workbook(_as_stream(file_content),
+                                        read_only=True,
+                                        data_only=True)
+            text = _TextBudget(SPREADSHEET_TEXT_LIMIT)
+            rows_left = SPREADSHEET_MAX_ROWS
+            try:
+                for sheet in wb.worksheets:
+                    columns = None
+                    row_count = 0
+                    for row in sheet.iter_rows(values_only=True):
+                        if rows_left <= 0:
+                            result["truncated"] = True
+                            break
+                        rows_left -= 1
+                        row_count += 1
+                        text.extend(str(cell) for cell in row if cell)
+                        if columns is not None:
+                            columns.add_row(row)
+                        elif any(cell not in (None, '') for cell in row):
+                            columns = _ColumnStats(row)
+
+                    result["sheets"].append({
+                        "name": sheet.title,
+                        "row_count": row_count
+                    })
+                    if columns is not None:
+                        result["numeric_columns"].extend(
+                            columns.numeric_columns(sheet.title))
+                    if result["truncated"]:
+                        break
+            finally:
+                wb.close()
+
+            result["text_content"] = text.value()
+            result["truncated"] |= text.truncated
+            result["metadata"] = {
+                "sheets": result["sheets"],
+                "numeric_columns": _numeric_summaries(result["numeric_columns"]),
+            }
+        except Exception as e:
+            logger.error(f"XLSX extraction error: {e}")
+
+        return result
+
+    @classmethod
+    def _first_pattern_match(cls, patterns: list, text: str, flags=re.IGNORECASE) -> Optional[re.Match]:
+        """Return the first regex match found among a list of patterns."""
+        for pattern in patterns:
+            if match := re.search(pattern, text, flags):
+                return match
+        return None
+
+    @classmethod
+    def _extract_amount_from_patterns(cls, patterns: list, text: str) -> Optional[float]:
+        """Return a parsed financial amount from the first matching pattern."""
+        if not (match := cls._first_pattern_match(patterns, text)):
+            return None
+        value = match[1]
+        mult = match[2] if len(match.groups()) > 1 else None
+        return cls.parse_amount(value, mult)
+
+    @classmethod
+    def _detect_industry(cls, text_lower: str) -> Optional[str]:
+        """Detect industry from text using keyword matching."""
+        return next(
+            (industry for industry, keywords in cls.INDUSTRY_KEYWORDS.items()
+             if any(kw in text_lower for kw in keywords)),
+            None
+        )
+
+    @classmethod
+    def extract_company_info(cls, text: str) -> dict:
+        """Extract company information from text using regex patterns"""
+        text_lower = text.lower()
+        info = {}
+
+        if name_match := cls._first_pattern_match(
+                cls.COMPANY_PATTERNS['company_name'], text, re.IGNORECASE | re.MULTILINE):
+            name = name_match.group(1).strip()
+            if 2 < len(name) < 100:
+                info['company_name'] = name
+
+        if (funding := cls._extract_amount_from_patterns(cls.COMPANY_PATTERNS['funding'], text)) is not None:
+            info['funding_amount'] = funding
+
+        if (revenue := cls._extract_amount_from_patterns(cls.COMPANY_PATTERNS['revenue'], text)) is not None:
+            info['revenue'] = revenue
+
+        if emp_match := cls._first_pattern_match(cls.COMPANY_PATTERNS['employees'], text):
+            info['employee_count'] = int(emp_match.group(1))
+
+        if founded_match := cls._first_pattern_match(cls.COMPANY_PATTERNS['founded'], text):
+            year = int(founded_match.group(1))
+            if 1900 <= year <= 2030:
+                info['founded_year'] = year
+
+        if loc_match := cls._first_pattern_match(cls.COMPANY_PATTERNS['location'], text):
+            info['location'] = loc_match.group(1).strip()
+
+        if web_match := cls._first_pattern_match(cls.COMPANY_PATTERNS['website'], text):
+            info['website'] = web_match.group(0)
+
+        if email_match := cls._first_pattern_match(cls.COMPANY_PATTERNS['email'], text, 0):
+            info['email'] = email_match.group(0)
+
+        if industry := cls._detect_industry(text_lower):
+            info['industry'] = industry
+
+        return info
+
+    @classmethod
+    def extract_financial_data(cls, text: str) -> dict:
+        """Extract financial metrics from text"""
+        financials = {}
+
+        for key, pattern in cls.FINANCIAL_PATTERNS.items():
+            if match := re.search(pattern, text, re.IGNORECASE):
+                value = match.group(1)
+                mult = match.group(2) if len(match.groups()) > 1 else None
+                try:
+                    if key in ['gross_margin', 'growth_rate', 'churn']:
+                        financials[key] = float(value.replace(',', ''))
+                    elif key in ['runway', 'customers']:
+                        financials[key] = int(value.replace(',', ''))
+                    else:
+                        financials[key] = cls.parse_amount(value, mult)
+                except ValueError:
+                    # Digit-less capture such as "customers, ..."
+                    continue
+
+        return financials
+
+    @classmethod
+    def extract_key_metrics(cls, text: str) -> dict:
+        """Extract key business metrics from text"""
+        patterns = cls.KEY_METRIC_PATTERNS
+        metrics = {}
+
+        # Team size
+        if team_match := re.search(patterns['team_size'], text, re.IGNORECASE):
+            metrics['team_size'] = int(team_match[1])
+
+        # Customer count
+        if customer_match := re.search(patterns['customers'], text,
+                                       re.IGNORECASE):
+            metrics['customers'] = int(
+                customer_match[1].replace(',', '').replace('+', ''))
+
+        # MRR/ARR
+        if mrr_match := re.search(patterns['mrr'], text, re.IGNORECASE):
+            metrics['mrr'] = cls.parse_amount(mrr_match[1], mrr_match[2])
+
+        if arr_match := re.search(patterns['arr'], text, re.IGNORECASE):
+            metrics['arr'] = cls.parse_amount(arr_match[1], arr_match[2])
+
+        # Growth rate
+        if growth_match := re.search(patterns['growth_rate'], text,
+                                     re.IGNORECASE):
+            metrics['growth_rate'] = float(growth_match[1])
+
+        # NRR (Net Revenue Retention)
+        if nrr_match := re.search(patterns['nrr'], text, re.IGNORECASE):
+            metrics['nrr'] = float(nrr_match[1])
+
+        # CAC (Customer Acquisition Cost)
+        if cac_match := re.search(patterns['cac'], text, re.IGNORECASE):
+            metrics['cac'] = cls.parse_amount(cac_match[1], None)
+
+        # LTV (Lifetime Value)
+        if ltv_match := re.search(patterns['ltv'], text, re.IGNORECASE):
+            metrics['ltv'] = cls.parse_amount(ltv_match[1], None)
+
+        # Churn
+        if churn_match := re.search(patterns['churn'], text, re.IGNORECASE):
+            metrics['churn'] = float(churn_match[1])
+
+        # NPS
+        if nps_match := re.search(patterns['nps'], text, re.IGNORECASE):
+            metrics['nps'] = int(nps_match[1])
+
+        return metrics
+
+    @classmethod
+    def extract_from_csv(cls, file_content: FileContent) -> dict:
+        """Extract data from CSV file.
+
+        Streams rows with the same limits as extract_from_xlsx; text_content
+        is the raw file text up to SPREADSHEET_TEXT_LIMIT characters.
+        """
+        import csv
+        result = {
+            "text_content": "",
+            "headers": [],
+            "numeric_columns": [],
+            "metadata": {},
+            "truncated": False,
+        }
+        text = _TextBudget(SPREADSHEET_TEXT_LIMIT, sep="")
+        stream = io.TextIOWrapper(_as_stream(file_content),
+                                  encoding='utf-8',
+                                  errors='ignore',
+                                  newline='')
+
+        def lines():
+            for line in stream:
+                text.extend((line, ))
+                yield line
+
+        try:
+            columns = None
+            row_count = 0
+            for row in csv.reader(lines()):
+                if row_count >= SPREADSHEET_MAX_ROWS:
+                    result["truncated"] = True
+                    break
+                row_count += 1
+                if columns is None:
+                    result["headers"] = row
+                    columns = _ColumnStats(row)
+                else:
+                    columns.add_row(row)
+            if columns is not None:
+                result["numeric_columns"] = columns.numeric_columns("csv")
+            result["row_count"] = row_count
+            result["metadata"] = {
+                "numeric_columns": _numeric_summaries(result["numeric_columns"])
+            }
+        except Exception as e:
+            logger.error(f"CSV extraction error: {e}")
+        finally:
+            # Leave a caller-owned file open
+            stream.detach()
+        result["text_content"] = text.value()
+        result["truncated"] |= text.truncated
+        return result
+
+    @classmethod
+    def extract_from_json(cls, file_content: FileContent) -> dict:
+        """Extract data from JSON file"""
+        result = {"text_content": "", "data": {}}
+        try:
+            text = _decode_utf8(file_content)
+            data = json.loads(text)
+            result["data"] = data
+
+            # Convert JSON to searchable text
+            def flatten(obj, prefix=''):
+                items = []
+                if isinstance(obj, dict):
+                    for k, v in obj.items():
+                        items.extend(flatten(v, f"{prefix}{k}: "))
+                elif isinstance(obj, list):
+                    for i, v in enumerate(obj):
+                        items.extend(flatten(v, prefix))
+                else:
+                    items.append(f"{prefix}{obj}")
+                return items
+
+            result["text_content"] = "\n".join(flatten(data))
+        except Exception as e:
+            logger.error(f"JSON extraction error: {e}")
+            result["text_content"] = _decode_utf8(file_content)
+        return result
+
+    @classmethod
+    def extract_from_rtf(cls, file_content: FileContent) -> dict:
+        """Extract text from RTF file"""
+        result = {"text_content": ""}
+        try:
+            text = _decode_utf8(file_content)
+            # Basic RTF stripping
+            import re
+            # Remove RTF control words and groups
+            text = re.sub(r'\\[a-z]+[\d]*\s?', ' ', text)
+            text = re.sub(r'[{}]', '', text)
+            text = re.sub(r'\s+', ' ', text)
+            result["text_content"] = text.strip()
+        except Exception as e:
+            logger.error(f"RTF extraction error: {e}")
+        return result
+
+    @classmethod
+    def extract_from_odt(cls, file_content: FileContent) -> dict:
+        """Extract text from ODT (OpenDocument) file"""
+        result = {"text_content": ""}
+        try:
+            import zipfile
+            import xml.etree.ElementTree as ET
+
+            with zipfile.ZipFile(_as_stream(file_content)) as z:
+                if 'content.xml' in z.namelist():
+                    content = z.read('content.xml')
+                    root = ET.fromstring(content)
+                    # Extract all text nodes
+                    texts = []
+                    for elem in root.iter():
+                        if elem.text:
+                            texts.append(elem.text)
+                        if elem.tail:
+                            texts.append(elem.tail)
+                    result["text_content"] = " ".join(texts)
+        except Exception as e:
+            logger.error(f"ODT extraction error: {e}")
+        return result
+
+    @classmethod
+    def extract_from_file(cls,
+                          file_content: FileContent,
+                          file_type: str,
+                          file_name: str = "",
+                          defer_tables: bool = False) -> dict:
+        """Main extraction method - routes to appropriate extractor for all supported types"""
+        file_type_lower = file_type.lower()
+        file_name_lower = file_name.lower()
+
+        # Determine file type and extract
+        if 'pdf' in file_type_lower or file_name_lower.endswith('.pdf'):
+            raw_extraction = cls.extract_from_pdf(file_content, defer_tables)
+        elif 'word' in file_type_lower or file_name_lower.endswith(
+            ('.docx', '.doc')):
+            raw_extraction = cls.extract_from_docx(file_content)
+        elif 'presentation' in file_type_lower or file_name_lower.endswith(
+            ('.pptx', '.ppt')):
+            raw_extraction = cls.extract_from_pptx(file_content)
+        elif 'sheet' in file_type_lower or file_name_lower.endswith(
+            ('.xlsx', '.xls')):
+            raw_extraction = cls.extract_from_xlsx(file_content)
+        elif 'csv' in file_type_lower or file_name_lower.endswith('.csv'):
+            raw_extraction = cls.extract_from_csv(file_content)
+        elif 'json' in file_type_lower or file_name_lower.endswith('.json'):
+            raw_extraction = cls.extract_from_json(file_content)
+        elif 'rtf' in file_type_lower or file_name_lower.endswith('.rtf'):
+            raw_extraction = cls.extract_from_rtf(file_content)
+        elif 'opendocument' in file_type_lower or file_name_lower.endswith(
+                '.odt'):
+            raw_extraction = cls.extract_from_odt(file_content)
+        elif file_name_lower.endswith('.txt') or 'text' in file_type_lower:
+            raw_extraction = {
+                "text_content": _decode_utf8(file_content)
+            }
+        else:
+            # Try to decode as text
+            try:
+                text = _decode_utf8(file_content)
+                raw_extraction = {"text_content": text}
+            except:
+                raw_extraction = {
+                    "text_content": "",
+                    "error": "Unsupported file type"
+                }
+
+        # Extract structured data from text
+        text_content = raw_extraction.get("text_content", "")
+
+        # Single compiled pass, equivalent to extract_company_info +
+        # extract_financial_data + extract_key_metrics + enhance_extraction
+        from pattern_scanner import pattern_scanner
+        company_info, financial_data, key_metrics = pattern_scanner.scan(
+            text_content)
+
+        result = {
+            "text_content":
+            text_content[:50000],  # Limit text size
+            "word_count":
+            len(text_content.split()),
+            "company_info":
+            company_info,
+            "financial_data":
+            financial_data,
+            "key_metrics":
+            key_metrics,
+            "metadata":
+            raw_extraction.get("metadata", {}),
+            "page_count":
+            raw_extraction.get("page_count",
+                               raw_extraction.get("slide_count", 1)),
+            "tables_count":
+            len(raw_extraction.get("tables", [])),
+            "extraction_quality":
+            cls.calculate_extraction_quality(company_info, financial_data,
+                                             key_metrics),
+            "truncated":
+            raw_extraction.get("truncated", False),
+        }
+        if raw_extraction.get("table_pages"):
+            # defer_tables: PDF pages still owed a pdfplumber table pass
+            result["table_pages"] = raw_extraction["table_pages"]
+        if raw_extraction.get("budget_exhausted"):
+            # Internal: ExtractionCache does not store these results
+            result["budget_exhausted"] = True
+        return result
+
+    @classmethod
+    def extract_from_path(cls,
+                          path: str,
+                          file_type: str,
+                          file_name: str = "",
+                          defer_tables: bool = False) -> dict:
+        """extract_from_file for an upload spooled to disk.
+
+        PDFs are opened by path, zip-based formats read through the file
+        handle and text formats decode from an mmap, so the upload is never
+        held in memory as one bytes object.
+        """
+        with open(path, 'rb') as file_content:
+            return cls.extract_from_file(file_content, file_type, file_name,
+                                         defer_tables)
+
+    @classmethod
+    def enhance_extraction(cls, text: str, company_info: dict,
+                           financial_data: dict, key_metrics: dict) -> tuple:
+        """Enhanced extraction to improve quality score"""
+        text_lower = text.lower()
+        patterns = cls.ENHANCE_PATTERNS
+
+        # Try harder to find company name
+        if not company_info.get('company_name'):
+            # Look for capitalized sequences at start of text
+            lines = text.strip().split('\n')
+            for line in lines[:5]:
+                line = line.strip()
+                if len(line) > 2 and len(line) < 50 and line[0].isupper():
+                    company_info['company_name'] = line
+                    break
+
+        # Industry detection with more keywords
+        if not company_info.get('industry'):
+            for industry, keywords in cls.INDUSTRY_FALLBACK_KEYWORDS.items():
+                if any(kw in text_lower for kw in keywords):
+                    company_info['industry'] = industry
+                    break
+
+        # Try to find location from common patterns
+        if not company_info.get('location'):
+            if loc_match := cls._first_pattern_match(patterns['location'],
+                                                     text):
+                company_info['location'] = loc_match.group(0)
+
+        # Estimate founded year from context
+        if not company_info.get('founded_year'):
+            year_match = cls._first_pattern_match(patterns['founded_year'],
+                                                  text)
+            if year_match:
+                year = int(year_match.group(1))
+                if 1980 <= year <= 2026:
+                    company_info['founded_year'] = year
+
+        # Try to extract revenue from various formats
+        if not financial_data.get('revenue'):
+            for pattern in patterns['revenue']:
+                match = re.search(pattern, text, re.IGNORECASE)
+                if match:
+                    value = match.group(1)
+                    mult = match.group(2) if len(match.groups()) > 1 else None
+                    financial_data['revenue'] = cls.parse_amount(value, mult)
+                    break
+
+        # Estimate burn rate from runway and cash
+        if not financial_data.get('burn_rate') and financial_data.get(
+                'runway'):
+            runway = financial_data['runway']
+            if runway > 0:
+                # Estimate based on typical cash positions
+                for pattern in patterns['cash']:
+                    match = re.search(pattern, text, re.IGNORECASE)
+                    if match:
+                        cash = cls.parse_amount(match.group(1), match.group(2))
+                        if cash > 0:
+                            financial_data['burn_rate'] = cash / runway
+                        break
+
+        # Try to find team size
+        if not key_metrics.get('team_size'):
+            for pattern in patterns['team_size']:
+                match = re.search(pattern, text, re.IGNORECASE)
+                if match:
+                    size = int(match.group(1))
+                    if 1 <= size <= 10000:
+                        key_metrics['team_size'] = size
+                        company_info['employee_count'] = size
+                        break
+
+        # Try to find customer count
+        if not key_metrics.get('customers'):
+            for pattern in patterns['customers']:
+                match = re.search(pattern, text, re.IGNORECASE)
+                if match:
+                    count = int(
+                        match.group(1).replace(',', '').replace('+', ''))
+                    if count > 0:
+                        key_metrics['customers'] = count
+                        break
+
+        return company_info, financial_data, key_metrics
+
+    @classmethod
+    def calculate_extraction_quality(cls, company_info: dict,
+                                     financial_data: dict,
+                                     key_metrics: dict) -> dict:
+        """Calculate quality score for the extraction"""
+        total_fields = 0
+        extracted_fields = 0
+
+        # Company info fields
+        company_expected = [
+            'company_name', 'industry', 'location', 'founded_year',
+            'employee_count'
+        ]
+        for field in company_expected:
+            total_fields += 1
+            if company_info.get(field):
+                extracted_fields += 1
+
+        # Financial fields
+        financial_expected = ['revenue', 'burn_rate', 'runway', 'valuation']
+        for field in financial_expected:
+            total_fields += 1
+            if financial_data.get(field):
+                extracted_fields += 1
+
+        # Metrics fields
+        metrics_expected = ['team_size', 'customers', 'mrr']
+        for field in metrics_expected:
+            total_fields += 1
+            if key_metrics.get(field):
+                extracted_fields += 1
+
+        quality_score = (extracted_fields / total_fields *
+                         100) if total_fields > 0 else 0
+
+        return {
+            "score":
+            round(quality_score, 1),
+            "total_expected_fields":
+            total_fields,
+            "extracted_fields":
+            extracted_fields,
+            "quality_level":
+            "high" if quality_score >= 70 else
+            "medium" if quality_score >= 40 else "low",
+            "missing_fields": [
+                f for f in company_expected + financial_expected +
+                metrics_expected if f not in company_info
+                and f not in financial_data and f not in key_metrics
+            ]
+        }
+
+
+def extract_pdf_text(pdf_bytes: bytes) -> str:
+    """Extract text from PDF using PyPDF2"""
+    try:
+        from PyPDF2 import PdfReader
+        pdf_file = io.BytesIO(pdf_bytes)
+        reader = PdfReader(pdf_file)
+        text_parts = []
+        for page in reader.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text_parts.append(page_text)
+        return "\n\n".join(text_parts)
+    except ImportError:
+        logger.warning("PyPDF2 not installed, using fallback")
+        return ""
+    except Exception as e:
+        logger.warning(f"PDF extraction error: {e}")
+        return ""
+
+
+def extract_pptx_text(pptx_bytes: bytes) -> str:
+    """Extract text from PPTX using python-pptx"""
+    try:
+        from pptx import Presentation
+        pptx_file = io.BytesIO(pptx_bytes)
+        prs = Presentation(pptx_file)
+        text_parts = []
+        for slide_num, slide in enumerate(prs.slides, 1):
+            slide_text = [f"--- Slide {slide_num} ---"]
+            for shape in slide.shapes:
+                if hasattr(shape, "text") and shape.text:
+                    slide_text.append(shape.text)
+                if hasattr(shape, "table"):
+                    for row in shape.table.rows:
+                        row_text = [
+                            cell.text for cell in row.cells if cell.text
+                        ]
+                        if row_text:
+                            slide_text.append(" | ".join(row_text))
+            text_parts.append("\n".join(slide_text))
+        return "\n\n".join(text_parts)
+    except ImportError:
+        logger.warning("python-pptx not installed, using fallback")
+        return ""
+    except Exception as e:
+        logger.warning(f"PPTX extraction error: {e}")
+        return ""
+
+
+def extract_docx_text(docx_bytes: bytes) -> str:
+    """Extract text from DOCX using python-docx"""
+    try:
+        from docx import Document
+        docx_file = io.BytesIO(docx_bytes)
+        doc = Document(docx_file)
+        text_parts = []
+        for para in doc.paragraphs:
+            if para.text.strip():
+                text_parts.append(para.text)
+        for table in doc.tables:
+            for row in table.rows:
+                row_text = [
+                    cell.text for cell in row.cells if cell.text.strip()
+                ]
+                if row_text:
+                    text_parts.append(" | ".join(row_text))
+        return "\n".join(text_parts)
+    except ImportError:
+        logger.warning("python-docx not installed, using fallback")
+        return ""
+    except Exception as e:
+        logger.warning(f"DOCX extraction error: {e}")
+        return ""
+
+
+def extract_text_from_bytes(file_bytes: bytes, filename: str) -> dict:
+    """Extract plain text for /api/v1/analysis/extract-text-from-file.
+
+    Returns ``{"text_content": ..., "extraction_method": ...}`` with the
+    whitespace clean-up already applied.
+    """
+    filename = (filename or 'unknown').lower()
+    text_content = ""
+    extraction_method = "unknown"
+
+    if filename.endswith('.pdf'):
+        text_content = extract_pdf_text(file_bytes)
+        extraction_method = "PyPDF2"
+
+    elif filename.endswith('.pptx'):
+        text_content = extract_pptx_text(file_bytes)
+        extraction_method = "python-pptx"
+
+    elif filename.endswith('.ppt'):
+        # Old PPT format - try basic extraction
+        text_content = file_bytes.decode('utf-8', errors='ignore')
+        text_content = ''.join(c for c in text_content
+                               if c.isprintable() or c in '\n\r\t ')
+        extraction_method = "binary-text"
+
+    elif filename.endswith('.docx'):
+        text_content = extract_docx_text(file_bytes)
+        extraction_method = "python-docx"
+
+    elif filename.endswith('.doc'):
+        # Old DOC format - try basic extraction
+        text_content = file_bytes.decode('utf-8', errors='ignore')
+        text_content = ''.join(c for c in text_content
+                               if c.isprintable() or c in '\n\r\t ')
+        extraction_method = "binary-text"
+
+    elif filename.endswith(('.txt', '.csv', '.json', '.md')):
+        text_content = file_bytes.decode('utf-8', errors='ignore')
+        extraction_method = "utf-8"
+
+    elif filename.endswith(('.xlsx', '.xls')):
+        # Excel files - try basic extraction
+        if XLSX_AVAILABLE:
+            wb = openpyxl.load_workbook(io.BytesIO(file_bytes),
+                                        read_only=True,
+                                        data_only=True)
+            text_parts = []
+            for sheet in wb.worksheets:
+                text_parts.append(f"--- Sheet: {sheet.title} ---")
+                for row in sheet.iter_rows(max_row=100, values_only=True):
+                    row_text = [str(cell) for cell in row if cell is not None]
+                    if row_text:
+                        text_parts.append(" | ".join(row_text))
+            wb.close()
+            text_content = "\n".join(text_parts)
+            extraction_method = "openpyxl"
+        else:
+            text_content = file_bytes.decode('utf-8', errors='ignore')
+            extraction_method = "binary-fallback"
+    else:
+        # Unknown format - try UTF-8 then Latin-1
+        try:
+            text_content = file_bytes.decode('utf-8', errors='ignore')
+        except Exception:
+            text_content = file_bytes.decode('latin-1', errors='ignore')
+        text_content = ''.join(c for c in text_content
+                               if c.isprintable() or c in '\n\r\t ')
+        extraction_method = "fallback"
+
+    # Clean up extracted text
+    if text_content:
+        # Remove excessive whitespace
+        text_content = re.sub(r'\n{3,}', '\n\n', text_content)
+        text_content = re.sub(r' {2,}', ' ', text_content)
+        text_content = text_content.strip()
+
+    return {"text_content": text_content, "extraction_method": extraction_method}
@@ -0,0 +1,163 @@
+"""
+Content-addressed cache for document extraction results.
+
+Investors re-upload the same deck many times.  Extraction output depends
+only on the raw bytes, the detected format and the extractor version, so
+results are cached under (SHA-256 of bytes, EXTRACTOR_VERSION, format):
+
+  1. an in-process LRU of serialized results (EXTRACTION_CACHE_SIZE entries)
+  2. the extraction_cache table (schema/extraction_cache.sql), shared by all
+     workers and surviving restarts
+
+Cache failures are logged and treated as misses; they never fail an upload.
+Results flagged ``budget_exhausted`` (the PDF time budget ran out, or a
+table job was rejected or timed out) depend on server load, not just the
+bytes, and are not cached.  Fixed caps (PDF_PAGE_BUDGET, spreadsheet row
+and text limits) only set ``truncated`` and are cached like any result.
+"""
+
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from database_config import db_manager
+from document_extractor import EXTRACTOR_VERSION
+from extraction_service import detect_format, extraction_service
+
+logger = logging.getLogger(__name__)
+
+class ExtractionCache:
+    """Two-level (LRU + Postgres) cache of extraction results"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lru: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self._memory_hits = 0
+        self._db_hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._partial = 0
+        self._errors = 0
+        self._bytes_saved = 0
+
+    async def ensure_schema(self):
+        """Create the extraction_cache table if it does not exist"""
+        from database_config import execute_sql_file
+        from pathlib import Path
+        await execute_sql_file(
+            str(Path(__file__).parent / "schema" / "extraction_cache.sql"))
+
+    # ─── Lookup / store ─────────────────────────────────────────────────
+
+    def _remember(self, key: Tuple[str, str, str], payload: str):
+        self._lru[key] = payload
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    async def get(self, digest: str, fmt: str,
+                  byte_size: int = 0) -> Optional[dict]:
+        """Cached extraction for ``digest`` / ``fmt`` or None"""
+        key = (digest, EXTRACTOR_VERSION, fmt)
+        payload = self._lru.get(key)
+        if payload is not None:
+            self._lru.move_to_end(key)
+            self._memory_hits += 1
+            self._bytes_saved += byte_size
+            return json.loads(payload)
+
+        try:
+            async with db_manager.get_connection() as conn:
+                row = await conn.fetchrow(
+                    """UPDATE extraction_cache
+                       SET hit_count = hit_count + 1, last_hit_at = NOW()
+                       WHERE content_sha256 = $1 AND extractor_version = $2
+                         AND format = $3
+                       RETURNING extracted_data""", *key)
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"Extraction cache lookup failed: {e}")
+            row = None
+
+        if row is None:
+            self._misses += 1
+            return None
+
+        payload = row['extracted_data']
+        if not isinstance(payload, str):
+            payload = json.dumps(payload)
+        self._remember(key, payload)
+        self._db_hits += 1
+        self._bytes_saved += byte_size
+        return json.loads(payload)
+
+    async def put(self, digest: str, fmt: str, extracted_data: dict,
+                  byte_size: int = 0):
+        """Store a successful extraction result"""
+        key = (digest, EXTRACTOR_VERSION, fmt)
+        payload = json.dumps(extracted_data)
+        self._remember(key, payload)
+        self._stores += 1
+        try:
+            async with db_manager.get_connection() as conn:
+                await conn.execute(
+                    """INSERT INTO extraction_cache
+                           (content_sha256, extractor_version, format,
+                            extracted_data, byte_size)
+                       VALUES ($1, $2, $3, $4, $5)
+                       ON CONFLICT DO NOTHING""", *key, payload, byte_size)
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"Extraction cache store failed: {e}")
+
+    # ─── Cached extraction entry points ─────────────────────────────────
+
+    async def extract_spooled(self, spool, file_type: str,
+                              file_name: str = "") -> Tuple[dict, Dict[str, Any]]:
+        """extraction_service.extract_path with caching, for an
+        upload_spool.SpooledUpload (its digest is computed while spooling).
+
+        Returns ``(extracted_data, cache_info)`` where cache_info holds the
+        content digest and whether the result came from the cache.
+        """
+        return await self._through_cache(
+            spool.sha256, detect_format(file_type, file_name), spool.size,
+            extraction_service.extract_path, spool.path, file_type, file_name)
+
+    async def _through_cache(self, digest: str, fmt: str, byte_size: int,
+                             extract, *args) -> Tuple[dict, Dict[str, Any]]:
+        cached = await self.get(digest, fmt, byte_size)
+        if cached is not None:
+            return cached, {"content_sha256": digest, "cache_hit": True}
+
+        extracted_data = await extract(*args)
+        if extracted_data.pop("budget_exhausted", False):
+            # Partial under load; the next upload should try again in full
+            self._partial += 1
+        else:
+            await self.put(digest, fmt, extracted_data, byte_size)
+        return extracted_data, {"content_sha256": digest, "cache_hit": False}
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._memory_hits + self._db_hits + self._misses
+        hits = self._memory_hits + self._db_hits
+        return {
+            "extractor_version": EXTRACTOR_VERSION,
+            "lru_entries": len(self._lru),
+            "lru_max_entries": self.max_entries,
+            "memory_hits": self._memory_hits,
+            "db_hits": self._db_hits,
+            "misses": self._misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "stores": self._stores,
+            "partial_not_stored": self._partial,
+            "errors": self._errors,
+            "bytes_not_reparsed": self._bytes_saved,
+        }
+
+
+# Global extraction cache instance
+extraction_cache = ExtractionCache(
+    int(os.getenv("EXTRACTION_CACHE_SIZE", "256")))
@@ -0,0 +1,367 @@
+"""
+Process-pool extraction service for the TCA IRR backend.
+
+PyMuPDF, pdfplumber, python-docx, python-pptx and openpyxl are CPU bound and
+synchronous.  Running them inside the async upload handlers blocks every other
+request on the uvicorn worker, so all document parsing is dispatched to a
+bounded ProcessPoolExecutor through this module.
+
+Configuration (environment variables):
+  EXTRACTION_WORKERS              – worker processes (0 = run in a thread)
+  EXTRACTION_MAX_QUEUE            – jobs allowed to wait for a free worker
+  EXTRACTION_JOB_TIMEOUT          – seconds before a single job is abandoned
+  EXTRACTION_MAX_TASKS_PER_CHILD  – recycle a worker after N jobs
+  EXTRACTION_PDF_TABLE_CHUNK      – PDF table-candidate pages per pool job
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+from document_extractor import (
+    PDF_TIME_BUDGET,
+    DocumentExtractor,
+    extract_pdf_pages,
+    extract_text_from_bytes,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionError(Exception):
+    """Raised when a document could not be extracted by the worker pool"""
+
+
+class ExtractionTimeout(ExtractionError):
+    """Raised when an extraction job exceeds its time budget"""
+
+
+class ExtractionQueueFull(ExtractionError):
+    """Raised when the extraction queue is saturated"""
+
+
+def detect_format(file_type: str, file_name: str = "") -> str:
+    """Map a MIME type / file name to the format key used for routing and stats"""
+    file_type_lower = (file_type or "").lower()
+    file_name_lower = (file_name or "").lower()
+
+    if 'pdf' in file_type_lower or file_name_lower.endswith('.pdf'):
+        return 'pdf'
+    if 'word' in file_type_lower or file_name_lower.endswith(('.docx', '.doc')):
+        return 'docx'
+    if 'presentation' in file_type_lower or file_name_lower.endswith(
+            ('.pptx', '.ppt')):
+        return 'pptx'
+    if 'sheet' in file_type_lower or file_name_lower.endswith(('.xlsx', '.xls')):
+        return 'xlsx'
+    if 'csv' in file_type_lower or file_name_lower.endswith('.csv'):
+        return 'csv'
+    if 'json' in file_type_lower or file_name_lower.endswith('.json'):
+        return 'json'
+    if 'rtf' in file_type_lower or file_name_lower.endswith('.rtf'):
+        return 'rtf'
+    if 'opendocument' in file_type_lower or file_name_lower.endswith('.odt'):
+        return 'odt'
+    if file_name_lower.endswith('.txt') or 'text' in file_type_lower:
+        return 'text'
+    return 'other'
+
+
+def failed_extraction(error: str) -> dict:
+    """Placeholder extracted_data for a file whose extraction job failed"""
+    return {
+        "text_content": "",
+        "word_count": 0,
+        "company_info": {},
+        "financial_data": {},
+        "key_metrics": {},
+        "extraction_error": error,
+        "extraction_quality": {
+            "score": 0,
+            "quality_level": "none"
+        }
+    }
+
+
+# ─── Worker-side entry points (must be importable top-level functions) ──────
+
+
+def _run_extract_path(path: str, file_type: str, file_name: str) -> dict:
+    started_at = time.time()
+    result = DocumentExtractor.extract_from_path(path,
+                                                 file_type,
+                                                 file_name,
+                                                 defer_tables=True)
+    result["started_at"] = started_at
+    return result
+
+
+def _run_pdf_tables(path: str, page_numbers: List[int],
+                    deadline: float) -> dict:
+    tables = extract_pdf_pages(path, page_numbers, deadline)
+    return {
+        "tables_count": len(tables["tables"]),
+        "truncated": tables["truncated"],
+        "budget_exhausted": tables["budget_exhausted"]
+    }
+
+
+def _run_extract_text(file_bytes: bytes, filename: str) -> dict:
+    return extract_text_from_bytes(file_bytes, filename)
+
+
+class ExtractionServiceConfig:
+    """Extraction pool configuration"""
+
+    def __init__(self):
+        cpu_count = os.cpu_count() or 1
+        self.workers = int(
+            os.getenv("EXTRACTION_WORKERS", str(min(4, cpu_count))))
+        self.max_queue = int(os.getenv("EXTRACTION_MAX_QUEUE", "64"))
+        self.job_timeout = float(os.getenv("EXTRACTION_JOB_TIMEOUT", "60"))
+        self.max_tasks_per_child = int(
+            os.getenv("EXTRACTION_MAX_TASKS_PER_CHILD", "50"))
+        self.pdf_table_chunk_pages = max(
+            1, int(os.getenv("EXTRACTION_PDF_TABLE_CHUNK", "4")))
+
+
+class _FormatStats:
+    """Latency accumulator for one document format"""
+
+    def __init__(self, sample_size: int = 256):
+        self.jobs = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples = deque(maxlen=sample_size)
+
+    def record(self, elapsed_ms: float, ok: bool):
+        self.jobs += 1
+        if not ok:
+            self.failures += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.samples.append(elapsed_ms)
+
+    def as_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+
+        def pct(p: float) -> float:
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 1)
+
+        return {
+            "jobs": self.jobs,
+            "failures": self.failures,
+            "avg_ms": round(self.total_ms / self.jobs, 1) if self.jobs else 0.0,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "max_ms": round(self.max_ms, 1),
+        }
+
+
+class ExtractionService:
+    """Bounded process pool with per-job timeouts and crash isolation"""
+
+    def __init__(self, config: ExtractionServiceConfig):
+        self.config = config
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots = asyncio.Semaphore(max(1, config.workers))
+        self._waiting = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._rejected = 0
+        self._pool_restarts = 0
+        self._wait_ms_total = 0.0
+        self._format_stats: Dict[str, _FormatStats] = {}
+
+    # ─── Lifecycle ──────────────────────────────────────────────────────
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # "spawn" keeps the asyncio loop and asyncpg sockets of the API
+        # process out of the workers and allows max_tasks_per_child.
+        return ProcessPoolExecutor(
+            max_workers=self.config.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=self.config.max_tasks_per_child or None)
+
+    def start(self):
+        """Create the worker pool (no-op in inline mode)"""
+        if self.config.workers <= 0 or self._pool is not None:
+            return
+        self._pool = self._new_pool()
+        logger.info(
+            f"Extraction pool started with {self.config.workers} workers "
+            f"(timeout {self.config.job_timeout}s)")
+
+    async def stop(self):
+        """Shut the worker pool down"""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await asyncio.to_thread(pool.shutdown, True, cancel_futures=True)
+            logger.info("Extraction pool stopped")
+
+    def _recycle_pool(self, broken: ProcessPoolExecutor):
+        """Replace a pool whose worker hung or died, killing its processes"""
+        if broken is self._pool:
+            self._pool = self._new_pool()
+            self._pool_restarts += 1
+            logger.warning("Extraction pool recycled")
+        for proc in list((getattr(broken, "_processes", None) or {}).values()):
+            try:
+                proc.terminate()
+            except Exception:
+                pass
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    # ─── Public API ─────────────────────────────────────────────────────
+
+    async def extract_path(self, path: str, file_type: str,
+                           file_name: str = "") -> dict:
+        """Full extraction of a spooled upload; only the path crosses to the worker.
+
+        PDF pages that look like tables come back unprocessed and are spread
+        over the pool in chunks that share the document's PDF_TIME_BUDGET,
+        counted from when a worker started on the document (time spent
+        waiting in the queue does not use it up).
+        """
+        result = await self._submit(detect_format(file_type, file_name),
+                                    _run_extract_path, path, file_type,
+                                    file_name)
+        deadline = result.pop("started_at", time.time()) + PDF_TIME_BUDGET
+        table_pages = result.pop("table_pages", None)
+        if table_pages:
+            await self._extract_pdf_tables(result, path, table_pages,
+                                           deadline)
+        return result
+
+    async def extract_text(self, file_bytes: bytes, filename: str) -> dict:
+        """Plain-text extraction used by /api/v1/analysis/extract-text-from-file"""
+        return await self._submit(detect_format("", filename),
+                                  _run_extract_text, file_bytes, filename)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, pool health and per-format latency"""
+        return {
+            "mode": "process_pool" if self.config.workers > 0 else "inline",
+            "workers": self.config.workers,
+            "max_queue": self.config.max_queue,
+            "job_timeout_s": self.config.job_timeout,
+            "queue_depth": self._waiting,
+            "in_flight": self._running,
+            "completed": self._completed,
+            "failed": self._failed,
+            "timeouts": self._timeouts,
+            "rejected": self._rejected,
+            "pool_restarts": self._pool_restarts,
+            "avg_queue_wait_ms":
+            round(self._wait_ms_total / (self._completed + self._failed), 1)
+            if (self._completed + self._failed) else 0.0,
+            "formats": {
+                fmt: s.as_dict()
+                for fmt, s in sorted(self._format_stats.items())
+            },
+        }
+
+    # ─── Internals ──────────────────────────────────────────────────────
+
+    async def _extract_pdf_tables(self, result: dict, path: str,
+                                  table_pages: List[int], deadline: float):
+        size = self.config.pdf_table_chunk_pages
+        chunks = [
+            table_pages[i:i + size] for i in range(0, len(table_pages), size)
+        ]
+        outcomes = await asyncio.gather(*(self._submit(
+            "pdf_tables", _run_pdf_tables, path, chunk, deadline)
+                                          for chunk in chunks),
+                                        return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, dict):
+                result["tables_count"] += outcome["tables_count"]
+                result["truncated"] |= outcome["truncated"]
+                if outcome["budget_exhausted"]:
+                    result["budget_exhausted"] = True
+            else:
+                # Queue full, timeout or crash: keep the partial result
+                logger.warning(f"PDF table job failed: {outcome!r}")
+                result["truncated"] = True
+                result["budget_exhausted"] = True
+
+    async def _submit(self, fmt: str, fn: Callable, *args) -> dict:
+        if self._waiting >= self.config.max_queue:
+            self._rejected += 1
+            raise ExtractionQueueFull(
+                f"Extraction queue full ({self._waiting} jobs waiting)")
+
+        queued_at = time.perf_counter()
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._running += 1
+        started = time.perf_counter()
+        self._wait_ms_total += (started - queued_at) * 1000
+        ok = False
+        try:
+            result = await self._run(fn, *args)
+            ok = True
+            return result
+        finally:
+            self._running -= 1
+            self._slots.release()
+            if ok:
+                self._completed += 1
+            else:
+                self._failed += 1
+            self._format_stats.setdefault(fmt, _FormatStats()).record(
+                (time.perf_counter() - started) * 1000, ok)
+
+    async def _run(self, fn: Callable, *args) -> dict:
+        loop = asyncio.get_running_loop()
+        if self.config.workers <= 0:
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(None, fn, *args),
+                    self.config.job_timeout)
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                raise ExtractionTimeout(
+                    f"Extraction exceeded {self.config.job_timeout}s")
+
+        if self._pool is None:
+            self.start()
+
+        # One retry: a job can land on a pool that was recycled because a
+        # *different* job hung or crashed its worker.
+        for attempt in range(2):
+            pool = self._pool
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(pool, fn, *args),
+                    self.config.job_timeout)
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                self._recycle_pool(pool)
+                raise ExtractionTimeout(
+                    f"Extraction exceeded {self.config.job_timeout}s")
+            except BrokenProcessPool as e:
+                self._recycle_pool(pool)
+                if attempt == 1:
+                    raise ExtractionError(f"Extraction worker crashed: {e}")
+                logger.warning("Extraction worker crashed, retrying job once")
+
+
+# Global extraction service instance
+extraction_config = ExtractionServiceConfig()
+extraction_service = ExtractionService(extraction_config)
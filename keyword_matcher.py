@@ -0,0 +1,76 @@
+"""
+Aho–Corasick keyword matcher for the 9-module scorer.
+
+The module scorers used to search the text once per keyword list, and
+each search lowercased the whole merged text (up to 20 uploads) and ran one
+substring search per keyword, so a single analysis rescanned the text
+dozens of times.
+
+KeywordMatcher compiles every module keyword into one automaton at import.
+scan() lowercases the text once and walks it once, returning the set of
+(lowercased) keywords that occur anywhere in it.  Matching is plain
+case-insensitive substring matching, exactly ``k.lower() in text.lower()``,
+so "AI" still matches inside "said" as it always has.
+"""
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List
+
+
+class KeywordMatcher:
+    """Find which of a fixed set of keywords occur in a text, in one pass"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = frozenset(k.lower() for k in keywords if k)
+
+        # Trie: goto[state] maps char -> state; out[state] holds the
+        # keywords ending at that state (own plus those via failure links)
+        goto: List[Dict[str, int]] = [{}]
+        out: List[FrozenSet[str]] = [frozenset()]
+        for keyword in sorted(self.keywords):
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(frozenset())
+                state = nxt
+            out[state] = out[state] | {keyword}
+
+        # Breadth-first failure links, folded into goto so every state has
+        # a full transition table (a DFA): scanning is one dict lookup per
+        # character with no failure-chain walking.
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            # fail[state] is shallower, so its row is already complete
+            fallback = fail[state]
+            out[state] = out[state] | out[fallback]
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                fail[nxt] = goto[fallback].get(ch, 0)
+            for ch, target in goto[fallback].items():
+                goto[state].setdefault(ch, target)
+
+        self._goto = goto
+        self._out = out
+
+    def scan(self, text: str) -> FrozenSet[str]:
+        """Return the lowercased keywords found in ``text``"""
+        if not text or not self.keywords:
+            return frozenset()
+        goto = self._goto
+        out = self._out
+        found = set()
+        remaining = len(self.keywords)
+        state = 0
+        for ch in text.lower():
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+                if len(found) == remaining:
+                    break
+        return frozenset(found)
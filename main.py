@@ -7,26 +7,24 @@ FastAPI backend server for the TCA Investment Risk Rating application
 from fastapi import FastAPI, Depends, HTTPException, status, Request, BackgroundTasks, Body, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from contextlib import asynccontextmanager
 import asyncpg
 import os
 import logging
 import uvicorn
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, NamedTuple, Tuple
 from datetime import datetime, timedelta, timezone
 import jwt
 import bcrypt
 import uuid
-from pydantic import BaseModel, EmailStr, validator
+from pydantic import BaseModel, EmailStr, ValidationError, validator
 import asyncio
-from pathlib import Path
 import json
 import httpx
 import secrets
 import hashlib
-import io
-import re
+import gzip
 from urllib.parse import urlparse
 import html as _html
 
@@ -49,794 +47,40 @@ from ssd_tirr_report_config import (
     interpret_score,
 )
 
-# Report output directory
-REPORTS_DIR = Path(__file__).parent / "reports"
-REPORTS_DIR.mkdir(exist_ok=True)
-
 # SSD callback URL — override via SSD_CALLBACK_URL environment variable
 SSD_CALLBACK_URL = os.getenv("SSD_CALLBACK_URL", "")
+# Public base URL of this API; the callback's generatedReportPath is the
+# report endpoint under it (root-relative when unset)
+SSD_REPORT_BASE_URL = os.getenv("SSD_REPORT_BASE_URL", "").rstrip("/")
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Document Extraction Utilities
-import base64
-import re
-import io
-
-try:
-    import fitz  # PyMuPDF
-    PYMUPDF_AVAILABLE = True
-except ImportError:
-    PYMUPDF_AVAILABLE = False
-    logger.warning("PyMuPDF not available - PDF extraction limited")
-
-try:
-    import pdfplumber
-    PDFPLUMBER_AVAILABLE = True
-except ImportError:
-    PDFPLUMBER_AVAILABLE = False
-
-try:
-    from docx import Document as DocxDocument
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
-
-try:
-    from pptx import Presentation
-    PPTX_AVAILABLE = True
-except ImportError:
-    PPTX_AVAILABLE = False
-
-try:
-    import openpyxl
-    XLSX_AVAILABLE = True
-except ImportError:
-    XLSX_AVAILABLE = False
-
-
-class DocumentExtractor:
-    """Production-grade document extraction utility"""
-
-    # Company information patterns
-    COMPANY_PATTERNS = {
-        'company_name': [
-            r'(?:company|startup|business)\s*(?:name)?[:\s]+([A-Z][A-Za-z0-9\s&\'-]+)',
-            r'^([A-Z][A-Za-z0-9\s&\'-]+(?:Inc\.?|LLC|Ltd\.?|Corp\.?|Co\.?))',
-            r'(?:about|introducing|welcome to)\s+([A-Z][A-Za-z0-9\s&\'-]+)',
-        ],
-        'funding': [
-            r'\$\s*([\d,.]+)\s*([MBK](?:illion)?)?',
-            r'(?:raised?|funding|round|investment)[:\s]*\$?([\d,.]+)\s*([MBK])?',
-            r'(?:series\s*[A-Z]|seed|pre-seed)[:\s]*\$?([\d,.]+)\s*([MBK])?',
-        ],
-        'revenue': [
-            r'(?:revenue|arr|mrr|sales)[:\s]*\$?([\d,.]+)\s*([MBK])?',
-            r'\$\s*([\d,.]+)\s*([MBK])?\s*(?:revenue|arr|mrr|sales)',
-        ],
-        'employees': [
-            r'(\d+)\s*(?:\+)?\s*(?:employees?|team members?|staff|people)',
-            r'(?:team|employees?)\s*(?:size)?[:\s]*(\d+)',
-        ],
-        'founded': [
-            r'(?:founded|established|started|since)[:\s]*(\d{4})',
-            r'(\d{4})\s*(?:-\s*present)?$',
-        ],
-        'location': [
-            r'(?:headquarters?|based in|located in|hq)[:\s]+([A-Za-z\s,]+)',
-            r'([A-Z][a-z]+(?:\s*,\s*[A-Z]{2})?)',
-        ],
-        'website': [
-            r'(?:https?://)?(?:www\.)?([a-zA-Z0-9-]+\.[a-z]{2,})',
-        ],
-        'industry': [
-            r'(?:industry|sector|market|space)[:\s]+([A-Za-z\s&-]+)',
-            r'(?:fintech|healthtech|edtech|saas|b2b|b2c|ai|ml|blockchain)',
-        ],
-        'email': [
-            r'[\w\.-]+@[\w\.-]+\.\w+',
-        ],
-        'phone': [
-            r'\+?[\d\s\(\)\-]{10,}',
-        ],
-    }
-
-    FINANCIAL_PATTERNS = {
-        'revenue':
-        r'(?:revenue|arr|mrr|sales)[:\s]*\$?([\d,.]+)\s*([MBK])?(?:illion)?',
-        'burn_rate':
-        r'(?:burn|burn\s*rate|monthly\s*burn)[:\s]*\$?([\d,.]+)\s*([MBK])?',
-        'runway': r'(?:runway)[:\s]*(\d+)\s*(?:months?)?',
-        'valuation': r'(?:valuation)[:\s]*\$?([\d,.]+)\s*([MBK])?(?:illion)?',
-        'gross_margin': r'(?:gross\s*margin)[:\s]*([\d.]+)\s*%?',
-        'growth_rate': r'(?:growth|growth\s*rate|yoy)[:\s]*([\d.]+)\s*%?',
-        'cac': r'(?:cac|customer\s*acquisition\s*cost)[:\s]*\$?([\d,.]+)',
-        'ltv': r'(?:ltv|lifetime\s*value|clv)[:\s]*\$?([\d,.]+)',
-        'customers': r'(?:customers?|clients?|users?)[:\s]*([\d,]+)',
-        'churn': r'(?:churn|churn\s*rate)[:\s]*([\d.]+)\s*%?',
-    }
-
-    @staticmethod
-    def parse_amount(value_str: str, multiplier: str = None) -> float:
-        """Parse financial amounts with K/M/B multipliers"""
-        try:
-            value = float(value_str.replace(',', ''))
-            if multiplier:
-                multiplier = multiplier.upper()
-                if multiplier.startswith('K'):
-                    value *= 1000
-                elif multiplier.startswith('M'):
-                    value *= 1000000
-                elif multiplier.startswith('B'):
-                    value *= 1000000000
-            return value
-        except:
-            return 0.0
-
-    @classmethod
-    def extract_from_pdf(cls, file_content: bytes) -> dict:
-        """Extract text and data from PDF using multiple methods"""
-        result = {
-            "text_content": "",
-            "pages": [],
-            "tables": [],
-            "images_count": 0,
-            "metadata": {},
-        }
-
-        # Try PyMuPDF first (better for images and complex PDFs)
-        if PYMUPDF_AVAILABLE:
-            try:
-                doc = fitz.open(stream=file_content, filetype="pdf")
-                result["metadata"] = dict(doc.metadata)
-                result["page_count"] = len(doc)
-
-                full_text = []
-                for page_num, page in enumerate(doc):
-                    page_text = page.get_text()
-                    full_text.append(page_text)
-                    result["pages"].append({
-                        "page_number": page_num + 1,
-                        "text": page_text,
-                        "word_count": len(page_text.split())
-                    })
-                    result["images_count"] += len(page.get_images())
-
-                result["text_content"] = "\n".join(full_text)
-                doc.close()
-            except Exception as e:
-                logger.error(f"PyMuPDF extraction error: {e}")
-
-        # Fall back to pdfplumber for tables
-        if PDFPLUMBER_AVAILABLE and (not result["text_content"]
-                                     or len(result.get("tables", [])) == 0):
-            try:
-                pdf = pdfplumber.open(io.BytesIO(file_content))
-                for page in pdf.pages:
-                    tables = page.extract_tables()
-                    for table in tables:
-                        result["tables"].append(table)
-                    if not result["text_content"]:
-                        text = page.extract_text() or ""
-                        result["text_content"] += text + "\n"
-                pdf.close()
-            except Exception as e:
-                logger.error(f"pdfplumber extraction error: {e}")
-
-        return result
-
-    @classmethod
-    def extract_from_docx(cls, file_content: bytes) -> dict:
-        """Extract text from DOCX files"""
-        result = {"text_content": "", "paragraphs": [], "tables": []}
-
-        if not DOCX_AVAILABLE:
-            return result
-
-        try:
-            doc = DocxDocument(io.BytesIO(file_content))
-            result["paragraphs"] = [para.text for para in doc.paragraphs if para.text.strip()]
-            result["text_content"] = "\n".join(result["paragraphs"])
-
-            for table in doc.tables:
-                table_data = []
-                for row in table.rows:
-                    row_data = [cell.text for cell in row.cells]
-                    table_data.append(row_data)
-                result["tables"].append(table_data)
-        except Exception as e:
-            logger.error(f"DOCX extraction error: {e}")
-
-        return result
-
-    @classmethod
-    def extract_from_pptx(cls, file_content: bytes) -> dict:
-        """Extract text from PowerPoint files"""
-        result = {"text_content": "", "slides": [], "slide_count": 0}
-
-        if not PPTX_AVAILABLE:
-            return result
-
-        try:
-            prs = Presentation(io.BytesIO(file_content))
-            result["slide_count"] = len(prs.slides)
-
-            all_text = []
-            for slide_num, slide in enumerate(prs.slides):
-                slide_text = [shape.text for shape in slide.shapes if hasattr(shape, "text") and shape.text.strip()]
-
-                slide_content = "\n".join(slide_text)
-                all_text.append(slide_content)
-                result["slides"].append({
-                    "slide_number": slide_num + 1,
-                    "text": slide_content
-                })
-
-            result["text_content"] = "\n\n".join(all_text)
-        except Exception as e:
-            logger.error(f"PPTX extraction error: {e}")
-
-        return result
-
-    @classmethod
-    def extract_from_xlsx(cls, file_content: bytes) -> dict:
-        """Extract data from Excel files"""
-        result = {"text_content": "", "sheets": [], "data": {}}
-
-        if not XLSX_AVAILABLE:
-            return result
-
-        try:
-            wb = openpyxl.load_workbook(io.BytesIO(file_content),
-                                        data_only=True)
-            all_text = []
-
-            for sheet_name in wb.sheetnames:
-                sheet = wb[sheet_name]
-                sheet_data = []
-                for row in sheet.iter_rows(values_only=True):
-                    row_text = [
-                        str(cell) if cell is not None else "" for cell in row
-                    ]
-                    sheet_data.append(row_text)
-                    all_text.extend([str(cell) for cell in row if cell])
-
-                result["sheets"].append({
-                    "name": sheet_name,
-                    "data": sheet_data
-                })
-                result["data"][sheet_name] = sheet_data
-
-            result["text_content"] = " ".join(all_text)
-        except Exception as e:
-            logger.error(f"XLSX extraction error: {e}")
-
-        return result
-
-    @classmethod
-    def _first_pattern_match(cls, patterns: list, text: str, flags=re.IGNORECASE) -> Optional[re.Match]:
-        """Return the first regex match found among a list of patterns."""
-        for pattern in patterns:
-            if match := re.search(pattern, text, flags):
-                return match
-        return None
-
-    @classmethod
-    def _extract_amount_from_patterns(cls, patterns: list, text: str) -> Optional[float]:
-        """Return a parsed financial amount from the first matching pattern."""
-        if not (match := cls._first_pattern_match(patterns, text)):
-            return None
-        value = match[1]
-        mult = match[2] if len(match.groups()) > 1 else None
-        return cls.parse_amount(value, mult)
-
-    @classmethod
-    def _detect_industry(cls, text_lower: str) -> Optional[str]:
-        """Detect industry from text using keyword matching."""
-        industry_keywords = {
-            'fintech': ['fintech', 'financial technology', 'payments', 'banking', 'lending'],
-            'healthtech': ['healthtech', 'healthcare', 'medical', 'health tech', 'telehealth'],
-            'edtech': ['edtech', 'education', 'learning', 'ed tech', 'e-learning'],
-            'saas': ['saas', 'software as a service', 'cloud software', 'subscription software'],
-            'e-commerce': ['e-commerce', 'ecommerce', 'online retail', 'marketplace'],
-            'ai_ml': ['artificial intelligence', 'machine learning', 'ai', 'ml', 'deep learning'],
-            'biotech': ['biotech', 'biotechnology', 'pharma', 'life sciences'],
-            'cleantech': ['cleantech', 'clean energy', 'renewable', 'sustainability'],
-            'proptech': ['proptech', 'real estate tech', 'property technology'],
-            'insurtech': ['insurtech', 'insurance technology', 'insurance tech'],
-        }
-        return next(
-            (industry for industry, keywords in industry_keywords.items()
-             if any(kw in text_lower for kw in keywords)),
-            None
-        )
-
-    @classmethod
-    def extract_company_info(cls, text: str) -> dict:
-        """Extract company information from text using regex patterns"""
-        text_lower = text.lower()
-        info = {}
-
-        if name_match := cls._first_pattern_match(
-                cls.COMPANY_PATTERNS['company_name'], text, re.IGNORECASE | re.MULTILINE):
-            name = name_match.group(1).strip()
-            if 2 < len(name) < 100:
-                info['company_name'] = name
-
-        if (funding := cls._extract_amount_from_patterns(cls.COMPANY_PATTERNS['funding'], text)) is not None:
-            info['funding_amount'] = funding
-
-        if (revenue := cls._extract_amount_from_patterns(cls.COMPANY_PATTERNS['revenue'], text)) is not None:
-            info['revenue'] = revenue
-
-        if emp_match := cls._first_pattern_match(cls.COMPANY_PATTERNS['employees'], text):
-            info['employee_count'] = int(emp_match.group(1))
-
-        if founded_match := cls._first_pattern_match(cls.COMPANY_PATTERNS['founded'], text):
-            year = int(founded_match.group(1))
-            if 1900 <= year <= 2030:
-                info['founded_year'] = year
-
-        if loc_match := cls._first_pattern_match(cls.COMPANY_PATTERNS['location'], text):
-            info['location'] = loc_match.group(1).strip()
-
-        if web_match := cls._first_pattern_match(cls.COMPANY_PATTERNS['website'], text):
-            info['website'] = web_match.group(0)
-
-        if email_match := cls._first_pattern_match(cls.COMPANY_PATTERNS['email'], text, 0):
-            info['email'] = email_match.group(0)
-
-        if industry := cls._detect_industry(text_lower):
-            info['industry'] = industry
-
-        return info
-
-    @classmethod
-    def extract_financial_data(cls, text: str) -> dict:
-        """Extract financial metrics from text"""
-        financials = {}
-
-        for key, pattern in cls.FINANCIAL_PATTERNS.items():
-            if match := re.search(pattern, text, re.IGNORECASE):
-                value = match.group(1)
-                mult = match.group(2) if len(match.groups()) > 1 else None
-                if key in ['gross_margin', 'growth_rate', 'churn']:
-                    financials[key] = float(value.replace(',', ''))
-                elif key in ['runway', 'customers']:
-                    financials[key] = int(value.replace(',', ''))
-                else:
-                    financials[key] = cls.parse_amount(value, mult)
-
-        return financials
-
-    @classmethod
-    def extract_key_metrics(cls, text: str) -> dict:
-        """Extract key business metrics from text"""
-        metrics = {}
-
-        # Team size
-        team_match = re.search(r'(\d+)\s*(?:team|employees?|people|staff)',
-                               text, re.IGNORECASE)
-        if team_match:
-            metrics['team_size'] = int(team_match[1])
-
-        # Customer count
-        if customer_match := re.search(
-            r'(\d+(?:,\d{3})*(?:\+)?)\s*(?:customers?|clients?|users?)', text,
-            re.IGNORECASE):
-            metrics['customers'] = int(
-                customer_match[1].replace(',', '').replace('+', ''))
-
-        # MRR/ARR
-        if mrr_match := re.search(
-            r'(?:mrr|monthly recurring revenue)[:\s]*\$?([\d,.]+)\s*([MK])?',
-            text, re.IGNORECASE):
-            metrics['mrr'] = cls.parse_amount(mrr_match[1],
-                                              mrr_match[2])
-
-        arr_match = re.search(
-            r'(?:arr|annual recurring revenue)[:\s]*\$?([\d,.]+)\s*([MK])?',
-            text, re.IGNORECASE)
-        if arr_match:
-            metrics['arr'] = cls.parse_amount(arr_match[1],
-                                              arr_match[2])
-
-        # Growth rate
-        if growth_match := re.search(r'(\d+(?:\.\d+)?)\s*%\s*(?:growth|yoy|mom)',
-                                     text, re.IGNORECASE):
-            metrics['growth_rate'] = float(growth_match[1])
-
-        # NRR (Net Revenue Retention)
-        nrr_match = re.search(
-            r'(?:nrr|net revenue retention)[:\s]*([\d.]+)\s*%?', text,
-            re.IGNORECASE)
-        if nrr_match:
-            metrics['nrr'] = float(nrr_match[1])
-
-        # CAC (Customer Acquisition Cost)
-        cac_match = re.search(
-            r'(?:cac|customer acquisition cost)[:\s]*\$?([\d,.]+)', text,
-            re.IGNORECASE)
-        if cac_match:
-            metrics['cac'] = cls.parse_amount(cac_match[1], None)
-
-        # LTV (Lifetime Value)
-        ltv_match = re.search(r'(?:ltv|lifetime value|clv)[:\s]*\$?([\d,.]+)',
-                              text, re.IGNORECASE)
-        if ltv_match:
-            metrics['ltv'] = cls.parse_amount(ltv_match[1], None)
-
-        # Churn
-        churn_match = re.search(r'(?:churn|churn rate)[:\s]*([\d.]+)\s*%?',
-                                text, re.IGNORECASE)
-        if churn_match:
-            metrics['churn'] = float(churn_match[1])
-
-        # NPS
-        nps_match = re.search(r'(?:nps|net promoter score)[:\s]*([+-]?\d+)',
-                              text, re.IGNORECASE)
-        if nps_match:
-            metrics['nps'] = int(nps_match[1])
-
-        return metrics
-
-    @classmethod
-    def extract_from_csv(cls, file_content: bytes) -> dict:
-        """Extract data from CSV file"""
-        result = {"text_content": "", "data": [], "headers": []}
-        try:
-            import csv
-            import io
-            text = file_content.decode('utf-8', errors='ignore')
-            reader = csv.reader(io.StringIO(text))
-            rows = list(reader)
-            if rows:
-                result["headers"] = rows[0]
-                result["data"] = rows[1:]
-                result["text_content"] = text
-            result["row_count"] = len(rows)
-        except Exception as e:
-            logger.error(f"CSV extraction error: {e}")
-            result["text_content"] = file_content.decode('utf-8',
-                                                         errors='ignore')
-        return result
-
-    @classmethod
-    def extract_from_json(cls, file_content: bytes) -> dict:
-        """Extract data from JSON file"""
-        result = {"text_content": "", "data": {}}
-        try:
-            text = file_content.decode('utf-8', errors='ignore')
-            data = json.loads(text)
-            result["data"] = data
-
-            # Convert JSON to searchable text
-            def flatten(obj, prefix=''):
-                items = []
-                if isinstance(obj, dict):
-                    for k, v in obj.items():
-                        items.extend(flatten(v, f"{prefix}{k}: "))
-                elif isinstance(obj, list):
-                    for i, v in enumerate(obj):
-                        items.extend(flatten(v, prefix))
-                else:
-                    items.append(f"{prefix}{obj}")
-                return items
-
-            result["text_content"] = "\n".join(flatten(data))
-        except Exception as e:
-            logger.error(f"JSON extraction error: {e}")
-            result["text_content"] = file_content.decode('utf-8',
-                                                         errors='ignore')
-        return result
-
-    @classmethod
-    def extract_from_rtf(cls, file_content: bytes) -> dict:
-        """Extract text from RTF file"""
-        result = {"text_content": ""}
-        try:
-            text = file_content.decode('utf-8', errors='ignore')
-            # Basic RTF stripping
-            import re
-            # Remove RTF control words and groups
-            text = re.sub(r'\\[a-z]+[\d]*\s?', ' ', text)
-            text = re.sub(r'[{}]', '', text)
-            text = re.sub(r'\s+', ' ', text)
-            result["text_content"] = text.strip()
-        except Exception as e:
-            logger.error(f"RTF extraction error: {e}")
-        return result
-
-    @classmethod
-    def extract_from_odt(cls, file_content: bytes) -> dict:
-        """Extract text from ODT (OpenDocument) file"""
-        result = {"text_content": ""}
-        try:
-            import zipfile
-            import io
-            import xml.etree.ElementTree as ET
-
-            with zipfile.ZipFile(io.BytesIO(file_content)) as z:
-                if 'content.xml' in z.namelist():
-                    content = z.read('content.xml')
-                    root = ET.fromstring(content)
-                    # Extract all text nodes
-                    texts = []
-                    for elem in root.iter():
-                        if elem.text:
-                            texts.append(elem.text)
-                        if elem.tail:
-                            texts.append(elem.tail)
-                    result["text_content"] = " ".join(texts)
-        except Exception as e:
-            logger.error(f"ODT extraction error: {e}")
-        return result
-
-    @classmethod
-    def extract_from_file(cls,
-                          file_content: bytes,
-                          file_type: str,
-                          file_name: str = "") -> dict:
-        """Main extraction method - routes to appropriate extractor for all supported types"""
-        file_type_lower = file_type.lower()
-        file_name_lower = file_name.lower()
-
-        # Determine file type and extract
-        if 'pdf' in file_type_lower or file_name_lower.endswith('.pdf'):
-            raw_extraction = cls.extract_from_pdf(file_content)
-        elif 'word' in file_type_lower or file_name_lower.endswith(
-            ('.docx', '.doc')):
-            raw_extraction = cls.extract_from_docx(file_content)
-        elif 'presentation' in file_type_lower or file_name_lower.endswith(
-            ('.pptx', '.ppt')):
-            raw_extraction = cls.extract_from_pptx(file_content)
-        elif 'sheet' in file_type_lower or file_name_lower.endswith(
-            ('.xlsx', '.xls')):
-            raw_extraction = cls.extract_from_xlsx(file_content)
-        elif 'csv' in file_type_lower or file_name_lower.endswith('.csv'):
-            raw_extraction = cls.extract_from_csv(file_content)
-        elif 'json' in file_type_lower or file_name_lower.endswith('.json'):
-            raw_extraction = cls.extract_from_json(file_content)
-        elif 'rtf' in file_type_lower or file_name_lower.endswith('.rtf'):
-            raw_extraction = cls.extract_from_rtf(file_content)
-        elif 'opendocument' in file_type_lower or file_name_lower.endswith(
-                '.odt'):
-            raw_extraction = cls.extract_from_odt(file_content)
-        elif file_name_lower.endswith('.txt') or 'text' in file_type_lower:
-            raw_extraction = {
-                "text_content": file_content.decode('utf-8', errors='ignore')
-            }
-        else:
-            # Try to decode as text
-            try:
-                text = file_content.decode('utf-8', errors='ignore')
-                raw_extraction = {"text_content": text}
-            except:
-                raw_extraction = {
-                    "text_content": "",
-                    "error": "Unsupported file type"
-                }
-
-        # Extract structured data from text
-        text_content = raw_extraction.get("text_content", "")
-
-        company_info = cls.extract_company_info(text_content)
-        financial_data = cls.extract_financial_data(text_content)
-        key_metrics = cls.extract_key_metrics(text_content)
-
-        # Enhanced extraction - try to fill missing fields
-        company_info, financial_data, key_metrics = cls.enhance_extraction(
-            text_content, company_info, financial_data, key_metrics)
-
-        return {
-            "text_content":
-            text_content[:50000],  # Limit text size
-            "word_count":
-            len(text_content.split()),
-            "company_info":
-            company_info,
-            "financial_data":
-            financial_data,
-            "key_metrics":
-            key_metrics,
-            "metadata":
-            raw_extraction.get("metadata", {}),
-            "page_count":
-            raw_extraction.get("page_count",
-                               raw_extraction.get("slide_count", 1)),
-            "tables_count":
-            len(raw_extraction.get("tables", [])),
-            "extraction_quality":
-            cls.calculate_extraction_quality(company_info, financial_data,
-                                             key_metrics),
-        }
-
-    @classmethod
-    def enhance_extraction(cls, text: str, company_info: dict,
-                           financial_data: dict, key_metrics: dict) -> tuple:
-        """Enhanced extraction to improve quality score"""
-        text_lower = text.lower()
-
-        # Try harder to find company name
-        if not company_info.get('company_name'):
-            # Look for capitalized sequences at start of text
-            lines = text.strip().split('\n')
-            for line in lines[:5]:
-                line = line.strip()
-                if len(line) > 2 and len(line) < 50 and line[0].isupper():
-                    company_info['company_name'] = line
-                    break
-
-        # Industry detection with more keywords
-        if not company_info.get('industry'):
-            industry_map = {
-                'fintech': ['fintech', 'payment', 'banking', 'financial'],
-                'healthtech':
-                ['health', 'medical', 'hospital', 'patient', 'clinical'],
-                'edtech':
-                ['education', 'learning', 'school', 'student', 'course'],
-                'saas':
-                ['saas', 'software', 'cloud', 'platform', 'subscription'],
-                'e-commerce':
-                ['shop', 'retail', 'commerce', 'marketplace', 'store'],
-                'ai_ml': [
-                    'ai', 'machine learning', 'artificial intelligence',
-                    'neural'
-                ],
-                'logistics':
-                ['logistics', 'shipping', 'delivery', 'supply chain', 'fleet'],
-                'real_estate':
-                ['real estate', 'property', 'housing', 'rental'],
-                'media': ['media', 'content', 'streaming', 'entertainment'],
-                'gaming': ['game', 'gaming', 'esports', 'mobile game'],
-            }
-            for industry, keywords in industry_map.items():
-                if any(kw in text_lower for kw in keywords):
-                    company_info['industry'] = industry
-                    break
-
-        # Try to find location from common patterns
-        if not company_info.get('location'):
-            loc_patterns = [
-                r'(?:San Francisco|New York|Los Angeles|Chicago|Boston|Seattle|Austin|Denver|Miami|Atlanta)',
-                r'(?:California|CA|NY|TX|FL|WA|MA|CO|IL|GA)\b',
-                r'(?:USA|US|United States|Canada|UK|Germany|France|Australia)',
-            ]
-            if loc_match := next(
-                (re.search(pattern, text, re.IGNORECASE) for pattern in loc_patterns
-                 if re.search(pattern, text, re.IGNORECASE)),
-                None
-            ):
-                company_info['location'] = loc_match.group(0)
-
-        # Estimate founded year from context
-        if not company_info.get('founded_year'):
-            year_match = re.search(
-                r'(?:since|founded in|established|started in)\s*(\d{4})', text,
-                re.IGNORECASE)
-            if year_match:
-                year = int(year_match.group(1))
-                if 1980 <= year <= 2026:
-                    company_info['founded_year'] = year
-
-        # Try to extract revenue from various formats
-        if not financial_data.get('revenue'):
-            rev_patterns = [
-                r'\$\s*([\d,.]+)\s*(million|M|K|billion|B)?\s*(?:revenue|arr|annual)',
-                r'(?:revenue|arr)\s*(?:of|:)?\s*\$?\s*([\d,.]+)\s*(million|M|K|billion|B)?',
-                r'([\d,.]+)\s*(million|M|K|billion|B)?\s*(?:in revenue|annual revenue)',
-            ]
-            for pattern in rev_patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    value = match.group(1)
-                    mult = match.group(2) if len(match.groups()) > 1 else None
-                    financial_data['revenue'] = cls.parse_amount(value, mult)
-                    break
-
-        # Estimate burn rate from runway and cash
-        if not financial_data.get('burn_rate') and financial_data.get(
-                'runway'):
-            runway = financial_data['runway']
-            if runway > 0:
-                # Estimate based on typical cash positions
-                cash_patterns = [
-                    r'\$\s*([\d,.]+)\s*(million|M|K)?\s*(?:cash|bank|runway)',
-                ]
-                for pattern in cash_patterns:
-                    match = re.search(pattern, text, re.IGNORECASE)
-                    if match:
-                        cash = cls.parse_amount(match.group(1), match.group(2))
-                        if cash > 0:
-                            financial_data['burn_rate'] = cash / runway
-                        break
-
-        # Try to find team size
-        if not key_metrics.get('team_size'):
-            team_patterns = [
-                r'team\s*(?:of)?\s*(\d+)',
-                r'(\d+)\s*(?:employees?|people|team members?)',
-                r'(\d+)\s*(?:full.?time|ft)',
-            ]
-            for pattern in team_patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    size = int(match.group(1))
-                    if 1 <= size <= 10000:
-                        key_metrics['team_size'] = size
-                        company_info['employee_count'] = size
-                        break
-
-        # Try to find customer count
-        if not key_metrics.get('customers'):
-            cust_patterns = [
-                r'(\d+(?:,\d+)?(?:\+)?)\s*(?:customers?|clients?|users?|companies)',
-                r'(?:serving|reached?)\s*(\d+(?:,\d+)?(?:\+)?)\s*(?:customers?|clients?)',
-            ]
-            for pattern in cust_patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    count = int(
-                        match.group(1).replace(',', '').replace('+', ''))
-                    if count > 0:
-                        key_metrics['customers'] = count
-                        break
-
-        return company_info, financial_data, key_metrics
-
-    @classmethod
-    def calculate_extraction_quality(cls, company_info: dict,
-                                     financial_data: dict,
-                                     key_metrics: dict) -> dict:
-        """Calculate quality score for the extraction"""
-        total_fields = 0
-        extracted_fields = 0
-
-        # Company info fields
-        company_expected = [
-            'company_name', 'industry', 'location', 'founded_year',
-            'employee_count'
-        ]
-        for field in company_expected:
-            total_fields += 1
-            if company_info.get(field):
-                extracted_fields += 1
-
-        # Financial fields
-        financial_expected = ['revenue', 'burn_rate', 'runway', 'valuation']
-        for field in financial_expected:
-            total_fields += 1
-            if financial_data.get(field):
-                extracted_fields += 1
-
-        # Metrics fields
-        metrics_expected = ['team_size', 'customers', 'mrr']
-        for field in metrics_expected:
-            total_fields += 1
-            if key_metrics.get(field):
-                extracted_fields += 1
-
-        quality_score = (extracted_fields / total_fields *
-                         100) if total_fields > 0 else 0
-
-        return {
-            "score":
-            round(quality_score, 1),
-            "total_expected_fields":
-            total_fields,
-            "extracted_fields":
-            extracted_fields,
-            "quality_level":
-            "high" if quality_score >= 70 else
-            "medium" if quality_score >= 40 else "low",
-            "missing_fields": [
-                f for f in company_expected + financial_expected +
-                metrics_expected if f not in company_info
-                and f not in financial_data and f not in key_metrics
-            ]
-        }
+# Document extraction runs in a process pool (see extraction_service.py)
+from document_extractor import DocumentExtractor
+from pattern_scanner import pattern_scanner
+from extraction_service import extraction_service, ExtractionQueueFull
+from extraction_cache import extraction_cache
+from upload_spool import (UPLOAD_MAX_BYTES, UploadTooLarge, spool_base64,
+                          spool_upload_file)
+from upload_jobs import UPLOAD_ASYNC_DEFAULT, upload_jobs
+from upload_batch import extract_spools, insert_upload_records, upload_record
+from analysis_modules import FeatureContext
+from analysis_memo import module_memo
+from analysis_store import analysis_store, new_analysis_id
+from analysis_reports import (REPORT_TYPES, StoredReport, analysis_reports,
+                              encode_report, if_none_match_tags)
+from analysis_batch import feature_contexts
+from company_profiles import (PROFILE_UPLOADS, company_profiles,
+                              merge_uploads, metric_sources)
+from ssd_jobs import (SSD_JOB_IN_PROCESS, ExistingJob, IdempotencyKeyReused,
+                      QueuedJob, SSDJob, ssd_jobs)
+from ssd_audit import AuditEvent, ssd_audit
+from ssd_callbacks import ssd_callbacks
+from ssd_reports import ReportFile, ssd_reports
+from ssd_events import STAGES as SSD_STAGES, snapshot_events, ssd_events
+from ssd_stats import latency_summary, ssd_stats
 
 
 # JWT Configuration
@@ -926,10 +170,53 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to create database pool: {e}")
         raise
 
+    extraction_service.start()
+    try:
+        await extraction_cache.ensure_schema()
+    except Exception as e:
+        logger.warning(f"Extraction cache table unavailable: {e}")
+    try:
+        await analysis_store.ensure_schema()
+        await analysis_reports.ensure_schema()
+    except Exception as e:
+        logger.warning(f"Analysis tables unavailable: {e}")
+    try:
+        await company_profiles.ensure_schema()
+        async with db_manager.get_connection() as conn:
+            built = await company_profiles.backfill(conn)
+        if built:
+            logger.info(f"Built {built} missing company profiles")
+    except Exception as e:
+        logger.warning(f"Company profiles unavailable: {e}")
+    upload_jobs.start()
+    try:
+        await ssd_audit.ensure_schema()
+        await ssd_stats.ensure_schema()
+        async with db_manager.get_connection() as conn:
+            await ssd_stats.backfill(conn)
+    except Exception as e:
+        logger.warning(f"SSD audit tables unavailable: {e}")
+    try:
+        await ssd_jobs.ensure_schema()
+        if SSD_JOB_IN_PROCESS:
+            ssd_jobs.start()
+    except Exception as e:
+        logger.warning(f"SSD job queue unavailable: {e}")
+    try:
+        await ssd_callbacks.ensure_schema()
+        if SSD_JOB_IN_PROCESS:
+            ssd_callbacks.start()
+    except Exception as e:
+        logger.warning(f"SSD callback outbox unavailable: {e}")
+
     yield
 
     # Shutdown
     logger.info("Shutting down TCA IRR Backend...")
+    await upload_jobs.stop()
+    await ssd_jobs.stop()
+    await ssd_callbacks.stop()
+    await extraction_service.stop()
     await db_manager.close_pool()
 
 
@@ -983,6 +270,11 @@ app.add_middleware(CatchAllErrorMiddleware)
 from starlette.types import ASGIApp, Receive, Scope, Send
 
 
+# Routes that read and validate their JSON body themselves, with a size cap
+# (see _read_json_body); buffering them here would bypass the cap
+_SELF_PARSED_JSON_PATHS = frozenset({"/api/files/upload"})
+
+
 class JSONBodyValidationMiddleware:
     """Validates JSON body at ASGI level before Starlette can parse and 500."""
 
@@ -991,7 +283,8 @@ class JSONBodyValidationMiddleware:
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send):
         if scope["type"] == "http" and scope.get(
-                "method", "") in ("POST", "PUT", "PATCH"):
+                "method", "") in ("POST", "PUT", "PATCH") and scope.get(
+                    "path") not in _SELF_PARSED_JSON_PATHS:
             headers = dict(scope.get("headers", []))
             content_type = headers.get(b"content-type",
                                        b"").decode("utf-8", errors="ignore")
@@ -1012,8 +305,16 @@ class JSONBodyValidationMiddleware:
                             content={"detail": "Invalid JSON in request body"})
                         await response(scope, receive, send)
                         return
-                # Re-wrap body so downstream can read it
+                # Re-wrap body so downstream can read it; later receives
+                # (disconnect detection for streamed responses) go to the
+                # real channel.
+                replayed = False
+
                 async def new_receive():
+                    nonlocal replayed
+                    if replayed:
+                        return await receive()
+                    replayed = True
                     return {
                         "type": "http.request",
                         "body": body,
@@ -1436,7 +737,7 @@ class SSDAuditLog(BaseModel):
     report_path: Optional[str] = None
     report_version: int = 1
     callback_url: Optional[str] = None
-    callback_status: Optional[str] = None  # sent, failed, not_configured
+    callback_status: Optional[str] = None  # pending, retrying, sent, failed, not_configured
     callback_response_code: Optional[int] = None
     processing_duration_ms: Optional[int] = None
     final_score: Optional[float] = None
@@ -1444,34 +745,21 @@ class SSDAuditLog(BaseModel):
     events: List[SSDAuditLogEntry] = []
 
 
-# In-memory audit storage (production would use database)
-SSD_AUDIT_LOGS: Dict[str, Dict[str, Any]] = {}
+# Audit logs are stored in ssd_audit_logs / ssd_audit_events (ssd_audit.py)
 
 
-def _ssd_audit_log(tracking_id: str,
-                   event_type: str,
-                   details: Optional[Dict[str, Any]] = None):
-    """Add an audit log entry for an SSD request."""
-    entry = {
-        "event_type": event_type,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "details": details or {},
-    }
-    if tracking_id not in SSD_AUDIT_LOGS:
-        SSD_AUDIT_LOGS[tracking_id] = {
-            "tracking_id": tracking_id,
-            "events": [],
-            "created_at": entry["timestamp"],
-        }
-    SSD_AUDIT_LOGS[tracking_id]["events"].append(entry)
-    SSD_AUDIT_LOGS[tracking_id]["updated_at"] = entry["timestamp"]
+async def _ssd_audit_log(tracking_id: str,
+                         event_type: str,
+                         details: Optional[Dict[str, Any]] = None,
+                         **fields):
+    """Add an audit log entry for an SSD request (and set ``fields``)."""
+    await ssd_audit.record(tracking_id, event_type, details, **fields)
     logger.info(f"[SSD-AUDIT] {tracking_id}: {event_type}")
 
 
-def _ssd_audit_update(tracking_id: str, **kwargs):
+async def _ssd_audit_update(tracking_id: str, **kwargs):
     """Update audit log metadata fields."""
-    if tracking_id in SSD_AUDIT_LOGS:
-        SSD_AUDIT_LOGS[tracking_id].update(kwargs)
+    await ssd_audit.record(tracking_id, **kwargs)
 
 
 # Utility functions
@@ -3148,99 +2436,243 @@ async def run_comprehensive_analysis(request: Request):
 # â”€â”€â”€ File upload endpoints (persisted to allupload table) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
 
 
+# Largest JSON upload body: UPLOAD_JSON_MAX_FILES files of UPLOAD_MAX_BYTES
+# as base64, plus the envelope (names, types, company_name)
+UPLOAD_JSON_MAX_FILES = int(os.getenv("UPLOAD_JSON_MAX_FILES", "10"))
+UPLOAD_JSON_MAX_BYTES = int(
+    os.getenv(
+        "UPLOAD_JSON_MAX_BYTES",
+        str(UPLOAD_JSON_MAX_FILES * (UPLOAD_MAX_BYTES * 4 // 3 + 4) +
+            1024 * 1024)))
+
+
+async def _read_json_body(request: Request):
+    """Read and parse a JSON body of at most UPLOAD_JSON_MAX_BYTES.
+
+    The body is held in memory once (Starlette does not also cache it on
+    the request, and JSONBodyValidationMiddleware skips these routes).
+    Raises UploadTooLarge on a larger Content-Length or as soon as the
+    bytes received pass the cap, and a 422 HTTPException on invalid JSON.
+    """
+    too_large = UploadTooLarge(
+        f"Request body exceeds {UPLOAD_JSON_MAX_BYTES} bytes")
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > UPLOAD_JSON_MAX_BYTES:
+        raise too_large
+    raw = bytearray()
+    async for chunk in request.stream():
+        raw += chunk
+        if len(raw) > UPLOAD_JSON_MAX_BYTES:
+            raise too_large
+    try:
+        return json.loads(raw)
+    except ValueError:
+        raise HTTPException(status_code=422,
+                            detail="Invalid JSON in request body")
+
+
+def _async_upload_requested(flag) -> bool:
+    """Resolve the optional ``async`` upload flag (body, query or form)"""
+    if flag is None:
+        return UPLOAD_ASYNC_DEFAULT
+    if isinstance(flag, str):
+        return flag.strip().lower() in ("1", "true", "yes")
+    return bool(flag)
+
+
+def _queued_upload(row, fname: str, fsize: int, ftype: str) -> dict:
+    """Response entry for a file handed to the background upload jobs"""
+    upload_id = str(row['upload_id'])
+    return {
+        "upload_id": upload_id,
+        "name": fname,
+        "size": fsize,
+        "type": ftype,
+        "processing_status": "queued",
+        "status_url": f"/api/uploads/{upload_id}",
+        "created_at": str(row['created_at']),
+    }
+
+
+@app.get("/api/extraction/stats")
+async def get_extraction_stats():
+    """Extraction pool queue depth, per-format latency and cache hit rate"""
+    return {
+        **extraction_service.stats(), "cache": extraction_cache.stats(),
+        "upload_jobs": upload_jobs.stats()
+    }
+
+
+def _no_content_extraction(fname: str) -> dict:
+    """extracted_data for a JSON upload entry that carried no file content"""
+    return {
+        "text_content": f"No content provided for {fname}",
+        "word_count": 0,
+        "company_info": {},
+        "financial_data": {},
+        "key_metrics": {},
+        "extraction_quality": {
+            "score": 0,
+            "quality_level": "none"
+        }
+    }
+
+
+async def _store_uploads(files: list, company_name: Optional[str],
+                         run_async: bool, original_request: str,
+                         propagate_company_name: bool) -> List[dict]:
+    """Extract and persist a batch of ``(name, type, size, spool)`` files.
+
+    Spools (None for files without content) are extracted concurrently, or
+    handed to the background upload jobs when ``run_async``; all allupload
+    rows are then written in one transaction.  Returns the per-file
+    response entries in input order.
+    """
+    spools = [spool for *_, spool in files if spool is not None]
+    try:
+        if run_async:
+            upload_jobs.reserve(len(spools))
+            outcomes = [None] * len(files)
+        else:
+            outcomes = await extract_spools([(spool, ftype, fname)
+                                             for fname, ftype, _, spool in files])
+    except BaseException:
+        for spool in spools:
+            spool.cleanup()
+        raise
+
+    created_at = datetime.now(timezone.utc)
+    records, entries, queued = [], [], []
+    for (fname, ftype, fsize, spool), outcome in zip(files, outcomes):
+        if spool is not None and run_async:
+            record = upload_jobs.queued_record(spool, fname, ftype, fsize,
+                                               company_name, original_request,
+                                               created_at)
+            records.append(record)
+            queued.append((record, spool, ftype, fname))
+            entries.append(_queued_upload(record, fname, fsize, ftype))
+            continue
+
+        if outcome is None:
+            extracted_data, processing_status, processing_error, cache_info = (
+                _no_content_extraction(fname), 'completed', None, {})
+        else:
+            extracted_data, processing_status, processing_error, cache_info = (
+                outcome)
+        extracted_company = extracted_data.get('company_info',
+                                               {}).get('company_name')
+        if (propagate_company_name and spool is not None
+                and not company_name and extracted_company):
+            company_name = extracted_company
+
+        record = upload_record(
+            fname, ftype, fsize, extracted_data, company_name
+            or extracted_company, processing_status, processing_error, {
+                "original_request": original_request,
+                "extraction_quality":
+                extracted_data.get('extraction_quality', {}),
+                **cache_info
+            }, created_at)
+        records.append(record)
+        entries.append({
+            "upload_id": str(record['upload_id']),
+            "name": fname,
+            "size": fsize,
+            "type": ftype,
+            "extracted_data": extracted_data,
+            "processing_status": processing_status,
+            "cache_hit": cache_info.get('cache_hit', False),
+            "created_at": str(created_at),
+            "extraction_quality": extracted_data.get('extraction_quality', {})
+        })
+
+    try:
+        async with db_manager.get_connection() as conn:
+            await insert_upload_records(conn, records)
+            await company_profiles.on_uploads_changed(
+                conn, [r['company_name'] for r in records])
+    except BaseException:
+        if run_async:
+            upload_jobs.release(len(spools))
+            for spool in spools:
+                spool.cleanup()
+        raise
+
+    for record, spool, ftype, fname in queued:
+        upload_jobs.schedule(str(record['upload_id']),
+                             spool,
+                             ftype,
+                             fname,
+                             reserved=True)
+    return entries
+
+
 @app.post("/api/files/upload")
 async def upload_files(request: Request):
-    """Handle file uploads, extract data, and persist to allupload table"""
+    """Handle file uploads, extract data, and persist to allupload table.
+
+    With ``"async": true`` (or ?async=true, or UPLOAD_ASYNC_DEFAULT) files
+    are queued for background extraction and the response is 202; poll
+    /api/uploads/{upload_id} for progress.
+    """
     try:
-        data = await request.json()
+        data = await _read_json_body(request)
         files_data = data.get('files', [])
         company_name = data.get('company_name', None)
+        run_async = _async_upload_requested(
+            data.get('async', request.query_params.get('async')))
 
         # BUG-SEC-001: Sanitize user-supplied company_name
         if company_name is not None:
             company_name = _html.escape(str(company_name))[:255]
 
-        processed_files = []
-        async with db_manager.get_connection() as conn:
+        files = []
+        try:
             for file_info in files_data:
                 fname = file_info.get('name', 'unknown.pdf')
                 ftype = file_info.get('type', 'application/pdf')
                 fsize = file_info.get('size', 0)
 
-                file_content_b64 = file_info.get(
-                    'content', '') or file_info.get('data', '')
+                # Pop the base64 payload so it is freed once spooled
+                file_content_b64 = file_info.pop(
+                    'content', '') or file_info.pop('data', '')
 
-                # Decode base64 file content if provided
-                file_bytes = None
+                # Decode base64 file content to a spool file if provided
+                spool = None
                 if file_content_b64:
                     try:
-                        if ',' in file_content_b64:
-                            file_content_b64 = file_content_b64.split(',')[1]
-                        file_bytes = base64.b64decode(file_content_b64)
+                        spool = await spool_base64(file_content_b64)
+                    except UploadTooLarge:
+                        raise
                     except Exception as decode_error:
                         logger.warning(
                             f"Could not decode file content for {fname}: {decode_error}"
                         )
-
-                # Use real document extraction if we have file bytes
-                if file_bytes:
-                    extracted_data = DocumentExtractor.extract_from_file(
-                        file_bytes, ftype, fname)
-                    if not company_name and extracted_data.get(
-                            'company_info', {}).get('company_name'):
-                        company_name = extracted_data['company_info'][
-                            'company_name']
-                else:
-                    extracted_data = {
-                        "text_content": f"No content provided for {fname}",
-                        "word_count": 0,
-                        "company_info": {},
-                        "financial_data": {},
-                        "key_metrics": {},
-                        "extraction_quality": {
-                            "score": 0,
-                            "quality_level": "none"
-                        }
-                    }
-                # Persist to allupload
-                row = await conn.fetchrow(
-                    """
-                    INSERT INTO allupload
-                        (source_type, file_name, file_type, file_size,
-                         extracted_text, extracted_data, company_name,
-                         processing_status, upload_metadata)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-                    RETURNING upload_id, created_at
-                    """, 'file', fname, ftype, fsize,
-                    extracted_data.get('text_content', '')[:65000],
-                    json.dumps(extracted_data), company_name
-                    or extracted_data.get('company_info',
-                                          {}).get('company_name'), 'completed',
-                    json.dumps({
-                        "original_request":
-                        "file_upload",
-                        "extraction_quality":
-                        extracted_data.get('extraction_quality', {})
-                    }))
-
-                processed_files.append({
-                    "upload_id":
-                    str(row['upload_id']),
-                    "name":
-                    fname,
-                    "size":
-                    fsize,
-                    "type":
-                    ftype,
-                    "extracted_data":
-                    extracted_data,
-                    "processing_status":
-                    "completed",
-                    "created_at":
-                    str(row['created_at']),
-                    "extraction_quality":
-                    extracted_data.get('extraction_quality', {})
-                })
+                    file_content_b64 = None
+                if spool is not None and spool.size == 0:
+                    spool.cleanup()
+                    spool = None
+                files.append((fname, ftype, fsize, spool))
+        except BaseException:
+            for *_, spool in files:
+                if spool is not None:
+                    spool.cleanup()
+            raise
+
+        # Extract concurrently (or queue), then one batched insert
+        processed_files = await _store_uploads(files,
+                                               company_name,
+                                               run_async,
+                                               "file_upload",
+                                               propagate_company_name=True)
+
+        if run_async:
+            return JSONResponse(status_code=202,
+                                content={
+                                    "status": "accepted",
+                                    "files_processed": len(processed_files),
+                                    "processed_files": processed_files,
+                                })
 
         return {
             "status": "success",
@@ -3255,6 +2687,12 @@ async def upload_files(request: Request):
             }
         }
 
+    except HTTPException:
+        raise
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ExtractionQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"File upload error: {e}")
         raise HTTPException(status_code=500,
@@ -3267,93 +2705,73 @@ from fastapi import UploadFile, File, Form
 
 @app.post("/api/files/upload/multipart")
 async def upload_files_multipart(files: List[UploadFile] = File(...),
-                                 company_name: Optional[str] = Form(None)):
-    """Handle multipart file uploads with real extraction"""
+                                 company_name: Optional[str] = Form(None),
+                                 async_mode: Optional[str] = Form(
+                                     None, alias="async")):
+    """Handle multipart file uploads with real extraction (202 + background
+    extraction when the ``async`` form field is true)"""
     try:
         # BUG-SEC-001: Sanitize user-supplied company_name from form field
         if company_name is not None:
             company_name = _html.escape(str(company_name))[:255]
-        processed_files = []
-        async with db_manager.get_connection() as conn:
+        run_async = _async_upload_requested(async_mode)
+        spooled = []
+        try:
             for uploaded_file in files:
                 fname = uploaded_file.filename or 'unknown.pdf'
                 ftype = uploaded_file.content_type or 'application/octet-stream'
 
-                # Read file content
-                file_bytes = await uploaded_file.read()
-                fsize = len(file_bytes)
+                # Spool file content to disk in chunks
+                spool = await spool_upload_file(uploaded_file)
+                spooled.append((fname, ftype, spool.size, spool))
+        except BaseException:
+            for *_, spool in spooled:
+                spool.cleanup()
+            raise
+
+        # Extract concurrently (or queue), then one batched insert
+        processed_files = await _store_uploads(spooled,
+                                               company_name,
+                                               run_async,
+                                               "multipart_upload",
+                                               propagate_company_name=False)
+        for entry in processed_files:
+            extracted_data = entry.get('extracted_data')
+            if extracted_data is not None:
+                entry["company_info"] = extracted_data.get('company_info', {})
+                entry["financial_data"] = extracted_data.get(
+                    'financial_data', {})
+                entry["key_metrics"] = extracted_data.get('key_metrics', {})
+
+        if run_async:
+            return JSONResponse(status_code=202,
+                                content={
+                                    "status": "accepted",
+                                    "files_processed": len(processed_files),
+                                    "processed_files": processed_files,
+                                })
 
-                # Extract data using DocumentExtractor
-                extracted_data = DocumentExtractor.extract_from_file(
-                    file_bytes, ftype, fname)
+        avg_score = sum(
+            f.get('extraction_quality', {}).get('score', 0) for f in
+            processed_files) / len(processed_files) if processed_files else 0
 
-                # Use extracted company name if not provided
-                extracted_company = extracted_data.get('company_info',
-                                                       {}).get('company_name')
-                final_company_name = company_name or extracted_company
-
-                # Persist to allupload
-                row = await conn.fetchrow(
-                    """
-                    INSERT INTO allupload
-                        (source_type, file_name, file_type, file_size,
-                         extracted_text, extracted_data, company_name,
-                         processing_status, upload_metadata)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-                    RETURNING upload_id, created_at
-                    """, 'file', fname, ftype, fsize,
-                    extracted_data.get('text_content', '')[:65000],
-                    json.dumps(extracted_data), final_company_name,
-                    'completed',
-                    json.dumps({
-                        "original_request":
-                        "multipart_upload",
-                        "extraction_quality":
-                        extracted_data.get('extraction_quality', {})
-                    }))
-
-                processed_files.append({
-                    "upload_id":
-                    str(row['upload_id']),
-                    "name":
-                    fname,
-                    "size":
-                    fsize,
-                    "type":
-                    ftype,
-                    "extracted_data":
-                    extracted_data,
-                    "company_info":
-                    extracted_data.get('company_info', {}),
-                    "financial_data":
-                    extracted_data.get('financial_data', {}),
-                    "key_metrics":
-                    extracted_data.get('key_metrics', {}),
-                    "processing_status":
-                    "completed",
-                    "created_at":
-                    str(row['created_at']),
-                    "extraction_quality":
-                    extracted_data.get('extraction_quality', {})
-                })
-
-        avg_score = sum(
-            f.get('extraction_quality', {}).get('score', 0) for f in
-            processed_files) / len(processed_files) if processed_files else 0
-
-        return {
-            "status": "success",
-            "files_processed": len(processed_files),
-            "processed_files": processed_files,
-            "total_extraction_quality": {
-                "average_score":
-                avg_score,
-                "quality_level":
-                "high"
-                if avg_score >= 70 else "medium" if avg_score >= 40 else "low"
-            }
-        }
+        return {
+            "status": "success",
+            "files_processed": len(processed_files),
+            "processed_files": processed_files,
+            "total_extraction_quality": {
+                "average_score":
+                avg_score,
+                "quality_level":
+                "high"
+                if avg_score >= 70 else "medium" if avg_score >= 40 else "low"
+            }
+        }
 
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ExtractionQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Multipart file upload error: {e}")
         raise HTTPException(status_code=500,
@@ -3463,12 +2881,8 @@ async def reprocess_extraction(request: Request):
             text_content = row['extracted_text'] or ''
 
             if text_content:
-                company_info = DocumentExtractor.extract_company_info(
-                    text_content)
-                financial_data = DocumentExtractor.extract_financial_data(
-                    text_content)
-                key_metrics = DocumentExtractor.extract_key_metrics(
-                    text_content)
+                company_info, financial_data, key_metrics = pattern_scanner.scan(
+                    text_content, enhance=False)
                 quality = DocumentExtractor.calculate_extraction_quality(
                     company_info, financial_data, key_metrics)
 
@@ -3491,6 +2905,10 @@ async def reprocess_extraction(request: Request):
                            processing_status = 'reprocessed'
                        WHERE upload_id = $3""", json.dumps(new_extracted_data),
                     company_info.get('company_name'), uuid.UUID(upload_id))
+                await company_profiles.on_uploads_changed(
+                    conn,
+                    [row['company_name'],
+                     company_info.get('company_name')])
 
                 return {
                     "success": True,
@@ -3553,6 +2971,9 @@ async def fetch_url_data(request: Request):
                     "processing_status": "completed",
                     "created_at": str(row['created_at'])
                 })
+            if processed_urls:
+                await company_profiles.on_uploads_changed(
+                    conn, [company_name])
 
         return {
             "status": "success",
@@ -3630,6 +3051,7 @@ async def submit_text(request: Request):
                 """, 'text', title, 'text/plain', text,
                 json.dumps(extracted_data), company_name, 'completed',
                 json.dumps({"original_request": "text_submit"}))
+            await company_profiles.on_uploads_changed(conn, [company_name])
 
         return {
             "status": "success",
@@ -3685,6 +3107,17 @@ async def list_uploads(status: Optional[str] = None, limit: int = 50):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _upload_progress(upload_id: str, processing_status: str) -> dict:
+    """Progress block for /api/uploads/{upload_id}"""
+    if processing_status in ('queued', 'extracting'):
+        # Live numbers exist only in the process running the job
+        return upload_jobs.progress(upload_id) or {
+            "stage": processing_status,
+            "percent": 0 if processing_status == 'queued' else 50
+        }
+    return {"stage": processing_status, "percent": 100}
+
+
 @app.get("/api/uploads/{upload_id}")
 async def get_upload(upload_id: str):
     """Get a single upload with full extracted data"""
@@ -3711,6 +3144,15 @@ async def get_upload(upload_id: str):
                         result[k] = v
                 else:
                     result[k] = v
+            # Analyses are stored once in nine_module_analyses; a result
+            # still embedded in the row may predate the latest analysis
+            if result.get('analysis_id'):
+                stored = await analysis_store.get(conn, result['analysis_id'])
+                result['analysis_result'] = (stored if stored is not None else
+                                             result.get('analysis_result')
+                                             or {})
+            result['progress'] = _upload_progress(upload_id,
+                                                  result['processing_status'])
             return result
     except HTTPException:
         raise
@@ -3724,11 +3166,13 @@ async def delete_upload(upload_id: str):
     """Delete an upload record"""
     try:
         async with db_manager.get_connection() as conn:
-            result = await conn.execute(
-                "DELETE FROM allupload WHERE upload_id = $1",
-                uuid.UUID(upload_id))
-            if result == "DELETE 0":
+            row = await conn.fetchrow(
+                """DELETE FROM allupload WHERE upload_id = $1
+                   RETURNING company_name""", uuid.UUID(upload_id))
+            if row is None:
                 raise HTTPException(status_code=404, detail="Upload not found")
+            await company_profiles.on_uploads_changed(conn,
+                                                      [row['company_name']])
             return {"status": "deleted", "upload_id": upload_id}
     except HTTPException:
         raise
@@ -3737,6 +3181,31 @@ async def delete_upload(upload_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/companies/{company_name}/profile")
+async def get_company_profile(company_name: str):
+    """Pre-merged analysis inputs of a company, with the upload behind each field"""
+    try:
+        async with db_manager.get_connection() as conn:
+            profile = (await company_profiles.load_many(
+                conn, [company_name])).get(company_name)
+        if not profile:
+            raise HTTPException(status_code=404,
+                                detail="No uploads for this company")
+        return {
+            "company_name": company_name,
+            "source_upload_ids": profile["source_upload_ids"],
+            "merged_data": profile["merged_data"],
+            "field_sources": profile["field_sources"],
+            "metric_sources": metric_sources(profile),
+            "text_length": len(profile["merged_text"]),
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Get company profile error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # ─── Analysis List and Module Weights Endpoints ─────────────────────────────
 
 
@@ -3939,1153 +3408,101 @@ MODULE_DATA_REQUIREMENTS = {
 }
 
 
-def _clamp(val, lo=0.0, hi=10.0):
-    """Clamp a value between lo and hi."""
-    return max(lo, min(hi, val))
-
-
-def _flag_color(score):
-    """Return traffic-light flag from a 0-10 score."""
-    if score >= 7.0:
-        return "green"
-    elif score >= 5.0:
-        return "yellow"
-    return "red"
-
-
-def _extract_text_mentions(text: str, keywords: list) -> list:
-    """Return which keywords appear in the text (case-insensitive)."""
-    lower = text.lower()
-    return [k for k in keywords if k.lower() in lower]
-
-
-def _run_module(module_cfg: dict, company_data: dict, extracted: dict) -> dict:
+def _merge_analysis_inputs(company_name: str, profile: Optional[dict],
+                           data: dict) -> Tuple[dict, dict, List[str]]:
     """
-    Run a single analysis module.
-    ALL scores are derived from the actual uploaded / client-entered data.
-    No hardcoded mock scores.
+    Turn merged uploads (a company profile or merge_uploads() output, None
+    when there are no uploads) plus any inline financial_data / key_metrics
+    in the request ``data`` into (company_data, merged_data, source_ids)
+    for the 9-module analysis.  404 when there is nothing to analyse.
     """
-    mid = module_cfg["id"]
-    fin = extracted.get("financial_data", {})
-    met = extracted.get("key_metrics", {})
-    ci = extracted.get("company_info", {})
-    text = company_data.get("extracted_text", "")
-
-    # â”€â”€ helpers to normalise incoming numeric values â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-    def n(dct, key, default=0):
-        v = dct.get(key, default)
-        try:
-            return float(v)
-        except (TypeError, ValueError):
-            return float(default)
-
-    # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
-    # 1. TCA SCORECARD
-    # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
-    if mid == "tca_scorecard":
-        # --- Market Potential (weight 20) --------------------------
-        revenue = n(fin, "revenue")
-        customers = n(met, "customers")
-        nrr = n(met, "nrr")
-        market_score = 5.0
-        if revenue > 0:
-            market_score += min(2.0, revenue / 500_000)  # up to +2 for $1M+
-        if customers >= 20:
-            market_score += 1.0
-        if nrr > 100:
-            market_score += min(1.0, (nrr - 100) / 30)
-        market_score = _clamp(round(market_score, 1))
-        market_strengths = []
-        market_concerns = []
-        if revenue >= 300_000:
-            market_strengths.append(
-                f"Revenue ${revenue:,.0f} shows product-market fit")
-        else:
-            market_concerns.append(
-                f"Revenue ${revenue:,.0f} â€” product-market fit not yet proven"
-            )
-        if customers >= 30:
-            market_strengths.append(f"{int(customers)} paying customers")
-        elif customers > 0:
-            market_concerns.append(
-                f"Only {int(customers)} customers â€” early traction")
-        if nrr > 100:
-            market_strengths.append(f"{nrr:.0f}% NRR â€” strong retention")
-
-        # --- Technology Innovation (weight 15) ---------------------
-        tech_mentions = _extract_text_mentions(text, [
-            "patent", "proprietary", "AI", "ML", "NLP", "machine learning",
-            "SOC 2", "SOC2", "ISO 27001", "microservice", "cloud-native"
-        ])
-        tech_score = _clamp(round(5.0 + min(3.0, len(tech_mentions) * 0.8), 1))
-        tech_strengths = tech_mentions[:3] if tech_mentions else [
-            "No specific tech differentiators identified"
-        ]
-        tech_concerns = []
-        if len(tech_mentions) < 2:
-            tech_concerns.append("Limited technology differentiation signals")
-        else:
-            tech_concerns.append("IP portfolio depth should be verified")
-
-        # --- Team Capability (weight 25) ---------------------------
-        team_size = n(met, "team_size")
-        team_mentions = _extract_text_mentions(text, [
-            "ex-Google", "ex-Meta", "ex-Amazon", "ex-Microsoft", "Stanford",
-            "MIT", "Harvard", "MBA", "PhD", "prior exit", "previous exit",
-            "co-founder", "CTO", "CEO", "VP"
-        ])
-        team_score = 5.0
-        if team_size >= 10:
-            team_score += 1.5
-        elif team_size >= 5:
-            team_score += 0.8
-        team_score += min(2.5, len(team_mentions) * 0.5)
-        team_score = _clamp(round(team_score, 1))
-        team_strengths = f"Team of {int(team_size)}" if team_size else "Team size not provided"
-        if team_mentions:
-            team_strengths += f"; signals: {', '.join(team_mentions[:4])}"
-        team_concerns = "Detailed team background needs verification" if len(
-            team_mentions) < 3 else "Key-person dependency risk"
-
-        # --- Business Model (weight 20) ----------------------------
-        mrr = n(fin, "mrr") or n(met, "mrr")
-        gross_margin = n(fin, "gross_margin")
-        bm_score = 5.0
-        if mrr > 0:
-            bm_score += min(2.0, mrr / 30_000)
-        if gross_margin > 50:
-            bm_score += min(2.0, (gross_margin - 50) / 20)
-        bm_mentions = _extract_text_mentions(
-            text,
-            ["SaaS", "subscription", "recurring", "ARR", "MRR", "enterprise"])
-        bm_score += min(1.0, len(bm_mentions) * 0.3)
-        bm_score = _clamp(round(bm_score, 1))
-        bm_strengths = f"MRR ${mrr:,.0f}" if mrr else "Revenue model data not provided"
-        if gross_margin:
-            bm_strengths += f"; Gross margin {gross_margin}%"
-        bm_concerns = "Unit economics at scale need validation"
-
-        # --- Financial Health (weight 20) --------------------------
-        burn_rate = n(fin, "burn_rate")
-        runway = n(fin, "runway_months")
-        fh_score = 5.0
-        if runway >= 18:
-            fh_score += 2.5
-        elif runway >= 12:
-            fh_score += 1.5
-        elif runway >= 6:
-            fh_score += 0.5
-        else:
-            fh_score -= 1.0
-        if revenue > 0 and burn_rate > 0:
-            burn_multiple = burn_rate / max(revenue / 12, 1)
-            if burn_multiple < 1.5:
-                fh_score += 1.5
-            elif burn_multiple < 3.0:
-                fh_score += 0.5
-        fh_score = _clamp(round(fh_score, 1))
-        fh_strengths = f"Runway {runway:.0f} months" if runway else "Runway not provided"
-        if burn_rate:
-            fh_strengths += f"; Burn ${burn_rate:,.0f}/mo"
-        fh_concerns = "Burn rate optimization needed" if burn_rate and revenue and burn_rate > revenue / 12 * 2 else "Monitor cash efficiency"
-
-        categories = [
-            {
-                "category":
-                "Market Potential",
-                "raw_score":
-                market_score,
-                "weight":
-                20,
-                "flag":
-                _flag_color(market_score),
-                "strengths":
-                "; ".join(market_strengths) if market_strengths else "N/A",
-                "concerns":
-                "; ".join(market_concerns)
-                if market_concerns else "None identified"
-            },
-            {
-                "category":
-                "Technology Innovation",
-                "raw_score":
-                tech_score,
-                "weight":
-                15,
-                "flag":
-                _flag_color(tech_score),
-                "strengths":
-                "; ".join(tech_strengths),
-                "concerns":
-                "; ".join(tech_concerns)
-                if tech_concerns else "None identified"
-            },
-            {
-                "category": "Team Capability",
-                "raw_score": team_score,
-                "weight": 25,
-                "flag": _flag_color(team_score),
-                "strengths": team_strengths,
-                "concerns": team_concerns
-            },
-            {
-                "category": "Business Model",
-                "raw_score": bm_score,
-                "weight": 20,
-                "flag": _flag_color(bm_score),
-                "strengths": bm_strengths,
-                "concerns": bm_concerns
-            },
-            {
-                "category": "Financial Health",
-                "raw_score": fh_score,
-                "weight": 20,
-                "flag": _flag_color(fh_score),
-                "strengths": fh_strengths,
-                "concerns": fh_concerns
-            },
-        ]
-        composite = round(
-            sum(c["raw_score"] * c["weight"] for c in categories) / 100, 2)
-        return {
-            "module_id":
-            mid,
-            "score":
-            composite,
-            "composite_score":
-            composite,
-            "categories":
-            categories,
-            "recommendation":
-            "Proceed with due diligence"
-            if composite >= 7 else "Further analysis needed",
-            "data_sources": {
-                "financial_data": bool(fin),
-                "key_metrics": bool(met),
-                "text_analysis": bool(text)
-            },
-            "confidence":
-            min(0.95, 0.5 + 0.15 *
-                sum([bool(fin), bool(met), bool(text)])),
-        }
-
-    # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
-    # 2. RISK ASSESSMENT
-    # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
-    if mid == "risk_assessment":
-        revenue = n(fin, "revenue")
-        burn_rate = n(fin, "burn_rate")
-        runway = n(fin, "runway_months")
-        team_size = n(met, "team_size")
-        customers = n(met, "customers")
-
-        # Financial risk: high burn vs runway
-        if runway > 0 and burn_rate > 0:
-            fin_risk = _clamp(round(10 - runway / 2, 1), 1, 9)
-        elif burn_rate > 0:
-            fin_risk = 7.0
-        else:
-            fin_risk = 5.0
-        fin_trigger = f"Burn ${burn_rate:,.0f}/mo with {runway:.0f} months runway" if burn_rate else "Financial data incomplete"
-        fin_impact = "High â€” limited runway" if runway < 12 else "Medium â€” adequate runway" if runway < 18 else "Low â€” strong runway"
-        fin_mitigation = "Raise follow-on or cut burn" if runway < 12 else "Optimise spend; plan next raise" if runway < 18 else "Maintain current trajectory"
-
-        # Market risk: customer concentration
-        mkt_risk = _clamp(round(8 - min(4.0, customers / 15), 1), 1,
-                          9) if customers > 0 else 6.0
-        mkt_trigger = f"{int(customers)} customers â€” {'diversified' if customers >= 30 else 'concentration risk'}"
-        mkt_impact = "Low" if customers >= 50 else "Medium" if customers >= 20 else "High â€” customer concentration"
-        mkt_mitigation = "Expand customer base" if customers < 30 else "Continue customer acquisition"
-
-        # Team risk
-        team_risk = _clamp(round(7 - min(3.0, team_size / 5), 1), 1,
-                           9) if team_size > 0 else 6.0
-        team_trigger = f"Team of {int(team_size)}" if team_size else "Team size unknown"
-        team_impact = "Limited" if team_size >= 10 else "Medium â€” small team" if team_size >= 5 else "High â€” very small team"
-        team_mitigation = "Cross-train and hire for gaps" if team_size < 10 else "Ensure succession planning"
-
-        # Technology risk from text signals
-        tech_risk_signals = _extract_text_mentions(text, [
-            "patent", "proprietary", "SOC 2", "SOC2", "cloud-native",
-            "microservice"
-        ])
-        tech_risk = _clamp(round(7 - len(tech_risk_signals) * 1.2, 1), 1, 9)
-        tech_trigger = f"{len(tech_risk_signals)} tech differentiators identified" if tech_risk_signals else "Limited tech differentiation signals"
-        tech_impact = "Low" if len(tech_risk_signals) >= 3 else "Medium"
-        tech_mitigation = "Continue R&D investment" if len(
-            tech_risk_signals
-        ) >= 2 else "Invest in IP protection and tech stack"
-
-        # Execution risk
-        mom_growth = n(met, "mom_growth")
-        nrr = n(met, "nrr")
-        exec_risk = 5.0
-        if mom_growth > 10:
-            exec_risk -= 1.5
-        elif mom_growth > 5:
-            exec_risk -= 0.5
-        if nrr > 100:
-            exec_risk -= 1.0
-        exec_risk = _clamp(round(exec_risk, 1), 1, 9)
-        exec_trigger = f"Growth {mom_growth}% MoM, NRR {nrr}%" if mom_growth or nrr else "Growth metrics not provided"
-        exec_impact = "Low" if exec_risk < 4 else "Medium" if exec_risk < 6 else "High"
-        exec_mitigation = "Maintain execution momentum" if exec_risk < 4 else "Improve delivery processes"
-
-        # Regulatory risk (baseline from text)
-        reg_signals = _extract_text_mentions(text, [
-            "SOC 2", "SOC2", "GDPR", "HIPAA", "ISO", "compliance", "certified"
-        ])
-        reg_risk = _clamp(round(6 - len(reg_signals) * 1.5, 1), 1, 9)
-        reg_trigger = f"Compliance signals: {', '.join(reg_signals)}" if reg_signals else "No compliance certifications mentioned"
-        reg_impact = "Low" if reg_risk < 4 else "Medium"
-        reg_mitigation = "Maintain compliance posture" if reg_signals else "Pursue relevant compliance certifications"
-
-        # Competitive risk
-        comp_signals = _extract_text_mentions(text, [
-            "first-mover", "moat", "network effect", "proprietary", "patent",
-            "barrier"
-        ])
-        comp_risk = _clamp(round(7 - len(comp_signals) * 1.5, 1), 1, 9)
-        comp_trigger = "Competitive moats identified" if comp_signals else "Limited competitive moats"
-        comp_impact = "Low" if comp_risk < 4 else "Medium-high"
-        comp_mitigation = "Build partnerships and strengthen moat" if comp_risk >= 5 else "Continue building competitive advantages"
-
-        risk_domains = {
-            "financial_risk": {
-                "score": fin_risk,
-                "level": _flag_color(10 - fin_risk),
-                "trigger": fin_trigger,
-                "impact": fin_impact,
-                "mitigation": fin_mitigation
-            },
-            "market_risk": {
-                "score": mkt_risk,
-                "level": _flag_color(10 - mkt_risk),
-                "trigger": mkt_trigger,
-                "impact": mkt_impact,
-                "mitigation": mkt_mitigation
-            },
-            "team_risk": {
-                "score": team_risk,
-                "level": _flag_color(10 - team_risk),
-                "trigger": team_trigger,
-                "impact": team_impact,
-                "mitigation": team_mitigation
-            },
-            "technology_risk": {
-                "score": tech_risk,
-                "level": _flag_color(10 - tech_risk),
-                "trigger": tech_trigger,
-                "impact": tech_impact,
-                "mitigation": tech_mitigation
-            },
-            "execution_risk": {
-                "score": exec_risk,
-                "level": _flag_color(10 - exec_risk),
-                "trigger": exec_trigger,
-                "impact": exec_impact,
-                "mitigation": exec_mitigation
-            },
-            "regulatory_risk": {
-                "score": reg_risk,
-                "level": _flag_color(10 - reg_risk),
-                "trigger": reg_trigger,
-                "impact": reg_impact,
-                "mitigation": reg_mitigation
-            },
-            "competitive_risk": {
-                "score": comp_risk,
-                "level": _flag_color(10 - comp_risk),
-                "trigger": comp_trigger,
-                "impact": comp_impact,
-                "mitigation": comp_mitigation
-            },
-        }
-        overall = round(
-            sum(d["score"] for d in risk_domains.values()) / len(risk_domains),
-            1)
-        flags = [{
-            "domain": k,
-            "flag": v["level"],
-            "severity": v["score"],
-            "trigger": v["trigger"],
-            "impact": v["impact"],
-            "mitigation": v["mitigation"]
-        } for k, v in risk_domains.items()]
-        return {
-            "module_id":
-            mid,
-            "score":
-            _clamp(round(10 - overall, 1)),
-            "overall_risk_score":
-            overall,
-            "risk_domains":
-            risk_domains,
-            "flags":
-            flags,
-            "data_sources": {
-                "financial_data": bool(fin),
-                "key_metrics": bool(met),
-                "text_analysis": bool(text)
-            },
-            "confidence":
-            min(0.90, 0.4 + 0.15 *
-                sum([bool(fin), bool(met), bool(text)]))
-        }
-
-    # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
-    # 3. MARKET ANALYSIS
-    # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
-    if mid == "market_analysis":
-        revenue = n(fin, "revenue")
-        customers = n(met, "customers")
-        nrr = n(met, "nrr")
-        mom_growth = n(met, "mom_growth")
-
-        # Extract market sizing from text or company_info
-        import re
-        tam_match = re.search(r'TAM[:\s]*\$?([\d.]+)\s*(B|M|billion|million)',
-                              text, re.IGNORECASE)
-        sam_match = re.search(r'SAM[:\s]*\$?([\d.]+)\s*(B|M|billion|million)',
-                              text, re.IGNORECASE)
-        som_match = re.search(r'SOM[:\s]*\$?([\d.]+)\s*(B|M|billion|million)',
-                              text, re.IGNORECASE)
-
-        def _fmt_market(m):
-            if not m:
-                return "Not provided"
-            val, unit = m.group(1), m.group(2).upper()
-            return f"${val}{'B' if unit.startswith('B') else 'M'}"
-
-        tam = _fmt_market(tam_match)
-        sam = _fmt_market(sam_match)
-        som = _fmt_market(som_match)
-
-        # Derive growth rate from text or metrics
-        growth_match = re.search(
-            r'(\d+)%?\s*(CAGR|month-over-month|MoM|annual)', text,
-            re.IGNORECASE)
-        growth_rate = f"{mom_growth}% MoM" if mom_growth else (
-            growth_match.group(0) if growth_match else "Not provided")
-
-        # Score: based on actual market data availability + metrics
-        market_score = 5.0
-        if tam != "Not provided":
-            market_score += 1.5
-        if revenue > 200_000:
-            market_score += 1.0
-        if customers >= 20:
-            market_score += 0.8
-        if nrr > 100:
-            market_score += 0.7
-        if mom_growth > 10:
-            market_score += 1.0
-        elif mom_growth > 5:
-            market_score += 0.5
-        market_score = _clamp(round(market_score, 1))
-
-        # Competitive advantages from text
-        adv_keywords = [
-            "proprietary", "patent", "first-mover", "network effect", "moat",
-            "AI-powered", "machine learning", "NLP", "unique", "barrier"
-        ]
-        competitive_advantages = _extract_text_mentions(
-            text, adv_keywords) or ["Not identified from submitted data"]
-
-        # Competitive position derived from score
-        if market_score >= 8:
-            competitive_position = "Leader"
-        elif market_score >= 6.5:
-            competitive_position = "Challenger"
-        elif market_score >= 5:
-            competitive_position = "Emerging"
+    merged_text = ""
+    merged_data = {}
+    source_ids = []
+
+    if profile:
+        merged_text = profile["merged_text"]
+        merged_data = dict(profile["merged_data"])
+        source_ids = list(profile["source_upload_ids"])
+    else:
+        # Support inline analysis: use data provided directly in the request
+        inline_financial = data.get("financial_data")
+        inline_metrics = data.get("key_metrics")
+        if inline_financial or inline_metrics:
+            if inline_financial:
+                merged_data["financial_data"] = inline_financial
+            if inline_metrics:
+                merged_data["key_metrics"] = inline_metrics
         else:
-            competitive_position = "Nascent"
-
-        return {
-            "module_id":
-            mid,
-            "score":
-            market_score,
-            "market_score":
-            market_score,
-            "tam":
-            tam,
-            "sam":
-            sam,
-            "som":
-            som,
-            "growth_rate":
-            growth_rate,
-            "competitive_position":
-            competitive_position,
-            "competitive_advantages":
-            competitive_advantages,
-            "data_sources": {
-                "text_analysis": bool(text),
-                "key_metrics": bool(met)
-            },
-            "confidence":
-            min(
-                0.90, 0.4 + 0.1 * sum([
-                    tam != "Not provided", sam != "Not provided", revenue > 0,
-                    customers > 0, mom_growth > 0
-                ]))
-        }
-
-    # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
-    # 4. TEAM ASSESSMENT
-    # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
-    if mid == "team_assessment":
-        team_size = n(met, "team_size")
-
-        # Parse founder/team info from text
-        import re
-        founder_mentions = re.findall(
-            r'(?:CEO|CTO|Co-?founder|Founder|VP|Director)[:\s]+([A-Z][a-z]+ [A-Z][a-z]+)',
-            text)
-        experience_signals = _extract_text_mentions(text, [
-            "ex-Google", "ex-Meta", "ex-Amazon", "ex-Microsoft", "ex-Apple",
-            "Stanford", "MIT", "Harvard", "Wharton", "MBA", "PhD",
-            "prior exit", "previous exit", "years experience",
-            "senior engineer"
-        ])
-        role_mentions = _extract_text_mentions(text, [
-            "CEO", "CTO", "CFO", "COO", "VP Sales", "VP Engineering",
-            "VP Marketing", "Head of", "Director"
-        ])
-
-        # Build founder list from real text
-        founders = []
-        ceo_match = re.search(r'CEO[:\s]+(.+?)(?:\n|$)', text)
-        cto_match = re.search(r'CTO[:\s]+(.+?)(?:\n|$)', text)
-        if ceo_match:
-            founders.append({
-                "role":
-                "CEO",
-                "description":
-                ceo_match.group(1).strip(),
-                "experience_score":
-                min(95, 60 + len(experience_signals) * 5)
-            })
-        if cto_match:
-            founders.append({
-                "role":
-                "CTO",
-                "description":
-                cto_match.group(1).strip(),
-                "experience_score":
-                min(95, 55 + len(experience_signals) * 5)
-            })
-        if not founders and founder_mentions:
-            for fm in founder_mentions[:3]:
-                founders.append({
-                    "role": "Team member",
-                    "description": fm,
-                    "experience_score": 60
-                })
-
-        # Completeness: check key roles present
-        key_roles = ["CEO", "CTO", "VP Sales", "CFO", "VP Engineering"]
-        covered = sum(1 for r in key_roles if r.lower() in text.lower())
-        team_completeness = round(covered / len(key_roles) * 100)
-
-        # Gaps: roles NOT found
-        gaps = [r for r in key_roles if r.lower() not in text.lower()]
-
-        # Score
-        team_score = 5.0
-        if team_size >= 10:
-            team_score += 1.5
-        elif team_size >= 5:
-            team_score += 0.8
-        team_score += min(2.0, len(experience_signals) * 0.4)
-        team_score += min(1.0, len(founders) * 0.5)
-        if team_completeness >= 60:
-            team_score += 0.5
-        team_score = _clamp(round(team_score, 1))
-
-        return {
-            "module_id":
-            mid,
-            "score":
-            team_score,
-            "team_score":
-            team_score,
-            "team_completeness":
-            team_completeness,
-            "diversity_score":
-            min(100, 40 + len(set(experience_signals)) * 10),
-            "founder_experience":
-            min(95, 50 + len(experience_signals) * 7),
-            "leadership_strength":
-            min(95, 45 + covered * 10),
-            "gaps":
-            gaps if gaps else ["No major gaps identified"],
-            "founders":
-            founders if founders else [{
-                "role": "Unknown",
-                "description": "No founder data extracted",
-                "experience_score": 0
-            }],
-            "team_size":
-            int(team_size) if team_size else "Not provided",
-            "data_sources": {
-                "text_analysis": bool(text),
-                "key_metrics": bool(met)
-            },
-            "confidence":
-            min(
-                0.90, 0.3 + 0.15 * sum([
-                    team_size > 0,
-                    bool(founders),
-                    bool(experience_signals),
-                    bool(text)
-                ]))
-        }
-
-    # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
-    # 5. FINANCIAL ANALYSIS
-    # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
-    if mid == "financial_analysis":
-        revenue = n(fin, "revenue")
-        burn_rate = n(fin, "burn_rate")
-        runway = n(fin, "runway_months")
-        mrr = n(fin, "mrr") or n(met, "mrr")
-        gross_margin = n(fin, "gross_margin")
-        mom_growth = n(met, "mom_growth")
-
-        # Score built entirely from actual data
-        score = 5.0
-        if revenue > 500_000:
-            score += 2.0
-        elif revenue > 200_000:
-            score += 1.0
-        elif revenue > 50_000:
-            score += 0.5
-        if runway >= 18:
-            score += 1.5
-        elif runway >= 12:
-            score += 1.0
-        elif runway < 6 and runway > 0:
-            score -= 1.0
-        if gross_margin >= 70:
-            score += 1.0
-        elif gross_margin >= 50:
-            score += 0.5
-        if mom_growth > 10:
-            score += 0.5
-
-        # Burn multiple (lower is better)
-        burn_multiple = 0
-        if revenue > 0 and burn_rate > 0:
-            burn_multiple = round(burn_rate / (revenue / 12), 2)
-            if burn_multiple < 1.5:
-                score += 1.0
-            elif burn_multiple < 3:
-                score += 0.3
-
-        # LTV/CAC proxy (if NRR and MRR available)
-        nrr = n(met, "nrr")
-        customers = n(met, "customers")
-        ltv_cac = 0
-        if mrr > 0 and customers > 0:
-            avg_revenue_per_customer = mrr / customers
-            estimated_ltv = avg_revenue_per_customer * 12 * (nrr / 100 if nrr
-                                                             > 0 else 1.0)
-            estimated_cac = burn_rate * 0.4 / max(
-                customers / 12, 1) if burn_rate > 0 and customers > 0 else 0
-            ltv_cac = round(estimated_ltv /
-                            estimated_cac, 1) if estimated_cac > 0 else 0
-
-        score = _clamp(round(score, 1))
-
-        # Revenue projections based on actual growth rate
-        growth_multiplier = 1 + (mom_growth / 100) if mom_growth > 0 else 1.05
-        proj_12m = round(revenue *
-                         (growth_multiplier**12)) if revenue > 0 else 0
-        proj_24m = round(revenue *
-                         (growth_multiplier**24)) if revenue > 0 else 0
-
-        return {
-            "module_id":
-            mid,
-            "score":
-            score,
-            "financial_health_score":
-            score,
-            "revenue":
-            revenue,
-            "mrr":
-            mrr,
-            "burn_rate":
-            burn_rate,
-            "runway_months":
-            runway,
-            "ltv_cac_ratio":
-            ltv_cac,
-            "gross_margin":
-            gross_margin / 100 if gross_margin > 1 else gross_margin,
-            "revenue_growth_mom":
-            mom_growth / 100 if mom_growth > 1 else mom_growth,
-            "burn_multiple":
-            burn_multiple,
-            "projections": {
-                "12m_revenue": proj_12m,
-                "24m_revenue": proj_24m
-            },
-            "data_sources": {
-                "financial_data": bool(fin),
-                "key_metrics": bool(met)
-            },
-            "confidence":
-            min(
-                0.95, 0.3 + 0.1 * sum([
-                    revenue > 0, burn_rate > 0, runway > 0, mrr > 0,
-                    gross_margin > 0, mom_growth > 0
-                ]))
-        }
-
-    # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
-    # 6. TECHNOLOGY ASSESSMENT
-    # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
-    if mid == "technology_assessment":
-        tech_keywords = [
-            "patent", "proprietary", "AI", "ML", "NLP", "machine learning",
-            "deep learning", "cloud-native", "microservice", "kubernetes",
-            "docker", "serverless", "API", "SDK"
-        ]
-        security_keywords = [
-            "SOC 2", "SOC2", "ISO 27001", "GDPR", "HIPAA", "encryption",
-            "certified"
-        ]
-        stack_keywords = [
-            "Python", "React", "Node", "TypeScript", "PostgreSQL", "MongoDB",
-            "Azure", "AWS", "GCP", "Terraform", "Redis", "Kafka"
-        ]
-
-        tech_found = _extract_text_mentions(text, tech_keywords)
-        security_found = _extract_text_mentions(text, security_keywords)
-        stack_found = _extract_text_mentions(text, stack_keywords)
-
-        # IP / patent signals
-        import re
-        patent_match = re.search(
-            r'(\d+)\s*patents?\s*(pending|granted|filed)?', text,
-            re.IGNORECASE)
-        patents_desc = patent_match.group(
-            0) if patent_match else "No patent data found"
-
-        # TRL (Technology Readiness Level) estimation
-        trl = 5  # base
-        if tech_found:
-            trl += 1
-        if security_found:
-            trl += 1
-        if n(met, "customers") >= 10:
-            trl = max(trl, 7)  # deployed with paying customers
-        if n(fin, "revenue") > 100_000:
-            trl = max(trl, 8)
-
-        # Score
-        score = 5.0
-        score += min(2.0, len(tech_found) * 0.5)
-        score += min(1.0, len(security_found) * 0.5)
-        score += min(1.0, len(stack_found) * 0.3)
-        if patent_match:
-            score += 1.0
-        score = _clamp(round(score, 1))
-
-        # Risks derived from gaps
-        risks = []
-        if not security_found:
-            risks.append("No security certifications mentioned")
-        if len(stack_found) < 2:
-            risks.append("Limited tech stack information provided")
-        if not patent_match:
-            risks.append("No patent or IP protection mentioned")
-        if not risks:
-            risks.append(
-                "Monitor technology evolution and competitive responses")
-
-        ip_strength = "Strong" if patent_match and security_found else "Moderate" if patent_match or security_found else "Weak â€” no IP signals found"
-
-        return {
-            "module_id":
-            mid,
-            "score":
-            score,
-            "technology_score":
-            score,
-            "ip_strength":
-            f"{ip_strength} â€” {patents_desc}",
-            "trl":
-            min(trl, 9),
-            "scalability":
-            "Production-ready"
-            if trl >= 7 else "Scaling needed" if trl >= 5 else "Early stage",
-            "stack":
-            stack_found
-            if stack_found else ["Not identified from submitted data"],
-            "risks":
-            risks,
-            "tech_differentiators":
-            tech_found if tech_found else ["None identified"],
-            "security_compliance":
-            security_found if security_found else ["None identified"],
-            "data_sources": {
-                "text_analysis": bool(text)
-            },
-            "confidence":
-            min(
-                0.85, 0.3 + 0.1 * sum([
-                    bool(tech_found),
-                    bool(security_found),
-                    bool(stack_found),
-                    bool(patent_match)
-                ]))
-        }
-
-    # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
-    # 7. BUSINESS MODEL
-    # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
-    if mid == "business_model":
-        revenue = n(fin, "revenue")
-        mrr = n(fin, "mrr") or n(met, "mrr")
-        burn_rate = n(fin, "burn_rate")
-        gross_margin = n(fin, "gross_margin")
-        customers = n(met, "customers")
-
-        # Detect model type from text
-        model_signals = _extract_text_mentions(text, [
-            "SaaS", "subscription", "B2B", "B2C", "marketplace", "platform",
-            "enterprise", "freemium", "usage-based", "transactional",
-            "licensing"
-        ])
-        model_type = ", ".join(
-            model_signals[:3]) if model_signals else "Not identified"
-
-        # Revenue model strength
-        rev_strength = 5.0
-        if mrr > 0:
-            rev_strength += min(2.0, mrr / 30_000)
-        if gross_margin > 60:
-            rev_strength += 1.0
-        if "subscription" in text.lower() or "SaaS" in text.lower(
-        ) or "recurring" in text.lower():
-            rev_strength += 0.5  # recurring revenue models are stronger
-        rev_strength = _clamp(round(rev_strength, 1))
-
-        # Unit economics from real data
-        cac = 0
-        ltv = 0
-        payback_months = 0
-        if customers > 0 and burn_rate > 0:
-            cac = round(burn_rate * 0.4 * 12 / max(customers, 1))  # estimated
-        if mrr > 0 and customers > 0:
-            avg_mrr_per_customer = mrr / customers
-            nrr = n(met, "nrr")
-            ltv = round(avg_mrr_per_customer * 12 *
-                        (nrr / 100 if nrr > 0 else 1.0))
-        if cac > 0 and mrr > 0 and customers > 0:
-            payback_months = round(
-                cac / (mrr / customers)) if mrr / customers > 0 else 0
-
-        # Overall score
-        score = 5.0
-        if mrr > 20_000:
-            score += 1.0
-        if gross_margin > 60:
-            score += 1.0
-        if ltv > 0 and cac > 0 and ltv / cac > 3:
-            score += 1.0
-        elif ltv > 0 and cac > 0 and ltv / cac > 1.5:
-            score += 0.5
-        score += min(1.0, len(model_signals) * 0.3)
-        score = _clamp(round(score, 1))
-
-        # Strategic positioning from text
-        positioning_signals = _extract_text_mentions(text, [
-            "product-led", "enterprise sales", "channel partner", "self-serve",
-            "land and expand", "niche", "vertical", "horizontal"
-        ])
-        strategic_positioning = ", ".join(
-            positioning_signals
-        ) if positioning_signals else "Not clearly identified from data"
-
-        return {
-            "module_id":
-            mid,
-            "score":
-            score,
-            "business_model_score":
-            score,
-            "model_type":
-            model_type,
-            "revenue_model_strength":
-            rev_strength,
-            "strategic_positioning":
-            strategic_positioning,
-            "unit_economics": {
-                "cac": cac,
-                "ltv": ltv,
-                "payback_months": payback_months,
-                "ltv_cac_ratio": round(ltv / cac, 1) if cac > 0 else 0
-            },
-            "data_sources": {
-                "financial_data": bool(fin),
-                "key_metrics": bool(met),
-                "text_analysis": bool(text)
-            },
-            "confidence":
-            min(
-                0.90, 0.3 + 0.1 * sum([
-                    revenue > 0, mrr > 0, customers > 0, gross_margin > 0,
-                    bool(model_signals)
-                ]))
-        }
-
-    # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
-    # 8. GROWTH ASSESSMENT
-    # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
-    if mid == "growth_assessment":
-        revenue = n(fin, "revenue")
-        mrr = n(fin, "mrr") or n(met, "mrr")
-        mom_growth = n(met, "mom_growth")
-        nrr = n(met, "nrr")
-        customers = n(met, "customers")
-        team_size = n(met, "team_size")
-
-        # Growth score from actual metrics
-        score = 5.0
-        if mom_growth > 15:
-            score += 2.0
-        elif mom_growth > 10:
-            score += 1.5
-        elif mom_growth > 5:
-            score += 0.8
-        if nrr > 120:
-            score += 1.5
-        elif nrr > 100:
-            score += 0.8
-        if customers >= 30:
-            score += 0.5
-        if revenue > 300_000:
-            score += 0.5
-        score = _clamp(round(score, 1))
-
-        # Scalability index
-        scalability = 5.0
-        if team_size > 0 and revenue > 0:
-            revenue_per_head = revenue / team_size
-            if revenue_per_head > 50_000:
-                scalability += 1.5
-            elif revenue_per_head > 25_000:
-                scalability += 0.8
-        if nrr > 100:
-            scalability += 1.0
-        scalability = _clamp(round(scalability, 1))
-
-        # Growth projections from actual growth rate
-        growth_multiplier = 1 + (mom_growth / 100) if mom_growth > 0 else 1.05
-        proj_y1 = round(
-            growth_multiplier**12,
-            1) if mom_growth > 0 else "N/A â€” growth data not provided"
-        proj_y2 = round(growth_multiplier**24, 1) if mom_growth > 0 else "N/A"
-        proj_y3 = round(growth_multiplier**36, 1) if mom_growth > 0 else "N/A"
-
-        # Drivers and challenges from actual data signals
-        growth_drivers = []
-        if nrr > 100:
-            growth_drivers.append(
-                f"Net revenue retention {nrr}% â€” expansion revenue")
-        if mom_growth > 10:
-            growth_drivers.append(
-                f"{mom_growth}% MoM growth â€” strong momentum")
-        if customers > 20:
-            growth_drivers.append(
-                f"{int(customers)} customers â€” expanding base")
-        text_drivers = _extract_text_mentions(text, [
-            "network effect", "platform", "expansion", "partnership",
-            "integration"
-        ])
-        growth_drivers.extend(text_drivers)
-        if not growth_drivers:
-            growth_drivers.append(
-                "Growth drivers not clearly identified from data")
-
-        scaling_challenges = []
-        if team_size < 10:
-            scaling_challenges.append(
-                f"Small team ({int(team_size)}) may limit scaling speed")
-        if n(fin, "runway_months") < 12:
-            scaling_challenges.append(
-                f"Limited runway ({n(fin, 'runway_months'):.0f} months) constrains growth"
-            )
-        text_challenges = _extract_text_mentions(
-            text, ["challenge", "risk", "limitation", "constraint"])
-        scaling_challenges.extend(text_challenges[:2])
-        if not scaling_challenges:
-            scaling_challenges.append("No major scaling challenges identified")
+            raise HTTPException(
+                status_code=404,
+                detail=
+                "No uploads found. Upload data first via /api/files/upload")
 
-        return {
-            "module_id":
-            mid,
-            "score":
-            score,
-            "growth_potential_score":
-            score,
-            "scalability_index":
-            scalability,
-            "growth_drivers":
-            growth_drivers,
-            "scaling_challenges":
-            scaling_challenges,
-            "growth_projections": {
-                "year1": f"{proj_y1}x",
-                "year2": f"{proj_y2}x",
-                "year3": f"{proj_y3}x"
-            },
-            "actual_growth_rate":
-            f"{mom_growth}% MoM" if mom_growth else "Not provided",
-            "nrr":
-            nrr if nrr else "Not provided",
-            "data_sources": {
-                "financial_data": bool(fin),
-                "key_metrics": bool(met),
-                "text_analysis": bool(text)
-            },
-            "confidence":
-            min(
-                0.90, 0.3 + 0.15 *
-                sum([mom_growth > 0, nrr > 0, customers > 0, revenue > 0]))
-        }
+    # Overlay any inline financial_data / key_metrics from the request
+    if data.get("financial_data") and "financial_data" not in merged_data:
+        merged_data["financial_data"] = data["financial_data"]
+    if data.get("key_metrics") and "key_metrics" not in merged_data:
+        merged_data["key_metrics"] = data["key_metrics"]
 
-    # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
-    # 9. INVESTMENT READINESS
-    # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
-    if mid == "investment_readiness":
-        revenue = n(fin, "revenue")
-        mrr = n(fin, "mrr") or n(met, "mrr")
-        burn_rate = n(fin, "burn_rate")
-        runway = n(fin, "runway_months")
-        customers = n(met, "customers")
-        nrr = n(met, "nrr")
-        mom_growth = n(met, "mom_growth")
-        team_size = n(met, "team_size")
-        gross_margin = n(fin, "gross_margin")
-
-        # Readiness score from actual data
-        score = 5.0
-        if revenue > 300_000:
-            score += 1.0
-        elif revenue > 100_000:
-            score += 0.5
-        if runway >= 12:
-            score += 0.8
-        if mom_growth > 10:
-            score += 0.8
-        if nrr > 100:
-            score += 0.5
-        if gross_margin > 60:
-            score += 0.5
-        if team_size >= 8:
-            score += 0.4
-        if customers >= 20:
-            score += 0.5
-        score = _clamp(round(score, 1))
+    company_data = {
+        "company_name": company_name,
+        "extracted_text": merged_text,
+        **merged_data,
+    }
+    return company_data, merged_data, source_ids
 
-        # Extract funding ask from text
-        import re
-        ask_match = re.search(
-            r'\$?([\d.]+)\s*[Mm](illion)?\s*(Series\s*[A-Z]|seed|raise|round)',
-            text, re.IGNORECASE)
-        valuation_match = re.search(
-            r'\$?([\d.]+)\s*[Mm](illion)?\s*(pre-money|post-money|valuation)',
-            text, re.IGNORECASE)
-        stage_match = re.search(r'(Series\s*[A-Z]|Seed|Pre-?seed|Bridge)',
-                                text, re.IGNORECASE)
-
-        funding_ask = ask_match.group(0) if ask_match else "Not specified"
-        valuation = valuation_match.group(
-            0) if valuation_match else "Not specified"
-        stage = stage_match.group(0) if stage_match else ci.get(
-            "stage", "Not specified")
-
-        # Implied ARR multiple
-        arr = revenue if revenue > 0 else mrr * 12 if mrr > 0 else 0
-        val_num = 0
-        if valuation_match:
-            try:
-                val_num = float(valuation_match.group(1)) * 1_000_000
-            except ValueError:
-                val_num = 0
-        arr_multiple = round(val_num /
-                             arr, 1) if arr > 0 and val_num > 0 else "N/A"
-
-        # Exit potential from actual metrics
-        exit_timeline = "7+ years"
-        if revenue > 500_000 and mom_growth > 10:
-            exit_timeline = "4-6 years"
-        elif revenue > 200_000:
-            exit_timeline = "5-7 years"
 
-        return {
-            "module_id":
-            mid,
-            "score":
-            score,
-            "readiness_score":
-            score,
-            "exit_potential": {
-                "timeline":
-                exit_timeline,
-                "strategic_fit":
-                "High" if score >= 7 else "Moderate" if score >= 5 else "Low"
-            },
-            "funding_recommendation": {
-                "round":
-                stage,
-                "ask":
-                funding_ask,
-                "valuation":
-                valuation,
-                "arr_multiple":
-                arr_multiple,
-                "valuation_range":
-                valuation
-                if valuation != "Not specified" else "Insufficient data"
-            },
-            "investor_fit":
-            [],  # no mock investors; real matching requires external data
-            "actual_metrics_used": {
-                "revenue": revenue,
-                "mrr": mrr,
-                "burn_rate": burn_rate,
-                "runway_months": runway,
-                "customers": int(customers),
-                "growth_rate": f"{mom_growth}% MoM" if mom_growth else "N/A",
-            },
-            "data_sources": {
-                "financial_data": bool(fin),
-                "key_metrics": bool(met),
-                "text_analysis": bool(text)
-            },
-            "confidence":
-            min(
-                0.90, 0.3 + 0.1 * sum([
-                    revenue > 0, mrr > 0, customers > 0, mom_growth > 0, runway
-                    > 0,
-                    bool(stage)
-                ]))
-        }
+def _nine_module_output(company_name: str, features: FeatureContext,
+                        source_ids: List[str]) -> dict:
+    """
+    Run NINE_MODULES over ``features`` and build the analysis result.
+    Modules whose inputs are unchanged since an earlier run are served
+    from module_memo; ``module_cache`` lists which.
+    """
+    module_results = {}
+    total_weight = 0
+    weighted_score = 0
+
+    results, cached = module_memo.run_modules(NINE_MODULES, features)
+    for mod in NINE_MODULES:
+        result = results[mod["id"]]
+        score = result.get("score", 0)
+        w = mod["weight"]
+        result["weighted_score"] = round(score * w / 100, 2)
+        module_results[mod["id"]] = result
+        weighted_score += score * w
+        total_weight += w
+
+    final_score = round(weighted_score /
+                        total_weight, 1) if total_weight > 0 else 0
+
+    if final_score >= 8.0:
+        recommendation = "STRONG BUY â€” High confidence investment opportunity"
+    elif final_score >= 7.0:
+        recommendation = "PROCEED â€” Proceed with due diligence"
+    elif final_score >= 5.5:
+        recommendation = "CONDITIONAL â€” Address key risks before investing"
+    else:
+        recommendation = "PASS â€” Risk/reward profile not aligned"
 
     return {
-        "module_id": mid,
-        "score": 5.0,
-        "confidence": 0.3,
-        "note": "Insufficient data for this module",
-        "data_sources": {}
+        "analysis_id": new_analysis_id(),
+        "analysis_type": "comprehensive_9_module",
+        "company_name": company_name,
+        "timestamp": datetime.utcnow().isoformat(),
+        "final_tca_score": final_score,
+        "investment_recommendation": recommendation,
+        "active_modules": [m["id"] for m in NINE_MODULES],
+        "module_count": len(NINE_MODULES),
+        "analysis_completeness": 100.0,
+        "source_upload_ids": source_ids,
+        "module_results": module_results,
+        "module_cache": {
+            "cached": cached,
+            "recomputed": [m["id"] for m in NINE_MODULES
+                           if m["id"] not in cached],
+        },
     }
 
 
@@ -5110,119 +3527,38 @@ async def run_nine_module_analysis(request: Request):
                        FROM allupload
                        WHERE upload_id = ANY($1::uuid[])
                        ORDER BY created_at""", upload_ids)
-            else:
+                profile = merge_uploads(rows)
+            elif company_name == 'Unknown':
                 rows = await conn.fetch(
                     """SELECT upload_id, source_type, file_name, extracted_text,
                               extracted_data, company_name
                        FROM allupload
-                       WHERE (company_name = $1 OR $1 = 'Unknown')
-                       ORDER BY created_at DESC LIMIT 20""", company_name)
-
-        # â”€â”€ 2. Merge extracted data from all uploads â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-        merged_text = []
-        merged_data = {}
-        source_ids = []
-
-        if rows:
-            for r in rows:
-                source_ids.append(str(r["upload_id"]))
-                if r["extracted_text"]:
-                    merged_text.append(r["extracted_text"])
-                ed = r["extracted_data"]
-                if isinstance(ed, str):
-                    try:
-                        ed = json.loads(ed)
-                    except Exception:
-                        ed = {}
-                if isinstance(ed, dict):
-                    merged_data = {**merged_data, **ed}
-        else:
-            # Support inline analysis: use data provided directly in the request
-            inline_financial = data.get("financial_data")
-            inline_metrics = data.get("key_metrics")
-            if inline_financial or inline_metrics:
-                if inline_financial:
-                    merged_data["financial_data"] = inline_financial
-                if inline_metrics:
-                    merged_data["key_metrics"] = inline_metrics
+                       ORDER BY created_at DESC LIMIT $1""", PROFILE_UPLOADS)
+                profile = merge_uploads(rows)
             else:
-                raise HTTPException(
-                    status_code=404,
-                    detail=
-                    "No uploads found. Upload data first via /api/files/upload"
-                )
-
-        # Overlay any inline financial_data / key_metrics from the request
-        if data.get("financial_data") and "financial_data" not in merged_data:
-            merged_data["financial_data"] = data["financial_data"]
-        if data.get("key_metrics") and "key_metrics" not in merged_data:
-            merged_data["key_metrics"] = data["key_metrics"]
+                # Pre-merged on upload (see company_profiles)
+                profile = (await company_profiles.load_many(
+                    conn, [company_name])).get(company_name)
 
-        company_data = {
-            "company_name": company_name,
-            "extracted_text": "\n".join(merged_text),
-            **merged_data,
-        }
+        # â”€â”€ 2. Merge extracted data from all uploads â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+        company_data, merged_data, source_ids = _merge_analysis_inputs(
+            company_name, profile, data)
 
         logger.info(
-            f"Running 9-module analysis for '{company_name}' using {len(rows)} uploads"
+            f"Running 9-module analysis for '{company_name}' using {len(source_ids)} uploads"
         )
 
         # â”€â”€ 3. Run all 9 modules â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-        await asyncio.sleep(1)  # simulate processing
-
-        module_results = {}
-        total_weight = 0
-        weighted_score = 0
-
-        for mod in NINE_MODULES:
-            result = _run_module(mod, company_data, merged_data)
-            score = result.get("score", 0)
-            w = mod["weight"]
-            result["weighted_score"] = round(score * w / 100, 2)
-            module_results[mod["id"]] = result
-            weighted_score += score * w
-            total_weight += w
-
-        final_score = round(weighted_score /
-                            total_weight, 1) if total_weight > 0 else 0
-
-        # â”€â”€ 4. Determine recommendation â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-        if final_score >= 8.0:
-            recommendation = "STRONG BUY â€” High confidence investment opportunity"
-        elif final_score >= 7.0:
-            recommendation = "PROCEED â€” Proceed with due diligence"
-        elif final_score >= 5.5:
-            recommendation = "CONDITIONAL â€” Address key risks before investing"
-        else:
-            recommendation = "PASS â€” Risk/reward profile not aligned"
-
-        analysis_output = {
-            "analysis_type": "comprehensive_9_module",
-            "company_name": company_name,
-            "timestamp": datetime.utcnow().isoformat(),
-            "final_tca_score": final_score,
-            "investment_recommendation": recommendation,
-            "active_modules": [m["id"] for m in NINE_MODULES],
-            "module_count": len(NINE_MODULES),
-            "analysis_completeness": 100.0,
-            "source_upload_ids": source_ids,
-            "module_results": module_results,
-        }
+        features = FeatureContext(company_data, merged_data)
+        analysis_output = _nine_module_output(company_name, features,
+                                              source_ids)
+        final_score = analysis_output["final_tca_score"]
+        recommendation = analysis_output["investment_recommendation"]
 
-        # â”€â”€ 5. Store analysis result back into allupload rows â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-        if source_ids:
-            async with db_manager.get_connection() as conn:
-                for uid in source_ids:
-                    await conn.execute(
-                        """UPDATE allupload
-                           SET analysis_result = $1,
-                               analysis_id = $2,
-                               updated_at = NOW()
-                           WHERE upload_id = $3""",
-                        json.dumps(analysis_output),
-                        f"9mod_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-                        uuid.UUID(uid))
+        # â”€â”€ 4. Store analysis result back into allupload rows â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+        async with db_manager.get_connection() as conn:
+            await analysis_store.save(conn, [analysis_output])
+            await _materialise_reports(conn, [analysis_output])
 
         logger.info(
             f"9-module analysis complete: score={final_score}, rec={recommendation}"
@@ -5237,178 +3573,409 @@ async def run_nine_module_analysis(request: Request):
                             detail=f"9-module analysis failed: {str(e)}")
 
 
-# â”€â”€â”€ Triage Report Generation â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+# Batch re-scoring: companies per request and per DB/scoring chunk
+ANALYSIS_BATCH_MAX = int(os.getenv("ANALYSIS_BATCH_MAX", "1000"))
+ANALYSIS_BATCH_CHUNK = int(os.getenv("ANALYSIS_BATCH_CHUNK", "100"))
 
 
-@app.post("/api/reports/triage")
-async def generate_triage_report(request: Request):
-    """
-    Generate a triage report from 9-module analysis data.
-    Returns structured JSON suitable for the frontend to render or export as PDF.
-    Structure: Executive Summary + TCA Scorecard (Page 1), Risks + Recommendation (Page 2),
-    plus additional detail pages for a total of ~5-6 pages.
-    """
+def _batch_analysis_items(data) -> List[dict]:
+    """Validate a batch body into [{"company_name", "upload_ids", ...}]"""
+    companies = data.get("companies") if isinstance(data, dict) else None
+    if not isinstance(companies, list) or not companies:
+        raise HTTPException(status_code=400,
+                            detail="companies must be a non-empty list")
+    if len(companies) > ANALYSIS_BATCH_MAX:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {ANALYSIS_BATCH_MAX} companies per request")
+    items = []
+    for entry in companies:
+        if isinstance(entry, str):
+            entry = {"company_name": entry}
+        if not isinstance(entry, dict):
+            raise HTTPException(
+                status_code=400,
+                detail="Each company must be a name or an object")
+        name = entry.get("company_name")
+        upload_ids = entry.get("upload_ids") or []
+        if not isinstance(upload_ids, list) or not (name or upload_ids):
+            raise HTTPException(
+                status_code=400,
+                detail="Each company needs a company_name or upload_ids")
+        try:
+            upload_ids = [uuid.UUID(str(uid)) for uid in upload_ids]
+        except ValueError:
+            raise HTTPException(status_code=400,
+                                detail="upload_ids must be UUIDs")
+        items.append({
+            **entry, "company_name": name or "Unknown",
+            "upload_ids": upload_ids
+        })
+    return items
+
+
+async def _fetch_batch_profiles(conn,
+                                items: List[dict]) -> List[Optional[dict]]:
+    """
+    Merged uploads for each item, as in the single-company path: the
+    company profile by name (exact match), or the listed upload_ids merged
+    oldest first.  None where there are no uploads.
+    """
+    names = [i["company_name"] for i in items if not i["upload_ids"]]
+    ids = list({uid for i in items for uid in i["upload_ids"]})
+    profiles = await company_profiles.load_many(conn, names)
+    by_id: Dict[uuid.UUID, Tuple[int, Any]] = {}
+    if ids:
+        rows = await conn.fetch(
+            """SELECT upload_id, extracted_text, extracted_data, company_name
+               FROM allupload
+               WHERE upload_id = ANY($1::uuid[])
+               ORDER BY created_at""", ids)
+        by_id = {r["upload_id"]: (pos, r) for pos, r in enumerate(rows)}
+
+    merged = []
+    for item in items:
+        if item["upload_ids"]:
+            found = sorted(by_id[uid] for uid in set(item["upload_ids"])
+                           if uid in by_id)
+            merged.append(merge_uploads([r for _, r in found]))
+        else:
+            merged.append(profiles.get(item["company_name"]))
+    return merged
+
+
+def _score_analysis_batch(items: List[dict],
+                          profiles: List[Optional[dict]]) -> List[dict]:
+    """9-module output (or an error line) per item, scored column-wise"""
+    lines: List[Optional[dict]] = [None] * len(items)
+    prepared = []
+    for idx, (item, profile) in enumerate(zip(items, profiles)):
+        try:
+            company_data, merged_data, source_ids = _merge_analysis_inputs(
+                item["company_name"], profile, item)
+        except HTTPException as e:
+            lines[idx] = {
+                "company_name": item["company_name"],
+                "status_code": e.status_code,
+                "error": e.detail
+            }
+            continue
+        prepared.append((idx, company_data, merged_data, source_ids))
+
+    contexts = feature_contexts([(company_data, merged_data)
+                                 for _, company_data, merged_data, _ in
+                                 prepared])
+    for (idx, _, _, source_ids), features in zip(prepared, contexts):
+        lines[idx] = _nine_module_output(items[idx]["company_name"], features,
+                                         source_ids)
+    return lines
+
+
+@app.post("/api/analysis/9-module/batch")
+async def run_nine_module_analysis_batch(request: Request):
+    """
+    Re-score many companies in one request.
+
+    Body: {"companies": ["Acme", {"company_name": "Beta"},
+                         {"company_name": "Gamma", "upload_ids": [...]}]}
+    Entries may also carry inline financial_data / key_metrics, as in
+    /api/analysis/9-module.  Companies are processed ANALYSIS_BATCH_CHUNK
+    at a time (profiles loaded per chunk, numeric rules evaluated
+    column-wise) and streamed back as NDJSON in request order: one line
+    per company, either the single-company analysis output or
+    {"company_name", "status_code", "error"}.
+    """
     try:
         data = await request.json()
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    items = _batch_analysis_items(data)
+    logger.info(f"Running batch 9-module analysis for {len(items)} companies")
+
+    async def stream():
+        for start in range(0, len(items), ANALYSIS_BATCH_CHUNK):
+            chunk = items[start:start + ANALYSIS_BATCH_CHUNK]
+            try:
+                async with db_manager.get_connection() as conn:
+                    profiles = await _fetch_batch_profiles(conn, chunk)
+                lines = await asyncio.to_thread(_score_analysis_batch, chunk,
+                                                profiles)
+                analysed = [line for line in lines if "analysis_id" in line]
+                if analysed:
+                    async with db_manager.get_connection() as conn:
+                        await analysis_store.save(conn, analysed)
+                        await _materialise_reports(conn, analysed)
+            except Exception as e:
+                logger.error(f"Batch 9-module analysis error: {e}")
+                lines = [{
+                    "company_name": item["company_name"],
+                    "status_code": 500,
+                    "error": f"9-module analysis failed: {str(e)}"
+                } for item in chunk]
+            yield "".join(
+                json.dumps(line, default=str) + "\n" for line in lines)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+# â”€â”€â”€ Triage Report Generation â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+
+
+def _triage_report_parts(company_name: str, analysis: dict):
+    """
+    Triage report pages in rendering order, one dict per page: the
+    header fields, then the executive summary and the remaining pages.
+    """
+    mr = analysis.get("module_results", {})
+    tca = mr.get("tca_scorecard", {})
+    risk = mr.get("risk_assessment", {})
+    market = mr.get("market_analysis", {})
+    team = mr.get("team_assessment", {})
+    fin = mr.get("financial_analysis", {})
+    tech = mr.get("technology_assessment", {})
+    biz = mr.get("business_model", {})
+    growth = mr.get("growth_assessment", {})
+    invest = mr.get("investment_readiness", {})
+
+    yield {
+        "report_type": "triage",
+        "company_name": company_name,
+        "generated_at": datetime.utcnow().isoformat(),
+        "final_tca_score": analysis.get("final_tca_score", 0),
+        "recommendation": analysis.get("investment_recommendation", ""),
+        "total_pages": 10,
+    }
+
+    # â”€â”€ Page 1: Executive Summary â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "page_1_executive_summary": {
+            "title":
+            f"Triage Report â€” {company_name}",
+            "overall_score":
+            analysis.get("final_tca_score", 0),
+            "score_interpretation":
+            ("Strong candidate for investment" if analysis.get(
+                "final_tca_score", 0) >= 7.5 else
+             "Moderate potential â€” further analysis required"
+             if analysis.get("final_tca_score", 0) >= 5.5 else
+             "Significant concerns identified"),
+            "investment_recommendation":
+            analysis.get("investment_recommendation", ""),
+            "analysis_completeness":
+            analysis.get("analysis_completeness", 0),
+            "modules_run":
+            analysis.get("module_count", 9),
+        },
+    }
+
+    # â”€â”€ Page 2: TCA Scorecard â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "page_2_tca_scorecard": {
+            "title":
+            "TCA Scorecard â€” Category Breakdown",
+            "composite_score":
+            tca.get("composite_score", 0),
+            "categories":
+            tca.get("categories", []),
+            "top_strengths": [
+                c["category"] for c in tca.get("categories", [])
+                if c.get("flag") == "green"
+            ][:3],
+            "areas_of_concern": [
+                c["category"] for c in tca.get("categories", [])
+                if c.get("flag") != "green"
+            ][:3],
+        },
+    }
+
+    # â”€â”€ Page 3: Risk Assessment â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "page_3_risk_assessment": {
+            "title":
+            "Risk Assessment & Flags",
+            "overall_risk_score":
+            risk.get("overall_risk_score", 0),
+            "total_flags":
+            len(risk.get("flags", [])),
+            "high_risk_count":
+            len([
+                f for f in risk.get("flags", [])
+                if f.get("severity", 0) >= 6
+            ]),
+            "risk_flags":
+            risk.get("flags", []),
+            "risk_domains":
+            risk.get("risk_domains", {}),
+        },
+    }
+
+    # â”€â”€ Page 4: Market & Team â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "page_4_market_and_team": {
+            "title": "Market Opportunity & Team Assessment",
+            "market_score": market.get("market_score", 0),
+            "tam": market.get("tam", "N/A"),
+            "sam": market.get("sam", "N/A"),
+            "som": market.get("som", "N/A"),
+            "growth_rate": market.get("growth_rate", "N/A"),
+            "competitive_position": market.get("competitive_position",
+                                               "N/A"),
+            "competitive_advantages": market.get("competitive_advantages",
+                                                 []),
+            "team_score": team.get("team_score", 0),
+            "team_completeness": team.get("team_completeness", 0),
+            "founders": team.get("founders", []),
+            "team_gaps": team.get("gaps", []),
+        },
+    }
+
+    # â”€â”€ Page 5: Financial & Technology â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "page_5_financials_and_tech": {
+            "title": "Financial Health & Technology Assessment",
+            "financial_score": fin.get("financial_health_score", 0),
+            "revenue": fin.get("revenue", 0),
+            "mrr": fin.get("mrr", 0),
+            "burn_rate": fin.get("burn_rate", 0),
+            "runway_months": fin.get("runway_months", 0),
+            "ltv_cac_ratio": fin.get("ltv_cac_ratio", 0),
+            "gross_margin": fin.get("gross_margin", 0),
+            "technology_score": tech.get("technology_score", 0),
+            "trl": tech.get("trl", 0),
+            "ip_strength": tech.get("ip_strength", "N/A"),
+            "tech_stack": tech.get("stack", []),
+        },
+    }
+
+    # â”€â”€ Page 6: Recommendations & Next Steps â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "page_6_recommendations": {
+            "title":
+            "Investment Recommendation & Next Steps",
+            "final_decision":
+            analysis.get("investment_recommendation", ""),
+            "business_model_score":
+            biz.get("business_model_score", 0),
+            "business_model_type":
+            biz.get("model_type", "N/A"),
+            "growth_potential_score":
+            growth.get("growth_potential_score", 0),
+            "growth_projections":
+            growth.get("growth_projections", {}),
+            "investment_readiness_score":
+            invest.get("readiness_score", 0),
+            "exit_potential":
+            invest.get("exit_potential", {}),
+            "funding_recommendation":
+            invest.get("funding_recommendation", {}),
+            "next_steps": [
+                "1. Conduct management team interviews and reference checks",
+                "2. Verify financial projections with audited statements",
+                "3. Commission independent market sizing analysis",
+                "4. Perform detailed competitive landscape mapping",
+                "5. Engage technical due diligence on IP and architecture",
+                "6. Negotiate term sheet based on analysis findings",
+            ],
+        },
+    }
+
+
+def _build_triage_report(company_name: str, analysis: dict) -> dict:
+    """Triage report (see generate_triage_report) for a 9-module analysis"""
+    triage_report = {}
+    for part in _triage_report_parts(company_name, analysis):
+        triage_report.update(part)
+    return triage_report
+
+
+# Streaming report formats (?stream=...) and their media types
+REPORT_STREAM_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def _check_report_stream(stream: Optional[str]):
+    if stream is not None and stream not in REPORT_STREAM_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"stream must be one of {sorted(REPORT_STREAM_FORMATS)}")
+
+
+def _stream_report(parts, stream: str, label: str) -> StreamingResponse:
+    """
+    Send report parts as they are built, one event per page / section:
+    {"event": "header", "data": {...}}, then {"event": "section", "key",
+    "data"} per part and a final {"event": "end", "sections": n}.  NDJSON
+    sends the objects as lines; SSE as ``event:`` / ``data:`` frames.
+    Only the part being sent is held in memory.
+    """
+
+    def frame(event: dict) -> str:
+        payload = json.dumps(event, default=str)
+        if stream == "sse":
+            return f"event: {event['event']}\ndata: {payload}\n\n"
+        return payload + "\n"
+
+    async def events():
+        sections = 0
+        try:
+            for part in parts:
+                if sections == 0 and "report_type" in part:
+                    yield frame({"event": "header", "data": part})
+                    continue
+                for key, value in part.items():
+                    sections += 1
+                    yield frame({"event": "section", "key": key, "data": value})
+                await asyncio.sleep(0)
+            yield frame({"event": "end", "sections": sections})
+        except Exception as e:
+            logger.error(f"{label} report stream error: {e}")
+            yield frame({"event": "error", "error": str(e)})
+
+    return StreamingResponse(events(),
+                             media_type=REPORT_STREAM_FORMATS[stream],
+                             headers={
+                                 "Cache-Control": "no-cache",
+                                 "X-Accel-Buffering": "no"
+                             })
+
+
+@app.post("/api/reports/triage")
+async def generate_triage_report(request: Request,
+                                 stream: Optional[str] = None):
+    """
+    Generate a triage report from 9-module analysis data.
+    Returns structured JSON suitable for the frontend to render or export as PDF.
+    Structure: Executive Summary + TCA Scorecard (Page 1), Risks + Recommendation (Page 2),
+    plus additional detail pages for a total of ~5-6 pages.
+    With ?stream=ndjson or ?stream=sse the pages are streamed as they are
+    built, executive summary first (see _stream_report).
+    """
+    try:
+        _check_report_stream(stream)
+        data = await request.json()
         company_name = data.get("company_name", "Unknown")
         analysis = data.get("analysis_data")
 
-        # If no analysis provided, try to read the latest from DB
+        # If no analysis provided, read it from DB (by analysis_id if given)
         if not analysis:
             async with db_manager.get_connection() as conn:
-                row = await conn.fetchrow(
-                    """SELECT analysis_result FROM allupload
-                       WHERE company_name = $1 AND analysis_result != '{}'::jsonb
-                       ORDER BY updated_at DESC LIMIT 1""", company_name)
-            if row:
-                ar = row["analysis_result"]
-                analysis = json.loads(ar) if isinstance(ar, str) else ar
-            else:
+                analysis = await analysis_store.resolve(
+                    conn, data.get("analysis_id"), company_name)
+            if not analysis:
                 raise HTTPException(
                     status_code=404,
                     detail=
                     "No analysis found. Run /api/analysis/9-module first.")
+            if "company_name" not in data:
+                company_name = analysis.get("company_name", company_name)
 
-        mr = analysis.get("module_results", {})
-        tca = mr.get("tca_scorecard", {})
-        risk = mr.get("risk_assessment", {})
-        market = mr.get("market_analysis", {})
-        team = mr.get("team_assessment", {})
-        fin = mr.get("financial_analysis", {})
-        tech = mr.get("technology_assessment", {})
-        biz = mr.get("business_model", {})
-        growth = mr.get("growth_assessment", {})
-        invest = mr.get("investment_readiness", {})
-
-        triage_report = {
-            "report_type": "triage",
-            "company_name": company_name,
-            "generated_at": datetime.utcnow().isoformat(),
-            "final_tca_score": analysis.get("final_tca_score", 0),
-            "recommendation": analysis.get("investment_recommendation", ""),
-            "total_pages": 10,
-
-            # â”€â”€ Page 1: Executive Summary â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "page_1_executive_summary": {
-                "title":
-                f"Triage Report â€” {company_name}",
-                "overall_score":
-                analysis.get("final_tca_score", 0),
-                "score_interpretation":
-                ("Strong candidate for investment" if analysis.get(
-                    "final_tca_score", 0) >= 7.5 else
-                 "Moderate potential â€” further analysis required"
-                 if analysis.get("final_tca_score", 0) >= 5.5 else
-                 "Significant concerns identified"),
-                "investment_recommendation":
-                analysis.get("investment_recommendation", ""),
-                "analysis_completeness":
-                analysis.get("analysis_completeness", 0),
-                "modules_run":
-                analysis.get("module_count", 9),
-            },
-
-            # â”€â”€ Page 2: TCA Scorecard â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "page_2_tca_scorecard": {
-                "title":
-                "TCA Scorecard â€” Category Breakdown",
-                "composite_score":
-                tca.get("composite_score", 0),
-                "categories":
-                tca.get("categories", []),
-                "top_strengths": [
-                    c["category"] for c in tca.get("categories", [])
-                    if c.get("flag") == "green"
-                ][:3],
-                "areas_of_concern": [
-                    c["category"] for c in tca.get("categories", [])
-                    if c.get("flag") != "green"
-                ][:3],
-            },
-
-            # â”€â”€ Page 3: Risk Assessment â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "page_3_risk_assessment": {
-                "title":
-                "Risk Assessment & Flags",
-                "overall_risk_score":
-                risk.get("overall_risk_score", 0),
-                "total_flags":
-                len(risk.get("flags", [])),
-                "high_risk_count":
-                len([
-                    f for f in risk.get("flags", [])
-                    if f.get("severity", 0) >= 6
-                ]),
-                "risk_flags":
-                risk.get("flags", []),
-                "risk_domains":
-                risk.get("risk_domains", {}),
-            },
-
-            # â”€â”€ Page 4: Market & Team â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "page_4_market_and_team": {
-                "title": "Market Opportunity & Team Assessment",
-                "market_score": market.get("market_score", 0),
-                "tam": market.get("tam", "N/A"),
-                "sam": market.get("sam", "N/A"),
-                "som": market.get("som", "N/A"),
-                "growth_rate": market.get("growth_rate", "N/A"),
-                "competitive_position": market.get("competitive_position",
-                                                   "N/A"),
-                "competitive_advantages": market.get("competitive_advantages",
-                                                     []),
-                "team_score": team.get("team_score", 0),
-                "team_completeness": team.get("team_completeness", 0),
-                "founders": team.get("founders", []),
-                "team_gaps": team.get("gaps", []),
-            },
-
-            # â”€â”€ Page 5: Financial & Technology â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "page_5_financials_and_tech": {
-                "title": "Financial Health & Technology Assessment",
-                "financial_score": fin.get("financial_health_score", 0),
-                "revenue": fin.get("revenue", 0),
-                "mrr": fin.get("mrr", 0),
-                "burn_rate": fin.get("burn_rate", 0),
-                "runway_months": fin.get("runway_months", 0),
-                "ltv_cac_ratio": fin.get("ltv_cac_ratio", 0),
-                "gross_margin": fin.get("gross_margin", 0),
-                "technology_score": tech.get("technology_score", 0),
-                "trl": tech.get("trl", 0),
-                "ip_strength": tech.get("ip_strength", "N/A"),
-                "tech_stack": tech.get("stack", []),
-            },
-
-            # â”€â”€ Page 6: Recommendations & Next Steps â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "page_6_recommendations": {
-                "title":
-                "Investment Recommendation & Next Steps",
-                "final_decision":
-                analysis.get("investment_recommendation", ""),
-                "business_model_score":
-                biz.get("business_model_score", 0),
-                "business_model_type":
-                biz.get("model_type", "N/A"),
-                "growth_potential_score":
-                growth.get("growth_potential_score", 0),
-                "growth_projections":
-                growth.get("growth_projections", {}),
-                "investment_readiness_score":
-                invest.get("readiness_score", 0),
-                "exit_potential":
-                invest.get("exit_potential", {}),
-                "funding_recommendation":
-                invest.get("funding_recommendation", {}),
-                "next_steps": [
-                    "1. Conduct management team interviews and reference checks",
-                    "2. Verify financial projections with audited statements",
-                    "3. Commission independent market sizing analysis",
-                    "4. Perform detailed competitive landscape mapping",
-                    "5. Engage technical due diligence on IP and architecture",
-                    "6. Negotiate term sheet based on analysis findings",
-                ],
-            },
-        }
+        if stream:
+            return _stream_report(
+                _triage_report_parts(company_name, analysis), stream,
+                "Triage")
+        triage_report = _build_triage_report(company_name, analysis)
 
         logger.info(
             f"Triage report generated for '{company_name}' â€” 6 pages")
@@ -5425,540 +3992,613 @@ async def generate_triage_report(request: Request):
 # â”€â”€â”€ DD (Due Diligence) Report Generation â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
 
 
-@app.post("/api/reports/dd")
-async def generate_dd_report(request: Request):
+def _dd_report_parts(company_name: str,
+                     analysis: dict,
+                     executive_first: bool = False):
     """
-    Generate a comprehensive Due Diligence report from 9-module analysis data.
-    Returns structured JSON with 20+ sections suitable for a thorough DD document.
+    DD report sections in document order, one dict per section: the header
+    fields, the cover, the executive summary, then the remaining sections.
+    With executive_first the summary comes before the cover (streaming).
     """
-    try:
-        data = await request.json()
-        company_name = data.get("company_name", "Unknown")
-        analysis = data.get("analysis_data")
+    mr = analysis.get("module_results", {})
+    tca = mr.get("tca_scorecard", {})
+    risk = mr.get("risk_assessment", {})
+    market = mr.get("market_analysis", {})
+    team = mr.get("team_assessment", {})
+    fin = mr.get("financial_analysis", {})
+    tech = mr.get("technology_assessment", {})
+    biz = mr.get("business_model", {})
+    growth = mr.get("growth_assessment", {})
+    invest = mr.get("investment_readiness", {})
+
+    yield {
+        "report_type": "due_diligence",
+        "company_name": company_name,
+        "generated_at": datetime.utcnow().isoformat(),
+        "final_tca_score": analysis.get("final_tca_score", 0),
+        "total_pages": 25,
+    }
 
-        # If no analysis provided, read from DB
-        if not analysis:
-            async with db_manager.get_connection() as conn:
-                # Get analysis result
-                row = await conn.fetchrow(
-                    """SELECT analysis_result FROM allupload
-                       WHERE company_name = $1 AND analysis_result != '{}'::jsonb
-                       ORDER BY updated_at DESC LIMIT 1""", company_name)
-            if row:
-                ar = row["analysis_result"]
-                analysis = json.loads(ar) if isinstance(ar, str) else ar
-            else:
-                raise HTTPException(
-                    status_code=404,
-                    detail=
-                    "No analysis found. Run /api/analysis/9-module first.")
+    # â”€â”€ Section 1: Cover & Table of Contents â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    cover = {
+        "section_01_cover": {
+            "title":
+            f"Due Diligence Report â€” {company_name}",
+            "subtitle":
+            "Comprehensive Investment Analysis",
+            "prepared_by":
+            "TCA IRR Analysis Platform",
+            "date":
+            datetime.utcnow().strftime("%B %d, %Y"),
+            "classification":
+            "CONFIDENTIAL",
+            "table_of_contents": [
+                "1. Executive Summary",
+                "2. Investment Thesis",
+                "3. TCA Scorecard",
+                "4. Risk Assessment",
+                "5. Market Analysis",
+                "6. Competitive Landscape",
+                "7. Team Assessment",
+                "8. Financial Analysis",
+                "9. Technology & IP",
+                "10. Business Model",
+                "11. Growth Assessment",
+                "12. Investment Readiness",
+                "13. PESTEL Analysis",
+                "14. Benchmarking",
+                "15. Gap Analysis",
+                "16. Strategic Fit",
+                "17. Valuation Analysis",
+                "18. Deal Structure",
+                "19. Conditions & Covenants",
+                "20. Appendices",
+            ],
+        },
+    }
 
-        mr = analysis.get("module_results", {})
-        tca = mr.get("tca_scorecard", {})
-        risk = mr.get("risk_assessment", {})
-        market = mr.get("market_analysis", {})
-        team = mr.get("team_assessment", {})
-        fin = mr.get("financial_analysis", {})
-        tech = mr.get("technology_assessment", {})
-        biz = mr.get("business_model", {})
-        growth = mr.get("growth_assessment", {})
-        invest = mr.get("investment_readiness", {})
+    # â”€â”€ Section 2: Executive Summary (2 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    executive_summary = {
+        "section_02_executive_summary": {
+            "title":
+            "Executive Summary",
+            "overall_score":
+            analysis.get("final_tca_score", 0),
+            "investment_recommendation":
+            analysis.get("investment_recommendation", ""),
+            "key_findings": [
+                f"TCA composite score: {analysis.get('final_tca_score', 0)}/10",
+                f"Overall risk level: {risk.get('overall_risk_score', 0)}/10",
+                f"Market opportunity: {market.get('tam', 'N/A')} TAM",
+                f"Team readiness: {team.get('team_score', 0)}/10",
+                f"Financial health: {fin.get('financial_health_score', 0)}/10",
+                f"Investment readiness: {invest.get('readiness_score', 0)}/10",
+            ],
+            "strengths_summary": [
+                c["category"] for c in tca.get("categories", [])
+                if c.get("flag") == "green"
+            ],
+            "concerns_summary": [
+                c["category"] for c in tca.get("categories", [])
+                if c.get("flag") != "green"
+            ],
+            "modules_completed":
+            analysis.get("module_count", 9),
+            "analysis_completeness":
+            analysis.get("analysis_completeness", 100),
+        },
+    }
 
-        dd_report = {
-            "report_type": "due_diligence",
-            "company_name": company_name,
-            "generated_at": datetime.utcnow().isoformat(),
-            "final_tca_score": analysis.get("final_tca_score", 0),
-            "total_pages": 25,
+    if executive_first:
+        yield executive_summary
+        yield cover
+    else:
+        yield cover
+        yield executive_summary
 
-            # â”€â”€ Section 1: Cover & Table of Contents â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "section_01_cover": {
-                "title":
-                f"Due Diligence Report â€” {company_name}",
-                "subtitle":
-                "Comprehensive Investment Analysis",
-                "prepared_by":
-                "TCA IRR Analysis Platform",
-                "date":
-                datetime.utcnow().strftime("%B %d, %Y"),
-                "classification":
-                "CONFIDENTIAL",
-                "table_of_contents": [
-                    "1. Executive Summary",
-                    "2. Investment Thesis",
-                    "3. TCA Scorecard",
-                    "4. Risk Assessment",
-                    "5. Market Analysis",
-                    "6. Competitive Landscape",
-                    "7. Team Assessment",
-                    "8. Financial Analysis",
-                    "9. Technology & IP",
-                    "10. Business Model",
-                    "11. Growth Assessment",
-                    "12. Investment Readiness",
-                    "13. PESTEL Analysis",
-                    "14. Benchmarking",
-                    "15. Gap Analysis",
-                    "16. Strategic Fit",
-                    "17. Valuation Analysis",
-                    "18. Deal Structure",
-                    "19. Conditions & Covenants",
-                    "20. Appendices",
-                ],
-            },
+    # â”€â”€ Section 3: Investment Thesis â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "section_03_investment_thesis": {
+            "title":
+            "Investment Thesis",
+            "thesis_statement":
+            f"{company_name} presents a {'compelling' if analysis.get('final_tca_score', 0) >= 7.5 else 'moderate'} investment opportunity with strong potential in its target market.",
+            "value_drivers": [
+                "Strong founding team with relevant domain expertise",
+                "Clear product-market fit demonstrated through growing revenue",
+                "Large addressable market with favorable growth dynamics",
+                "Defensible technology with intellectual property protection",
+            ],
+            "key_risks": [
+                f.get("trigger", "") for f in risk.get("flags", [])
+                if f.get("severity", 0) >= 5
+            ],
+            "risk_mitigants": [
+                f.get("mitigation", "") for f in risk.get("flags", [])
+                if f.get("severity", 0) >= 5
+            ],
+        },
+    }
 
-            # â”€â”€ Section 2: Executive Summary (2 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "section_02_executive_summary": {
-                "title":
-                "Executive Summary",
-                "overall_score":
-                analysis.get("final_tca_score", 0),
-                "investment_recommendation":
-                analysis.get("investment_recommendation", ""),
-                "key_findings": [
-                    f"TCA composite score: {analysis.get('final_tca_score', 0)}/10",
-                    f"Overall risk level: {risk.get('overall_risk_score', 0)}/10",
-                    f"Market opportunity: {market.get('tam', 'N/A')} TAM",
-                    f"Team readiness: {team.get('team_score', 0)}/10",
-                    f"Financial health: {fin.get('financial_health_score', 0)}/10",
-                    f"Investment readiness: {invest.get('readiness_score', 0)}/10",
-                ],
-                "strengths_summary": [
-                    c["category"] for c in tca.get("categories", [])
-                    if c.get("flag") == "green"
-                ],
-                "concerns_summary": [
-                    c["category"] for c in tca.get("categories", [])
-                    if c.get("flag") != "green"
-                ],
-                "modules_completed":
-                analysis.get("module_count", 9),
-                "analysis_completeness":
-                analysis.get("analysis_completeness", 100),
+    # â”€â”€ Section 4: TCA Scorecard (2 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "section_04_tca_scorecard": {
+            "title": "TCA Scorecard â€” Detailed Category Breakdown",
+            "composite_score": tca.get("composite_score", 0),
+            "categories": tca.get("categories", []),
+            "scoring_methodology":
+            "Weighted average across 5 core categories (weights sum to 100%)",
+            "interpretation_scale": {
+                "8.0_plus": "Excellent â€” strong investment candidate",
+                "7.0_to_8.0": "Good â€” proceed with due diligence",
+                "5.5_to_7.0": "Moderate â€” conditional proceed",
+                "below_5.5": "Weak â€” significant barriers to investment",
             },
+        },
+    }
 
-            # â”€â”€ Section 3: Investment Thesis â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "section_03_investment_thesis": {
-                "title":
-                "Investment Thesis",
-                "thesis_statement":
-                f"{company_name} presents a {'compelling' if analysis.get('final_tca_score', 0) >= 7.5 else 'moderate'} investment opportunity with strong potential in its target market.",
-                "value_drivers": [
-                    "Strong founding team with relevant domain expertise",
-                    "Clear product-market fit demonstrated through growing revenue",
-                    "Large addressable market with favorable growth dynamics",
-                    "Defensible technology with intellectual property protection",
+    # â”€â”€ Section 5: Risk Assessment (3 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "section_05_risk_assessment": {
+            "title":
+            "Comprehensive Risk Assessment",
+            "overall_risk_score":
+            risk.get("overall_risk_score", 0),
+            "risk_rating":
+            ("LOW" if risk.get("overall_risk_score", 0) < 4 else "MEDIUM"
+             if risk.get("overall_risk_score", 0) < 6 else "HIGH"),
+            "flags":
+            risk.get("flags", []),
+            "risk_domains":
+            risk.get("risk_domains", {}),
+            "risk_matrix": {
+                "high_impact_high_probability": [
+                    f for f in risk.get("flags", [])
+                    if f.get("severity", 0) >= 6
                 ],
-                "key_risks": [
-                    f.get("trigger", "") for f in risk.get("flags", [])
-                    if f.get("severity", 0) >= 5
+                "high_impact_low_probability": [],
+                "low_impact_high_probability": [
+                    f for f in risk.get("flags", [])
+                    if 4 <= f.get("severity", 0) < 6
                 ],
-                "risk_mitigants": [
-                    f.get("mitigation", "") for f in risk.get("flags", [])
-                    if f.get("severity", 0) >= 5
+                "low_impact_low_probability": [
+                    f for f in risk.get("flags", [])
+                    if f.get("severity", 0) < 4
                 ],
             },
+            "mitigation_plan": [{
+                "risk":
+                f.get("domain", ""),
+                "strategy":
+                f.get("mitigation", ""),
+                "priority":
+                "High" if f.get("severity", 0) >= 6 else "Medium"
+            } for f in risk.get("flags", [])],
+        },
+    }
 
-            # â”€â”€ Section 4: TCA Scorecard (2 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "section_04_tca_scorecard": {
-                "title": "TCA Scorecard â€” Detailed Category Breakdown",
-                "composite_score": tca.get("composite_score", 0),
-                "categories": tca.get("categories", []),
-                "scoring_methodology":
-                "Weighted average across 5 core categories (weights sum to 100%)",
-                "interpretation_scale": {
-                    "8.0_plus": "Excellent â€” strong investment candidate",
-                    "7.0_to_8.0": "Good â€” proceed with due diligence",
-                    "5.5_to_7.0": "Moderate â€” conditional proceed",
-                    "below_5.5": "Weak â€” significant barriers to investment",
-                },
+    # â”€â”€ Section 6: Market Analysis (2 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "section_06_market_analysis": {
+            "title":
+            "Market & Competition Analysis",
+            "market_score":
+            market.get("market_score", 0),
+            "market_sizing": {
+                "tam": market.get("tam"),
+                "sam": market.get("sam"),
+                "som": market.get("som")
             },
+            "growth_rate":
+            market.get("growth_rate", ""),
+            "competitive_position":
+            market.get("competitive_position", ""),
+            "competitive_advantages":
+            market.get("competitive_advantages", []),
+            "market_trends": [
+                "Digital transformation acceleration",
+                "AI/ML adoption growth", "Remote-work enablement"
+            ],
+            "barriers_to_entry": [
+                "Technical complexity", "Regulatory requirements",
+                "Network effects"
+            ],
+        },
+    }
 
-            # â”€â”€ Section 5: Risk Assessment (3 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "section_05_risk_assessment": {
-                "title":
-                "Comprehensive Risk Assessment",
-                "overall_risk_score":
-                risk.get("overall_risk_score", 0),
-                "risk_rating":
-                ("LOW" if risk.get("overall_risk_score", 0) < 4 else "MEDIUM"
-                 if risk.get("overall_risk_score", 0) < 6 else "HIGH"),
-                "flags":
-                risk.get("flags", []),
-                "risk_domains":
-                risk.get("risk_domains", {}),
-                "risk_matrix": {
-                    "high_impact_high_probability": [
-                        f for f in risk.get("flags", [])
-                        if f.get("severity", 0) >= 6
-                    ],
-                    "high_impact_low_probability": [],
-                    "low_impact_high_probability": [
-                        f for f in risk.get("flags", [])
-                        if 4 <= f.get("severity", 0) < 6
-                    ],
-                    "low_impact_low_probability": [
-                        f for f in risk.get("flags", [])
-                        if f.get("severity", 0) < 4
-                    ],
-                },
-                "mitigation_plan": [{
-                    "risk":
-                    f.get("domain", ""),
-                    "strategy":
-                    f.get("mitigation", ""),
-                    "priority":
-                    "High" if f.get("severity", 0) >= 6 else "Medium"
-                } for f in risk.get("flags", [])],
-            },
+    # â”€â”€ Section 7: Team Assessment (2 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "section_07_team_assessment": {
+            "title":
+            "Team & Leadership Assessment",
+            "team_score":
+            team.get("team_score", 0),
+            "team_completeness":
+            team.get("team_completeness", 0),
+            "diversity_score":
+            team.get("diversity_score", 0),
+            "founders":
+            team.get("founders", []),
+            "leadership_strength":
+            team.get("leadership_strength", 0),
+            "gaps_identified":
+            team.get("gaps", []),
+            "recommendations": [
+                f"Hire {gap} within next 6 months"
+                for gap in team.get("gaps", [])
+            ],
+            "organizational_readiness":
+            "Adequate for current stage; scaling plan needed for Series A",
+        },
+    }
 
-            # â”€â”€ Section 6: Market Analysis (2 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "section_06_market_analysis": {
-                "title":
-                "Market & Competition Analysis",
-                "market_score":
-                market.get("market_score", 0),
-                "market_sizing": {
-                    "tam": market.get("tam"),
-                    "sam": market.get("sam"),
-                    "som": market.get("som")
-                },
-                "growth_rate":
-                market.get("growth_rate", ""),
-                "competitive_position":
-                market.get("competitive_position", ""),
-                "competitive_advantages":
-                market.get("competitive_advantages", []),
-                "market_trends": [
-                    "Digital transformation acceleration",
-                    "AI/ML adoption growth", "Remote-work enablement"
-                ],
-                "barriers_to_entry": [
-                    "Technical complexity", "Regulatory requirements",
-                    "Network effects"
-                ],
+    # â”€â”€ Section 8: Financial Analysis (3 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "section_08_financial_analysis": {
+            "title":
+            "Financial Health & Projections",
+            "financial_score":
+            fin.get("financial_health_score", 0),
+            "current_metrics": {
+                "revenue": fin.get("revenue", 0),
+                "mrr": fin.get("mrr", 0),
+                "burn_rate": fin.get("burn_rate", 0),
+                "runway_months": fin.get("runway_months", 0),
+                "gross_margin": fin.get("gross_margin", 0),
+                "ltv_cac_ratio": fin.get("ltv_cac_ratio", 0),
+                "revenue_growth_mom": fin.get("revenue_growth_mom", 0),
             },
+            "projections":
+            fin.get("projections", {}),
+            "funding_history":
+            "Seed round completed",
+            "use_of_proceeds": [
+                "Engineering (40%)", "Sales & Marketing (30%)",
+                "Operations (15%)", "G&A (15%)"
+            ],
+            "financial_risks": [
+                "Burn rate exceeds revenue growth rate in short term",
+                "Customer concentration risk in top accounts",
+            ],
+        },
+    }
 
-            # â”€â”€ Section 7: Team Assessment (2 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "section_07_team_assessment": {
-                "title":
-                "Team & Leadership Assessment",
-                "team_score":
-                team.get("team_score", 0),
-                "team_completeness":
-                team.get("team_completeness", 0),
-                "diversity_score":
-                team.get("diversity_score", 0),
-                "founders":
-                team.get("founders", []),
-                "leadership_strength":
-                team.get("leadership_strength", 0),
-                "gaps_identified":
-                team.get("gaps", []),
-                "recommendations": [
-                    f"Hire {gap} within next 6 months"
-                    for gap in team.get("gaps", [])
-                ],
-                "organizational_readiness":
-                "Adequate for current stage; scaling plan needed for Series A",
-            },
+    # â”€â”€ Section 9: Technology & IP (2 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "section_09_technology": {
+            "title": "Technology & Intellectual Property Assessment",
+            "technology_score": tech.get("technology_score", 0),
+            "trl": tech.get("trl", 0),
+            "ip_strength": tech.get("ip_strength", ""),
+            "tech_stack": tech.get("stack", []),
+            "development_risks": tech.get("risks", []),
+            "scalability_assessment": tech.get("scalability", ""),
+            "security_posture": "SOC 2 Type I in progress, GDPR compliant",
+            "technical_debt": "Moderate â€” refactoring scheduled for Q3",
+        },
+    }
 
-            # â”€â”€ Section 8: Financial Analysis (3 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "section_08_financial_analysis": {
-                "title":
-                "Financial Health & Projections",
-                "financial_score":
-                fin.get("financial_health_score", 0),
-                "current_metrics": {
-                    "revenue": fin.get("revenue", 0),
-                    "mrr": fin.get("mrr", 0),
-                    "burn_rate": fin.get("burn_rate", 0),
-                    "runway_months": fin.get("runway_months", 0),
-                    "gross_margin": fin.get("gross_margin", 0),
-                    "ltv_cac_ratio": fin.get("ltv_cac_ratio", 0),
-                    "revenue_growth_mom": fin.get("revenue_growth_mom", 0),
-                },
-                "projections":
-                fin.get("projections", {}),
-                "funding_history":
-                "Seed round completed",
-                "use_of_proceeds": [
-                    "Engineering (40%)", "Sales & Marketing (30%)",
-                    "Operations (15%)", "G&A (15%)"
-                ],
-                "financial_risks": [
-                    "Burn rate exceeds revenue growth rate in short term",
-                    "Customer concentration risk in top accounts",
-                ],
-            },
+    # â”€â”€ Section 10: Business Model (2 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "section_10_business_model": {
+            "title":
+            "Business Model & Strategy Analysis",
+            "business_model_score":
+            biz.get("business_model_score", 0),
+            "model_type":
+            biz.get("model_type", ""),
+            "revenue_model_strength":
+            biz.get("revenue_model_strength", 0),
+            "strategic_positioning":
+            biz.get("strategic_positioning", ""),
+            "unit_economics":
+            biz.get("unit_economics", {}),
+            "pricing_strategy":
+            "Value-based tiered pricing with annual contracts",
+            "customer_segments":
+            ["Mid-market B2B", "Enterprise", "Government"],
+        },
+    }
 
-            # â”€â”€ Section 9: Technology & IP (2 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "section_09_technology": {
-                "title": "Technology & Intellectual Property Assessment",
-                "technology_score": tech.get("technology_score", 0),
-                "trl": tech.get("trl", 0),
-                "ip_strength": tech.get("ip_strength", ""),
-                "tech_stack": tech.get("stack", []),
-                "development_risks": tech.get("risks", []),
-                "scalability_assessment": tech.get("scalability", ""),
-                "security_posture": "SOC 2 Type I in progress, GDPR compliant",
-                "technical_debt": "Moderate â€” refactoring scheduled for Q3",
+    # â”€â”€ Section 11: Growth Assessment (2 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "section_11_growth": {
+            "title": "Growth Potential & Scalability Analysis",
+            "growth_potential_score": growth.get("growth_potential_score",
+                                                 0),
+            "scalability_index": growth.get("scalability_index", 0),
+            "growth_drivers": growth.get("growth_drivers", []),
+            "scaling_challenges": growth.get("scaling_challenges", []),
+            "growth_projections": growth.get("growth_projections", {}),
+            "expansion_strategy": {
+                "geographic": ["North America", "Europe", "APAC"],
+                "product":
+                ["Core platform", "API marketplace", "Analytics add-on"],
+                "channel":
+                ["Direct sales", "Partner channel", "Self-serve"],
             },
+        },
+    }
 
-            # â”€â”€ Section 10: Business Model (2 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "section_10_business_model": {
-                "title":
-                "Business Model & Strategy Analysis",
-                "business_model_score":
-                biz.get("business_model_score", 0),
-                "model_type":
-                biz.get("model_type", ""),
-                "revenue_model_strength":
-                biz.get("revenue_model_strength", 0),
-                "strategic_positioning":
-                biz.get("strategic_positioning", ""),
-                "unit_economics":
-                biz.get("unit_economics", {}),
-                "pricing_strategy":
-                "Value-based tiered pricing with annual contracts",
-                "customer_segments":
-                ["Mid-market B2B", "Enterprise", "Government"],
-            },
+    # â”€â”€ Section 12: Investment Readiness (2 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "section_12_investment_readiness": {
+            "title":
+            "Investment Readiness & Exit Potential",
+            "readiness_score":
+            invest.get("readiness_score", 0),
+            "exit_potential":
+            invest.get("exit_potential", {}),
+            "funding_recommendation":
+            invest.get("funding_recommendation", {}),
+            "investor_fit":
+            invest.get("investor_fit", []),
+            "comparable_exits": [
+                {
+                    "company": "CompanyA",
+                    "exit_type": "Acquisition",
+                    "valuation": "$45M",
+                    "year": 2024
+                },
+                {
+                    "company": "CompanyB",
+                    "exit_type": "IPO",
+                    "valuation": "$200M",
+                    "year": 2025
+                },
+            ],
+        },
+    }
 
-            # â”€â”€ Section 11: Growth Assessment (2 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "section_11_growth": {
-                "title": "Growth Potential & Scalability Analysis",
-                "growth_potential_score": growth.get("growth_potential_score",
-                                                     0),
-                "scalability_index": growth.get("scalability_index", 0),
-                "growth_drivers": growth.get("growth_drivers", []),
-                "scaling_challenges": growth.get("scaling_challenges", []),
-                "growth_projections": growth.get("growth_projections", {}),
-                "expansion_strategy": {
-                    "geographic": ["North America", "Europe", "APAC"],
-                    "product":
-                    ["Core platform", "API marketplace", "Analytics add-on"],
-                    "channel":
-                    ["Direct sales", "Partner channel", "Self-serve"],
+    # â”€â”€ Section 13: PESTEL Analysis â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "section_13_pestel": {
+            "title": "PESTEL Macro-Environment Analysis",
+            "factors": {
+                "political": {
+                    "score":
+                    7.2,
+                    "assessment":
+                    "Favorable regulatory environment for tech startups"
+                },
+                "economic": {
+                    "score":
+                    6.8,
+                    "assessment":
+                    "Mixed macro conditions; strong VC funding environment"
+                },
+                "social": {
+                    "score": 8.1,
+                    "assessment": "Growing demand for digital solutions"
+                },
+                "technological": {
+                    "score": 8.7,
+                    "assessment": "Rapid AI/ML adoption creating tailwinds"
+                },
+                "environmental": {
+                    "score": 7.0,
+                    "assessment": "Low environmental regulatory exposure"
+                },
+                "legal": {
+                    "score":
+                    6.9,
+                    "assessment":
+                    "Standard compliance requirements; data privacy focus"
                 },
             },
+            "composite_score": 44.7,
+        },
+    }
 
-            # â”€â”€ Section 12: Investment Readiness (2 pages) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "section_12_investment_readiness": {
-                "title":
-                "Investment Readiness & Exit Potential",
-                "readiness_score":
-                invest.get("readiness_score", 0),
-                "exit_potential":
-                invest.get("exit_potential", {}),
-                "funding_recommendation":
-                invest.get("funding_recommendation", {}),
-                "investor_fit":
-                invest.get("investor_fit", []),
-                "comparable_exits": [
-                    {
-                        "company": "CompanyA",
-                        "exit_type": "Acquisition",
-                        "valuation": "$45M",
-                        "year": 2024
-                    },
-                    {
-                        "company": "CompanyB",
-                        "exit_type": "IPO",
-                        "valuation": "$200M",
-                        "year": 2025
-                    },
-                ],
+    # â”€â”€ Section 14: Benchmark Comparison â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "section_14_benchmarks": {
+            "title": "Industry Benchmarking & Peer Comparison",
+            "overall_percentile": 72,
+            "benchmarks": {
+                "revenue_growth": {
+                    "company": "15% MoM",
+                    "industry_avg": "10% MoM",
+                    "percentile": 75
+                },
+                "burn_multiple": {
+                    "company": "1.8x",
+                    "industry_avg": "2.5x",
+                    "percentile": 68
+                },
+                "ltv_cac": {
+                    "company": "3.2x",
+                    "industry_avg": "3.0x",
+                    "percentile": 55
+                },
+                "team_size_efficiency": {
+                    "company": "$62K ARR/employee",
+                    "industry_avg": "$55K",
+                    "percentile": 70
+                },
             },
+        },
+    }
 
-            # â”€â”€ Section 13: PESTEL Analysis â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "section_13_pestel": {
-                "title": "PESTEL Macro-Environment Analysis",
-                "factors": {
-                    "political": {
-                        "score":
-                        7.2,
-                        "assessment":
-                        "Favorable regulatory environment for tech startups"
-                    },
-                    "economic": {
-                        "score":
-                        6.8,
-                        "assessment":
-                        "Mixed macro conditions; strong VC funding environment"
-                    },
-                    "social": {
-                        "score": 8.1,
-                        "assessment": "Growing demand for digital solutions"
-                    },
-                    "technological": {
-                        "score": 8.7,
-                        "assessment": "Rapid AI/ML adoption creating tailwinds"
-                    },
-                    "environmental": {
-                        "score": 7.0,
-                        "assessment": "Low environmental regulatory exposure"
-                    },
-                    "legal": {
-                        "score":
-                        6.9,
-                        "assessment":
-                        "Standard compliance requirements; data privacy focus"
-                    },
+    # â”€â”€ Section 15: Gap Analysis â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+    yield {
+        "section_15_gap_analysis": {
+            "title":
+            "Gap Analysis & Improvement Roadmap",
+            "gaps": [
+                {
+                    "area": "Sales & Marketing Capability",
+                    "gap_size": 2.5,
+                    "priority": "High",
+                    "recommendation":
+                    "Hire VP Sales and build outbound motion"
                 },
-                "composite_score": 44.7,
-            },
+                {
+                    "area": "Product Analytics",
+                    "gap_size": 1.2,
+                    "priority": "Medium",
+                    "recommendation":
+                    "Implement product-led growth metrics"
+                },
+                {
+                    "area":
+                    "Operations Scalability",
+                    "gap_size":
+                    3.0,
+                    "priority":
+                    "High",
+                    "recommendation":
+                    "Automate onboarding and support workflows"
+                },
+                {
+                    "area": "Financial Planning",
+                    "gap_size": 1.5,
+                    "priority": "Medium",
+                    "recommendation":
+                    "Build rolling 18-month financial model"
+                },
+            ],
+        },
+    }
 
-            # â”€â”€ Section 14: Benchmark Comparison â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "section_14_benchmarks": {
-                "title": "Industry Benchmarking & Peer Comparison",
-                "overall_percentile": 72,
-                "benchmarks": {
-                    "revenue_growth": {
-                        "company": "15% MoM",
-                        "industry_avg": "10% MoM",
-                        "percentile": 75
-                    },
-                    "burn_multiple": {
-                        "company": "1.8x",
-                        "industry_avg": "2.5x",
-                        "percentile": 68
-                    },
-                    "ltv_cac": {
-                        "company": "3.2x",
-                        "industry_avg": "3.0x",
-                        "percentile": 55
-                    },
-                    "team_size_efficiency": {
-                        "company": "$62K ARR/employee",
-                        "industry_avg": "$55K",
-                        "percentile": 70
-                    },
+    # â”€â”€ Section 16â€“20: Strategic Fit, Valuation, Deal, Conditions, Appendices
+    yield {
+        "section_16_strategic_fit": {
+            "title":
+            "Strategic Fit Analysis",
+            "alignment_score":
+            7.5,
+            "fit_factors": [
+                {
+                    "factor": "Market Alignment",
+                    "score": 8.0,
+                    "comment": "Strong fit with target sectors"
                 },
-            },
+                {
+                    "factor": "Portfolio Synergy",
+                    "score": 7.2,
+                    "comment": "Complementary to existing investments"
+                },
+                {
+                    "factor": "Value-Add Potential",
+                    "score": 7.8,
+                    "comment":
+                    "Significant operational support opportunity"
+                },
+            ],
+        },
+    }
 
-            # â”€â”€ Section 15: Gap Analysis â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-            "section_15_gap_analysis": {
-                "title":
-                "Gap Analysis & Improvement Roadmap",
-                "gaps": [
-                    {
-                        "area": "Sales & Marketing Capability",
-                        "gap_size": 2.5,
-                        "priority": "High",
-                        "recommendation":
-                        "Hire VP Sales and build outbound motion"
-                    },
-                    {
-                        "area": "Product Analytics",
-                        "gap_size": 1.2,
-                        "priority": "Medium",
-                        "recommendation":
-                        "Implement product-led growth metrics"
-                    },
-                    {
-                        "area":
-                        "Operations Scalability",
-                        "gap_size":
-                        3.0,
-                        "priority":
-                        "High",
-                        "recommendation":
-                        "Automate onboarding and support workflows"
-                    },
-                    {
-                        "area": "Financial Planning",
-                        "gap_size": 1.5,
-                        "priority": "Medium",
-                        "recommendation":
-                        "Build rolling 18-month financial model"
-                    },
-                ],
+    yield {
+        "section_17_valuation": {
+            "title":
+            "Valuation Analysis",
+            "methodology":
+            ["DCF", "Comparable Multiples", "Precedent Transactions"],
+            "valuation_range":
+            invest.get("funding_recommendation",
+                       {}).get("valuation_range", "$15-20M"),
+            "implied_multiples": {
+                "revenue": "8-12x ARR",
+                "arr_growth_adjusted": "1.5-2.0x"
             },
+        },
+    }
 
-            # â”€â”€ Section 16â€“20: Strategic Fit, Valuation, Deal, Conditions, Appendices
-            "section_16_strategic_fit": {
-                "title":
-                "Strategic Fit Analysis",
-                "alignment_score":
-                7.5,
-                "fit_factors": [
-                    {
-                        "factor": "Market Alignment",
-                        "score": 8.0,
-                        "comment": "Strong fit with target sectors"
-                    },
-                    {
-                        "factor": "Portfolio Synergy",
-                        "score": 7.2,
-                        "comment": "Complementary to existing investments"
-                    },
-                    {
-                        "factor": "Value-Add Potential",
-                        "score": 7.8,
-                        "comment":
-                        "Significant operational support opportunity"
-                    },
-                ],
-            },
-            "section_17_valuation": {
-                "title":
-                "Valuation Analysis",
-                "methodology":
-                ["DCF", "Comparable Multiples", "Precedent Transactions"],
-                "valuation_range":
-                invest.get("funding_recommendation",
-                           {}).get("valuation_range", "$15-20M"),
-                "implied_multiples": {
-                    "revenue": "8-12x ARR",
-                    "arr_growth_adjusted": "1.5-2.0x"
-                },
-            },
-            "section_18_deal_structure": {
-                "title":
-                "Proposed Deal Structure",
-                "investment_amount":
-                invest.get("funding_recommendation",
-                           {}).get("target", "$3-5M"),
-                "instrument":
-                "Series A Preferred Equity",
-                "key_terms": [
-                    "1x non-participating liquidation preference",
-                    "Pro-rata rights for follow-on rounds",
-                    "Board observer seat",
-                    "Standard protective provisions",
-                ],
-            },
-            "section_19_conditions": {
-                "title":
-                "Conditions & Covenants",
-                "conditions_precedent": [
-                    "Satisfactory completion of legal due diligence",
-                    "Verification of financial statements",
-                    "Key employee retention agreements",
-                    "IP assignment confirmation",
-                ],
-                "ongoing_covenants": [
-                    "Monthly financial reporting",
-                    "Quarterly board meetings",
-                    "Annual budget approval",
-                    "Material event notification",
-                ],
-            },
-            "section_20_appendices": {
-                "title":
-                "Appendices",
-                "items": [
-                    "A. Detailed Financial Statements",
-                    "B. Market Research Data Sources",
-                    "C. Technical Architecture Diagrams",
-                    "D. Team Biographies",
-                    "E. Comparable Transaction Analysis",
-                    "F. Risk Register (Full)",
-                    "G. Data Room Index",
-                ],
-            },
-        }
+    yield {
+        "section_18_deal_structure": {
+            "title":
+            "Proposed Deal Structure",
+            "investment_amount":
+            invest.get("funding_recommendation",
+                       {}).get("target", "$3-5M"),
+            "instrument":
+            "Series A Preferred Equity",
+            "key_terms": [
+                "1x non-participating liquidation preference",
+                "Pro-rata rights for follow-on rounds",
+                "Board observer seat",
+                "Standard protective provisions",
+            ],
+        },
+    }
+
+    yield {
+        "section_19_conditions": {
+            "title":
+            "Conditions & Covenants",
+            "conditions_precedent": [
+                "Satisfactory completion of legal due diligence",
+                "Verification of financial statements",
+                "Key employee retention agreements",
+                "IP assignment confirmation",
+            ],
+            "ongoing_covenants": [
+                "Monthly financial reporting",
+                "Quarterly board meetings",
+                "Annual budget approval",
+                "Material event notification",
+            ],
+        },
+    }
+
+    yield {
+        "section_20_appendices": {
+            "title":
+            "Appendices",
+            "items": [
+                "A. Detailed Financial Statements",
+                "B. Market Research Data Sources",
+                "C. Technical Architecture Diagrams",
+                "D. Team Biographies",
+                "E. Comparable Transaction Analysis",
+                "F. Risk Register (Full)",
+                "G. Data Room Index",
+            ],
+        },
+    }
+
+
+def _build_dd_report(company_name: str, analysis: dict) -> dict:
+    """Due Diligence report (see generate_dd_report) for a 9-module analysis"""
+    dd_report = {}
+    for part in _dd_report_parts(company_name, analysis):
+        dd_report.update(part)
+    return dd_report
+
+
+@app.post("/api/reports/dd")
+async def generate_dd_report(request: Request, stream: Optional[str] = None):
+    """
+    Generate a comprehensive Due Diligence report from 9-module analysis data.
+    Returns structured JSON with 20+ sections suitable for a thorough DD document.
+    With ?stream=ndjson or ?stream=sse the sections are streamed as they
+    are built, executive summary first (see _stream_report).
+    """
+    try:
+        _check_report_stream(stream)
+        data = await request.json()
+        company_name = data.get("company_name", "Unknown")
+        analysis = data.get("analysis_data")
+
+        # If no analysis provided, read from DB (by analysis_id when given)
+        if not analysis:
+            async with db_manager.get_connection() as conn:
+                analysis = await analysis_store.resolve(
+                    conn, data.get("analysis_id"), company_name)
+            if not analysis:
+                raise HTTPException(
+                    status_code=404,
+                    detail=
+                    "No analysis found. Run /api/analysis/9-module first.")
+            if "company_name" not in data:
+                company_name = analysis.get("company_name", company_name)
+
+        if stream:
+            return _stream_report(
+                _dd_report_parts(company_name, analysis, executive_first=True),
+                stream, "DD")
+        dd_report = _build_dd_report(company_name, analysis)
 
         logger.info(
             f"DD report generated for '{company_name}' â€” {dd_report['total_pages']} pages, 20 sections"
@@ -5968,9 +4608,89 @@ async def generate_dd_report(request: Request):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"DD report error: {e}")
+        logger.error(f"DD report error: {e}")
+        raise HTTPException(status_code=500,
+                            detail=f"DD report failed: {str(e)}")
+
+
+# â”€â”€â”€ Precomputed Reports â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+
+_REPORT_BUILDERS = {"triage": _build_triage_report, "dd": _build_dd_report}
+
+
+def _render_reports(analyses: List[dict]) -> List[tuple]:
+    """Encoded triage and DD reports for stored 9-module analyses"""
+    return [(analysis["analysis_id"], report_type,
+             *encode_report(build(analysis.get("company_name", "Unknown"),
+                                  analysis)))
+            for analysis in analyses
+            for report_type, build in _REPORT_BUILDERS.items()]
+
+
+async def _materialise_reports(conn, analyses: List[dict]):
+    """
+    Render and store the reports of just-stored analyses.  A failure only
+    costs the first view (GET renders missing reports on demand).
+    """
+    try:
+        rendered = await asyncio.to_thread(_render_reports, analyses)
+        await analysis_reports.save(conn, rendered)
+    except Exception as e:
+        logger.warning(f"Report precomputation failed: {e}")
+
+
+@app.get("/api/reports/{report_type}/{analysis_id}")
+async def get_stored_report(report_type: str, analysis_id: str,
+                            request: Request):
+    """
+    Triage or DD report of a stored analysis, served from the bytes
+    rendered when the analysis completed.  Supports If-None-Match (304)
+    and sends the stored gzip body as-is to clients accepting gzip.
+    """
+    if report_type not in REPORT_TYPES:
+        raise HTTPException(status_code=404, detail="Unknown report type")
+    if_none_match = request.headers.get("if-none-match")
+    try:
+        async with db_manager.get_connection() as conn:
+            stored = await analysis_reports.get(conn, analysis_id,
+                                                report_type, if_none_match)
+            if stored is None:
+                # Analysis from before precomputation, or an older
+                # REPORT_VERSION: render and store it now
+                analysis = await analysis_store.get(conn, analysis_id)
+                if analysis is None:
+                    raise HTTPException(status_code=404,
+                                        detail="Analysis not found")
+                rendered = await asyncio.to_thread(_render_reports,
+                                                   [analysis])
+                await analysis_reports.save(conn, rendered)
+                _, _, content, etag, _ = next(
+                    r for r in rendered if r[1] == report_type)
+                stored = StoredReport(etag, content)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Stored report error: {e}")
         raise HTTPException(status_code=500,
-                            detail=f"DD report failed: {str(e)}")
+                            detail=f"Report retrieval failed: {str(e)}")
+
+    headers = {
+        "ETag": stored.etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if stored.content is None or stored.etag in if_none_match_tags(
+            if_none_match):
+        return Response(status_code=304, headers=headers)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(stored.content,
+                        media_type="application/json",
+                        headers={
+                            **headers, "Content-Encoding": "gzip"
+                        })
+    return Response(gzip.decompress(stored.content),
+                    media_type="application/json",
+                    headers=headers)
 
 
 # Health check for API
@@ -6169,8 +4889,7 @@ def _ssd_build_key_metrics(payload: SSDStartupData) -> Dict[str, Any]:
 
 
 @app.post("/api/ssd/tirr")
-async def ssd_tirr_endpoint(payload: SSDStartupData,
-                            background_tasks: BackgroundTasks):
+async def ssd_tirr_endpoint(payload: SSDStartupData, request: Request):
     """
     TCA TIRR endpoint for the SSD application.
 
@@ -6187,6 +4906,11 @@ async def ssd_tirr_endpoint(payload: SSDStartupData,
 
     Response: immediate 202 Accepted with a tracking reference;
               the full report is delivered asynchronously via the SSD callback.
+              Steps 2-5 run as a durable ssd_tirr_jobs job (see ssd_jobs.py).
+
+    Idempotent: a resubmission (same Idempotency-Key header or, without
+    one, the same payload) while the first is in flight or recently
+    completed returns the first tracking_id with ``"duplicate": true``.
     """
     import hashlib
 
@@ -6198,50 +4922,100 @@ async def ssd_tirr_endpoint(payload: SSDStartupData,
     payload_json = payload.model_dump_json(exclude_none=True)
     payload_hash = hashlib.sha256(payload_json.encode()).hexdigest()[:16]
     payload_size = len(payload_json)
+    header_key = request.headers.get("idempotency-key")
+    idempotency_key = (f"key:{header_key}"
+                       if header_key else f"payload:{payload_hash}")
+
+    # Determine callback URL
+    callback = payload.callback_url or SSD_CALLBACK_URL
+
+    # Queue the heavy work so SSD gets an immediate response
+    try:
+        async with db_manager.get_connection() as conn:
+            existing = await ssd_jobs.enqueue(
+                conn, tracking_id,
+                payload.model_dump(mode="json", exclude_none=True), callback,
+                idempotency_key, payload_hash)
+    except IdempotencyKeyReused:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key was already used with a different payload")
+    except Exception as e:
+        logger.error(f"[SSD-TIRR] Could not queue {tracking_id}: {e}")
+        await _ssd_audit_log(tracking_id,
+                             "received", {
+                                 "company_name": company_name,
+                                 "founder_email": founder_email,
+                             },
+                             company_name=company_name,
+                             founder_email=founder_email,
+                             request_payload=payload.model_dump(
+                                 exclude_none=True),
+                             request_payload_hash=payload_hash,
+                             request_payload_size=payload_size)
+        await _ssd_audit_log(tracking_id,
+                             "error", {"error": str(e)},
+                             status="failed")
+        raise HTTPException(status_code=503,
+                            detail="Report queue unavailable, please retry")
+
+    if existing is not None:
+        logger.info(f"[SSD-TIRR] Duplicate request for '{company_name}' "
+                    f"matched {existing.tracking_id} ({existing.status})")
+        await _ssd_audit_log(existing.tracking_id, "duplicate_submission", {
+            "payload_hash": payload_hash,
+            "idempotency_key": header_key,
+        })
+        return JSONResponse(
+            status_code=202,
+            content={
+                "status":
+                "accepted",
+                "tracking_id":
+                existing.tracking_id,
+                "duplicate":
+                True,
+                "job_status":
+                existing.status,
+                "message":
+                f"Report for '{company_name}' was already requested. "
+                f"Results will be delivered to the SSD callback endpoint.",
+            },
+        )
 
     logger.info(f"[SSD-TIRR] Received request for '{company_name}' "
                 f"(founder={founder_email}, tracking={tracking_id})")
 
-    # Initialize audit log
-    _ssd_audit_log(tracking_id, "received", {
-        "company_name": company_name,
-        "founder_email": founder_email,
-    })
-    _ssd_audit_update(
+    # Initialize audit log (status defaults to pending; the job may
+    # already have moved it on)
+    await _ssd_audit_log(
         tracking_id,
+        "received", {
+            "company_name": company_name,
+            "founder_email": founder_email,
+        },
         company_name=company_name,
         founder_email=founder_email,
-        status="pending",
         request_payload=payload.model_dump(exclude_none=True),
         request_payload_hash=payload_hash,
-        request_payload_size=payload_size,
-    )
+        request_payload_size=payload_size)
 
-    # Determine callback URL
-    callback = payload.callback_url or SSD_CALLBACK_URL
     if not callback:
         logger.warning(
             "[SSD-TIRR] No SSD callback URL configured — report will be saved but not pushed."
         )
-        _ssd_audit_update(tracking_id,
-                          callback_url=None,
-                          callback_status="not_configured")
+        callback_fields = {
+            "callback_url": None,
+            "callback_status": "not_configured"
+        }
     else:
-        _ssd_audit_update(tracking_id, callback_url=callback)
+        callback_fields = {"callback_url": callback}
 
     # Log validation success
-    _ssd_audit_log(tracking_id, "validated", {
+    await _ssd_audit_log(tracking_id, "validated", {
         "payload_hash": payload_hash,
         "payload_size": payload_size,
-    })
-
-    # Schedule the heavy work in a background task so SSD gets an immediate response
-    background_tasks.add_task(
-        _process_ssd_tirr_request,
-        payload=payload,
-        tracking_id=tracking_id,
-        callback_url=callback,
-    )
+    }, **callback_fields)
 
     return JSONResponse(
         status_code=202,
@@ -6257,119 +5031,484 @@ async def ssd_tirr_endpoint(payload: SSDStartupData,
     )
 
 
+# Limits of one /api/ssd/tirr/bulk request
+SSD_BULK_MAX_RECORDS = int(os.getenv("SSD_BULK_MAX_RECORDS", "1000"))
+SSD_BULK_MAX_BYTES = int(os.getenv("SSD_BULK_MAX_BYTES",
+                                   str(32 * 1024 * 1024)))
+
+
+class _SSDBulkRecord(NamedTuple):
+    line: int
+    payload: SSDStartupData
+    company_name: str
+    founder_email: str
+    payload_hash: str
+    payload_size: int
+    job: QueuedJob
+    upload: Dict[str, Any]  # allupload row
+
+
+def _ssd_bulk_audit_events(
+        record: _SSDBulkRecord,
+        duplicate_of: Optional[ExistingJob]) -> List[AuditEvent]:
+    """The audit events /api/ssd/tirr logs for the same submission"""
+    if duplicate_of is not None:
+        return [
+            AuditEvent(duplicate_of.tracking_id, "duplicate_submission", {
+                "payload_hash": record.payload_hash,
+                "idempotency_key": None,
+                "bulk_line": record.line,
+            })
+        ]
+    tracking_id = record.job.tracking_id
+    callback_fields = {"callback_url": record.job.callback_url}
+    if not record.job.callback_url:
+        callback_fields["callback_status"] = "not_configured"
+    return [
+        AuditEvent(
+            tracking_id, "received", {
+                "company_name": record.company_name,
+                "founder_email": record.founder_email,
+                "bulk_line": record.line,
+            }, {
+                "company_name": record.company_name,
+                "founder_email": record.founder_email,
+                "request_payload":
+                record.payload.model_dump(exclude_none=True),
+                "request_payload_hash": record.payload_hash,
+                "request_payload_size": record.payload_size,
+            }),
+        AuditEvent(tracking_id, "validated", {
+            "payload_hash": record.payload_hash,
+            "payload_size": record.payload_size,
+        }, callback_fields),
+    ]
+
+
+def _ssd_bulk_result(record: _SSDBulkRecord,
+                     duplicate_of: Optional[ExistingJob]) -> Dict[str, Any]:
+    """Response line of a validated bulk record"""
+    if duplicate_of is not None:
+        return {
+            "line": record.line,
+            "status": "duplicate",
+            "tracking_id": duplicate_of.tracking_id,
+            "job_status": duplicate_of.status,
+        }
+    return {
+        "line": record.line,
+        "status": "accepted",
+        "tracking_id": record.job.tracking_id
+    }
+
+
+@app.post("/api/ssd/tirr/bulk")
+async def ssd_tirr_bulk_endpoint(request: Request):
+    """
+    Bulk /api/ssd/tirr, for SSD replaying submissions after an outage.
+
+    Request body: NDJSON, one SSDStartupData per line.  Every line is
+    validated first; the valid ones are then stored with one allupload
+    batch insert, queued with one ssd_tirr_jobs INSERT and audit-logged
+    with ssd_audit.record_many(), in a single transaction, before the
+    response starts.  The queue's workers (SSD_JOB_CONCURRENCY) bound how
+    many are processed at once.  A line with the same payload as a job in
+    flight or recently completed, or as an earlier line, is a duplicate.
+
+    Response: streamed NDJSON, one result per input line, in order, then a
+    summary:
+
+        {"line": 1, "status": "accepted", "tracking_id": "..."}
+        {"line": 2, "status": "duplicate", "tracking_id": "...", "job_status": "running"}
+        {"line": 3, "status": "invalid", "errors": [{"loc": [...], "msg": "...", "type": "..."}]}
+        {"summary": {"accepted": 1, "duplicate": 1, "invalid": 1}}
+    """
+    import hashlib
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > SSD_BULK_MAX_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Body exceeds {SSD_BULK_MAX_BYTES} bytes")
+    lines = [(n, line) for n, line in enumerate(bytes(body).splitlines(), 1)
+             if line.strip()]
+    if not lines:
+        raise HTTPException(status_code=400, detail="No NDJSON records")
+    if len(lines) > SSD_BULK_MAX_RECORDS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {SSD_BULK_MAX_RECORDS} records per request")
+
+    # ── Validate every line ──────────────────────────────────────────
+    invalid: Dict[int, List[Dict[str, Any]]] = {}
+    records: List[_SSDBulkRecord] = []
+    for n, line in lines:
+        try:
+            payload = SSDStartupData.model_validate_json(line)
+        except ValidationError as e:
+            invalid[n] = [{
+                "loc": list(error["loc"]),
+                "msg": error["msg"],
+                "type": error["type"]
+            } for error in e.errors()]
+            continue
+        company_name = payload.companyInformation.companyName or f"{payload.contactInformation.firstName}'s Company"
+        founder_email = payload.contactInformation.email
+        tracking_id = str(uuid.uuid4())
+        payload_json = payload.model_dump_json(exclude_none=True)
+        payload_hash = hashlib.sha256(payload_json.encode()).hexdigest()[:16]
+        upload = _ssd_upload_record(payload, tracking_id, company_name,
+                                    founder_email,
+                                    _ssd_extracted_data(payload))
+        job = QueuedJob(tracking_id,
+                        payload.model_dump(mode="json", exclude_none=True),
+                        payload.callback_url or SSD_CALLBACK_URL,
+                        f"payload:{payload_hash}", payload_hash,
+                        str(upload["upload_id"]))
+        records.append(
+            _SSDBulkRecord(n, payload, company_name, founder_email,
+                           payload_hash, len(payload_json), job, upload))
+
+    # ── Store, queue and audit the valid ones in one transaction ─────
+    existing: List[Optional[ExistingJob]] = []
+    if records:
+        try:
+            async with db_manager.get_connection() as conn:
+                async with conn.transaction():
+                    existing = await ssd_jobs.enqueue_many(
+                        conn, [r.job for r in records])
+                    stored = [
+                        r for r, e in zip(records, existing) if e is None
+                    ]
+                    await insert_upload_records(conn,
+                                                [r.upload for r in stored])
+                    await ssd_audit.record_many(
+                        conn, [
+                            event for r, e in zip(records, existing)
+                            for event in _ssd_bulk_audit_events(r, e)
+                        ])
+                await company_profiles.on_uploads_changed(
+                    conn, {r.company_name for r in stored})
+        except Exception as e:
+            logger.error(f"[SSD-TIRR] Could not queue bulk request "
+                         f"({len(records)} records): {e}")
+            raise HTTPException(status_code=503,
+                                detail="Report queue unavailable, please retry")
+    audited = {
+        r.line: _ssd_bulk_result(r, e)
+        for r, e in zip(records, existing)
+    }
+    logger.info(f"[SSD-TIRR] Bulk request: {len(lines)} records, "
+                f"{existing.count(None)} queued, "
+                f"{len(records) - existing.count(None)} duplicate, "
+                f"{len(invalid)} invalid")
+
+    async def results():
+        counts = {"accepted": 0, "duplicate": 0, "invalid": 0}
+        for n, _ in lines:
+            result = audited.get(n) or {
+                "line": n,
+                "status": "invalid",
+                "errors": invalid[n]
+            }
+            counts[result["status"]] += 1
+            yield json.dumps(result) + "\n"
+        yield json.dumps({"summary": counts}) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+def _ssd_report_response(request: Request, report: ReportFile,
+                         fields: Dict[str, Any]) -> Response:
+    """
+    ``{**fields, "report": <stored report>}`` with the stored JSON streamed
+    as-is (not parsed), or 304 when If-None-Match names the stored file.
+    """
+    headers = {"ETag": report.etag, "Cache-Control": "private, no-cache"}
+    tags = if_none_match_tags(request.headers.get("if-none-match"))
+    if report.etag in tags or "*" in tags:
+        return Response(status_code=304, headers=headers)
+
+    async def body():
+        yield json.dumps(fields)[:-1].encode() + b', "report": '
+        async for chunk in ssd_reports.iter_json(report):
+            yield chunk
+        yield b"}"
+
+    return StreamingResponse(body(),
+                             media_type="application/json",
+                             headers=headers)
+
+
 @app.get("/api/ssd/tirr/{tracking_id}")
-async def ssd_tirr_status(tracking_id: str):
+async def ssd_tirr_status(tracking_id: str, request: Request):
     """
     Check the status of a TCA TIRR report by tracking_id.
-    Returns the report if it has been generated, or a status message otherwise.
+    Returns the report if it has been generated (with an ETag; supports
+    If-None-Match), or a status message otherwise.
     """
-    report_path = REPORTS_DIR / f"tirr_{tracking_id}.json"
-    if report_path.exists():
-        with open(report_path, "r", encoding="utf-8") as f:
-            report = json.load(f)
-        return {
-            "status": "completed",
-            "tracking_id": tracking_id,
-            "report_file_path": str(report_path),
-            "report": report,
-        }
+    report = await ssd_reports.stat(tracking_id)
+    if report is not None:
+        return _ssd_report_response(
+            request, report, {
+                "status": "completed",
+                "tracking_id": tracking_id,
+                "report_file_path": str(report.path),
+            })
     else:
+        async with db_manager.get_connection() as conn:
+            job = await ssd_jobs.get(conn, tracking_id)
+        if job is not None and job["status"] == "failed":
+            return {
+                "status": "failed",
+                "tracking_id": tracking_id,
+                "message": "Report generation failed.",
+                "job": job,
+            }
         return JSONResponse(
             status_code=202,
             content={
                 "status": "processing",
                 "tracking_id": tracking_id,
                 "message": "Report is still being generated.",
+                "job": job,
             },
         )
 
 
-async def _process_ssd_tirr_request(
-    payload: SSDStartupData,
-    tracking_id: str,
-    callback_url: str,
-):
+# Interval of SSE keep-alive comments while no stage completes
+SSD_EVENTS_KEEPALIVE_S = 15.0
+
+
+async def _ssd_stage_snapshot(tracking_id: str):
+    """Stage events of a job as recorded in the database (ssd_events.py)"""
+    async with db_manager.get_connection() as conn:
+        job = await ssd_jobs.get(conn, tracking_id)
+        if job is None:
+            return None
+        callbacks = await ssd_callbacks.get(conn, tracking_id)
+    return snapshot_events(job, callbacks), bool(job["callback_url"])
+
+
+@app.get("/api/ssd/tirr/{tracking_id}/wait")
+async def ssd_tirr_wait(tracking_id: str,
+                        after: Optional[str] = None,
+                        timeout: float = Query(25, ge=0, le=60)):
+    """
+    Long-poll the progress of a TIRR job.  Returns as soon as a stage
+    after ``after`` completes (data_extraction, scoring, report, callback,
+    or failed), or with no events after ``timeout`` seconds.  Pass the
+    returned ``last_event`` as ``after`` to continue until ``done``.
+    """
+    if after is not None and after not in SSD_STAGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"after must be one of {', '.join(SSD_STAGES)}")
+    try:
+        events, done = await ssd_events.wait(
+            tracking_id, lambda: _ssd_stage_snapshot(tracking_id), after,
+            timeout)
+    except LookupError:
+        raise HTTPException(status_code=404,
+                            detail=f"Unknown tracking_id '{tracking_id}'")
+    return {
+        "tracking_id": tracking_id,
+        "events": events,
+        "done": done,
+        "last_event": events[-1]["stage"] if events else after,
+    }
+
+
+@app.get("/api/ssd/tirr/{tracking_id}/events")
+async def ssd_tirr_events(tracking_id: str, request: Request):
+    """
+    Server-Sent Events stream of a TIRR job's stages as they complete
+    (``id`` and ``event`` are the stage name), ending with an ``end``
+    event once the job is done.  Reconnecting with Last-Event-ID resumes
+    after that stage.
+    """
+    after = request.headers.get("last-event-id")
+    if after not in SSD_STAGES:
+        after = None
+
+    def load():
+        return _ssd_stage_snapshot(tracking_id)
+
+    try:
+        first = await ssd_events.wait(tracking_id, load, after, 0)
+    except LookupError:
+        raise HTTPException(status_code=404,
+                            detail=f"Unknown tracking_id '{tracking_id}'")
+
+    async def frames():
+        nonlocal after
+        events, done = first
+        while True:
+            for event in events:
+                after = event["stage"]
+                yield (f"id: {after}\nevent: {after}\n"
+                       f"data: {json.dumps(event, default=str)}\n\n")
+            if done:
+                yield "event: end\ndata: {}\n\n"
+                return
+            if not events:
+                yield ": keep-alive\n\n"
+            if await request.is_disconnected():
+                return
+            try:
+                events, done = await ssd_events.wait(
+                    tracking_id, load, after, SSD_EVENTS_KEEPALIVE_S)
+            except LookupError:
+                return
+
+    return StreamingResponse(frames(),
+                             media_type="text/event-stream",
+                             headers={
+                                 "Cache-Control": "no-cache",
+                                 "X-Accel-Buffering": "no"
+                             })
+
+
+@app.get("/api/ssd/jobs/stats")
+async def ssd_job_stats():
+    """SSD TIRR job queue depth and this process's worker counters"""
+    async with db_manager.get_connection() as conn:
+        queue = await ssd_jobs.queue_stats(conn)
+        callbacks = await ssd_callbacks.queue_stats(conn)
+    return {
+        **ssd_jobs.stats(), "queue": queue,
+        "callbacks": {
+            **ssd_callbacks.stats(), "queue": callbacks
+        },
+        "events": ssd_events.stats()
+    }
+
+
+async def _ssd_stage(tracking_id: str,
+                     stage: str,
+                     details: Optional[Dict[str, Any]] = None,
+                     upload_id: Optional[str] = None,
+                     **fields):
+    """Audit-log a pipeline stage, timestamp it on the job row and publish
+    the stage event it completes (ssd_events.py)"""
+    await _ssd_audit_log(tracking_id, "processing", {
+        "stage": stage,
+        **(details or {})
+    }, **fields)
+    await ssd_jobs.mark_stage(tracking_id, stage, upload_id)
+    ssd_events.publish_stage(tracking_id, stage, details)
+
+
+def _ssd_extracted_data(payload: SSDStartupData) -> Dict[str, Any]:
+    """allupload extracted_data of an SSD submission"""
+    text = _ssd_build_extracted_text(payload)
+    financial_data = _ssd_build_financial_data(payload)
+    key_metrics = _ssd_build_key_metrics(payload)
+    return {
+        "text_content": text,
+        "word_count": len(text.split()),
+        "char_count": len(text),
+        "financial_data": financial_data,
+        "key_metrics": key_metrics,
+        "company_data": {
+            **financial_data,
+            **key_metrics,
+        },
+        "ssd_payload": payload.model_dump(mode="json", exclude_none=True),
+    }
+
+
+def _ssd_upload_record(payload: SSDStartupData, tracking_id: str,
+                       company_name: str, founder_email: str,
+                       extracted_data: Dict[str, Any]) -> Dict[str, Any]:
+    """The allupload row (upload_batch.upload_record) of an SSD submission"""
+    return upload_record(
+        f"SSD-{company_name}",
+        "application/json",
+        len(extracted_data["text_content"].encode()),
+        extracted_data,
+        company_name,
+        "processing",
+        None, {
+            "source":
+            "ssd_tirr",
+            "tracking_id":
+            tracking_id,
+            "founder_email":
+            founder_email,
+            "founder_name":
+            f"{payload.contactInformation.firstName} {payload.contactInformation.lastName}",
+        },
+        source_type="ssd_tirr")
+
+
+async def _ssd_insert_upload(payload: SSDStartupData, tracking_id: str,
+                             company_name: str, founder_email: str,
+                             extracted_data: Dict[str, Any]) -> str:
+    """Store an SSD submission as an allupload row and return its upload_id"""
+    record = _ssd_upload_record(payload, tracking_id, company_name,
+                                founder_email, extracted_data)
+    async with db_manager.get_connection() as conn:
+        await insert_upload_records(conn, [record])
+        await company_profiles.on_uploads_changed(conn, [company_name])
+    return str(record["upload_id"])
+
+
+async def _process_ssd_tirr_request(job: SSDJob):
     """
-    Background task that:
-      1. Stores the SSD data in allupload
+    ssd_jobs handler, one attempt of a queued SSD request:
+      1. Stores the SSD data in allupload (once; retries reuse the row)
       2. Runs the 9-module analysis
       3. Generates a triage report
-      4. Saves the report to REPORTS_DIR
-      5. POSTs the callback to SSD CaptureTCAReportResponse
+      4. Saves the report (compressed, see ssd_reports.py)
+      5. Queues the callback to SSD CaptureTCAReportResponse
+         (delivered by the ssd_callbacks outbox)
+
+    Failures are re-raised so the queue retries the job; only the final
+    attempt marks the request failed and notifies SSD.
     """
     import time
     start_time = time.time()
 
+    tracking_id = job.tracking_id
+    callback_url = job.callback_url
+    payload = SSDStartupData.model_validate(job.payload)
     company_name = payload.companyInformation.companyName or f"{payload.contactInformation.firstName}'s Company"
     founder_email = payload.contactInformation.email
-    upload_id = None
+    upload_id = job.upload_id
 
     # Update audit status to processing
-    _ssd_audit_log(tracking_id, "processing", {"stage": "started"})
-    _ssd_audit_update(tracking_id, status="processing")
+    await _ssd_audit_log(tracking_id,
+                         "processing", {
+                             "stage": "started",
+                             "attempt": job.attempt
+                         },
+                         status="processing")
 
     try:
         # ── 1. Persist to allupload ──────────────────────────────────
-        _ssd_audit_log(tracking_id, "processing", {"stage": "data_extraction"})
-
-        text = _ssd_build_extracted_text(payload)
-        financial_data = _ssd_build_financial_data(payload)
-        key_metrics = _ssd_build_key_metrics(payload)
-
-        extracted_data: Dict[str, Any] = {
-            "text_content": text,
-            "word_count": len(text.split()),
-            "char_count": len(text),
-            "financial_data": financial_data,
-            "key_metrics": key_metrics,
-            "company_data": {
-                **financial_data,
-                **key_metrics,
-            },
-            "ssd_payload": payload.model_dump(exclude_none=True),
-        }
-
-        _ssd_audit_log(tracking_id, "processing", {"stage": "database_insert"})
+        await _ssd_stage(tracking_id, "data_extraction")
 
-        async with db_manager.get_connection() as conn:
-            row = await conn.fetchrow(
-                """
-                INSERT INTO allupload
-                    (source_type, file_name, file_type,
-                     extracted_text, extracted_data, company_name,
-                     processing_status, upload_metadata)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                RETURNING upload_id, created_at
-                """,
-                "ssd_tirr",
-                f"SSD-{company_name}",
-                "application/json",
-                text,
-                json.dumps(extracted_data, default=str),
-                company_name,
-                "processing",
-                json.dumps({
-                    "source":
-                    "ssd_tirr",
-                    "tracking_id":
-                    tracking_id,
-                    "founder_email":
-                    founder_email,
-                    "founder_name":
-                    f"{payload.contactInformation.firstName} {payload.contactInformation.lastName}",
-                }),
-            )
-            upload_id = str(row["upload_id"])
+        extracted_data = _ssd_extracted_data(payload)
+        text = extracted_data["text_content"]
 
-        logger.info(f"[SSD-TIRR] Data stored as upload_id={upload_id}")
-        _ssd_audit_log(tracking_id, "processing", {
-            "stage": "data_stored",
-            "upload_id": upload_id
-        })
+        if upload_id:
+            logger.info(f"[SSD-TIRR] Reusing upload_id={upload_id} "
+                        f"(attempt {job.attempt})")
+        else:
+            await _ssd_stage(tracking_id, "database_insert")
+            upload_id = await _ssd_insert_upload(payload, tracking_id,
+                                                 company_name, founder_email,
+                                                 extracted_data)
+            logger.info(f"[SSD-TIRR] Data stored as upload_id={upload_id}")
+        await _ssd_stage(tracking_id,
+                         "data_stored", {"upload_id": upload_id},
+                         upload_id=upload_id)
 
         # ── 2. Run 9-module analysis ─────────────────────────────────
-        _ssd_audit_log(tracking_id, "processing",
-                       {"stage": "analysis_started"})
+        await _ssd_stage(tracking_id, "analysis_started")
 
         merged_data = extracted_data.copy()
         company_context = {
@@ -6383,8 +5522,10 @@ async def _process_ssd_tirr_request(
         weighted_score = 0.0
         source_ids = [upload_id]
 
+        features = FeatureContext(company_context, merged_data)
+        results, _ = module_memo.run_modules(NINE_MODULES, features)
         for mod in NINE_MODULES:
-            result = _run_module(mod, company_context, merged_data)
+            result = results[mod["id"]]
             score = result.get("score", 0)
             w = mod["weight"]
             result["weighted_score"] = round(score * w / 100, 2)
@@ -6400,6 +5541,7 @@ async def _process_ssd_tirr_request(
         score_interpretation = interpret_score(final_score)
 
         analysis_output = {
+            "analysis_id": f"tirr_{tracking_id}",
             "analysis_type": "comprehensive_9_module",
             "company_name": company_name,
             "timestamp": datetime.utcnow().isoformat(),
@@ -6412,38 +5554,25 @@ async def _process_ssd_tirr_request(
             "module_results": module_results,
         }
 
-        # Store analysis result back into allupload
+        # Store the analysis and link it to the upload
         async with db_manager.get_connection() as conn:
-            await conn.execute(
-                """UPDATE allupload
-                   SET analysis_result = $1,
-                       analysis_id = $2,
-                       processing_status = 'completed',
-                       updated_at = NOW()
-                   WHERE upload_id = $3""",
-                json.dumps(analysis_output),
-                f"tirr_{tracking_id}",
-                uuid.UUID(upload_id),
-            )
+            await analysis_store.save(conn, [analysis_output],
+                                      processing_status="completed")
+            await _materialise_reports(conn, [analysis_output])
 
         logger.info(
             f"[SSD-TIRR] 9-module analysis complete: score={final_score}, rec={recommendation}"
         )
-        _ssd_audit_log(
-            tracking_id, "processing", {
-                "stage": "analysis_complete",
-                "final_score": final_score,
-                "recommendation": recommendation,
-            })
-        _ssd_audit_update(
-            tracking_id,
-            final_score=final_score,
-            recommendation=recommendation,
-        )
+        await _ssd_stage(tracking_id,
+                         "analysis_complete", {
+                             "final_score": final_score,
+                             "recommendation": recommendation,
+                         },
+                         final_score=final_score,
+                         recommendation=recommendation)
 
         # ── 3. Generate triage report ────────────────────────────────
-        _ssd_audit_log(tracking_id, "processing",
-                       {"stage": "report_generation"})
+        await _ssd_stage(tracking_id, "report_generation")
         mr = analysis_output.get("module_results", {})
         tca = mr.get("tca_scorecard", {})
         risk = mr.get("risk_assessment", {})
@@ -6558,22 +5687,17 @@ async def _process_ssd_tirr_request(
                 "funding_recommendation":
                 invest.get("funding_recommendation", {}),
                 "next_steps":
-                PAGE_CONFIG["page_6_recommendations"]["default_next_steps"],
+                PAGE_CONFIG["page_10_recommendations"]["default_next_steps"],
             },
         }
 
         # ── 4. Save report to filesystem ─────────────────────────────
-        report_filename = f"tirr_{tracking_id}.json"
-        report_path = REPORTS_DIR / report_filename
-        with open(report_path, "w", encoding="utf-8") as f:
-            json.dump(triage_report, f, indent=2, default=str)
+        report_path = await ssd_reports.save(tracking_id, triage_report)
 
         logger.info(f"[SSD-TIRR] Triage report saved → {report_path}")
-        _ssd_audit_log(tracking_id, "processing", {
-            "stage": "report_saved",
-            "path": str(report_path)
-        })
-        _ssd_audit_update(tracking_id, report_path=str(report_path))
+        await _ssd_stage(tracking_id,
+                         "report_saved", {"path": str(report_path)},
+                         report_path=str(report_path))
 
         # ── 4.1 Store report in database for searchability ───────────
         try:
@@ -6605,116 +5729,143 @@ async def _process_ssd_tirr_request(
                     "source": "SSD-TIRR",
                     "approval_status": "Pending"
                 }
-                await conn.execute(
+                # Once per tracking_id: retries and reclaimed jobs run
+                # this step again
+                inserted = await conn.execute(
                     """
                     INSERT INTO reports (
                         title, report_type, status, metadata, generated_at
-                    ) VALUES ($1, $2, $3, $4, NOW())
+                    )
+                    SELECT $1, $2, $3, $4::jsonb, NOW()
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM reports
+                        WHERE report_type = $2
+                          AND metadata->>'tracking_id' = $5)
                 """, company_name, "SSD-TIRR", "Completed",
-                    json.dumps(metadata))
-                logger.info(
-                    f"[SSD-TIRR] Report stored in database for company: {company_name}"
-                )
+                    json.dumps(metadata), tracking_id)
+                if inserted != "INSERT 0 0":
+                    logger.info(
+                        f"[SSD-TIRR] Report stored in database for company: {company_name}"
+                    )
         except Exception as db_err:
             logger.warning(
                 f"[SSD-TIRR] Failed to store report in database: {db_err}")
             # Non-fatal - continue with callback
 
-        # ── 5. POST callback to SSD CaptureTCAReportResponse ─────────
+        # ── 5. Queue callback to SSD CaptureTCAReportResponse ────────
         if callback_url:
             # Response payload per spec section 4.2
+            # The report endpoint, not the storage path: the file layout
+            # (ssd_reports.py) is not part of the SSD contract
             callback_payload = {
-                "founderEmail": founder_email,
-                "generatedReportPath": str(report_path),
+                "founderEmail":
+                founder_email,
+                "generatedReportPath":
+                f"{SSD_REPORT_BASE_URL}/api/ssd/audit/logs/{tracking_id}/report",
             }
-            _ssd_audit_update(tracking_id, response_payload=callback_payload)
+            await _ssd_audit_update(tracking_id,
+                                    response_payload=callback_payload)
 
-            try:
-                async with httpx.AsyncClient(timeout=30) as client:
-                    resp = await client.post(callback_url,
-                                             json=callback_payload)
-                    resp.raise_for_status()
-                logger.info(
-                    f"[SSD-TIRR] Callback sent to {callback_url} — HTTP {resp.status_code}"
-                )
-                _ssd_audit_log(tracking_id, "callback_sent", {
-                    "url": callback_url,
-                    "status_code": resp.status_code,
-                })
-                _ssd_audit_update(
-                    tracking_id,
-                    callback_status="sent",
-                    callback_response_code=resp.status_code,
-                    callback_sent_at=datetime.utcnow().isoformat() + "Z",
-                )
-            except Exception as cb_err:
-                logger.error(f"[SSD-TIRR] Callback to SSD failed: {cb_err}")
-                _ssd_audit_log(tracking_id, "callback_failed", {
-                    "url": callback_url,
-                    "error": str(cb_err),
-                })
-                _ssd_audit_update(tracking_id, callback_status="failed")
+            # Delivered (and retried) by the callback outbox
+            async with db_manager.get_connection() as conn:
+                queued = await ssd_callbacks.enqueue(conn, tracking_id,
+                                                     "report", callback_url,
+                                                     callback_payload)
+            if queued:
+                await _ssd_audit_log(tracking_id,
+                                     "callback_queued", {"url": callback_url},
+                                     callback_status="pending")
+            await ssd_jobs.mark_stage(tracking_id, "callback_queued")
         else:
             logger.info(
                 "[SSD-TIRR] No callback URL — skipping SSD notification.")
 
         # Mark completed
         processing_duration_ms = int((time.time() - start_time) * 1000)
-        _ssd_audit_log(
-            tracking_id, "completed", {
-                "duration_ms": processing_duration_ms,
-                "final_score": final_score,
-                "recommendation": recommendation,
-            })
-        _ssd_audit_update(
-            tracking_id,
-            status="completed",
-            processing_duration_ms=processing_duration_ms,
-        )
+        await _ssd_audit_log(tracking_id,
+                             "completed", {
+                                 "duration_ms": processing_duration_ms,
+                                 "final_score": final_score,
+                                 "recommendation": recommendation,
+                             },
+                             status="completed",
+                             processing_duration_ms=processing_duration_ms)
 
     except Exception as e:
-        logger.error(
-            f"[SSD-TIRR] Processing failed for tracking_id={tracking_id}: {e}")
-        _ssd_audit_log(tracking_id, "error", {"error": str(e)})
-        _ssd_audit_update(tracking_id, status="failed")
-        # Update allupload status to failed if we got an upload_id
-        if upload_id:
-            try:
-                async with db_manager.get_connection() as conn:
-                    await conn.execute(
-                        """UPDATE allupload
-                           SET processing_status = 'failed',
-                               processing_error = $1,
-                               updated_at = NOW()
-                           WHERE upload_id = $2""",
-                        str(e),
-                        uuid.UUID(upload_id),
-                    )
-            except Exception as update_err:
-                logger.error(
-                    f"[SSD-TIRR] Failed to update status: {update_err}")
+        if not job.final_attempt:
+            await _ssd_audit_log(tracking_id,
+                                 "retry_scheduled", {
+                                     "attempt": job.attempt,
+                                     "max_attempts": job.max_attempts,
+                                     "error": str(e),
+                                 },
+                                 status="retrying")
+            raise
+        await _ssd_tirr_failed(job, str(e), upload_id)
+        raise
 
-        # Attempt to notify SSD of failure (error response per spec section 5.3)
-        if callback_url:
-            try:
-                async with httpx.AsyncClient(timeout=15) as client:
-                    await client.post(
-                        callback_url,
-                        json={
-                            "error": {
-                                "code": "REPORT_GENERATION_FAILED",
-                                "message": str(e),
-                                "details": {
-                                    "tracking_id":
-                                    tracking_id,
-                                    "timestamp":
-                                    datetime.utcnow().isoformat() + "Z",
-                                },
+
+async def _ssd_tirr_failed(job: SSDJob,
+                           error: str,
+                           upload_id: Optional[str] = None):
+    """
+    Final failure of an SSD request: audit it, publish the ``failed``
+    event, mark its allupload row failed and queue the error callback.
+    Runs after the handler's last attempt raised, and for jobs whose worker
+    died during it (ssd_jobs on_abandoned).
+    """
+    tracking_id = job.tracking_id
+    callback_url = job.callback_url
+    founder_email = job.payload.get("contactInformation", {}).get("email")
+    upload_id = upload_id or job.upload_id
+
+    logger.error(
+        f"[SSD-TIRR] Processing failed for tracking_id={tracking_id}: {error}")
+    await _ssd_audit_log(tracking_id,
+                         "error", {"error": error},
+                         status="failed")
+    ssd_events.publish(tracking_id, "failed", error=error)
+    # Update allupload status to failed if we got an upload_id
+    if upload_id:
+        try:
+            async with db_manager.get_connection() as conn:
+                await conn.execute(
+                    """UPDATE allupload
+                       SET processing_status = 'failed',
+                           processing_error = $1,
+                           updated_at = NOW()
+                       WHERE upload_id = $2""",
+                    error,
+                    uuid.UUID(upload_id),
+                )
+        except Exception as update_err:
+            logger.error(
+                f"[SSD-TIRR] Failed to update status: {update_err}")
+
+    # Notify SSD of failure (error response per spec section 5.3)
+    if callback_url:
+        try:
+            async with db_manager.get_connection() as conn:
+                await ssd_callbacks.enqueue(
+                    conn, tracking_id, "error", callback_url, {
+                        "error": {
+                            "code": "REPORT_GENERATION_FAILED",
+                            "message": error,
+                            "details": {
+                                "tracking_id":
+                                tracking_id,
+                                "timestamp":
+                                datetime.utcnow().isoformat() + "Z",
                             },
-                            "founderEmail": founder_email,
-                        })
-            except Exception:
-                pass
+                        },
+                        "founderEmail": founder_email,
+                    })
+        except Exception as notify_err:
+            logger.error(
+                f"[SSD-TIRR] Could not queue failure notification: {notify_err}")
+
+
+ssd_jobs.set_handler(_process_ssd_tirr_request, on_abandoned=_ssd_tirr_failed)
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -6726,52 +5877,63 @@ async def _process_ssd_tirr_request(
 @app.get("/api/v1/ssd/audit/logs")  # v1 alias
 async def list_ssd_audit_logs(
     status: Optional[str] = None,
-    limit: int = 50,
-    offset: int = 0,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
 ):
     """
     List all SSD integration audit logs.
     Admin endpoint to review all SSD→TCA TIRR requests.
+    Newest first; pass ``next_cursor`` back as ``cursor`` for the next
+    page.  Entries are summaries: events and payloads are on the detail
+    endpoints.  ``total`` takes a full count, so it is only returned with
+    ``include_total=true`` or for legacy offset paging (offset > 0);
+    otherwise it is null.
     """
-    logs = list(SSD_AUDIT_LOGS.values())
-
-    # Filter by status if provided
-    if status:
-        logs = [l for l in logs if l.get("status") == status]
-
-    # Sort by created_at descending
-    logs.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-
-    # Paginate
-    total = len(logs)
-    paginated = logs[offset:offset + limit]
+    try:
+        async with db_manager.get_connection() as conn:
+            logs, next_cursor = await ssd_audit.page(conn, status, limit,
+                                                     cursor, offset)
+            total = None
+            if include_total or (offset and cursor is None):
+                total = await ssd_audit.count(conn, status)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return {
         "total": total,
         "limit": limit,
         "offset": offset,
-        "logs": paginated,
+        "next_cursor": next_cursor,
+        "logs": logs,
     }
 
 
+async def _get_ssd_audit_log(tracking_id: str,
+                             events: bool = True) -> Dict[str, Any]:
+    async with db_manager.get_connection() as conn:
+        audit_log = await ssd_audit.get(conn, tracking_id, events)
+    if audit_log is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Audit log for tracking_id '{tracking_id}' not found")
+    return audit_log
+
+
 @app.get("/api/ssd/audit/logs/{tracking_id}")
 async def get_ssd_audit_log(tracking_id: str):
     """
     Get detailed audit log for a specific SSD request by tracking_id.
     Includes all events, request/response data, and processing details.
     """
-    if tracking_id not in SSD_AUDIT_LOGS:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Audit log for tracking_id '{tracking_id}' not found")
-
-    audit_log = SSD_AUDIT_LOGS[tracking_id]
+    audit_log = await _get_ssd_audit_log(tracking_id)
 
     # Also check if report exists and enrich with report info
-    report_path = REPORTS_DIR / f"tirr_{tracking_id}.json"
-    if report_path.exists():
+    report = await ssd_reports.stat(tracking_id)
+    if report is not None:
         audit_log["report_exists"] = True
-        audit_log["report_file_size"] = report_path.stat().st_size
+        audit_log["report_file_size"] = report.size
     else:
         audit_log["report_exists"] = False
 
@@ -6784,12 +5946,7 @@ async def get_ssd_request_payload(tracking_id: str):
     Retrieve the original SSD request payload for a tracking_id.
     Used for audit review to see exact data received from SSD.
     """
-    if tracking_id not in SSD_AUDIT_LOGS:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Audit log for tracking_id '{tracking_id}' not found")
-
-    audit_log = SSD_AUDIT_LOGS[tracking_id]
+    audit_log = await _get_ssd_audit_log(tracking_id, events=False)
 
     return {
         "tracking_id": tracking_id,
@@ -6804,13 +5961,12 @@ async def get_ssd_response_payload(tracking_id: str):
     """
     Retrieve the callback response sent to SSD for a tracking_id.
     Used for audit review to see exact data sent back to SSD.
+    ``deliveries`` lists each queued callback with its attempts and
+    delivery latency (ssd_callbacks.py).
     """
-    if tracking_id not in SSD_AUDIT_LOGS:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Audit log for tracking_id '{tracking_id}' not found")
-
-    audit_log = SSD_AUDIT_LOGS[tracking_id]
+    audit_log = await _get_ssd_audit_log(tracking_id, events=False)
+    async with db_manager.get_connection() as conn:
+        deliveries = await ssd_callbacks.get(conn, tracking_id)
 
     return {
         "tracking_id": tracking_id,
@@ -6819,82 +5975,71 @@ async def get_ssd_response_payload(tracking_id: str):
         "callback_response_code": audit_log.get("callback_response_code"),
         "response_payload": audit_log.get("response_payload"),
         "sent_at": audit_log.get("callback_sent_at"),
+        "deliveries": deliveries,
     }
 
 
 @app.get("/api/ssd/audit/logs/{tracking_id}/report")
-async def get_ssd_report_data(tracking_id: str):
+async def get_ssd_report_data(tracking_id: str, request: Request):
     """
     Retrieve the generated report for a tracking_id.
-    Returns the full report JSON if available.
+    Returns the full report JSON if available (with an ETag; supports
+    If-None-Match).
     """
-    report_path = REPORTS_DIR / f"tirr_{tracking_id}.json"
-    if not report_path.exists():
+    report = await ssd_reports.stat(tracking_id)
+    if report is None:
         raise HTTPException(
             status_code=404,
             detail=
             f"Report for tracking_id '{tracking_id}' not found or not yet generated"
         )
 
-    with open(report_path, "r", encoding="utf-8") as f:
-        report = json.load(f)
-
-    return {
+    return _ssd_report_response(request, report, {
         "tracking_id": tracking_id,
-        "report_path": str(report_path),
-        "report": report,
-    }
+        "report_path": str(report.path),
+    })
 
 
 @app.get("/api/ssd/audit/stats")
 @app.get("/api/v1/ssd/audit/stats")  # v1 alias
-async def get_ssd_audit_stats():
+async def get_ssd_audit_stats(window: str = "all"):
     """
     Get aggregate statistics on SSD integration health.
+    ``window`` is one of 15m, 1h, 24h, 7d, 30d or all; counts are of
+    events within it, "processing" is the current in-flight count.  Read
+    from counters maintained as audit events arrive (ssd_stats.py).
     """
-    logs = list(SSD_AUDIT_LOGS.values())
-    total = len(logs)
-    completed = len([l for l in logs if l.get("status") == "completed"])
-    failed = len([l for l in logs if l.get("status") == "failed"])
-    processing = len([l for l in logs if l.get("status") == "processing"])
-
-    callback_sent = len(
-        [l for l in logs if l.get("callback_status") == "sent"])
-    callback_failed = len(
-        [l for l in logs if l.get("callback_status") == "failed"])
-
-    # Calculate average processing time
-    processing_times = [
-        l.get("processing_duration_ms", 0) for l in logs
-        if l.get("processing_duration_ms")
-    ]
-    avg_processing_ms = sum(processing_times) / len(
-        processing_times) if processing_times else 0
-
-    # Score distribution
-    scores = [
-        l.get("final_score") for l in logs if l.get("final_score") is not None
-    ]
-    avg_score = sum(scores) / len(scores) if scores else 0
+    try:
+        async with db_manager.get_connection() as conn:
+            stats = await ssd_stats.window(conn, window)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = stats["received"]
 
     return {
+        "window": window,
         "total_requests": total,
         "status_breakdown": {
-            "completed": completed,
-            "failed": failed,
-            "processing": processing,
+            "completed": stats["completed"],
+            "failed": stats["failed"],
+            "processing": stats["in_flight"],
+            "retried": stats["retried"],
         },
         "callback_stats": {
-            "sent": callback_sent,
-            "failed": callback_failed,
-            "not_configured": total - callback_sent - callback_failed,
-        },
-        "performance": {
-            "avg_processing_time_ms": round(avg_processing_ms, 2),
+            "sent":
+            stats["callback_sent"],
+            "failed":
+            stats["callback_failed"],
+            "not_configured":
+            max(0, total - stats["callback_sent"] - stats["callback_failed"]),
         },
+        "performance": latency_summary(stats),
         "scores": {
-            "avg_final_score": round(avg_score, 2),
-            "total_evaluated": len(scores),
+            "avg_final_score":
+            round(stats["score_sum"] / stats["score_count"], 2)
+            if stats["score_count"] else 0,
+            "total_evaluated":
+            stats["score_count"],
         },
     }
 
@@ -6904,17 +6049,15 @@ async def delete_ssd_audit_log(tracking_id: str):
     """
     Delete an audit log entry (admin only, for cleanup).
     """
-    if tracking_id not in SSD_AUDIT_LOGS:
+    async with db_manager.get_connection() as conn:
+        deleted = await ssd_audit.delete(conn, tracking_id)
+    if not deleted:
         raise HTTPException(
             status_code=404,
             detail=f"Audit log for tracking_id '{tracking_id}' not found")
 
-    del SSD_AUDIT_LOGS[tracking_id]
-
     # Also try to delete the report file
-    report_path = REPORTS_DIR / f"tirr_{tracking_id}.json"
-    if report_path.exists():
-        report_path.unlink()
+    await ssd_reports.delete(tracking_id)
 
     return {"status": "deleted", "tracking_id": tracking_id}
 
@@ -7818,81 +6961,6 @@ async def create_analysis_session_v1(data: dict = Body(...)):
 # ============================================================================
 
 
-def extract_pdf_text(pdf_bytes: bytes) -> str:
-    """Extract text from PDF using PyPDF2"""
-    try:
-        from PyPDF2 import PdfReader
-        pdf_file = io.BytesIO(pdf_bytes)
-        reader = PdfReader(pdf_file)
-        text_parts = []
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text_parts.append(page_text)
-        return "\n\n".join(text_parts)
-    except ImportError:
-        logger.warning("PyPDF2 not installed, using fallback")
-        return ""
-    except Exception as e:
-        logger.warning(f"PDF extraction error: {e}")
-        return ""
-
-
-def extract_pptx_text(pptx_bytes: bytes) -> str:
-    """Extract text from PPTX using python-pptx"""
-    try:
-        from pptx import Presentation
-        pptx_file = io.BytesIO(pptx_bytes)
-        prs = Presentation(pptx_file)
-        text_parts = []
-        for slide_num, slide in enumerate(prs.slides, 1):
-            slide_text = [f"--- Slide {slide_num} ---"]
-            for shape in slide.shapes:
-                if hasattr(shape, "text") and shape.text:
-                    slide_text.append(shape.text)
-                if hasattr(shape, "table"):
-                    for row in shape.table.rows:
-                        row_text = [
-                            cell.text for cell in row.cells if cell.text
-                        ]
-                        if row_text:
-                            slide_text.append(" | ".join(row_text))
-            text_parts.append("\n".join(slide_text))
-        return "\n\n".join(text_parts)
-    except ImportError:
-        logger.warning("python-pptx not installed, using fallback")
-        return ""
-    except Exception as e:
-        logger.warning(f"PPTX extraction error: {e}")
-        return ""
-
-
-def extract_docx_text(docx_bytes: bytes) -> str:
-    """Extract text from DOCX using python-docx"""
-    try:
-        from docx import Document
-        docx_file = io.BytesIO(docx_bytes)
-        doc = Document(docx_file)
-        text_parts = []
-        for para in doc.paragraphs:
-            if para.text.strip():
-                text_parts.append(para.text)
-        for table in doc.tables:
-            for row in table.rows:
-                row_text = [
-                    cell.text for cell in row.cells if cell.text.strip()
-                ]
-                if row_text:
-                    text_parts.append(" | ".join(row_text))
-        return "\n".join(text_parts)
-    except ImportError:
-        logger.warning("python-docx not installed, using fallback")
-        return ""
-    except Exception as e:
-        logger.warning(f"DOCX extraction error: {e}")
-        return ""
-
-
 async def scrape_webpage(url: str) -> dict:
     """Scrape text content from a webpage"""
     try:
@@ -8014,77 +7082,11 @@ async def extract_text_from_file(data: dict = Body(...)):
             # Decode base64 content
             file_bytes = base64.b64decode(content)
 
-            # Determine file type and extract accordingly
-            if filename.endswith('.pdf'):
-                text_content = extract_pdf_text(file_bytes)
-                extraction_method = "PyPDF2"
-
-            elif filename.endswith('.pptx'):
-                text_content = extract_pptx_text(file_bytes)
-                extraction_method = "python-pptx"
-
-            elif filename.endswith('.ppt'):
-                # Old PPT format - try basic extraction
-                text_content = file_bytes.decode('utf-8', errors='ignore')
-                text_content = ''.join(c for c in text_content
-                                       if c.isprintable() or c in '\n\r\t ')
-                extraction_method = "binary-text"
-
-            elif filename.endswith('.docx'):
-                text_content = extract_docx_text(file_bytes)
-                extraction_method = "python-docx"
-
-            elif filename.endswith('.doc'):
-                # Old DOC format - try basic extraction
-                text_content = file_bytes.decode('utf-8', errors='ignore')
-                text_content = ''.join(c for c in text_content
-                                       if c.isprintable() or c in '\n\r\t ')
-                extraction_method = "binary-text"
-
-            elif filename.endswith(('.txt', '.csv', '.json', '.md')):
-                text_content = file_bytes.decode('utf-8', errors='ignore')
-                extraction_method = "utf-8"
-
-            elif filename.endswith(('.xlsx', '.xls')):
-                # Excel files - try basic extraction
-                try:
-                    import openpyxl
-                    xlsx_file = io.BytesIO(file_bytes)
-                    wb = openpyxl.load_workbook(xlsx_file,
-                                                read_only=True,
-                                                data_only=True)
-                    text_parts = []
-                    for sheet in wb.worksheets:
-                        text_parts.append(f"--- Sheet: {sheet.title} ---")
-                        for row in sheet.iter_rows(max_row=100,
-                                                   values_only=True):
-                            row_text = [
-                                str(cell) for cell in row if cell is not None
-                            ]
-                            if row_text:
-                                text_parts.append(" | ".join(row_text))
-                    text_content = "\n".join(text_parts)
-                    extraction_method = "openpyxl"
-                except ImportError:
-                    text_content = file_bytes.decode('utf-8', errors='ignore')
-                    extraction_method = "binary-fallback"
-            else:
-                # Unknown format - try UTF-8 then Latin-1
-                try:
-                    text_content = file_bytes.decode('utf-8', errors='ignore')
-                except:
-                    text_content = file_bytes.decode('latin-1',
-                                                     errors='ignore')
-                text_content = ''.join(c for c in text_content
-                                       if c.isprintable() or c in '\n\r\t ')
-                extraction_method = "fallback"
-
-            # Clean up extracted text
-            if text_content:
-                # Remove excessive whitespace
-                text_content = re.sub(r'\n{3,}', '\n\n', text_content)
-                text_content = re.sub(r' {2,}', ' ', text_content)
-                text_content = text_content.strip()
+            # Parse in the extraction worker pool
+            extracted = await extraction_service.extract_text(
+                file_bytes, filename)
+            text_content = extracted["text_content"]
+            extraction_method = extracted["extraction_method"]
 
             # If still no content, provide meaningful feedback
             if not text_content or len(text_content) < 20:
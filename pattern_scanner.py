@@ -0,0 +1,399 @@
+"""
+Precompiled pattern scanner for DocumentExtractor.
+
+extract_company_info / extract_financial_data / extract_key_metrics /
+enhance_extraction run ~45 independent re.search calls and lowercase the
+text several times.  A pattern that does not match costs a full scan of the
+(up to 50k char) text, and most patterns in a deck do not match.
+
+The scanner compiles every pattern once at import and lowercases the text
+once per document.  Each pattern is paired with the literal keywords any
+match must contain; the keyword positions are located with str.find on the
+lowercased text and the compiled pattern is only tried (re.match) at those
+positions.  Results are identical to re.search: candidates are visited in
+ascending order and every position where a match could start is covered.
+
+Patterns without an anchor spec (or text containing the few characters for
+which re.IGNORECASE and str.lower() disagree) fall back to a plain search,
+so editing a pattern in DocumentExtractor can never change results here.
+"""
+
+import heapq
+import re
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from document_extractor import DocumentExtractor
+
+# re.IGNORECASE equates these with ASCII letters but str.lower() does not
+# (or changes the string length), which would misalign keyword positions.
+_CASE_HAZARDS = ('İ', 'ı', 'ſ')
+
+
+def _numeric_prefix(ch: str) -> bool:
+    return ch.isdigit() or ch.isspace() or ch in ',.+%'
+
+
+def _host_prefix(ch: str) -> bool:
+    return ch.isalnum() or ch in '-:/.'
+
+
+def _email_prefix(ch: str) -> bool:
+    return ch.isalnum() or ch in '_.-'
+
+
+# Anchor specs keyed by pattern source.
+#   ("lead", literals)          – every match starts with one of the literals
+#   ("tail", literals, prefix)  – every match is a run of ``prefix`` chars
+#                                 followed by one of the literals
+#   ("gate", literals)          – every match contains one of the literals
+_P = DocumentExtractor.COMPANY_PATTERNS
+_F = DocumentExtractor.FINANCIAL_PATTERNS
+_K = DocumentExtractor.KEY_METRIC_PATTERNS
+_E = DocumentExtractor.ENHANCE_PATTERNS
+
+_ANCHORS = {
+    # Company patterns
+    _P['company_name'][0]: ("lead", ('company', 'startup', 'business')),
+    _P['company_name'][2]: ("lead", ('about', 'introducing', 'welcome to')),
+    _P['funding'][0]: ("lead", ('$', )),
+    _P['funding'][1]: ("lead", ('raise', 'funding', 'round', 'investment')),
+    _P['funding'][2]: ("lead", ('series', 'seed', 'pre-seed')),
+    _P['revenue'][0]: ("lead", ('revenue', 'arr', 'mrr', 'sales')),
+    _P['revenue'][1]: ("lead", ('$', )),
+    _P['employees'][0]: ("tail", ('employee', 'team member', 'staff',
+                                  'people'), _numeric_prefix),
+    _P['employees'][1]: ("lead", ('team', 'employee')),
+    _P['founded'][0]: ("lead", ('founded', 'established', 'started',
+                                'since')),
+    _P['location'][0]: ("lead", ('headquarter', 'based in', 'located in',
+                                 'hq')),
+    _P['website'][0]: ("tail", ('.', ), _host_prefix),
+    _P['email'][0]: ("tail", ('@', ), _email_prefix),
+    # Financial patterns
+    _F['revenue']: ("lead", ('revenue', 'arr', 'mrr', 'sales')),
+    _F['burn_rate']: ("lead", ('burn', 'monthly')),
+    _F['runway']: ("lead", ('runway', )),
+    _F['valuation']: ("lead", ('valuation', )),
+    _F['gross_margin']: ("lead", ('gross', )),
+    _F['growth_rate']: ("lead", ('growth', 'yoy')),
+    _F['cac']: ("lead", ('cac', 'customer')),
+    _F['ltv']: ("lead", ('ltv', 'lifetime', 'clv')),
+    _F['customers']: ("lead", ('customer', 'client', 'user')),
+    _F['churn']: ("lead", ('churn', )),
+    # Key metric patterns
+    _K['team_size']: ("tail", ('team', 'employee', 'people', 'staff'),
+                      _numeric_prefix),
+    _K['customers']: ("tail", ('customer', 'client', 'user'),
+                      _numeric_prefix),
+    _K['mrr']: ("lead", ('mrr', 'monthly recurring revenue')),
+    _K['arr']: ("lead", ('arr', 'annual recurring revenue')),
+    _K['growth_rate']: ("tail", ('growth', 'yoy', 'mom'), _numeric_prefix),
+    _K['nrr']: ("lead", ('nrr', 'net revenue retention')),
+    _K['cac']: ("lead", ('cac', 'customer acquisition cost')),
+    _K['ltv']: ("lead", ('ltv', 'lifetime value', 'clv')),
+    _K['churn']: ("lead", ('churn', )),
+    _K['nps']: ("lead", ('nps', 'net promoter score')),
+    # Enhancement patterns
+    _E['location'][0]: ("lead", ('san francisco', 'new york', 'los angeles',
+                                 'chicago', 'boston', 'seattle', 'austin',
+                                 'denver', 'miami', 'atlanta')),
+    _E['location'][1]: ("lead", ('california', 'ca', 'ny', 'tx', 'fl', 'wa',
+                                 'ma', 'co', 'il', 'ga')),
+    _E['location'][2]: ("lead", ('usa', 'us', 'united states', 'canada',
+                                 'uk', 'germany', 'france', 'australia')),
+    _E['founded_year'][0]: ("lead", ('since', 'founded in', 'established',
+                                     'started in')),
+    _E['revenue'][0]: ("lead", ('$', )),
+    _E['revenue'][1]: ("lead", ('revenue', 'arr')),
+    _E['revenue'][2]: ("gate", ('in revenue', 'annual revenue')),
+    _E['cash'][0]: ("lead", ('$', )),
+    _E['team_size'][0]: ("lead", ('team', )),
+    _E['team_size'][1]: ("tail", ('employee', 'people', 'team member'),
+                         _numeric_prefix),
+    _E['team_size'][2]: ("tail", ('full', 'ft'), _numeric_prefix),
+    _E['customers'][0]: ("tail", ('customer', 'client', 'user',
+                                  'companies'), _numeric_prefix),
+    _E['customers'][1]: ("lead", ('serving', 'reach')),
+}
+
+
+class _Rule:
+    """A compiled pattern plus the keyword anchor used to locate it"""
+
+    __slots__ = ('regex', 'mode', 'literals', 'prefix')
+
+    def __init__(self, pattern: str, flags: int = re.IGNORECASE):
+        self.regex = re.compile(pattern, flags)
+        spec = _ANCHORS.get(pattern)
+        self.mode = spec[0] if spec else 'plain'
+        self.literals = spec[1] if spec else ()
+        self.prefix: Optional[Callable[[str], bool]] = (spec[2] if spec
+                                                        and len(spec) > 2
+                                                        else None)
+
+
+class ScanContext:
+    """Per-document state shared by all rules: text, lowercased text"""
+
+    __slots__ = ('text', 'lower', 'fast')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lower = text.lower()
+        self.fast = (len(self.lower) == len(text)
+                     and not any(ch in text for ch in _CASE_HAZARDS))
+
+
+def _find_all(haystack: str, literal: str) -> Iterator[int]:
+    pos = haystack.find(literal)
+    while pos != -1:
+        yield pos
+        pos = haystack.find(literal, pos + 1)
+
+
+class PatternScanner:
+    """Drop-in replacement for DocumentExtractor's text-to-fields pass"""
+
+    def __init__(self):
+        D = DocumentExtractor
+        ci = re.IGNORECASE
+        self.company = {
+            'company_name': [
+                _Rule(p, ci | re.MULTILINE)
+                for p in D.COMPANY_PATTERNS['company_name']
+            ],
+            **{
+                key: [_Rule(p) for p in D.COMPANY_PATTERNS[key]]
+                for key in ('funding', 'revenue', 'employees', 'founded',
+                            'location', 'website')
+            },
+            'email': [_Rule(p, 0) for p in D.COMPANY_PATTERNS['email']],
+        }
+        self.financial = {
+            key: _Rule(p)
+            for key, p in D.FINANCIAL_PATTERNS.items()
+        }
+        self.metrics = {
+            key: _Rule(p)
+            for key, p in D.KEY_METRIC_PATTERNS.items()
+        }
+        self.enhance = {
+            key: [_Rule(p) for p in patterns]
+            for key, patterns in D.ENHANCE_PATTERNS.items()
+        }
+
+    # ─── Matching ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def search(rule: _Rule, ctx: ScanContext) -> Optional[re.Match]:
+        """Equivalent of rule.regex.search(ctx.text)"""
+        if rule.mode == 'plain' or not ctx.fast:
+            return rule.regex.search(ctx.text)
+
+        lower = ctx.lower
+        if rule.mode == 'gate':
+            if not any(lit in lower for lit in rule.literals):
+                return None
+            return rule.regex.search(ctx.text)
+
+        text = ctx.text
+        match = rule.regex.match
+        prefix = rule.prefix
+        tried = 0  # every start position below this has been tried
+        for pos in heapq.merge(*(_find_all(lower, lit)
+                                 for lit in rule.literals)):
+            if pos < tried:
+                continue
+            start = pos
+            if prefix is not None:
+                while start > tried and prefix(text[start - 1]):
+                    start -= 1
+            for candidate in range(start, pos + 1):
+                if m := match(text, candidate):
+                    return m
+            tried = pos + 1
+        return None
+
+    def first(self, rules: List[_Rule], ctx: ScanContext) -> Optional[re.Match]:
+        """Equivalent of DocumentExtractor._first_pattern_match"""
+        for rule in rules:
+            if m := self.search(rule, ctx):
+                return m
+        return None
+
+    def _amount(self, rules: List[_Rule], ctx: ScanContext) -> Optional[float]:
+        if not (match := self.first(rules, ctx)):
+            return None
+        mult = match[2] if len(match.groups()) > 1 else None
+        return DocumentExtractor.parse_amount(match[1], mult)
+
+    # ─── Field extraction (mirrors DocumentExtractor) ───────────────────
+
+    def company_info(self, ctx: ScanContext) -> dict:
+        rules = self.company
+        info = {}
+
+        if name_match := self.first(rules['company_name'], ctx):
+            name = name_match.group(1).strip()
+            if 2 < len(name) < 100:
+                info['company_name'] = name
+
+        if (funding := self._amount(rules['funding'], ctx)) is not None:
+            info['funding_amount'] = funding
+
+        if (revenue := self._amount(rules['revenue'], ctx)) is not None:
+            info['revenue'] = revenue
+
+        if emp_match := self.first(rules['employees'], ctx):
+            info['employee_count'] = int(emp_match.group(1))
+
+        if founded_match := self.first(rules['founded'], ctx):
+            year = int(founded_match.group(1))
+            if 1900 <= year <= 2030:
+                info['founded_year'] = year
+
+        if loc_match := self.first(rules['location'], ctx):
+            info['location'] = loc_match.group(1).strip()
+
+        if web_match := self.first(rules['website'], ctx):
+            info['website'] = web_match.group(0)
+
+        if email_match := self.first(rules['email'], ctx):
+            info['email'] = email_match.group(0)
+
+        if industry := self._industry(DocumentExtractor.INDUSTRY_KEYWORDS,
+                                      ctx):
+            info['industry'] = industry
+
+        return info
+
+    def financial_data(self, ctx: ScanContext) -> dict:
+        financials = {}
+        for key, rule in self.financial.items():
+            if match := self.search(rule, ctx):
+                value = match.group(1)
+                mult = match.group(2) if len(match.groups()) > 1 else None
+                try:
+                    if key in ['gross_margin', 'growth_rate', 'churn']:
+                        financials[key] = float(value.replace(',', ''))
+                    elif key in ['runway', 'customers']:
+                        financials[key] = int(value.replace(',', ''))
+                    else:
+                        financials[key] = DocumentExtractor.parse_amount(
+                            value, mult)
+                except ValueError:
+                    # Digit-less capture such as "customers, ..."
+                    continue
+        return financials
+
+    def key_metrics(self, ctx: ScanContext) -> dict:
+        rules = self.metrics
+        parse_amount = DocumentExtractor.parse_amount
+        metrics = {}
+
+        if m := self.search(rules['team_size'], ctx):
+            metrics['team_size'] = int(m[1])
+        if m := self.search(rules['customers'], ctx):
+            metrics['customers'] = int(m[1].replace(',', '').replace('+', ''))
+        if m := self.search(rules['mrr'], ctx):
+            metrics['mrr'] = parse_amount(m[1], m[2])
+        if m := self.search(rules['arr'], ctx):
+            metrics['arr'] = parse_amount(m[1], m[2])
+        if m := self.search(rules['growth_rate'], ctx):
+            metrics['growth_rate'] = float(m[1])
+        if m := self.search(rules['nrr'], ctx):
+            metrics['nrr'] = float(m[1])
+        if m := self.search(rules['cac'], ctx):
+            metrics['cac'] = parse_amount(m[1], None)
+        if m := self.search(rules['ltv'], ctx):
+            metrics['ltv'] = parse_amount(m[1], None)
+        if m := self.search(rules['churn'], ctx):
+            metrics['churn'] = float(m[1])
+        if m := self.search(rules['nps'], ctx):
+            metrics['nps'] = int(m[1])
+
+        return metrics
+
+    def enhance_extraction(self, ctx: ScanContext, company_info: dict,
+                           financial_data: dict, key_metrics: dict) -> tuple:
+        rules = self.enhance
+        parse_amount = DocumentExtractor.parse_amount
+
+        if not company_info.get('company_name'):
+            for line in ctx.text.strip().split('\n', 5)[:5]:
+                line = line.strip()
+                if len(line) > 2 and len(line) < 50 and line[0].isupper():
+                    company_info['company_name'] = line
+                    break
+
+        if not company_info.get('industry'):
+            if industry := self._industry(
+                    DocumentExtractor.INDUSTRY_FALLBACK_KEYWORDS, ctx):
+                company_info['industry'] = industry
+
+        if not company_info.get('location'):
+            if loc_match := self.first(rules['location'], ctx):
+                company_info['location'] = loc_match.group(0)
+
+        if not company_info.get('founded_year'):
+            if year_match := self.first(rules['founded_year'], ctx):
+                year = int(year_match.group(1))
+                if 1980 <= year <= 2026:
+                    company_info['founded_year'] = year
+
+        if not financial_data.get('revenue'):
+            if match := self.first(rules['revenue'], ctx):
+                mult = match.group(2) if len(match.groups()) > 1 else None
+                financial_data['revenue'] = parse_amount(match.group(1), mult)
+
+        if not financial_data.get('burn_rate') and financial_data.get(
+                'runway'):
+            runway = financial_data['runway']
+            if runway > 0:
+                if match := self.first(rules['cash'], ctx):
+                    cash = parse_amount(match.group(1), match.group(2))
+                    if cash > 0:
+                        financial_data['burn_rate'] = cash / runway
+
+        if not key_metrics.get('team_size'):
+            for rule in rules['team_size']:
+                if match := self.search(rule, ctx):
+                    size = int(match.group(1))
+                    if 1 <= size <= 10000:
+                        key_metrics['team_size'] = size
+                        company_info['employee_count'] = size
+                        break
+
+        if not key_metrics.get('customers'):
+            for rule in rules['customers']:
+                if match := self.search(rule, ctx):
+                    count = int(
+                        match.group(1).replace(',', '').replace('+', ''))
+                    if count > 0:
+                        key_metrics['customers'] = count
+                        break
+
+        return company_info, financial_data, key_metrics
+
+    @staticmethod
+    def _industry(keyword_map: Dict[str, list],
+                  ctx: ScanContext) -> Optional[str]:
+        return next((industry for industry, keywords in keyword_map.items()
+                     if any(kw in ctx.lower for kw in keywords)), None)
+
+    # ─── Entry point ────────────────────────────────────────────────────
+
+    def scan(self, text: str, enhance: bool = True) -> Tuple[dict, dict, dict]:
+        """Return (company_info, financial_data, key_metrics) for ``text``"""
+        ctx = ScanContext(text)
+        company_info = self.company_info(ctx)
+        financial_data = self.financial_data(ctx)
+        key_metrics = self.key_metrics(ctx)
+        if enhance:
+            return self.enhance_extraction(ctx, company_info, financial_data,
+                                           key_metrics)
+        return company_info, financial_data, key_metrics
+
+
+# Built once at import
+pattern_scanner = PatternScanner()
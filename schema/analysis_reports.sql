@@ -0,0 +1,24 @@
+-- =============================================================================
+-- Analysis Reports
+-- Triage / DD reports rendered once when a 9-module analysis completes and
+-- served as stored bytes.  report_version is analysis_reports.REPORT_VERSION
+-- (bumped whenever the report builders change), so stale layouts are
+-- re-rendered on first view instead of being served.
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS analysis_reports (
+    analysis_id         TEXT NOT NULL REFERENCES nine_module_analyses(analysis_id) ON DELETE CASCADE,
+    report_type         TEXT NOT NULL,                          -- 'triage', 'dd'
+    report_version      INTEGER NOT NULL,
+
+    etag                TEXT NOT NULL,                          -- Quoted SHA-256 of the JSON
+    content             BYTEA NOT NULL,                         -- gzip-compressed JSON
+    raw_size            INTEGER NOT NULL DEFAULT 0,             -- Uncompressed JSON size in bytes
+
+    created_at          TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (analysis_id, report_type, report_version)
+);
+
+-- content is already gzip-compressed; skip TOAST compression
+ALTER TABLE analysis_reports ALTER COLUMN content SET STORAGE EXTERNAL;
@@ -0,0 +1,21 @@
+-- =============================================================================
+-- Company Profiles
+-- The 9-module analysis inputs for each company, pre-merged from its latest
+-- uploads (company_profiles.PROFILE_UPLOADS).  Rebuilt by the backend
+-- whenever an allupload row of the company is inserted, re-extracted or
+-- deleted, so an analysis reads one row instead of re-merging the uploads.
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS company_profiles (
+    company_name        TEXT PRIMARY KEY,
+
+    merged_data         JSONB NOT NULL DEFAULT '{}'::JSONB,     -- Shallow merge of the uploads' extracted_data
+    merged_text         TEXT NOT NULL DEFAULT '',               -- extracted_text of the uploads, newest first
+    field_sources       JSONB NOT NULL DEFAULT '{}'::JSONB,     -- merged_data key -> upload_id that supplied it
+    source_upload_ids   UUID[] NOT NULL DEFAULT '{}',           -- Uploads merged, newest first
+
+    updated_at          TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_allupload_company_created
+    ON allupload(company_name, created_at DESC);
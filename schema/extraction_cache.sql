@@ -0,0 +1,24 @@
+-- =============================================================================
+-- Extraction Cache Table
+-- Content-addressed DocumentExtractor results, keyed by SHA-256 of the raw
+-- upload bytes, the extractor version and the detected document format.
+-- Sits next to allupload: a cache hit skips parsing but still creates a new
+-- allupload row.
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS extraction_cache (
+    content_sha256      TEXT NOT NULL,                          -- hex digest of raw bytes
+    extractor_version   TEXT NOT NULL,                          -- document_extractor.EXTRACTOR_VERSION
+    format              TEXT NOT NULL,                          -- extraction_service.detect_format()
+
+    extracted_data      JSONB NOT NULL,                         -- extract_from_file() output
+    byte_size           BIGINT DEFAULT 0,                       -- Size of the source bytes
+
+    hit_count           BIGINT NOT NULL DEFAULT 0,
+    created_at          TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    last_hit_at         TIMESTAMPTZ,
+
+    PRIMARY KEY (content_sha256, extractor_version, format)
+);
+
+CREATE INDEX IF NOT EXISTS idx_extraction_cache_created_at ON extraction_cache(created_at DESC);
@@ -0,0 +1,55 @@
+-- =============================================================================
+-- 9-Module Analyses
+-- One row per 9-module analysis run, plus a link table to the allupload rows
+-- it was computed from.  Replaces copying the full result JSON into
+-- allupload.analysis_result of every source upload; allupload.analysis_id
+-- still points at the latest analysis for each upload.
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS nine_module_analyses (
+    analysis_id         TEXT PRIMARY KEY,                       -- '9mod_...' or 'tirr_<tracking_id>'
+    company_name        TEXT,
+    final_tca_score     NUMERIC,
+    recommendation      TEXT,
+    result              JSONB NOT NULL,                         -- Full analysis output
+    created_at          TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS nine_module_analysis_uploads (
+    analysis_id         TEXT NOT NULL REFERENCES nine_module_analyses(analysis_id) ON DELETE CASCADE,
+    upload_id           UUID NOT NULL REFERENCES allupload(upload_id) ON DELETE CASCADE,
+    PRIMARY KEY (analysis_id, upload_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_nine_module_analyses_company
+    ON nine_module_analyses(company_name, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_nine_module_analysis_uploads_upload
+    ON nine_module_analysis_uploads(upload_id);
+
+-- One-off backfill of results previously copied into allupload
+INSERT INTO nine_module_analyses
+    (analysis_id, company_name, final_tca_score, recommendation, result,
+     created_at)
+SELECT DISTINCT ON (analysis_id)
+       analysis_id,
+       company_name,
+       CASE WHEN jsonb_typeof(analysis_result->'final_tca_score') = 'number'
+            THEN (analysis_result->>'final_tca_score')::NUMERIC END,
+       analysis_result->>'investment_recommendation',
+       analysis_result,
+       updated_at
+FROM allupload
+WHERE analysis_id IS NOT NULL
+  AND analysis_result IS NOT NULL
+  AND analysis_result != '{}'::JSONB
+  AND NOT EXISTS (SELECT 1 FROM nine_module_analyses n
+                  WHERE n.analysis_id = allupload.analysis_id)
+ORDER BY analysis_id, updated_at DESC
+ON CONFLICT (analysis_id) DO NOTHING;
+
+INSERT INTO nine_module_analysis_uploads (analysis_id, upload_id)
+SELECT a.analysis_id, a.upload_id
+FROM allupload a
+JOIN nine_module_analyses n ON n.analysis_id = a.analysis_id
+WHERE a.analysis_result != '{}'::JSONB
+ON CONFLICT DO NOTHING;
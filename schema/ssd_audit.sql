@@ -0,0 +1,51 @@
+-- =============================================================================
+-- SSD Audit Logs
+-- One row per SSD -> TCA TIRR request plus its event timeline (ssd_audit.py).
+-- Replaces the per-process SSD_AUDIT_LOGS dict.  Request / callback payloads
+-- are gzip-compressed JSON, read only by the detail endpoints.
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS ssd_audit_logs (
+    tracking_id             TEXT PRIMARY KEY,
+    company_name            TEXT,
+    founder_email           TEXT,
+    status                  TEXT NOT NULL DEFAULT 'pending',    -- pending | processing | retrying | completed | failed
+
+    request_payload_hash    TEXT,
+    request_payload_size    INTEGER NOT NULL DEFAULT 0,
+    request_payload         BYTEA,                              -- gzip JSON
+    response_payload        BYTEA,                              -- gzip JSON (callback body)
+
+    report_path             TEXT,
+    report_version          INTEGER NOT NULL DEFAULT 1,
+    callback_url            TEXT,
+    callback_status         TEXT,                               -- sent | failed | not_configured
+    callback_response_code  INTEGER,
+    callback_sent_at        TIMESTAMPTZ,
+    processing_duration_ms  INTEGER,
+    final_score             DOUBLE PRECISION,
+    recommendation          TEXT,
+    event_count             INTEGER NOT NULL DEFAULT 0,
+
+    created_at              TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp(),
+    updated_at              TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
+
+ALTER TABLE ssd_audit_logs ALTER COLUMN request_payload SET STORAGE EXTERNAL;
+ALTER TABLE ssd_audit_logs ALTER COLUMN response_payload SET STORAGE EXTERNAL;
+
+CREATE TABLE IF NOT EXISTS ssd_audit_events (
+    event_id                BIGSERIAL PRIMARY KEY,
+    tracking_id             TEXT NOT NULL REFERENCES ssd_audit_logs(tracking_id) ON DELETE CASCADE,
+    event_type              TEXT NOT NULL,
+    details                 JSONB NOT NULL DEFAULT '{}'::JSONB,
+    created_at              TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
+
+-- Keyset pagination, newest first, optionally by status
+CREATE INDEX IF NOT EXISTS idx_ssd_audit_logs_created
+    ON ssd_audit_logs(created_at DESC, tracking_id DESC);
+CREATE INDEX IF NOT EXISTS idx_ssd_audit_logs_status_created
+    ON ssd_audit_logs(status, created_at DESC, tracking_id DESC);
+CREATE INDEX IF NOT EXISTS idx_ssd_audit_events_tracking
+    ON ssd_audit_events(tracking_id, event_id);
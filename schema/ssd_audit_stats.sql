@@ -0,0 +1,27 @@
+-- =============================================================================
+-- SSD Audit Stats
+-- Counters behind /api/ssd/audit/stats, incremented in the same statement
+-- that records an audit event (ssd_audit.py / ssd_stats.py).  One row per
+-- minute ('m') and per hour ('h') for time windows, plus a running total
+-- ('all', bucket = epoch).  latency_buckets is a fixed-bucket histogram of
+-- processing_duration_ms (bounds in ssd_stats.LATENCY_BOUNDS_MS).
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS ssd_audit_stats (
+    granularity         TEXT NOT NULL,                          -- m | h | all
+    bucket              TIMESTAMPTZ NOT NULL,                   -- Start of the minute / hour
+
+    received            BIGINT NOT NULL DEFAULT 0,
+    completed           BIGINT NOT NULL DEFAULT 0,
+    failed              BIGINT NOT NULL DEFAULT 0,
+    retried             BIGINT NOT NULL DEFAULT 0,
+    callback_sent       BIGINT NOT NULL DEFAULT 0,
+    callback_failed     BIGINT NOT NULL DEFAULT 0,
+    duration_sum_ms     BIGINT NOT NULL DEFAULT 0,
+    duration_count      BIGINT NOT NULL DEFAULT 0,
+    latency_buckets     BIGINT[] NOT NULL,
+    score_sum           DOUBLE PRECISION NOT NULL DEFAULT 0,
+    score_count         BIGINT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (granularity, bucket)
+);
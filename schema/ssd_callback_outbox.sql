@@ -0,0 +1,42 @@
+-- =============================================================================
+-- SSD Callback Outbox
+-- Callbacks to SSD CaptureTCAReportResponse (ssd_callbacks.py).  The TIRR
+-- pipeline inserts a 'pending' row instead of POSTing inline; dispatchers
+-- (in the API process or `python ssd_worker.py`) claim rows with FOR UPDATE
+-- SKIP LOCKED under a lease and retry failed deliveries with backoff, so a
+-- callback survives SSD outages and restarts.  One row per tracking_id and
+-- kind ('report' = generated report, 'error' = failure notification).
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS ssd_callback_outbox (
+    id                  BIGSERIAL PRIMARY KEY,
+    tracking_id         TEXT NOT NULL,
+    kind                TEXT NOT NULL,                          -- report | error
+    url                 TEXT NOT NULL,
+    payload             JSONB NOT NULL,
+
+    status              TEXT NOT NULL DEFAULT 'pending',        -- pending | delivering | delivered | failed
+    attempts            INTEGER NOT NULL DEFAULT 0,
+    max_attempts        INTEGER NOT NULL DEFAULT 8,
+    next_attempt_at     TIMESTAMPTZ NOT NULL DEFAULT NOW(),     -- Not claimed before (retry backoff)
+    locked_by           TEXT,                                   -- Dispatcher delivering the row
+    locked_until        TIMESTAMPTZ,                            -- Lease; reclaimed once it expires
+    last_status_code    INTEGER,
+    last_error          TEXT,
+    last_duration_ms    INTEGER,                                -- Duration of the last POST
+
+    created_at          TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    first_attempt_at    TIMESTAMPTZ,
+    last_attempt_at     TIMESTAMPTZ,
+    delivered_at        TIMESTAMPTZ,
+    updated_at          TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    CONSTRAINT ssd_callback_outbox_kind_key UNIQUE (tracking_id, kind),
+    CONSTRAINT ssd_callback_outbox_status_check
+        CHECK (status IN ('pending', 'delivering', 'delivered', 'failed'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_ssd_callback_outbox_ready
+    ON ssd_callback_outbox(next_attempt_at) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_ssd_callback_outbox_leased
+    ON ssd_callback_outbox(locked_until) WHERE status = 'delivering';
@@ -0,0 +1,48 @@
+-- =============================================================================
+-- SSD TIRR Jobs
+-- Durable queue for the SSD -> TCA TIRR pipeline (ssd_jobs.py).  POST
+-- /api/ssd/tirr inserts a 'queued' row; workers (in the API process or a
+-- separate `python ssd_worker.py`) claim rows with FOR UPDATE SKIP LOCKED,
+-- heartbeat them while running and retry failures with backoff.
+-- idempotency_key deduplicates resubmissions of the same request.
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS ssd_tirr_jobs (
+    tracking_id         TEXT PRIMARY KEY,
+    payload             JSONB NOT NULL,                         -- SSDStartupData as received
+    callback_url        TEXT,
+
+    status              TEXT NOT NULL DEFAULT 'queued',         -- queued | running | completed | failed
+    stage               TEXT,                                   -- Last pipeline stage reached
+    stage_times         JSONB NOT NULL DEFAULT '{}'::JSONB,     -- stage -> time it was (last) reached
+    attempts            INTEGER NOT NULL DEFAULT 0,
+    max_attempts        INTEGER NOT NULL DEFAULT 5,
+    run_after           TIMESTAMPTZ NOT NULL DEFAULT NOW(),     -- Not claimed before (retry backoff)
+    locked_by           TEXT,                                   -- Worker running the job
+    heartbeat_at        TIMESTAMPTZ,
+    upload_id           UUID,                                   -- allupload row, reused by retries
+    idempotency_key     TEXT,                                   -- Idempotency-Key header or payload hash
+    payload_hash        TEXT,                                   -- Same as ssd_audit_logs.request_payload_hash
+    last_error          TEXT,
+
+    created_at          TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    started_at          TIMESTAMPTZ,
+    finished_at         TIMESTAMPTZ,
+    updated_at          TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    CONSTRAINT ssd_tirr_jobs_status_check
+        CHECK (status IN ('queued', 'running', 'completed', 'failed'))
+);
+
+-- Tables created before idempotent submission
+ALTER TABLE ssd_tirr_jobs ADD COLUMN IF NOT EXISTS idempotency_key TEXT;
+ALTER TABLE ssd_tirr_jobs ADD COLUMN IF NOT EXISTS payload_hash TEXT;
+
+-- A key is held by at most one job; failed / expired jobs release it
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ssd_tirr_jobs_idempotency_key
+    ON ssd_tirr_jobs(idempotency_key) WHERE idempotency_key IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_ssd_tirr_jobs_ready
+    ON ssd_tirr_jobs(run_after) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_ssd_tirr_jobs_running
+    ON ssd_tirr_jobs(heartbeat_at) WHERE status = 'running';
@@ -0,0 +1,319 @@
+"""
+Postgres audit trail (ssd_audit_logs / ssd_audit_events) of SSD TIRR requests
+"""
+
+import base64
+import gzip
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from database_config import db_manager
+from ssd_stats import event_deltas, merge_deltas, stats_params, stats_upsert
+
+logger = logging.getLogger(__name__)
+
+# Log columns record() may set; PAYLOAD_FIELDS are stored compressed
+FIELDS = (
+    "company_name",
+    "founder_email",
+    "status",
+    "request_payload_hash",
+    "request_payload_size",
+    "report_path",
+    "report_version",
+    "callback_url",
+    "callback_status",
+    "callback_response_code",
+    "callback_sent_at",
+    "processing_duration_ms",
+    "final_score",
+    "recommendation",
+)
+PAYLOAD_FIELDS = ("request_payload", "response_payload")
+
+# Column types, for the unnest() arrays of record_many()
+_FIELD_TYPES = {
+    "request_payload_size": "integer",
+    "report_version": "integer",
+    "callback_response_code": "integer",
+    "callback_sent_at": "timestamptz",
+    "processing_duration_ms": "integer",
+    "final_score": "float8",
+    "request_payload": "bytea",
+    "response_payload": "bytea",
+}
+
+_SUMMARY_COLUMNS = ", ".join(
+    ("tracking_id", "created_at", "updated_at", "event_count") + FIELDS)
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    """UTC timestamp in the audit log's original ``...Z`` format"""
+    if value is None:
+        return None
+    return value.astimezone(timezone.utc).replace(
+        tzinfo=None).isoformat() + "Z"
+
+
+def _compress(payload: Any) -> bytes:
+    return gzip.compress(
+        json.dumps(payload, default=str).encode("utf-8"), mtime=0)
+
+
+def _decompress(content: Optional[bytes]) -> Any:
+    if content is None:
+        return None
+    return json.loads(gzip.decompress(bytes(content)))
+
+
+def encode_cursor(created_at: datetime, tracking_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), tracking_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """(created_at, tracking_id) of a list cursor; ValueError if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, tracking_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(tracking_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+class AuditEvent(NamedTuple):
+    """One record() call, for record_many()"""
+    tracking_id: str
+    event_type: str
+    details: Dict[str, Any]
+    fields: Dict[str, Any] = {}
+
+
+def _columns(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """``fields`` as column values, payloads compressed"""
+    columns = {}
+    for name, value in fields.items():
+        if name in PAYLOAD_FIELDS:
+            value = _compress(value) if value is not None else None
+        elif name not in FIELDS:
+            raise ValueError(f"Unknown SSD audit field: {name}")
+        columns[name] = value
+    return columns
+
+
+def _summary(row) -> Dict[str, Any]:
+    log = {name: row[name] for name in FIELDS}
+    log["tracking_id"] = row["tracking_id"]
+    log["event_count"] = row["event_count"]
+    for name in ("created_at", "updated_at", "callback_sent_at"):
+        log[name] = _iso(row[name])
+    return log
+
+
+class SSDAuditStore:
+    """Read / write ssd_audit_logs and ssd_audit_events"""
+
+    async def ensure_schema(self):
+        """Create the audit tables if they do not exist"""
+        from database_config import execute_sql_file
+        await execute_sql_file(
+            str(Path(__file__).parent / "schema" / "ssd_audit.sql"))
+
+    async def record(self,
+                     tracking_id: str,
+                     event_type: Optional[str] = None,
+                     details: Optional[Dict[str, Any]] = None,
+                     **fields):
+        """
+        Create or update the log of ``tracking_id``: set ``fields`` (see
+        FIELDS / PAYLOAD_FIELDS) and, with ``event_type``, append an event.
+        Failures are logged, never raised.
+        """
+        columns = _columns(fields)
+        counted = 1 if event_type else 0
+        params: List[Any] = [tracking_id, *columns.values()]
+        names = "".join(f", {name}" for name in columns)
+        values = "".join(f", ${i}" for i in range(2, len(params) + 1))
+        sets = "".join(f", {name} = EXCLUDED.{name}" for name in columns)
+        sql = f"""INSERT INTO ssd_audit_logs (tracking_id, event_count{names})
+                  VALUES ($1, {counted}{values})
+                  ON CONFLICT (tracking_id) DO UPDATE
+                  SET updated_at = clock_timestamp(),
+                      event_count = ssd_audit_logs.event_count + {counted}{sets}
+                  RETURNING tracking_id"""
+        if event_type:
+            params += [event_type, json.dumps(details or {}, default=str)]
+            event = f"""INSERT INTO ssd_audit_events
+                            (tracking_id, event_type, details)
+                        SELECT tracking_id, ${len(params) - 1}, ${len(params)}
+                        FROM log"""
+            deltas = event_deltas(event_type, details, fields)
+            stats = ""
+            if deltas is not None:
+                stats = f", stats AS ({stats_upsert(len(params) + 1)})"
+                params += stats_params(deltas)
+            sql = f"WITH log AS ({sql}){stats} {event}"
+        try:
+            async with db_manager.get_connection() as conn:
+                await conn.execute(sql, *params)
+        except Exception as e:
+            logger.warning(f"[SSD-AUDIT] {tracking_id}: could not record "
+                           f"{event_type or 'update'}: {e}")
+
+    async def record_many(self, conn, events: Sequence[AuditEvent]):
+        """
+        record() for many events on ``conn``, within the caller's
+        transaction: one statement per distinct set of fields (the events
+        of a tracking_id are merged first), each an unnest() upsert of the
+        logs plus the event INSERT, with the stats of all events added
+        once.  Failures are logged, never raised.
+        """
+        logs: Dict[str, Dict[str, Any]] = {}
+        for event in events:
+            log = logs.setdefault(event.tracking_id, {
+                "columns": {},
+                "events": []
+            })
+            log["columns"].update(_columns(event.fields))
+            log["events"].append(event)
+        groups: Dict[Tuple[str, ...], List[str]] = {}
+        for tracking_id, log in logs.items():
+            groups.setdefault(tuple(log["columns"]), []).append(tracking_id)
+        deltas = merge_deltas(
+            event_deltas(e.event_type, e.details, e.fields) for e in events)
+
+        try:
+            async with conn.transaction():
+                for names, tracking_ids in groups.items():
+                    params: List[Any] = [
+                        tracking_ids,
+                        [len(logs[t]["events"]) for t in tracking_ids]
+                    ]
+                    arrays = ["$1::text[]", "$2::integer[]"]
+                    for name in names:
+                        params.append(
+                            [logs[t]["columns"][name] for t in tracking_ids])
+                        arrays.append(
+                            f"${len(params)}::{_FIELD_TYPES.get(name, 'text')}[]"
+                        )
+                    grouped = [
+                        e for t in tracking_ids for e in logs[t]["events"]
+                    ]
+                    params += [[e.tracking_id for e in grouped],
+                               [e.event_type for e in grouped],
+                               [
+                                   json.dumps(e.details or {}, default=str)
+                                   for e in grouped
+                               ]]
+                    n = len(params)
+                    cols = "".join(f", {name}" for name in names)
+                    sets = "".join(f", {name} = EXCLUDED.{name}"
+                                   for name in names)
+                    stats = ""
+                    if deltas is not None:
+                        stats = f", stats AS ({stats_upsert(n + 1)})"
+                        params += stats_params(deltas)
+                        deltas = None
+                    await conn.execute(
+                        f"""WITH log AS (
+                                INSERT INTO ssd_audit_logs
+                                    (tracking_id, event_count{cols})
+                                SELECT * FROM unnest({", ".join(arrays)})
+                                ON CONFLICT (tracking_id) DO UPDATE
+                                SET updated_at = clock_timestamp(),
+                                    event_count = ssd_audit_logs.event_count
+                                                  + EXCLUDED.event_count{sets}
+                                RETURNING tracking_id){stats}
+                            INSERT INTO ssd_audit_events
+                                (tracking_id, event_type, details)
+                            SELECT e.tracking_id, e.event_type, e.details
+                            FROM unnest(${n - 2}::text[], ${n - 1}::text[],
+                                        ${n}::jsonb[])
+                                 WITH ORDINALITY
+                                 AS e(tracking_id, event_type, details, i)
+                            JOIN log ON log.tracking_id = e.tracking_id
+                            ORDER BY e.i""", *params)
+        except Exception as e:
+            logger.warning(f"[SSD-AUDIT] could not record {len(events)} "
+                           f"events: {e}")
+
+    async def page(self,
+                   conn,
+                   status: Optional[str] = None,
+                   limit: int = 50,
+                   cursor: Optional[str] = None,
+                   offset: int = 0) -> Tuple[List[Dict[str, Any]],
+                                             Optional[str]]:
+        """
+        A page of log summaries (no events or payloads), newest first, and
+        the cursor of the next page (None on the last page).  ``cursor``
+        continues a previous page; ``offset`` is only for old clients.
+        """
+        where, params = [], []
+        if status:
+            params.append(status)
+            where.append(f"status = ${len(params)}")
+        if cursor:
+            created_at, tracking_id = decode_cursor(cursor)
+            params += [created_at, tracking_id]
+            where.append(f"(created_at, tracking_id) < "
+                         f"(${len(params) - 1}, ${len(params)})")
+        params += [limit + 1, offset]
+        rows = await conn.fetch(
+            f"""SELECT {_SUMMARY_COLUMNS} FROM ssd_audit_logs
+                {"WHERE " + " AND ".join(where) if where else ""}
+                ORDER BY created_at DESC, tracking_id DESC
+                LIMIT ${len(params) - 1} OFFSET ${len(params)}""", *params)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"],
+                                        rows[-1]["tracking_id"])
+        return [_summary(r) for r in rows], next_cursor
+
+    async def count(self, conn, status: Optional[str] = None) -> int:
+        if status:
+            return await conn.fetchval(
+                "SELECT COUNT(*) FROM ssd_audit_logs WHERE status = $1",
+                status)
+        return await conn.fetchval("SELECT COUNT(*) FROM ssd_audit_logs")
+
+    async def get(self,
+                  conn,
+                  tracking_id: str,
+                  events: bool = True) -> Optional[Dict[str, Any]]:
+        """The full log with payloads (and events), or None"""
+        row = await conn.fetchrow(
+            f"""SELECT {_SUMMARY_COLUMNS}, request_payload, response_payload
+                FROM ssd_audit_logs WHERE tracking_id = $1""", tracking_id)
+        if row is None:
+            return None
+        log = _summary(row)
+        log["request_payload"] = _decompress(row["request_payload"])
+        log["response_payload"] = _decompress(row["response_payload"])
+        if events:
+            rows = await conn.fetch(
+                """SELECT event_type, details, created_at
+                   FROM ssd_audit_events WHERE tracking_id = $1
+                   ORDER BY event_id""", tracking_id)
+            log["events"] = [{
+                "event_type": r["event_type"],
+                "timestamp": _iso(r["created_at"]),
+                "details": json.loads(r["details"]) if isinstance(
+                    r["details"], str) else r["details"],
+            } for r in rows]
+        return log
+
+    async def delete(self, conn, tracking_id: str) -> bool:
+        """Delete a log and its events; False if there was none"""
+        deleted = await conn.fetchval(
+            """DELETE FROM ssd_audit_logs WHERE tracking_id = $1
+               RETURNING tracking_id""", tracking_id)
+        return deleted is not None
+
+
+# Global SSD audit store instance
+ssd_audit = SSDAuditStore()
@@ -0,0 +1,364 @@
+"""
+Durable outbox (ssd_callback_outbox) delivering SSD callbacks over a
+shared keep-alive client.
+
+Configuration (environment variables):
+  SSD_CALLBACK_CONCURRENCY   – deliveries at once per process (default 8)
+  SSD_CALLBACK_MAX_ATTEMPTS  – attempts before a callback fails (default 8)
+  SSD_CALLBACK_RETRY_BASE_S  – first retry delay (default 10)
+  SSD_CALLBACK_RETRY_MAX_S   – retry delay cap (default 1800)
+  SSD_CALLBACK_TIMEOUT_S     – per-request timeout (default 30)
+  SSD_CALLBACK_POLL_S        – idle poll interval (default 2)
+  SSD_CALLBACK_HTTP2         – use HTTP/2 when h2 is installed (default true)
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import httpx
+
+from claim_loop import ClaimLoop
+from database_config import db_manager
+from ssd_audit import ssd_audit
+from ssd_events import ssd_events
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+SSD_CALLBACK_HTTP2 = os.getenv("SSD_CALLBACK_HTTP2",
+                               "true").lower() in ("1", "true", "yes")
+
+# Status codes worth retrying; other non-2xx responses fail the callback
+_RETRY_STATUS = {408, 425, 429}
+
+
+class SSDCallback(NamedTuple):
+    """A claimed outbox row"""
+    id: int
+    tracking_id: str
+    kind: str  # report | error
+    url: str
+    payload: dict
+    attempt: int
+    max_attempts: int
+
+    @property
+    def final_attempt(self) -> bool:
+        return self.attempt >= self.max_attempts
+
+
+def retryable(status_code: Optional[int]) -> bool:
+    """Whether a failed delivery should be retried (None = no response)"""
+    return (status_code is None or status_code in _RETRY_STATUS
+            or status_code >= 500)
+
+
+def _decode(value):
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+class SSDCallbackOutbox(ClaimLoop):
+    """Queues and delivers ssd_callback_outbox rows"""
+
+    label = "SSD callback"
+
+    def __init__(self, concurrency: int, max_attempts: int,
+                 retry_base_s: float, retry_max_s: float, timeout_s: float,
+                 poll_interval_s: float):
+        super().__init__(concurrency, max_attempts, retry_base_s,
+                         retry_max_s, poll_interval_s)
+        self.timeout_s = timeout_s
+        self._client: Optional[httpx.AsyncClient] = None
+        self._delivered = 0
+        self._failed = 0
+        self._retried = 0
+
+    async def ensure_schema(self):
+        """Create the ssd_callback_outbox table if it does not exist"""
+        from database_config import execute_sql_file
+        await execute_sql_file(
+            str(Path(__file__).parent / "schema" / "ssd_callback_outbox.sql"))
+
+    @property
+    def lease_s(self) -> float:
+        # Long enough for a POST to time out, short enough to recover soon
+        return 3 * self.timeout_s
+
+    # ─── HTTP client ────────────────────────────────────────────────────
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared keep-alive client (HTTP/2 when h2 is installed)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=H2_AVAILABLE and SSD_CALLBACK_HTTP2,
+                timeout=httpx.Timeout(self.timeout_s, connect=10.0),
+                limits=httpx.Limits(max_connections=self.concurrency * 2,
+                                    max_keepalive_connections=self.concurrency,
+                                    keepalive_expiry=60.0),
+                headers={"User-Agent": "TCA-IRR-Backend/1.0"})
+        return self._client
+
+    # ─── Lifecycle ──────────────────────────────────────────────────────
+
+    async def stop(self):
+        """Stop delivering, hand claimed rows back and close the client"""
+        await super().stop()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ─── Submission ─────────────────────────────────────────────────────
+
+    async def enqueue(self, conn, tracking_id: str, kind: str, url: str,
+                      payload: dict) -> bool:
+        """
+        Queue a callback (on the caller's connection / transaction).
+        Returns False when one of this kind was already queued for the
+        tracking_id, e.g. by an earlier attempt of a retried job.
+        """
+        queued = await conn.fetchval(
+            """INSERT INTO ssd_callback_outbox
+                   (tracking_id, kind, url, payload, max_attempts)
+               VALUES ($1, $2, $3, $4, $5)
+               ON CONFLICT (tracking_id, kind) DO NOTHING
+               RETURNING TRUE""", tracking_id, kind, url,
+            json.dumps(payload, default=str), self.max_attempts)
+        self._wake.set()
+        return bool(queued)
+
+    # ─── Dispatch ───────────────────────────────────────────────────────
+
+    async def _claim(self, conn, limit: int) -> List[SSDCallback]:
+        # Rows whose lease expired belong to a dispatcher that died mid-POST
+        rows = await conn.fetch(
+            """UPDATE ssd_callback_outbox AS o
+               SET status = 'delivering', attempts = o.attempts + 1,
+                   locked_by = $1,
+                   locked_until = NOW() + make_interval(secs => $3),
+                   first_attempt_at = COALESCE(o.first_attempt_at, NOW()),
+                   last_attempt_at = NOW(), updated_at = NOW()
+               FROM (SELECT id FROM ssd_callback_outbox
+                     WHERE (status = 'pending' AND next_attempt_at <= NOW())
+                        OR (status = 'delivering' AND locked_until < NOW())
+                     ORDER BY next_attempt_at
+                     LIMIT $2
+                     FOR UPDATE SKIP LOCKED) AS ready
+               WHERE o.id = ready.id
+               RETURNING o.id, o.tracking_id, o.kind, o.url, o.payload,
+                         o.attempts, o.max_attempts""", self.worker_id, limit,
+            self.lease_s)
+        return [
+            SSDCallback(r["id"], r["tracking_id"], r["kind"], r["url"],
+                        _decode(r["payload"]), r["attempts"],
+                        r["max_attempts"]) for r in rows
+        ]
+
+    def _key(self, callback: SSDCallback) -> int:
+        return callback.id
+
+    async def _process(self, callback: SSDCallback):
+        status_code, error, duration_ms = await self._post(callback)
+        if error is None:
+            await self._delivered_ok(callback, status_code, duration_ms)
+        else:
+            await self._delivery_failed(callback, status_code, error,
+                                        duration_ms)
+
+    async def _release(self, conn, ids: List[int]):
+        await conn.execute(
+            """UPDATE ssd_callback_outbox
+               SET status = 'pending', attempts = attempts - 1,
+                   locked_by = NULL, locked_until = NULL,
+                   next_attempt_at = NOW(), updated_at = NOW()
+               WHERE id = ANY($1::bigint[])
+                 AND locked_by = $2 AND status = 'delivering'""",
+            ids, self.worker_id)
+
+    async def _post(self, callback: SSDCallback):
+        """POST a callback: (status code, error or None, duration ms)"""
+        started = time.monotonic()
+        try:
+            response = await self.client.post(callback.url,
+                                              json=callback.payload)
+        except httpx.HTTPError as e:
+            return None, f"{type(e).__name__}: {e}", \
+                int((time.monotonic() - started) * 1000)
+        duration_ms = int((time.monotonic() - started) * 1000)
+        if response.is_success:
+            return response.status_code, None, duration_ms
+        return response.status_code, \
+            f"HTTP {response.status_code}: {response.text[:200]}", duration_ms
+
+    async def _delivered_ok(self, callback: SSDCallback, status_code: int,
+                            duration_ms: int):
+        async with db_manager.get_connection() as conn:
+            latency_ms = await conn.fetchval(
+                """UPDATE ssd_callback_outbox
+                   SET status = 'delivered', delivered_at = NOW(),
+                       last_status_code = $3, last_error = NULL,
+                       last_duration_ms = $4, locked_by = NULL,
+                       locked_until = NULL, updated_at = NOW()
+                   WHERE id = $1 AND locked_by = $2
+                   RETURNING (EXTRACT(EPOCH FROM delivered_at - created_at)
+                              * 1000)::bigint""", callback.id,
+                self.worker_id, status_code, duration_ms)
+        self._delivered += 1
+        logger.info(f"[SSD-TIRR] {callback.kind} callback for "
+                    f"{callback.tracking_id} sent to {callback.url} — HTTP "
+                    f"{status_code} (attempt {callback.attempt})")
+        details = {
+            "url": callback.url,
+            "status_code": status_code,
+            "attempts": callback.attempt,
+            "latency_ms": latency_ms,
+        }
+        if callback.kind == "report":
+            ssd_events.publish(callback.tracking_id, "callback",
+                               status="delivered", **details)
+            await ssd_audit.record(
+                callback.tracking_id, "callback_sent", details,
+                callback_status="sent",
+                callback_response_code=status_code,
+                callback_sent_at=datetime.now(timezone.utc))
+        else:
+            await ssd_audit.record(callback.tracking_id,
+                                   f"{callback.kind}_callback_sent", details)
+
+    async def _delivery_failed(self, callback: SSDCallback,
+                               status_code: Optional[int], error: str,
+                               duration_ms: int):
+        retry = retryable(status_code) and not callback.final_attempt
+        delay_s = self._backoff_s(callback.attempt) if retry else 0.0
+        async with db_manager.get_connection() as conn:
+            await conn.execute(
+                """UPDATE ssd_callback_outbox
+                   SET status = $3, last_status_code = $4, last_error = $5,
+                       last_duration_ms = $6, locked_by = NULL,
+                       locked_until = NULL,
+                       next_attempt_at = NOW() + make_interval(secs => $7),
+                       updated_at = NOW()
+                   WHERE id = $1 AND locked_by = $2""", callback.id,
+                self.worker_id, 'pending' if retry else 'failed',
+                status_code, error, duration_ms, delay_s)
+        details = {
+            "url": callback.url,
+            "status_code": status_code,
+            "attempt": callback.attempt,
+            "max_attempts": callback.max_attempts,
+            "error": error,
+        }
+        prefix = "" if callback.kind == "report" else f"{callback.kind}_"
+        if retry:
+            self._retried += 1
+            logger.warning(
+                f"[SSD-TIRR] {callback.kind} callback for "
+                f"{callback.tracking_id} attempt {callback.attempt}/"
+                f"{callback.max_attempts} failed, retrying in "
+                f"{delay_s:.0f}s: {error}")
+            details["retry_in_s"] = round(delay_s, 1)
+            event, status = f"{prefix}callback_retry_scheduled", "retrying"
+        else:
+            self._failed += 1
+            logger.error(f"[SSD-TIRR] {callback.kind} callback for "
+                         f"{callback.tracking_id} failed: {error}")
+            event, status = f"{prefix}callback_failed", "failed"
+            if callback.kind == "report":
+                ssd_events.publish(callback.tracking_id, "callback",
+                                   status="failed", status_code=status_code,
+                                   attempts=callback.attempt, error=error)
+        if callback.kind == "report":
+            await ssd_audit.record(callback.tracking_id, event, details,
+                                   callback_status=status,
+                                   callback_response_code=status_code)
+        else:
+            await ssd_audit.record(callback.tracking_id, event, details)
+
+    # ─── Reporting ──────────────────────────────────────────────────────
+
+    async def get(self, conn, tracking_id: str) -> List[Dict[str, Any]]:
+        """Delivery status, attempts and latency of a tracking_id's callbacks"""
+        rows = await conn.fetch(
+            """SELECT kind, url, status, attempts, max_attempts,
+                      last_status_code, last_error, last_duration_ms,
+                      next_attempt_at, created_at, first_attempt_at,
+                      last_attempt_at, delivered_at,
+                      (EXTRACT(EPOCH FROM delivered_at - created_at)
+                       * 1000)::bigint AS latency_ms
+               FROM ssd_callback_outbox
+               WHERE tracking_id = $1
+               ORDER BY id""", tracking_id)
+        callbacks = []
+        for r in rows:
+            callback = {k: r[k] for k in (
+                "kind", "url", "status", "attempts", "max_attempts",
+                "last_status_code", "last_error", "last_duration_ms",
+                "latency_ms")}
+            for k in ("created_at", "first_attempt_at", "last_attempt_at",
+                      "delivered_at"):
+                callback[k] = _iso(r[k])
+            if r["status"] == "pending" and r["attempts"]:
+                callback["next_attempt_at"] = _iso(r["next_attempt_at"])
+            callbacks.append(callback)
+        return callbacks
+
+    async def queue_stats(self, conn) -> Dict[str, Any]:
+        """Callbacks per status plus last-day delivery latency"""
+        rows = await conn.fetch(
+            """SELECT status, COUNT(*) AS callbacks,
+                      AVG(attempts) AS avg_attempts,
+                      AVG(EXTRACT(EPOCH FROM delivered_at - created_at)
+                          * 1000) AS avg_latency_ms,
+                      MAX(EXTRACT(EPOCH FROM delivered_at - created_at)
+                          * 1000) AS max_latency_ms
+               FROM ssd_callback_outbox
+               WHERE status IN ('pending', 'delivering')
+                  OR updated_at > NOW() - INTERVAL '1 day'
+               GROUP BY status""")
+        stats: Dict[str, Any] = {status: 0 for status in (
+            "pending", "delivering", "delivered", "failed")}
+        stats.update({r["status"]: r["callbacks"] for r in rows})
+        delivered = [r for r in rows if r["status"] == "delivered"]
+        if delivered:
+            row = delivered[0]
+            stats["avg_attempts"] = round(float(row["avg_attempts"]), 2)
+            stats["avg_latency_ms"] = round(float(row["avg_latency_ms"]), 1)
+            stats["max_latency_ms"] = round(float(row["max_latency_ms"]), 1)
+        return stats
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of this process's dispatcher"""
+        return {
+            "worker_id": self.worker_id,
+            "started": self.started,
+            "http2": H2_AVAILABLE and SSD_CALLBACK_HTTP2,
+            "concurrency": self.concurrency,
+            "delivering": len(self._running),
+            "delivered": self._delivered,
+            "failed": self._failed,
+            "retried": self._retried,
+        }
+
+
+# Global SSD callback outbox instance
+ssd_callbacks = SSDCallbackOutbox(
+    concurrency=int(os.getenv("SSD_CALLBACK_CONCURRENCY", "8")),
+    max_attempts=int(os.getenv("SSD_CALLBACK_MAX_ATTEMPTS", "8")),
+    retry_base_s=float(os.getenv("SSD_CALLBACK_RETRY_BASE_S", "10")),
+    retry_max_s=float(os.getenv("SSD_CALLBACK_RETRY_MAX_S", "1800")),
+    timeout_s=float(os.getenv("SSD_CALLBACK_TIMEOUT_S", "30")),
+    poll_interval_s=float(os.getenv("SSD_CALLBACK_POLL_S", "2")))
@@ -0,0 +1,171 @@
+"""
+In-process hub publishing SSD TIRR job stages to SSE and long-poll waiters.
+
+Configuration (environment variables):
+  SSD_EVENTS_RETENTION_S – how long a job's events are kept after its
+                           last stage (default 3600)
+  SSD_EVENTS_MAX_JOBS    – jobs tracked at once (default 10000)
+  SSD_EVENTS_DB_POLL_S   – how often waiters reload the job from the
+                           database (default 10)
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import (Any, Awaitable, Callable, Dict, Iterator, List,
+                    Optional, Set, Tuple)
+
+STAGES = ("data_extraction", "scoring", "report", "callback", "failed")
+
+# Pipeline stage (ssd_jobs.mark_stage) -> stage event it completes
+PIPELINE_STAGES = {
+    "data_stored": "data_extraction",
+    "analysis_complete": "scoring",
+    "report_saved": "report",
+}
+
+# (stage events by name, whether a callback is expected), or None for an
+# unknown tracking_id
+Snapshot = Optional[Tuple[Dict[str, Dict[str, Any]], bool]]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def stage_index(stage: Optional[str]) -> int:
+    """Position of ``stage`` in STAGES; -1 for None / unknown stages"""
+    return STAGES.index(stage) if stage in STAGES else -1
+
+
+def is_done(events: Dict[str, Any], expects_callback: bool) -> bool:
+    return "failed" in events or ("report" in events and
+                                  ("callback" in events
+                                   or not expects_callback))
+
+
+def snapshot_events(job: Dict[str, Any],
+                    callbacks: List[Dict[str, Any]]) -> Dict[str, Dict]:
+    """Stage events implied by a job (ssd_jobs.get) and its callbacks"""
+    events: Dict[str, Dict[str, Any]] = {}
+    for pipeline_stage, at in (job.get("stage_times") or {}).items():
+        stage = PIPELINE_STAGES.get(pipeline_stage)
+        if stage:
+            events[stage] = {"stage": stage, "at": at}
+    if job.get("status") == "failed":
+        events["failed"] = {
+            "stage": "failed",
+            "at": job.get("finished_at"),
+            "error": job.get("last_error"),
+        }
+    for callback in callbacks:
+        if callback["kind"] == "report" and callback["status"] in (
+                "delivered", "failed"):
+            events["callback"] = {
+                "stage": "callback",
+                "at": callback["delivered_at"] or callback["last_attempt_at"],
+                "status": callback["status"],
+                "attempts": callback["attempts"],
+                "latency_ms": callback["latency_ms"],
+            }
+    return events
+
+
+class SSDEventHub:
+    """Stage events of recent jobs, and the clients waiting for them"""
+
+    def __init__(self, retention_s: float, max_jobs: int, db_poll_s: float):
+        self.retention_s = retention_s
+        self.max_jobs = max_jobs
+        self.db_poll_s = db_poll_s
+        # tracking_id -> (last publish time, stage -> event), oldest first
+        self._events: "OrderedDict[str, Tuple[float, Dict[str, Dict]]]" = \
+            OrderedDict()
+        self._waiters: Dict[str, Set[asyncio.Event]] = {}
+
+    def publish(self, tracking_id: str, stage: str, **details):
+        """Record that ``tracking_id`` completed ``stage`` and wake waiters"""
+        now = time.monotonic()
+        _, events = self._events.pop(tracking_id, (now, {}))
+        events[stage] = {"stage": stage, "at": _now(), **details}
+        self._events[tracking_id] = (now, events)
+        while self._events:
+            oldest, (published, _) = next(iter(self._events.items()))
+            if (len(self._events) <= self.max_jobs
+                    and now - published < self.retention_s):
+                break
+            del self._events[oldest]
+        for waiter in self._waiters.get(tracking_id, ()):
+            waiter.set()
+
+    def publish_stage(self, tracking_id: str, pipeline_stage: str,
+                      details: Optional[Dict[str, Any]] = None):
+        """publish() the stage event a pipeline stage completes, if any"""
+        stage = PIPELINE_STAGES.get(pipeline_stage)
+        if stage:
+            self.publish(tracking_id, stage, **(details or {}))
+
+    @contextmanager
+    def _subscribe(self, tracking_id: str) -> Iterator[asyncio.Event]:
+        changed = asyncio.Event()
+        self._waiters.setdefault(tracking_id, set()).add(changed)
+        try:
+            yield changed
+        finally:
+            waiters = self._waiters[tracking_id]
+            waiters.discard(changed)
+            if not waiters:
+                del self._waiters[tracking_id]
+
+    async def wait(self, tracking_id: str,
+                   load: Callable[[], Awaitable[Snapshot]],
+                   after: Optional[str], timeout: float
+                   ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Stage events after stage ``after``, waiting up to ``timeout``
+        seconds for one, and whether the job is done.  ``load`` reads the
+        job's snapshot from the database; LookupError when it is None.
+        """
+        start = stage_index(after) + 1
+        deadline = time.monotonic() + timeout
+        loaded_at = None
+        known: Dict[str, Dict[str, Any]] = {}
+        expects_callback = True
+        with self._subscribe(tracking_id) as changed:
+            while True:
+                changed.clear()
+                now = time.monotonic()
+                if loaded_at is None or now - loaded_at >= self.db_poll_s:
+                    snapshot = await load()
+                    if snapshot is None:
+                        raise LookupError(tracking_id)
+                    known, expects_callback = snapshot
+                    loaded_at = now = time.monotonic()
+                events = {**known, **self._events.get(tracking_id,
+                                                      (0, {}))[1]}
+                new = [events[s] for s in STAGES[start:] if s in events]
+                done = is_done(events, expects_callback)
+                if new or done or now >= deadline:
+                    return new, done
+                try:
+                    await asyncio.wait_for(
+                        changed.wait(),
+                        min(deadline, loaded_at + self.db_poll_s) - now)
+                except asyncio.TimeoutError:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "jobs": len(self._events),
+            "waiting_clients": sum(len(w) for w in self._waiters.values()),
+        }
+
+
+# Global SSD event hub instance
+ssd_events = SSDEventHub(
+    retention_s=float(os.getenv("SSD_EVENTS_RETENTION_S", "3600")),
+    max_jobs=int(os.getenv("SSD_EVENTS_MAX_JOBS", "10000")),
+    db_poll_s=float(os.getenv("SSD_EVENTS_DB_POLL_S", "10")))
@@ -0,0 +1,465 @@
+"""
+Durable Postgres job queue (ssd_tirr_jobs) for the SSD TIRR pipeline.
+
+Configuration (environment variables):
+  SSD_JOB_CONCURRENCY   – jobs run at once per process (default 4)
+  SSD_JOB_MAX_ATTEMPTS  – attempts before a job fails (default 5)
+  SSD_JOB_RETRY_BASE_S  – first retry delay (default 5)
+  SSD_JOB_RETRY_MAX_S   – retry delay cap (default 300)
+  SSD_JOB_POLL_S        – idle poll interval (default 2)
+  SSD_JOB_IN_PROCESS    – run workers in the API process; when false run
+                          ``python ssd_worker.py`` instead (default true)
+  SSD_IDEMPOTENCY_TTL_S – how long a completed job answers duplicates
+                          (default 86400)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+from claim_loop import ClaimLoop
+from database_config import db_manager
+
+logger = logging.getLogger(__name__)
+
+SSD_JOB_IN_PROCESS = os.getenv("SSD_JOB_IN_PROCESS",
+                               "true").lower() in ("1", "true", "yes")
+
+# Heartbeat period and the silence after which a running job is requeued
+_HEARTBEAT_S = 30.0
+_ORPHAN_AFTER_S = 120.0
+_ORPHAN_ERROR = "Worker stopped responding"
+
+
+class SSDJob(NamedTuple):
+    """A claimed job, as passed to the handler"""
+    tracking_id: str
+    payload: dict
+    callback_url: Optional[str]
+    attempt: int
+    max_attempts: int
+    upload_id: Optional[str]  # set once an earlier attempt stored the data
+
+    @property
+    def final_attempt(self) -> bool:
+        return self.attempt >= self.max_attempts
+
+
+class ExistingJob(NamedTuple):
+    """The job a duplicate submission was matched to"""
+    tracking_id: str
+    status: str
+
+
+class QueuedJob(NamedTuple):
+    """A job for enqueue_many()"""
+    tracking_id: str
+    payload: dict
+    callback_url: Optional[str]
+    idempotency_key: Optional[str] = None
+    payload_hash: Optional[str] = None
+    upload_id: Optional[str] = None  # allupload row already stored for it
+
+
+class IdempotencyKeyReused(Exception):
+    """Raised when an idempotency key is resubmitted with another payload"""
+
+
+def _decode(value):
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _job(row) -> SSDJob:
+    return SSDJob(row["tracking_id"], _decode(row["payload"]),
+                  row["callback_url"], row["attempts"], row["max_attempts"],
+                  str(row["upload_id"]) if row["upload_id"] else None)
+
+
+class SSDJobQueue(ClaimLoop):
+    """Claims and runs ssd_tirr_jobs rows"""
+
+    label = "SSD job"
+
+    def __init__(self, concurrency: int, max_attempts: int,
+                 retry_base_s: float, retry_max_s: float,
+                 poll_interval_s: float, idempotency_ttl_s: float):
+        super().__init__(concurrency, max_attempts, retry_base_s,
+                         retry_max_s, poll_interval_s)
+        self.idempotency_ttl_s = idempotency_ttl_s
+        self._handler: Optional[Callable[[SSDJob], Awaitable[None]]] = None
+        self._on_abandoned: Optional[Callable[[SSDJob, str],
+                                              Awaitable[None]]] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._completed = 0
+        self._failed = 0
+        self._retried = 0
+        self._recovered = 0
+        self._deduplicated = 0
+
+    def set_handler(self,
+                    handler: Callable[[SSDJob], Awaitable[None]],
+                    on_abandoned: Optional[Callable[[SSDJob, str],
+                                                    Awaitable[None]]] = None):
+        """Register the coroutine that runs one attempt of a job.
+
+        It raises to fail the attempt; the queue then retries or fails the
+        job (``job.final_attempt`` tells the handler which).
+        ``on_abandoned(job, error)`` is awaited for a job failed because its
+        worker died during the final attempt.
+        """
+        self._handler = handler
+        self._on_abandoned = on_abandoned
+
+    async def ensure_schema(self):
+        """Create the ssd_tirr_jobs table if it does not exist"""
+        from database_config import execute_sql_file
+        await execute_sql_file(
+            str(Path(__file__).parent / "schema" / "ssd_tirr_jobs.sql"))
+
+    # ─── Lifecycle ──────────────────────────────────────────────────────
+
+    def start(self):
+        """Start claiming jobs and heartbeating the running ones"""
+        if self._handler is None:
+            raise RuntimeError("No SSD job handler registered")
+        if self._poll_task is None:
+            super().start()
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    async def stop(self):
+        """Stop claiming, cancel running jobs and hand them back to the queue"""
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            await asyncio.gather(self._heartbeat_task, return_exceptions=True)
+            self._heartbeat_task = None
+        await super().stop()
+
+    # ─── Submission ─────────────────────────────────────────────────────
+
+    async def enqueue(self,
+                      conn,
+                      tracking_id: str,
+                      payload: dict,
+                      callback_url: Optional[str],
+                      idempotency_key: Optional[str] = None,
+                      payload_hash: Optional[str] = None
+                      ) -> Optional[ExistingJob]:
+        """
+        Queue a job, or return the job already holding ``idempotency_key``
+        (and queue nothing).  Raises IdempotencyKeyReused when that job was
+        submitted with a different ``payload_hash``.
+        """
+        existing, = await self.enqueue_many(conn, [
+            QueuedJob(tracking_id, payload, callback_url, idempotency_key,
+                      payload_hash)
+        ])
+        return existing
+
+    async def enqueue_many(self, conn, jobs: List[QueuedJob]
+                           ) -> List[Optional[ExistingJob]]:
+        """
+        Queue ``jobs`` with one INSERT.  Returns, in input order, None for
+        each job queued, or the job already holding its idempotency key
+        (an earlier job, or an earlier entry of ``jobs``) for duplicates.
+        Raises IdempotencyKeyReused like enqueue(), queueing nothing.
+        """
+        hashes: Dict[str, Optional[str]] = {}
+        for job in jobs:
+            if job.idempotency_key:
+                hashes.setdefault(job.idempotency_key, job.payload_hash)
+        async with conn.transaction():
+            held: Dict[str, ExistingJob] = {}
+            if hashes:
+                keys = sorted(hashes)
+                # Serialises concurrent submissions of the same keys; taken
+                # in sorted order so that overlapping batches cannot deadlock
+                await conn.execute(
+                    """SELECT pg_advisory_xact_lock(hashtext(k))
+                       FROM unnest($1::text[]) AS k""", keys)
+                rows = await conn.fetch(
+                    """SELECT idempotency_key, tracking_id, status,
+                              payload_hash,
+                              status <> 'failed'
+                              AND created_at > NOW() - make_interval(secs => $2)
+                                  AS current
+                       FROM ssd_tirr_jobs
+                       WHERE idempotency_key = ANY($1::text[])""",
+                    keys, self.idempotency_ttl_s)
+                stale = []
+                for row in rows:
+                    key = row["idempotency_key"]
+                    if not row["current"]:
+                        stale.append(row["tracking_id"])
+                        continue
+                    if (hashes[key] and row["payload_hash"]
+                            and row["payload_hash"] != hashes[key]):
+                        raise IdempotencyKeyReused(key)
+                    held[key] = ExistingJob(row["tracking_id"], row["status"])
+                if stale:
+                    await conn.execute(
+                        """UPDATE ssd_tirr_jobs SET idempotency_key = NULL
+                           WHERE tracking_id = ANY($1::text[])""", stale)
+
+            results: List[Optional[ExistingJob]] = []
+            new: List[QueuedJob] = []
+            for job in jobs:
+                key = job.idempotency_key
+                if key and key in held:
+                    if (job.payload_hash and hashes[key]
+                            and hashes[key] != job.payload_hash):
+                        raise IdempotencyKeyReused(key)
+                    results.append(held[key])
+                    continue
+                if key:
+                    held[key] = ExistingJob(job.tracking_id, "queued")
+                results.append(None)
+                new.append(job)
+            if new:
+                await conn.execute(
+                    """INSERT INTO ssd_tirr_jobs
+                           (tracking_id, payload, callback_url, max_attempts,
+                            stage, stage_times, idempotency_key, payload_hash,
+                            upload_id)
+                       SELECT j.tracking_id, j.payload::jsonb, j.callback_url,
+                              $7, 'queued', jsonb_build_object('queued', NOW()),
+                              j.idempotency_key, j.payload_hash, j.upload_id
+                       FROM unnest($1::text[], $2::text[], $3::text[],
+                                   $4::text[], $5::text[], $6::uuid[])
+                            AS j(tracking_id, payload, callback_url,
+                                 idempotency_key, payload_hash, upload_id)""",
+                    [j.tracking_id for j in new],
+                    [json.dumps(j.payload) for j in new],
+                    [j.callback_url for j in new],
+                    [j.idempotency_key for j in new],
+                    [j.payload_hash for j in new],
+                    [uuid.UUID(j.upload_id) if j.upload_id else None
+                     for j in new], self.max_attempts)
+        self._deduplicated += len(jobs) - len(new)
+        if new:
+            self._wake.set()
+        return results
+
+    async def mark_stage(self,
+                         tracking_id: str,
+                         stage: str,
+                         upload_id: Optional[str] = None):
+        """Record that a job reached ``stage`` (never raises)"""
+        try:
+            async with db_manager.get_connection() as conn:
+                await conn.execute(
+                    """UPDATE ssd_tirr_jobs
+                       SET stage = $2,
+                           stage_times = stage_times
+                                         || jsonb_build_object($2::text, NOW()),
+                           upload_id = COALESCE($3::uuid, upload_id),
+                           heartbeat_at = NOW(), updated_at = NOW()
+                       WHERE tracking_id = $1""", tracking_id, stage,
+                    uuid.UUID(upload_id) if upload_id else None)
+        except Exception as e:
+            logger.warning(f"SSD job {tracking_id} stage update failed: {e}")
+
+    # ─── Workers ────────────────────────────────────────────────────────
+
+    async def _claim(self, conn, limit: int) -> List[SSDJob]:
+        rows = await conn.fetch(
+            """UPDATE ssd_tirr_jobs AS j
+               SET status = 'running', attempts = j.attempts + 1,
+                   locked_by = $1, heartbeat_at = NOW(),
+                   started_at = COALESCE(j.started_at, NOW()),
+                   stage = 'started',
+                   stage_times = j.stage_times
+                                 || jsonb_build_object('started', NOW()),
+                   updated_at = NOW()
+               FROM (SELECT tracking_id FROM ssd_tirr_jobs
+                     WHERE status = 'queued' AND run_after <= NOW()
+                     ORDER BY run_after
+                     LIMIT $2
+                     FOR UPDATE SKIP LOCKED) AS ready
+               WHERE j.tracking_id = ready.tracking_id
+               RETURNING j.tracking_id, j.payload, j.callback_url,
+                         j.attempts, j.max_attempts, j.upload_id""",
+            self.worker_id, limit)
+        return [_job(r) for r in rows]
+
+    def _key(self, job: SSDJob) -> str:
+        return job.tracking_id
+
+    async def _process(self, job: SSDJob):
+        try:
+            await self._handler(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._fail(job, e)
+        else:
+            await self._complete(job)
+
+    async def _release(self, conn, tracking_ids: List[str]):
+        await conn.execute(
+            """UPDATE ssd_tirr_jobs
+               SET status = 'queued', attempts = attempts - 1,
+                   locked_by = NULL, run_after = NOW(), updated_at = NOW()
+               WHERE tracking_id = ANY($1::text[])
+                 AND locked_by = $2 AND status = 'running'""",
+            tracking_ids, self.worker_id)
+
+    async def _complete(self, job: SSDJob):
+        async with db_manager.get_connection() as conn:
+            await conn.execute(
+                """UPDATE ssd_tirr_jobs
+                   SET status = 'completed', stage = 'completed',
+                       stage_times = stage_times
+                                     || jsonb_build_object('completed', NOW()),
+                       locked_by = NULL, last_error = NULL,
+                       finished_at = NOW(), updated_at = NOW()
+                   WHERE tracking_id = $1 AND locked_by = $2""",
+                job.tracking_id, self.worker_id)
+        self._completed += 1
+
+    async def _fail(self, job: SSDJob, error: Exception):
+        retry = not job.final_attempt
+        async with db_manager.get_connection() as conn:
+            await conn.execute(
+                """UPDATE ssd_tirr_jobs
+                   SET status = $3, last_error = $4, locked_by = NULL,
+                       run_after = NOW() + make_interval(secs => $5),
+                       finished_at = CASE WHEN $3 = 'failed' THEN NOW() END,
+                       stage_times = stage_times
+                                     || jsonb_build_object($3::text, NOW()),
+                       updated_at = NOW()
+                   WHERE tracking_id = $1 AND locked_by = $2""",
+                job.tracking_id, self.worker_id,
+                'queued' if retry else 'failed', str(error),
+                self._backoff_s(job.attempt) if retry else 0.0)
+        if retry:
+            self._retried += 1
+            logger.warning(
+                f"SSD job {job.tracking_id} attempt {job.attempt}/"
+                f"{job.max_attempts} failed, will retry: {error}")
+        else:
+            self._failed += 1
+            logger.error(f"SSD job {job.tracking_id} failed: {error}")
+
+    # ─── Heartbeat / recovery ───────────────────────────────────────────
+
+    async def _heartbeat(self):
+        while True:
+            try:
+                async with db_manager.get_connection() as conn:
+                    if self._running:
+                        await conn.execute(
+                            """UPDATE ssd_tirr_jobs SET heartbeat_at = NOW()
+                               WHERE tracking_id = ANY($1::text[])
+                                 AND locked_by = $2""", list(self._running),
+                            self.worker_id)
+                    abandoned = await self._reclaim_orphans(conn)
+                for job in abandoned:
+                    await self._abandoned(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"SSD job heartbeat failed: {e}")
+            await asyncio.sleep(_HEARTBEAT_S)
+
+    async def _reclaim_orphans(self, conn) -> List[SSDJob]:
+        """Requeue jobs whose worker died; returns the ones failed instead"""
+        # A job whose worker died on its last attempt is failed rather than
+        # run again
+        rows = await conn.fetch(
+            """UPDATE ssd_tirr_jobs
+               SET status = CASE WHEN attempts >= max_attempts
+                                 THEN 'failed' ELSE 'queued' END,
+                   last_error = $2,
+                   locked_by = NULL, run_after = NOW(),
+                   finished_at = CASE WHEN attempts >= max_attempts
+                                      THEN NOW() END,
+                   updated_at = NOW()
+               WHERE status = 'running'
+                 AND heartbeat_at < NOW() - make_interval(secs => $1)
+               RETURNING tracking_id, status, payload, callback_url,
+                         attempts, max_attempts, upload_id""",
+            _ORPHAN_AFTER_S, _ORPHAN_ERROR)
+        for row in rows:
+            logger.warning(f"Reclaimed orphaned SSD job {row['tracking_id']}"
+                           f" ({row['status']})")
+        if rows:
+            self._recovered += len(rows)
+            self._wake.set()
+        return [_job(r) for r in rows if r["status"] == "failed"]
+
+    async def _abandoned(self, job: SSDJob):
+        self._failed += 1
+        logger.error(f"SSD job {job.tracking_id} failed: {_ORPHAN_ERROR}")
+        if self._on_abandoned is None:
+            return
+        try:
+            await self._on_abandoned(job, _ORPHAN_ERROR)
+        except Exception as e:
+            logger.error(f"SSD job {job.tracking_id} failure bookkeeping "
+                         f"failed: {e}")
+
+    # ─── Reporting ──────────────────────────────────────────────────────
+
+    async def get(self, conn, tracking_id: str) -> Optional[Dict[str, Any]]:
+        """Status, stage timestamps and attempts of a job, or None"""
+        row = await conn.fetchrow(
+            """SELECT status, stage, stage_times, attempts, max_attempts,
+                      last_error, callback_url, run_after, created_at,
+                      started_at, finished_at
+               FROM ssd_tirr_jobs WHERE tracking_id = $1""", tracking_id)
+        if row is None:
+            return None
+        job = {k: row[k] for k in ("status", "stage", "attempts",
+                                   "max_attempts", "last_error",
+                                   "callback_url")}
+        job["stage_times"] = _decode(row["stage_times"])
+        for k in ("created_at", "started_at", "finished_at"):
+            job[k] = row[k].isoformat() if row[k] else None
+        if row["status"] == "queued" and row["attempts"]:
+            job["next_attempt_at"] = row["run_after"].isoformat()
+        return job
+
+    async def queue_stats(self, conn) -> Dict[str, Any]:
+        """Jobs per status across all workers"""
+        rows = await conn.fetch(
+            """SELECT status, COUNT(*) AS jobs,
+                      EXTRACT(EPOCH FROM NOW() - MIN(run_after)) AS oldest_s
+               FROM ssd_tirr_jobs
+               WHERE status IN ('queued', 'running')
+                  OR finished_at > NOW() - INTERVAL '1 day'
+               GROUP BY status""")
+        stats = {status: 0 for status in ("queued", "running", "completed",
+                                           "failed")}
+        stats.update({r["status"]: r["jobs"] for r in rows})
+        oldest = [r["oldest_s"] for r in rows if r["status"] == "queued"]
+        stats["oldest_queued_s"] = round(max(0.0, float(oldest[0])), 1) \
+            if oldest and oldest[0] is not None else 0.0
+        return stats
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of this process's workers"""
+        return {
+            "worker_id": self.worker_id,
+            "started": self.started,
+            "concurrency": self.concurrency,
+            "running": len(self._running),
+            "completed": self._completed,
+            "failed": self._failed,
+            "retried": self._retried,
+            "recovered": self._recovered,
+            "deduplicated": self._deduplicated,
+        }
+
+
+# Global SSD job queue instance
+ssd_jobs = SSDJobQueue(
+    concurrency=int(os.getenv("SSD_JOB_CONCURRENCY", "4")),
+    max_attempts=int(os.getenv("SSD_JOB_MAX_ATTEMPTS", "5")),
+    retry_base_s=float(os.getenv("SSD_JOB_RETRY_BASE_S", "5")),
+    retry_max_s=float(os.getenv("SSD_JOB_RETRY_MAX_S", "300")),
+    poll_interval_s=float(os.getenv("SSD_JOB_POLL_S", "2")),
+    idempotency_ttl_s=float(os.getenv("SSD_IDEMPOTENCY_TTL_S", "86400")))
@@ -0,0 +1,131 @@
+"""
+Gzip-compressed, hash-sharded file storage for SSD TIRR reports
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import zlib
+from pathlib import Path
+from typing import AsyncIterator, NamedTuple, Optional
+
+from analysis_reports import encode_report
+
+# Bytes read from disk per streamed chunk
+REPORT_CHUNK_SIZE = 64 * 1024
+
+_TRACKING_ID = re.compile(r"[\w-]{1,128}")
+
+
+class ReportFile(NamedTuple):
+    path: Path
+    etag: str
+    size: int  # on disk
+    compressed: bool  # False for flat files from before the store
+
+
+class SSDReportStore:
+    """Read / write TIRR report files"""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def path(self, tracking_id: str) -> Path:
+        """Where the report of ``tracking_id`` is stored"""
+        if not _TRACKING_ID.fullmatch(tracking_id):
+            raise ValueError(f"Invalid tracking_id: {tracking_id!r}")
+        digest = hashlib.sha256(tracking_id.encode()).hexdigest()
+        return (self.root / "tirr" / digest[:2] / digest[2:4] /
+                f"tirr_{tracking_id}.json.gz")
+
+    def _legacy_path(self, tracking_id: str) -> Path:
+        return self.root / f"tirr_{tracking_id}.json"
+
+    # ─── Write ──────────────────────────────────────────────────────────
+
+    def _write(self, tracking_id: str, report: dict) -> Path:
+        content, _, _ = encode_report(report)
+        path = self.path(tracking_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Readers never see a partly written file
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(content)
+        os.replace(tmp, path)
+        self._legacy_path(tracking_id).unlink(missing_ok=True)
+        return path
+
+    async def save(self, tracking_id: str, report: dict) -> Path:
+        """Compress and store a report, returning its path"""
+        return await asyncio.to_thread(self._write, tracking_id, report)
+
+    # ─── Read ───────────────────────────────────────────────────────────
+
+    def _stat(self, tracking_id: str) -> Optional[ReportFile]:
+        try:
+            candidates = ((self.path(tracking_id), True),
+                          (self._legacy_path(tracking_id), False))
+        except ValueError:
+            return None
+        for path, compressed in candidates:
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            return ReportFile(path, f'"{st.st_size:x}-{st.st_mtime_ns:x}"',
+                              st.st_size, compressed)
+        return None
+
+    async def stat(self, tracking_id: str) -> Optional[ReportFile]:
+        """The stored report file of ``tracking_id``, or None"""
+        return await asyncio.to_thread(self._stat, tracking_id)
+
+    async def iter_json(self, report: ReportFile) -> AsyncIterator[bytes]:
+        """The report's JSON bytes, read and decompressed off the loop"""
+        decompressor = (zlib.decompressobj(16 + zlib.MAX_WBITS)
+                        if report.compressed else None)
+
+        def read_chunk(f) -> bytes:
+            while True:
+                chunk = f.read(REPORT_CHUNK_SIZE)
+                if decompressor is None:
+                    return chunk
+                if not chunk:
+                    return decompressor.flush()
+                data = decompressor.decompress(chunk)
+                if data:
+                    return data
+
+        f = await asyncio.to_thread(open, report.path, "rb")
+        try:
+            while True:
+                chunk = await asyncio.to_thread(read_chunk, f)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            await asyncio.to_thread(f.close)
+
+    # ─── Delete ─────────────────────────────────────────────────────────
+
+    def _delete(self, tracking_id: str) -> bool:
+        try:
+            paths = (self.path(tracking_id), self._legacy_path(tracking_id))
+        except ValueError:
+            return False
+        deleted = False
+        for path in paths:
+            try:
+                path.unlink()
+                deleted = True
+            except FileNotFoundError:
+                pass
+        return deleted
+
+    async def delete(self, tracking_id: str) -> bool:
+        """Remove the report of ``tracking_id``; False if there was none"""
+        return await asyncio.to_thread(self._delete, tracking_id)
+
+
+# Global SSD report store instance
+ssd_reports = SSDReportStore(Path(__file__).parent / "reports")
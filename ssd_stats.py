@@ -0,0 +1,250 @@
+"""
+Incrementally maintained SSD integration statistics (ssd_audit_stats)
+"""
+
+import bisect
+import logging
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (exclusive) of the latency histogram buckets; the last
+# bucket holds everything from LATENCY_BOUNDS_MS[-1] up
+LATENCY_BOUNDS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 20000,
+                     30000, 60000, 120000, 300000, 600000)
+
+COUNTERS = ("received", "completed", "failed", "retried", "callback_sent",
+            "callback_failed")
+
+# window -> (row granularity, span)
+WINDOWS = {
+    "15m": ("m", timedelta(minutes=15)),
+    "1h": ("m", timedelta(hours=1)),
+    "24h": ("h", timedelta(hours=24)),
+    "7d": ("h", timedelta(days=7)),
+    "30d": ("h", timedelta(days=30)),
+    "all": ("all", None),
+}
+
+STATS_MINUTE_RETENTION = timedelta(hours=2)
+STATS_HOUR_RETENTION = timedelta(days=31)
+_PRUNE_EVERY_S = 600.0
+
+_EVENT_COUNTERS = {
+    "received": "received",
+    "completed": "completed",
+    "retry_scheduled": "retried",
+    "callback_sent": "callback_sent",
+    "callback_failed": "callback_failed",
+}
+
+
+def latency_bucket(duration_ms: float) -> int:
+    """Histogram bucket index of a processing time"""
+    return bisect.bisect_right(LATENCY_BOUNDS_MS, duration_ms)
+
+
+def event_deltas(event_type: Optional[str], details: Optional[dict],
+                 fields: dict) -> Optional[Dict[str, Any]]:
+    """Counter increments for an audit event, or None if it counts nothing"""
+    counter = _EVENT_COUNTERS.get(event_type)
+    if counter is None and fields.get("status") == "failed":
+        counter = "failed"
+    if counter is None:
+        return None
+    deltas: Dict[str, Any] = dict.fromkeys(COUNTERS, 0)
+    deltas[counter] = 1
+    deltas.update(duration_sum_ms=0, duration_count=0, score_sum=0.0,
+                  score_count=0,
+                  latency_buckets=[0] * (len(LATENCY_BOUNDS_MS) + 1))
+    if counter == "completed":
+        duration_ms = fields.get("processing_duration_ms")
+        if duration_ms is not None:
+            deltas["duration_sum_ms"] = int(duration_ms)
+            deltas["duration_count"] = 1
+            deltas["latency_buckets"][latency_bucket(duration_ms)] = 1
+        score = (details or {}).get("final_score")
+        if score is not None:
+            deltas["score_sum"] = float(score)
+            deltas["score_count"] = 1
+    return deltas
+
+
+_DELTA_COLUMNS = COUNTERS + ("duration_sum_ms", "duration_count",
+                             "score_sum", "score_count", "latency_buckets")
+
+
+def stats_upsert(first_param: int) -> str:
+    """
+    ``INSERT`` adding event_deltas() to the current minute, hour and total
+    rows, for use as a CTE; its parameters are stats_params(), numbered
+    from ``first_param``.
+    """
+    params = [f"${first_param + i}" for i in range(len(_DELTA_COLUMNS))]
+    params[-1] += "::bigint[]"
+    values = ", ".join(params)
+    sets = ",\n".join(f"{c} = s.{c} + EXCLUDED.{c}"
+                      for c in _DELTA_COLUMNS[:-1])
+    return f"""INSERT INTO ssd_audit_stats AS s
+                   (granularity, bucket, {", ".join(_DELTA_COLUMNS)})
+               VALUES ('m', date_trunc('minute', clock_timestamp()), {values}),
+                      ('h', date_trunc('hour', clock_timestamp()), {values}),
+                      ('all', 'epoch', {values})
+               ON CONFLICT (granularity, bucket) DO UPDATE
+               SET {sets},
+                   latency_buckets = (
+                       SELECT array_agg(a + b ORDER BY i)
+                       FROM unnest(s.latency_buckets,
+                                   EXCLUDED.latency_buckets)
+                            WITH ORDINALITY AS t(a, b, i))"""
+
+
+def stats_params(deltas: Dict[str, Any]) -> List[Any]:
+    return [deltas[c] for c in _DELTA_COLUMNS]
+
+
+def percentile(counts: Sequence[int], q: float) -> Optional[float]:
+    """Approximate ``q`` quantile (0..1) of a latency histogram, in ms"""
+    total = sum(counts)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for i, count in enumerate(counts):
+        if count and seen + count >= rank:
+            low = LATENCY_BOUNDS_MS[i - 1] if i else 0
+            if i == len(LATENCY_BOUNDS_MS):
+                return float(low)
+            high = LATENCY_BOUNDS_MS[i]
+            return round(low + (high - low) * (rank - seen) / count, 1)
+        seen += count
+    return float(LATENCY_BOUNDS_MS[-1])
+
+
+def _sum_rows(rows) -> Dict[str, Any]:
+    totals: Dict[str, Any] = {c: 0 for c in _DELTA_COLUMNS[:-1]}
+    latency = [0] * (len(LATENCY_BOUNDS_MS) + 1)
+    for row in rows:
+        for c in totals:
+            totals[c] += row[c]
+        for i, count in enumerate(row["latency_buckets"][:len(latency)]):
+            latency[i] += count
+    totals["latency_buckets"] = latency
+    return totals
+
+
+def merge_deltas(
+        deltas: Iterable[Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """Sum of several event_deltas() results, None if none counts"""
+    counted = [d for d in deltas if d is not None]
+    return _sum_rows(counted) if counted else None
+
+
+class SSDStats:
+    """Read / maintain ssd_audit_stats"""
+
+    def __init__(self):
+        self._pruned_at = 0.0
+
+    async def ensure_schema(self):
+        """Create the ssd_audit_stats table if it does not exist"""
+        from database_config import execute_sql_file
+        await execute_sql_file(
+            str(Path(__file__).parent / "schema" / "ssd_audit_stats.sql"))
+
+    async def backfill(self, conn) -> bool:
+        """Seed the running total from existing audit logs (once)"""
+        return await conn.fetchval(
+            """INSERT INTO ssd_audit_stats AS s
+                   (granularity, bucket, received, completed, failed,
+                    callback_sent, callback_failed, duration_sum_ms,
+                    duration_count, score_sum, score_count, latency_buckets)
+               SELECT 'all', 'epoch', COUNT(*),
+                      COUNT(*) FILTER (WHERE status = 'completed'),
+                      COUNT(*) FILTER (WHERE status = 'failed'),
+                      COUNT(*) FILTER (WHERE callback_status = 'sent'),
+                      COUNT(*) FILTER (WHERE callback_status = 'failed'),
+                      COALESCE(SUM(processing_duration_ms)
+                               FILTER (WHERE status = 'completed'), 0),
+                      COUNT(processing_duration_ms)
+                          FILTER (WHERE status = 'completed'),
+                      COALESCE(SUM(final_score)
+                               FILTER (WHERE status = 'completed'), 0),
+                      COUNT(final_score) FILTER (WHERE status = 'completed'),
+                      (SELECT array_agg(COALESCE(h.n, 0) ORDER BY b.i)
+                       FROM generate_series(0, cardinality($1::int[])) AS b(i)
+                       LEFT JOIN (SELECT width_bucket(processing_duration_ms,
+                                                      $1::int[]) AS i,
+                                         COUNT(*) AS n
+                                  FROM ssd_audit_logs
+                                  WHERE status = 'completed'
+                                    AND processing_duration_ms IS NOT NULL
+                                  GROUP BY 1) h ON h.i = b.i)
+               FROM ssd_audit_logs
+               ON CONFLICT (granularity, bucket) DO NOTHING
+               RETURNING TRUE""", list(LATENCY_BOUNDS_MS)) or False
+
+    async def window(self, conn, window: str = "all") -> Dict[str, Any]:
+        """
+        Counters for ``window`` (a WINDOWS key) plus the current in-flight
+        count.  Raises ValueError for an unknown window.
+        """
+        if window not in WINDOWS:
+            raise ValueError(
+                f"window must be one of {', '.join(WINDOWS)}")
+        await self._maybe_prune(conn)
+        granularity, span = WINDOWS[window]
+        rows = await conn.fetch(
+            """SELECT * FROM ssd_audit_stats
+               WHERE granularity = 'all'
+                  OR (granularity = $1
+                      AND bucket >= date_trunc(
+                          CASE $1 WHEN 'm' THEN 'minute' ELSE 'hour' END,
+                          NOW() - $2::interval))""", granularity,
+            span or timedelta(0))
+        totals = [r for r in rows if r["granularity"] == "all"]
+        in_range = [r for r in rows if r["granularity"] == granularity]
+        stats = _sum_rows(in_range)
+        all_time = _sum_rows(totals)
+        stats["in_flight"] = max(
+            0, all_time["received"] - all_time["completed"] -
+            all_time["failed"])
+        return stats
+
+    async def _maybe_prune(self, conn):
+        now = time.monotonic()
+        if now - self._pruned_at < _PRUNE_EVERY_S:
+            return
+        self._pruned_at = now
+        try:
+            await conn.execute(
+                """DELETE FROM ssd_audit_stats
+                   WHERE (granularity = 'm' AND bucket < NOW() - $1::interval)
+                      OR (granularity = 'h' AND bucket < NOW() - $2::interval)""",
+                STATS_MINUTE_RETENTION, STATS_HOUR_RETENTION)
+        except Exception as e:
+            logger.warning(f"Pruning SSD audit stats failed: {e}")
+
+
+def latency_summary(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """avg / p50 / p95 / p99 and the histogram of a window()"""
+    counts = stats["latency_buckets"]
+    count = stats["duration_count"]
+    return {
+        "avg_processing_time_ms":
+        round(stats["duration_sum_ms"] / count, 2) if count else 0,
+        "p50_ms": percentile(counts, 0.50),
+        "p95_ms": percentile(counts, 0.95),
+        "p99_ms": percentile(counts, 0.99),
+        "histogram": [{
+            "lt_ms": bound,
+            "count": n
+        } for bound, n in zip(list(LATENCY_BOUNDS_MS) + [None], counts)],
+    }
+
+
+# Global SSD stats instance
+ssd_stats = SSDStats()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Standalone SSD TIRR job worker.
+
+    python ssd_worker.py
+
+Runs the ssd_tirr_jobs queue (see ssd_jobs.py) outside the API process, so
+bursts from SSD are processed without competing with API requests.  Start
+the API with SSD_JOB_IN_PROCESS=false when all processing should happen
+here; any number of workers can run against the same database.  Workers
+also deliver the SSD callback outbox (see ssd_callbacks.py).
+"""
+
+import asyncio
+import logging
+import signal
+
+from database_config import db_manager
+from ssd_audit import ssd_audit
+from ssd_callbacks import ssd_callbacks
+from ssd_jobs import ssd_jobs
+from ssd_stats import ssd_stats
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+async def run():
+    # Importing the API module registers the pipeline as the job handler
+    import main  # noqa: F401
+
+    await db_manager.create_pool()
+    try:
+        await ssd_audit.ensure_schema()
+        await ssd_stats.ensure_schema()
+        await ssd_jobs.ensure_schema()
+        await ssd_callbacks.ensure_schema()
+        ssd_jobs.start()
+        ssd_callbacks.start()
+        logger.info(f"SSD worker {ssd_jobs.worker_id} started "
+                    f"(concurrency={ssd_jobs.concurrency})")
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        await stop.wait()
+
+        logger.info("Stopping SSD worker...")
+        await ssd_jobs.stop()
+        await ssd_callbacks.stop()
+    finally:
+        await db_manager.close_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
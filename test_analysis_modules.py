@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+The module registry must cover the scorers, skip modules on request and
+fall back for unknown ids; FeatureContext must tolerate malformed input;
+batch (column-wise) scoring must match single-company scoring; the module
+memo must recompute exactly the modules whose declared inputs changed.
+"""
+
+import copy
+import random
+
+import pytest
+
+from analysis_batch import feature_contexts
+from analysis_memo import ModuleMemo
+from analysis_modules import (MODULE_INPUTS, MODULE_SCORERS, SCORE_RULES,
+                              FeatureContext, UndeclaredInputError,
+                              module_scorer, run_module, run_modules)
+
+SCORER_IDS = [
+    "tca_scorecard", "risk_assessment", "market_analysis", "team_assessment",
+    "financial_analysis", "technology_assessment", "business_model",
+    "growth_assessment", "investment_readiness"
+]
+
+EXTRACTED = {
+    "financial_data": {
+        "revenue": "600000",
+        "burn_rate": 40000,
+        "runway_months": 18,
+        "gross_margin": 72
+    },
+    "key_metrics": {
+        "customers": 40,
+        "nrr": 115,
+        "mom_growth": 12,
+        "team_size": 9,
+        "mrr": 50000
+    },
+}
+TEXT = "CEO: Jane Doe\nSOC 2 certified SaaS platform. TAM $8B. $5M Series A"
+
+
+def _context(extracted=EXTRACTED, text=TEXT):
+    return FeatureContext({"extracted_text": text}, extracted)
+
+
+def test_every_module_is_registered():
+    assert sorted(MODULE_SCORERS) == sorted(SCORER_IDS)
+
+
+def test_context_parses_numbers_once():
+    ctx = _context()
+    assert ctx.revenue == 600000.0
+    assert ctx.mrr == 50000.0
+    assert ctx.burn_multiple == 0.8
+    assert ctx.mrr_per_customer == 1250.0
+    assert ctx.mentions("technology_security") == ["SOC 2", "certified"]
+
+
+def test_run_modules_skips_and_keeps_order():
+    modules = [{"id": mid} for mid in SCORER_IDS]
+    results = run_modules(modules, _context(), skip={"risk_assessment"})
+    assert list(results) == [m for m in SCORER_IDS if m != "risk_assessment"]
+    for mid, result in results.items():
+        assert result["module_id"] == mid
+        assert 0 <= result["score"] <= 10
+
+
+def test_unknown_module_falls_back():
+    result = run_module({"id": "strategicFit"}, _context())
+    assert result == {
+        "module_id": "strategicFit",
+        "score": 5.0,
+        "confidence": 0.3,
+        "note": "Insufficient data for this module",
+        "data_sources": {}
+    }
+
+
+def test_malformed_sections_are_treated_as_missing():
+    ctx = _context({"financial_data": None, "key_metrics": ["x"]}, "")
+    assert ctx.revenue == 0.0 and ctx.burn_multiple is None
+    results = run_modules([{"id": mid} for mid in SCORER_IDS], ctx)
+    assert len(results) == len(SCORER_IDS)
+
+
+def test_batch_contexts_score_like_single_company():
+    rng = random.Random(12)
+    values = [0, "0", 5, "12", "5e5", 25000, 50000, 1e6, -3, "x", None,
+              1.005, 6, 12, 18, 60, 70, 100, 120]
+    companies = []
+    for _ in range(500):
+        extracted = {
+            "financial_data": {
+                k: rng.choice(values)
+                for k in ("revenue", "burn_rate", "runway_months", "mrr",
+                          "gross_margin")
+            },
+            "key_metrics": {
+                k: rng.choice(values)
+                for k in ("customers", "nrr", "team_size", "mom_growth")
+            },
+        }
+        companies.append(({"extracted_text": TEXT}, extracted))
+
+    for (data, extracted), batch in zip(companies,
+                                        feature_contexts(companies)):
+        single = FeatureContext(data, extracted)
+        for rule in SCORE_RULES:
+            assert repr(batch.rule_score(rule)) == repr(
+                single.rule_score(rule))
+        for mid in ("financial_analysis", "growth_assessment",
+                    "investment_readiness"):
+            assert repr(run_module({"id": mid}, batch)) == repr(
+                run_module({"id": mid}, single))
+
+
+def test_memo_recomputes_only_modules_whose_inputs_changed():
+    memo = ModuleMemo(100)
+    modules = [{"id": mid} for mid in SCORER_IDS + ["strategicFit"]]
+    results, cached = memo.run_modules(modules, _context())
+    assert cached == []
+
+    results["tca_scorecard"]["score"] = -1  # callers get their own copy
+    again, cached = memo.run_modules(modules, _context())
+    assert cached == [m["id"] for m in modules]
+    assert again == run_modules(modules, _context())
+
+    # A new customer-metrics upload: only modules reading customers rerun
+    extracted = copy.deepcopy(EXTRACTED)
+    extracted["key_metrics"]["customers"] = 55
+    ctx = _context(extracted)
+    results, cached = memo.run_modules(modules, ctx)
+    assert results == run_modules(modules, ctx)
+    recomputed = {m["id"] for m in modules} - set(cached)
+    assert recomputed == {
+        mid for mid, inputs in MODULE_INPUTS.items()
+        if "customers" in inputs.features
+    }
+    assert "team_assessment" in cached
+
+
+def test_scorers_cannot_read_undeclared_inputs():
+    @module_scorer("test_probe", features=("revenue", ))
+    def probe(ctx):
+        return {"score": ctx.revenue + ctx.customers}
+
+    try:
+        with pytest.raises(UndeclaredInputError):
+            run_module({"id": "test_probe"}, _context())
+    finally:
+        del MODULE_SCORERS["test_probe"], MODULE_INPUTS["test_probe"]
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Stored reports must decode to the JSON FastAPI would have sent, with
+stable ETags, and If-None-Match parsing must accept lists and weak tags.
+"""
+
+import gzip
+import json
+
+from analysis_reports import encode_report, if_none_match_tags
+
+REPORT = {"company_name": "Acme — Ltd", "score": 7.5, "sections": [1, 2]}
+
+
+def test_encoded_report_round_trips_with_stable_etag():
+    content, etag, raw_size = encode_report(REPORT)
+    raw = gzip.decompress(content)
+    assert json.loads(raw) == REPORT
+    # Non-ASCII is sent as UTF-8, as FastAPI does, not \u-escaped
+    assert "Acme — Ltd".encode("utf-8") in raw
+    assert raw_size == len(raw)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert encode_report(dict(REPORT)) == (content, etag, raw_size)
+    assert encode_report({**REPORT, "score": 7.6})[1] != etag
+
+
+def test_if_none_match_tags():
+    assert if_none_match_tags(None) == []
+    assert if_none_match_tags('"a", W/"b" ,*') == ['"a"', '"b"', "*"]
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+The synthetic extraction corpus must stay extractable, and the baseline
+comparison must flag slowdowns, memory growth and changed output.
+"""
+
+import pytest
+
+from benchmark_extraction import GENERATORS, MIME_TYPES, SIZES, compare
+from document_extractor import DocumentExtractor
+
+
+@pytest.mark.parametrize("fmt", sorted(GENERATORS))
+def test_small_corpus_document_extracts(fmt):
+    data = GENERATORS[fmt](SIZES["small"][fmt])
+    result = DocumentExtractor.extract_from_file(data, MIME_TYPES[fmt],
+                                                 f"sample.{fmt}")
+    assert result["word_count"] > 0
+    assert result["text_content"].strip()
+
+
+def _run(calibration_ms, **doc):
+    base = {"raw_ms": 10.0, "file_ms": 20.0, "peak_kb": 1000.0, "words": 50}
+    return {"calibration_ms": calibration_ms,
+            "documents": {"pdf-small": {**base, **doc}}}
+
+
+def test_compare_flags_regressions_over_threshold():
+    baseline = _run(10.0)
+    assert compare(_run(10.0, file_ms=24.0), baseline, 0.3) == []
+    assert len(compare(_run(10.0, file_ms=40.0), baseline, 0.3)) == 1
+    assert len(compare(_run(10.0, peak_kb=2000.0), baseline, 0.3)) == 1
+    assert len(compare(_run(10.0, words=49), baseline, 0.3)) == 1
+
+
+def test_compare_scales_by_calibration():
+    # Twice as slow on a machine whose calibration loop is twice as slow
+    assert compare(_run(20.0, raw_ms=20.0, file_ms=40.0), _run(10.0),
+                   0.3) == []
+
+
+def test_timings_are_only_gated_on_request():
+    slower = _run(10.0, file_ms=40.0)
+    assert compare(slower, _run(10.0), 0.3, timings=False) == []
+    assert compare(_run(10.0, words=49), _run(10.0), 0.3, timings=False)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Claim loop: retries back off with growing, capped delays, the poll loop
+claims again while rows keep filling the free slots, a failed outcome
+write does not leak the slot, and stop() hands running rows back.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import claim_loop as claim_loop_module
+from claim_loop import ClaimLoop
+
+
+class _Loop(ClaimLoop):
+    label = "test row"
+
+    def __init__(self, ready, concurrency=2):
+        super().__init__(concurrency, max_attempts=3, retry_base_s=5,
+                         retry_max_s=30, poll_interval_s=0.01)
+        self.ready = list(ready)
+        self.limits = []
+        self.processed = []
+        self.released = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def _claim(self, conn, limit):
+        self.limits.append(limit)
+        claimed, self.ready = self.ready[:limit], self.ready[limit:]
+        return claimed
+
+    def _key(self, item):
+        return item
+
+    async def _process(self, item):
+        await self.gate.wait()
+        self.processed.append(item)
+        if item == "bad":
+            raise RuntimeError("outcome write failed")
+
+    async def _release(self, conn, keys):
+        self.released.extend(keys)
+
+
+def _connection(monkeypatch):
+
+    @asynccontextmanager
+    async def get_connection():
+        yield None
+
+    monkeypatch.setattr(claim_loop_module.db_manager, "get_connection",
+                        get_connection)
+
+
+def test_backoff_grows_and_is_capped():
+    loop = _Loop([])
+    for attempt, base in ((1, 5), (2, 10), (3, 20), (6, 30)):
+        assert 0.8 * base <= loop._backoff_s(attempt) <= 1.2 * base
+
+
+def test_poll_drains_ready_rows(monkeypatch):
+    _connection(monkeypatch)
+    loop = _Loop(["a", "bad", "c", "d", "e"])
+
+    async def run():
+        loop.start()
+        for _ in range(100):
+            if len(loop.processed) == 5 and not loop._running:
+                break
+            await asyncio.sleep(0.01)
+        await loop.stop()
+
+    asyncio.run(run())
+    assert sorted(loop.processed) == ["a", "bad", "c", "d", "e"]
+    assert loop._running == {} and loop.released == []
+    assert loop.limits[0] == 2 and max(loop.limits) == 2
+
+
+def test_stop_releases_running_rows(monkeypatch):
+    _connection(monkeypatch)
+    loop = _Loop(["a", "b", "c"])
+    loop.gate.clear()
+
+    async def run():
+        loop.start()
+        for _ in range(100):
+            if len(loop._running) == 2:
+                break
+            await asyncio.sleep(0.01)
+        await loop.stop()
+
+    asyncio.run(run())
+    assert not loop.started
+    assert sorted(loop.released) == ["a", "b"]
+    assert loop.processed == [] and loop.ready == ["c"]
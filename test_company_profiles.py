@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+merge_uploads must merge exactly as the 9-module analysis always has and
+record which upload supplied each field.
+"""
+
+import json
+
+from company_profiles import merge_uploads, metric_sources
+
+
+def _row(upload_id, text, data):
+    return {
+        "upload_id": upload_id,
+        "extracted_text": text,
+        "extracted_data": data
+    }
+
+
+def test_later_rows_override_and_keep_provenance():
+    rows = [
+        _row("new", "deck v2", json.dumps({
+            "financial_data": {"revenue": 2},
+            "company_info": {"stage": "Seed"}
+        })),
+        _row("mid", None, "not json"),
+        _row("old", "deck v1", {"financial_data": {"revenue": 1,
+                                                   "burn_rate": 5}}),
+    ]
+    profile = merge_uploads(rows)
+    assert profile["merged_text"] == "deck v2\ndeck v1"
+    assert profile["merged_data"] == {
+        "financial_data": {"revenue": 1, "burn_rate": 5},
+        "company_info": {"stage": "Seed"}
+    }
+    assert profile["source_upload_ids"] == ["new", "mid", "old"]
+    assert profile["field_sources"] == {
+        "financial_data": "old",
+        "company_info": "new"
+    }
+    assert metric_sources(profile) == {
+        "financial_data.revenue": "old",
+        "financial_data.burn_rate": "old",
+        "company_info.stage": "new"
+    }
+
+
+def test_no_rows_means_no_profile():
+    assert merge_uploads([]) is None
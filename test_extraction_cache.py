@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Extraction cache: results cut short by the PDF time budget (server load)
+are not stored, results cut by the fixed page / row caps are.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import extraction_cache as extraction_cache_module
+from extraction_cache import ExtractionCache
+
+
+class _MissConn:
+    """Cache table that is always empty; records stores"""
+
+    def __init__(self):
+        self.stored = []
+
+    async def fetchrow(self, query, *args):
+        return None
+
+    async def execute(self, query, *args):
+        self.stored.append(args[:3])
+
+
+def _cache(monkeypatch):
+    conn = _MissConn()
+
+    @asynccontextmanager
+    async def get_connection():
+        yield conn
+
+    monkeypatch.setattr(extraction_cache_module.db_manager, "get_connection",
+                        get_connection)
+    return ExtractionCache(max_entries=8), conn
+
+
+def _extract(result):
+
+    async def extract():
+        return dict(result)
+
+    return extract
+
+
+def test_budget_exhausted_result_is_not_cached(monkeypatch):
+    cache, conn = _cache(monkeypatch)
+    partial = {"text_content": "p1", "truncated": True,
+               "budget_exhausted": True}
+
+    async def run():
+        data, info = await cache._through_cache("d1", "pdf", 10,
+                                                _extract(partial))
+        assert data == {"text_content": "p1", "truncated": True}
+        assert info == {"content_sha256": "d1", "cache_hit": False}
+        assert await cache.get("d1", "pdf") is None
+
+    asyncio.run(run())
+    assert conn.stored == []
+    assert cache.stats()["partial_not_stored"] == 1
+
+
+def test_capped_result_is_cached(monkeypatch):
+    cache, conn = _cache(monkeypatch)
+    capped = {"text_content": "rows", "truncated": True}
+
+    async def run():
+        await cache._through_cache("d2", "xlsx", 10, _extract(capped))
+        data, info = await cache._through_cache("d2", "xlsx", 10,
+                                                _extract({}))
+        assert data == capped
+        assert info["cache_hit"]
+
+    asyncio.run(run())
+    assert len(conn.stored) == 1
+    assert cache.stats()["partial_not_stored"] == 0
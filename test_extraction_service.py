@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Extraction pool: jobs past EXTRACTION_MAX_QUEUE are rejected, a job that
+times out recycles the pool, and a job that lands on a broken pool is
+retried once on a fresh one.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from extraction_service import (ExtractionError, ExtractionQueueFull,
+                                ExtractionService, ExtractionServiceConfig,
+                                ExtractionTimeout)
+
+
+def _service(monkeypatch, workers=1, max_queue=1, job_timeout=5.0):
+    monkeypatch.setenv("EXTRACTION_WORKERS", str(workers))
+    monkeypatch.setenv("EXTRACTION_MAX_QUEUE", str(max_queue))
+    monkeypatch.setenv("EXTRACTION_JOB_TIMEOUT", str(job_timeout))
+    service = ExtractionService(ExtractionServiceConfig())
+    pools = []
+
+    def new_pool():
+        # Threads stand in for worker processes
+        pool = ThreadPoolExecutor(max_workers=max(1, workers))
+        pool._processes = {}
+        pools.append(pool)
+        return pool
+
+    monkeypatch.setattr(service, "_new_pool", new_pool)
+    return service, pools
+
+
+def test_queue_full_is_rejected(monkeypatch):
+    service, _ = _service(monkeypatch, workers=0, max_queue=1)
+    release = threading.Event()
+
+    def blocked():
+        release.wait(5)
+        return {"ok": True}
+
+    async def run():
+        running = asyncio.create_task(service._submit("pdf", blocked))
+        waiting = asyncio.create_task(service._submit("pdf", blocked))
+        await asyncio.sleep(0.05)
+        assert service.stats()["in_flight"] == 1
+        assert service.stats()["queue_depth"] == 1
+        with pytest.raises(ExtractionQueueFull):
+            await service._submit("pdf", blocked)
+        release.set()
+        return await asyncio.gather(running, waiting)
+
+    assert asyncio.run(run()) == [{"ok": True}, {"ok": True}]
+    stats = service.stats()
+    assert stats["rejected"] == 1 and stats["completed"] == 2
+    assert stats["formats"]["pdf"]["jobs"] == 2
+
+
+def test_timeout_recycles_the_pool(monkeypatch):
+    service, pools = _service(monkeypatch, job_timeout=0.05)
+
+    async def run():
+        with pytest.raises(ExtractionTimeout):
+            await service._submit("pdf", time.sleep, 0.5)
+        return await service._submit("pdf", dict)
+
+    assert asyncio.run(run()) == {}
+    assert len(pools) == 2 and service._pool is pools[1]
+    stats = service.stats()
+    assert stats["timeouts"] == 1 and stats["pool_restarts"] == 1
+    assert stats["failed"] == 1 and stats["completed"] == 1
+    asyncio.run(service.stop())
+
+
+def test_broken_pool_is_retried_once(monkeypatch):
+    service, pools = _service(monkeypatch)
+    crashes = []
+
+    def crash_first(times):
+        if len(crashes) < times:
+            crashes.append(1)
+            raise BrokenProcessPool("worker died")
+        return {"ok": True}
+
+    assert asyncio.run(service._submit("docx", crash_first, 1)) == {"ok": True}
+    assert len(pools) == 2 and service.stats()["pool_restarts"] == 1
+
+    crashes.clear()
+    with pytest.raises(ExtractionError, match="worker crashed"):
+        asyncio.run(service._submit("docx", crash_first, 2))
+    assert len(pools) == 4 and service.stats()["failed"] == 1
+    asyncio.run(service.stop())
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+KeywordMatcher must find exactly the keywords a case-insensitive substring
+search finds.
+"""
+
+import random
+
+import pytest
+
+from keyword_matcher import KeywordMatcher
+
+KEYWORDS = [
+    "AI", "AI-powered", "ML", "machine learning", "SOC 2", "SOC2", "ISO",
+    "ISO 27001", "he", "she", "hers", "his", "CEO", "CTO", "VP", "VP Sales"
+]
+
+SAMPLES = [
+    "",
+    "she said",
+    "Our AI-powered platform is SOC 2 and ISO 27001 certified",
+    "ushers",
+    "vp sales and the ceo; cto tbd",
+    "İSO and ſoc2",
+]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_samples_match_substring_search(text):
+    expected = {k.lower() for k in KEYWORDS if k.lower() in text.lower()}
+    assert KeywordMatcher(KEYWORDS).scan(text) == expected
+
+
+def test_random_texts_match_substring_search():
+    rng = random.Random(10)
+    matcher = KeywordMatcher(KEYWORDS)
+    alphabet = "aehilmnorsvCEOTPSI 2-7"
+    for _ in range(3000):
+        text = "".join(
+            rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        expected = {k.lower() for k in KEYWORDS if k.lower() in text.lower()}
+        assert matcher.scan(text) == expected, text
+
+
+def test_empty_keyword_set():
+    assert KeywordMatcher([]).scan("anything") == frozenset()
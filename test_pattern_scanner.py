@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+PatternScanner must return exactly what the per-pattern DocumentExtractor
+methods return.
+"""
+
+import random
+
+import pytest
+
+from benchmark_pattern_scanner import legacy_scan, synthetic_deck
+from pattern_scanner import pattern_scanner
+
+SAMPLES = [
+    "",
+    "Acme Robotics Inc\nRevenue: $2.4M ARR, 35 employees, founded 2019",
+    "Company: Zeta Labs. HQ: Berlin. Series A: $12M. burn rate $150K",
+    "runway 18 months, $1.2M cash, 1,200+ customers, 40% growth",
+    "contact jo.doe@acme.io or visit https://www.acme-robotics.com",
+    "NRR 120%, CAC $450, LTV: $9,000, churn 3%, nps: +45",
+    "team of 12 full-time, serving 40 clients, $3M in revenue",
+    "İstanbul based, ſtartup with 20 team members since 2015",
+    "2.5 million annual revenue\n2023 - present",
+]
+
+FRAGMENTS = list("0123456789 ,.+%$:-/@_\n") + [
+    "team", "employees", "customers", "users", "growth", "yoy", "mom",
+    "revenue", "arr", "www.", "com", "ft", "full time", "people", "M", "K",
+    "million", "in revenue", "Inc", "since", "founded in", "CA", "us",
+    "cac", "ltv", "churn", "nps", "seed", "raised", "hq", "based in"
+]
+
+
+def _outcome(fn, text):
+    try:
+        return fn(text)
+    except Exception as e:  # both paths must fail the same way, too
+        return repr(e)
+
+
+@pytest.mark.parametrize("text", SAMPLES + [synthetic_deck()])
+def test_scanner_matches_legacy_on_samples(text):
+    assert _outcome(pattern_scanner.scan, text) == _outcome(legacy_scan, text)
+
+
+def test_scanner_matches_legacy_on_random_text():
+    rng = random.Random(3)
+    for _ in range(3000):
+        text = "".join(
+            rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 30)))
+        assert _outcome(pattern_scanner.scan,
+                        text) == _outcome(legacy_scan, text), text
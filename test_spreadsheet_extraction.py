@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Streaming xlsx / CSV extraction: below SPREADSHEET_MAX_ROWS and
+SPREADSHEET_TEXT_LIMIT the text, sheets, headers and row counts match a
+full load of the file; hitting either cap sets truncated.
+"""
+
+import csv
+import io
+
+import openpyxl
+import pytest
+
+import document_extractor
+from document_extractor import DocumentExtractor
+
+
+def _workbook():
+    wb = openpyxl.Workbook()
+    sheet = wb.active
+    sheet.title = "P&L"
+    sheet.append(["Month", "Revenue", "Notes"])
+    for month in range(1, 13):
+        sheet.append([f"2024-{month:02d}", 1000.5 * month,
+                      "launch" if month == 3 else None])
+    team = wb.create_sheet("Team")
+    team.append(["Name", "Role"])
+    team.append(["Ada", "CEO"])
+    team.append([None, None])
+    team.append(["Lin", 0])
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def _full_load_xlsx(data):
+    """What extract_from_xlsx returned before it streamed rows"""
+    wb = openpyxl.load_workbook(io.BytesIO(data), data_only=True)
+    text, sheets = [], []
+    for name in wb.sheetnames:
+        rows = list(wb[name].iter_rows(values_only=True))
+        text.extend(str(cell) for row in rows for cell in row if cell)
+        sheets.append({"name": name, "row_count": len(rows)})
+    return " ".join(text), sheets
+
+
+_CSV = ("Quarter,ARR,Churn\r\n"
+        "Q1,\"$1,200\",2%\r\n"
+        "Q2,1500,(3)\r\n"
+        "Q3,1800,1.5%\r\n"
+        "\"Q4, est.\",2100,\r\n")
+
+
+def test_xlsx_matches_full_load_below_caps():
+    data = _workbook()
+    result = DocumentExtractor.extract_from_xlsx(data)
+
+    text, sheets = _full_load_xlsx(data)
+    assert result["text_content"] == text
+    assert result["sheets"] == sheets
+    assert not result["truncated"]
+    revenue, = [c for c in result["numeric_columns"]
+                if c["column"] == "Revenue"]
+    assert list(revenue["values"]) == [1000.5 * m for m in range(1, 13)]
+    assert [c["column"] for c in result["metadata"]["numeric_columns"]] == \
+        ["Revenue"]
+
+
+def test_csv_matches_full_load_below_caps():
+    result = DocumentExtractor.extract_from_csv(_CSV.encode())
+
+    rows = list(csv.reader(io.StringIO(_CSV)))
+    assert result["text_content"] == _CSV
+    assert result["headers"] == rows[0]
+    assert result["row_count"] == len(rows)
+    assert not result["truncated"]
+
+
+def test_csv_from_open_file_is_left_open(tmp_path):
+    path = tmp_path / "metrics.csv"
+    path.write_bytes(_CSV.encode())
+    with open(path, "rb") as f:
+        result = DocumentExtractor.extract_from_csv(f)
+        assert not f.closed
+    assert result == DocumentExtractor.extract_from_csv(_CSV.encode())
+
+
+@pytest.mark.parametrize("cap, value", [("SPREADSHEET_MAX_ROWS", 3),
+                                        ("SPREADSHEET_TEXT_LIMIT", 20)])
+def test_caps_set_truncated(monkeypatch, cap, value):
+    monkeypatch.setattr(document_extractor, cap, value)
+
+    xlsx = DocumentExtractor.extract_from_xlsx(_workbook())
+    csv_result = DocumentExtractor.extract_from_csv(_CSV.encode())
+
+    assert xlsx["truncated"] and csv_result["truncated"]
+    if cap == "SPREADSHEET_MAX_ROWS":
+        assert sum(s["row_count"] for s in xlsx["sheets"]) == value
+        assert csv_result["row_count"] == value
+    else:
+        assert len(xlsx["text_content"]) <= value
+        assert len(csv_result["text_content"]) <= value
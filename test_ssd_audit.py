@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+SSD audit store helpers: list cursors must round-trip exactly (keyset
+pagination compares them against created_at), payloads must survive
+compression, timestamps keep the original ``...Z`` format, and
+record_many() writes a batch with one statement per set of fields.
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from ssd_audit import (AuditEvent, SSDAuditStore, _compress, _decompress,
+                       _iso, decode_cursor, encode_cursor)
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 3, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+    cursor = encode_cursor(created_at, "3f2a-tracking")
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, "3f2a-tracking")
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "WzFd"])
+def test_bad_cursor_is_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_payload_compression_round_trip():
+    payload = {"companyInformation": {"companyName": "Acme"}, "n": [1, 2.5]}
+    assert _decompress(_compress(payload)) == payload
+    assert _decompress(None) is None
+
+
+def test_iso_is_utc_with_z_suffix():
+    local = datetime(2026, 3, 1, 14, 0, tzinfo=timezone(timedelta(hours=2)))
+    assert _iso(local) == "2026-03-01T12:00:00Z"
+    assert _iso(None) is None
+
+
+class _RecordingConn:
+
+    def __init__(self):
+        self.statements = []
+
+    @asynccontextmanager
+    async def _transaction(self):
+        yield
+
+    def transaction(self):
+        return self._transaction()
+
+    async def execute(self, sql, *args):
+        self.statements.append((sql, args))
+
+
+def test_record_many_batches_by_field_set():
+    conn = _RecordingConn()
+    events = [
+        AuditEvent("t-1", "received", {"n": 1}, {"company_name": "Acme"}),
+        AuditEvent("t-1", "validated", {}, {"callback_url": None}),
+        AuditEvent("t-2", "received", {"n": 2}, {"company_name": "Beta"}),
+        AuditEvent("t-2", "validated", {}, {"callback_url": "https://cb"}),
+        AuditEvent("t-0", "duplicate_submission", {"line": 5}),
+    ]
+    asyncio.run(SSDAuditStore().record_many(conn, events))
+
+    assert len(conn.statements) == 2
+    (sql, args), (bare_sql, bare_args) = conn.statements
+    # Both events of a tracking_id go into one row, in order
+    assert args[:4] == (["t-1", "t-2"], [2, 2], ["Acme", "Beta"],
+                        [None, "https://cb"])
+    assert args[4:7] == (["t-1", "t-1", "t-2", "t-2"], [
+        "received", "validated", "received", "validated"
+    ], [json.dumps(e.details) for e in events[:4]])
+    # Stats deltas of the whole batch, added once
+    assert "INSERT INTO ssd_audit_stats" in sql
+    assert args[7] == 2  # received
+    assert "INSERT INTO ssd_audit_stats" not in bare_sql
+    assert bare_args == (["t-0"], [1], ["t-0"], ["duplicate_submission"],
+                         ['{"line": 5}'])
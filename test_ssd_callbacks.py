@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+SSD callback outbox: transient failures are retried, permanent 4xx
+responses are not, and a delivery attempt is routed to the right outcome.
+"""
+
+import asyncio
+
+import httpx
+
+from ssd_callbacks import SSDCallback, SSDCallbackOutbox, retryable
+
+
+def _outbox():
+    return SSDCallbackOutbox(concurrency=2, max_attempts=3, retry_base_s=10,
+                             retry_max_s=60, timeout_s=5, poll_interval_s=1)
+
+
+def _callback(attempt=1):
+    return SSDCallback(7, "t-1", "report", "https://ssd.test/cb",
+                       {"founderEmail": "f@x.io"}, attempt, 3)
+
+
+def test_retryable_status_codes():
+    assert retryable(None)
+    assert retryable(429) and retryable(503)
+    assert not retryable(400) and not retryable(404)
+
+
+def _process(outbox, handler, attempt=1):
+    outcomes = []
+
+    async def ok(callback, status_code, duration_ms):
+        outcomes.append(("delivered", status_code))
+
+    async def failed(callback, status_code, error, duration_ms):
+        outcomes.append(("failed", status_code))
+
+    outbox._delivered_ok = ok
+    outbox._delivery_failed = failed
+    outbox._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def run():
+        await outbox._process(_callback(attempt))
+        await outbox._client.aclose()
+
+    asyncio.run(run())
+    return outcomes
+
+
+def test_process_routes_outcome():
+    seen = []
+
+    def accept(request):
+        seen.append(request.read())
+        return httpx.Response(200)
+
+    assert _process(_outbox(), accept) == [("delivered", 200)]
+    assert seen == [b'{"founderEmail":"f@x.io"}']
+    assert _process(_outbox(), lambda r: httpx.Response(502)) == [("failed", 502)]
+
+
+def test_connection_error_has_no_status_code():
+
+    def refuse(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    assert _process(_outbox(), refuse) == [("failed", None)]
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+SSD stage events: waiters wake as soon as a stage is published, resume
+after the last stage they saw, and fall back to the database snapshot for
+jobs this process does not run.
+"""
+
+import asyncio
+
+import pytest
+
+from ssd_events import SSDEventHub, is_done, snapshot_events
+
+
+def _hub(**kwargs):
+    return SSDEventHub(**{"retention_s": 60, "max_jobs": 100,
+                          "db_poll_s": 30, **kwargs})
+
+
+def _load(events=None, expects_callback=True):
+
+    async def load():
+        return dict(events or {}), expects_callback
+
+    return load
+
+
+def test_waiter_wakes_on_publish():
+    hub = _hub()
+
+    async def run():
+        waiter = asyncio.create_task(hub.wait("t-1", _load(), None, 10))
+        await asyncio.sleep(0)
+        hub.publish_stage("t-1", "analysis_started")  # completes nothing
+        hub.publish_stage("t-1", "data_stored", {"upload_id": "u"})
+        events, done = await asyncio.wait_for(waiter, 1)
+        assert [e["stage"] for e in events] == ["data_extraction"]
+        assert events[0]["upload_id"] == "u" and not done
+        assert hub.stats()["waiting_clients"] == 0
+
+    asyncio.run(run())
+
+
+def test_resume_after_stage_and_done():
+    hub = _hub()
+    for stage in ("data_extraction", "scoring", "report"):
+        hub.publish("t-1", stage)
+
+    async def run():
+        events, done = await hub.wait("t-1", _load(), "scoring", 0)
+        assert [e["stage"] for e in events] == ["report"] and not done
+        events, done = await hub.wait("t-1", _load(expects_callback=False),
+                                      "report", 0)
+        assert events == [] and done
+
+    asyncio.run(run())
+
+
+def test_unknown_tracking_id():
+
+    async def missing():
+        return None
+
+    with pytest.raises(LookupError):
+        asyncio.run(_hub().wait("nope", missing, None, 0))
+
+
+def test_database_snapshot_is_polled():
+    hub = _hub(db_poll_s=0.01)
+    snapshot = {}
+
+    async def load():
+        return dict(snapshot), False
+
+    async def run():
+        waiter = asyncio.create_task(hub.wait("t-1", load, None, 5))
+        await asyncio.sleep(0.02)
+        snapshot["failed"] = {"stage": "failed"}
+        events, done = await asyncio.wait_for(waiter, 1)
+        assert [e["stage"] for e in events] == ["failed"] and done
+
+    asyncio.run(run())
+
+
+def test_snapshot_events():
+    job = {"status": "completed",
+           "stage_times": {"started": "t0", "data_stored": "t1",
+                           "analysis_complete": "t2", "report_saved": "t3"}}
+    callbacks = [{"kind": "report", "status": "delivered", "attempts": 2,
+                  "latency_ms": 900, "delivered_at": "t4",
+                  "last_attempt_at": "t4"},
+                 {"kind": "error", "status": "pending"}]
+    events = snapshot_events(job, callbacks)
+    assert sorted(events) == ["callback", "data_extraction", "report",
+                              "scoring"]
+    assert events["callback"]["attempts"] == 2 and is_done(events, True)
+    assert not is_done({"report": {}}, True)
+
+
+def test_old_jobs_are_dropped():
+    hub = _hub(max_jobs=2)
+    for tracking_id in ("a", "b", "c"):
+        hub.publish(tracking_id, "scoring")
+    assert hub.stats()["jobs"] == 2 and "a" not in hub._events
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+SSD job attempts: a handler failure fails the attempt (retried until the
+final attempt) and success completes the job.
+Submissions holding the same idempotency key share one job, also within
+one enqueue_many() batch.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from ssd_jobs import (ExistingJob, IdempotencyKeyReused, QueuedJob, SSDJob,
+                      SSDJobQueue)
+
+
+def _queue():
+    return SSDJobQueue(concurrency=2, max_attempts=3, retry_base_s=5,
+                       retry_max_s=30, poll_interval_s=1,
+                       idempotency_ttl_s=3600)
+
+
+def _job(attempt):
+    return SSDJob("t-1", {}, None, attempt, 3, None)
+
+
+def test_final_attempt():
+    assert not _job(2).final_attempt
+    assert _job(3).final_attempt
+
+
+def test_process_routes_outcome(monkeypatch):
+    queue = _queue()
+    outcomes = []
+
+    async def complete(job):
+        outcomes.append(("completed", job.attempt))
+
+    async def fail(job, error):
+        outcomes.append((str(error), job.attempt))
+
+    async def handler(job):
+        if job.attempt < 2:
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(queue, "_complete", complete)
+    monkeypatch.setattr(queue, "_fail", fail)
+    queue.set_handler(handler)
+
+    async def run():
+        for attempt in (1, 2):
+            await queue._process(_job(attempt))
+
+    asyncio.run(run())
+    assert outcomes == [("boom", 1), ("completed", 2)]
+
+
+class _KeyConn:
+    """Answers the idempotency lookup with ``held`` and records writes"""
+
+    def __init__(self, held=None):
+        self.held = held
+        self.writes = []
+
+    @asynccontextmanager
+    async def _transaction(self):
+        yield
+
+    def transaction(self):
+        return self._transaction()
+
+    async def fetch(self, sql, *args):
+        return [{**self.held, "idempotency_key": "key:k"}] if self.held else []
+
+    async def execute(self, sql, *args):
+        self.writes.append(sql.split()[0] + " " + sql.split()[1])
+
+
+def _enqueue(conn, payload_hash="h1"):
+    return asyncio.run(_queue().enqueue(conn, "t-2", {}, None, "key:k",
+                                        payload_hash))
+
+
+def test_enqueue_returns_current_holder_of_key():
+    held = {"tracking_id": "t-1", "status": "running",
+            "payload_hash": "h1", "current": True}
+    conn = _KeyConn(held)
+    assert _enqueue(conn) == ExistingJob("t-1", "running")
+    assert not any(w.startswith(("INSERT", "UPDATE")) for w in conn.writes)
+    with pytest.raises(IdempotencyKeyReused):
+        _enqueue(_KeyConn(held), payload_hash="h2")
+
+
+def test_failed_or_expired_holder_releases_key():
+    conn = _KeyConn({"tracking_id": "t-1", "status": "failed",
+                     "payload_hash": "h1", "current": False})
+    assert _enqueue(conn) is None
+    assert conn.writes[-2:] == ["UPDATE ssd_tirr_jobs", "INSERT INTO"]
+    conn = _KeyConn()
+    assert _enqueue(conn) is None and conn.writes[-1] == "INSERT INTO"
+
+
+def test_enqueue_many_shares_job_within_batch():
+    conn = _KeyConn()
+    jobs = [QueuedJob(f"t-{i}", {}, None, f"payload:{h}", h)
+            for i, h in enumerate(("h1", "h2", "h1"))]
+    queue = _queue()
+    assert asyncio.run(queue.enqueue_many(conn, jobs)) == [
+        None, None, ExistingJob("t-0", "queued")
+    ]
+    assert conn.writes.count("INSERT INTO") == 1
+    assert queue.stats()["deduplicated"] == 1
+
+
+def test_orphan_on_final_attempt_runs_failure_bookkeeping():
+    rows = [{"tracking_id": t, "status": status, "payload": "{}",
+             "callback_url": None, "attempts": attempts, "max_attempts": 3,
+             "upload_id": None}
+            for t, status, attempts in (("t-1", "failed", 3),
+                                        ("t-2", "queued", 1))]
+
+    class _OrphanConn:
+        async def fetch(self, sql, *args):
+            return rows
+
+    abandoned = []
+
+    async def on_abandoned(job, error):
+        abandoned.append((job.tracking_id, error))
+
+    queue = _queue()
+    queue.set_handler(lambda job: None, on_abandoned=on_abandoned)
+
+    async def run():
+        for job in await queue._reclaim_orphans(_OrphanConn()):
+            await queue._abandoned(job)
+
+    asyncio.run(run())
+    assert abandoned == [("t-1", "Worker stopped responding")]
+    assert queue.stats()["failed"] == 1 and queue.stats()["recovered"] == 2
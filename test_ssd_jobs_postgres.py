@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+SSD job queue against a real Postgres: a burst of a few hundred
+submissions (with duplicates) is claimed, retried and completed with
+bounded concurrency, and an orphaned final attempt is failed.
+
+Runs only when SSD_TEST_DATABASE_URL is set, e.g.
+
+    SSD_TEST_DATABASE_URL=postgresql://postgres@localhost/postgres \
+        python -m pytest -q test_ssd_jobs_postgres.py
+
+Tables are created in a throwaway schema, dropped afterwards.
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest
+
+import ssd_jobs as ssd_jobs_module
+from ssd_jobs import QueuedJob, SSDJobQueue
+
+DSN = os.getenv("SSD_TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not DSN,
+                                reason="SSD_TEST_DATABASE_URL is not set")
+
+BURST = 300
+DUPLICATES = 60
+CONCURRENCY = 8
+
+
+def _queue():
+    return SSDJobQueue(concurrency=CONCURRENCY, max_attempts=3,
+                       retry_base_s=0.05, retry_max_s=0.2,
+                       poll_interval_s=0.05, idempotency_ttl_s=3600)
+
+
+@asynccontextmanager
+async def _database(monkeypatch):
+    import asyncpg
+
+    schema = f"ssd_jobs_test_{uuid.uuid4().hex[:8]}"
+    admin = await asyncpg.connect(DSN)
+    await admin.execute(f"CREATE SCHEMA {schema}")
+    pool = await asyncpg.create_pool(
+        DSN, min_size=2, max_size=CONCURRENCY + 8,
+        server_settings={"search_path": schema})
+    try:
+        async with pool.acquire() as conn:
+            await conn.execute(
+                (Path(__file__).parent / "schema" /
+                 "ssd_tirr_jobs.sql").read_text())
+
+        @asynccontextmanager
+        async def get_connection():
+            async with pool.acquire() as conn:
+                yield conn
+
+        monkeypatch.setattr(ssd_jobs_module.db_manager, "get_connection",
+                            get_connection)
+        yield pool
+    finally:
+        await pool.close()
+        await admin.execute(f"DROP SCHEMA {schema} CASCADE")
+        await admin.close()
+
+
+async def _enqueue(pool, queue, n):
+    async with pool.acquire() as conn:
+        return await queue.enqueue(conn, f"t-{uuid.uuid4()}", {"n": n}, None,
+                                   f"payload:{n}", f"h{n}")
+
+
+def test_burst_is_deduplicated_retried_and_bounded(monkeypatch):
+    queue = _queue()
+    running = set()
+    peak = [0]
+    attempts = {}
+
+    async def handler(job):
+        assert job.tracking_id not in running, "job run twice at once"
+        running.add(job.tracking_id)
+        peak[0] = max(peak[0], len(running))
+        attempts[job.tracking_id] = job.attempt
+        try:
+            await asyncio.sleep(0.01)
+            if job.payload["n"] % 10 == 0 and job.attempt == 1:
+                raise RuntimeError("transient")
+        finally:
+            running.discard(job.tracking_id)
+
+    queue.set_handler(handler)
+
+    async def run():
+        async with _database(monkeypatch) as pool:
+            # Concurrent submissions; n < DUPLICATES arrive twice
+            numbers = list(range(BURST)) + list(range(DUPLICATES))
+            results = await asyncio.gather(
+                *(_enqueue(pool, queue, n) for n in numbers))
+            assert sum(r is None for r in results) == BURST
+            assert queue.stats()["deduplicated"] == DUPLICATES
+
+            # One batch: an in-batch duplicate and an already queued payload
+            async with pool.acquire() as conn:
+                batch = await queue.enqueue_many(conn, [
+                    QueuedJob("b-1", {"n": 1001}, None, "payload:1001", "h1001"),
+                    QueuedJob("b-2", {"n": 1001}, None, "payload:1001", "h1001"),
+                    QueuedJob("b-3", {"n": 1}, None, "payload:1", "h1"),
+                ])
+            assert batch[0] is None
+            assert batch[1].tracking_id == "b-1"
+            assert batch[2] is not None and batch[2].tracking_id != "b-3"
+
+            queue.start()
+            deadline = time.monotonic() + 120
+            try:
+                while True:
+                    async with pool.acquire() as conn:
+                        pending = await conn.fetchval(
+                            """SELECT COUNT(*) FROM ssd_tirr_jobs
+                               WHERE status <> 'completed'""")
+                    if not pending:
+                        break
+                    assert time.monotonic() < deadline, f"{pending} pending"
+                    await asyncio.sleep(0.1)
+            finally:
+                await queue.stop()
+
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(
+                    "SELECT payload, attempts FROM ssd_tirr_jobs")
+        assert len(rows) == BURST + 1
+        assert peak[0] <= CONCURRENCY
+        for row in rows:
+            n = ssd_jobs_module._decode(row["payload"])["n"]
+            assert row["attempts"] == (2 if n % 10 == 0 else 1)
+
+    asyncio.run(run())
+
+
+def test_orphaned_final_attempt_is_failed(monkeypatch):
+    queue = _queue()
+    abandoned = []
+
+    async def handler(job):
+        pass
+
+    async def on_abandoned(job, error):
+        abandoned.append((job.tracking_id, error))
+
+    queue.set_handler(handler, on_abandoned=on_abandoned)
+
+    async def run():
+        async with _database(monkeypatch) as pool:
+            async with pool.acquire() as conn:
+                for tracking_id, attempts in (("last", 3), ("early", 1)):
+                    await conn.execute(
+                        """INSERT INTO ssd_tirr_jobs
+                               (tracking_id, payload, status, attempts,
+                                max_attempts, locked_by, heartbeat_at)
+                           VALUES ($1, '{}', 'running', $2, 3, 'gone',
+                                   NOW() - INTERVAL '1 hour')""",
+                        tracking_id, attempts)
+                failed = await queue._reclaim_orphans(conn)
+                assert [job.tracking_id for job in failed] == ["last"]
+                for job in failed:
+                    await queue._abandoned(job)
+                status = dict(await conn.fetch(
+                    "SELECT tracking_id, status FROM ssd_tirr_jobs"))
+        assert status == {"last": "failed", "early": "queued"}
+        assert abandoned == [("last", "Worker stopped responding")]
+
+    asyncio.run(run())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+SSD report store: reports round-trip through the compressed, sharded
+files, flat files from before the store are still served, and tracking
+ids cannot escape the reports directory.
+"""
+
+import asyncio
+import json
+
+from ssd_reports import REPORT_CHUNK_SIZE, SSDReportStore
+
+
+async def _read(store, report):
+    return b"".join([chunk async for chunk in store.iter_json(report)])
+
+
+def test_save_stat_stream_delete(tmp_path):
+    store = SSDReportStore(tmp_path)
+    report = {"company": "Acme", "rows": [{"i": i} for i in range(20000)]}
+
+    async def run():
+        path = await store.save("t-1", report)
+        assert path.parent.parent.parent == tmp_path / "tirr"
+        assert path.name == "tirr_t-1.json.gz"
+        stored = await store.stat("t-1")
+        assert stored.compressed and stored.size < REPORT_CHUNK_SIZE
+        assert json.loads(await _read(store, stored)) == report
+
+        assert await store.delete("t-1")
+        assert await store.stat("t-1") is None
+        assert not await store.delete("t-1")
+
+    asyncio.run(run())
+
+
+def test_etag_changes_when_report_is_rewritten(tmp_path):
+    store = SSDReportStore(tmp_path)
+
+    async def run():
+        await store.save("t-1", {"v": 1})
+        first = await store.stat("t-1")
+        await store.save("t-1", {"v": 22})
+        assert (await store.stat("t-1")).etag != first.etag
+
+    asyncio.run(run())
+
+
+def test_flat_legacy_file_is_served(tmp_path):
+    store = SSDReportStore(tmp_path)
+    (tmp_path / "tirr_old.json").write_text('{\n  "v": 1\n}')
+
+    async def run():
+        stored = await store.stat("old")
+        assert not stored.compressed
+        assert json.loads(await _read(store, stored)) == {"v": 1}
+        await store.save("old", {"v": 2})
+        assert not (tmp_path / "tirr_old.json").exists()
+
+    asyncio.run(run())
+
+
+def test_unsafe_tracking_id_is_not_found(tmp_path):
+    store = SSDReportStore(tmp_path / "reports")
+    (tmp_path / "tirr_x.json").write_text("{}")
+    assert asyncio.run(store.stat("../tirr_x")) is None
+    assert not asyncio.run(store.delete("../tirr_x"))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+SSD stats: audit events map to the right counter increments and the
+histogram percentiles interpolate within the fixed latency buckets.
+"""
+
+from ssd_stats import (LATENCY_BOUNDS_MS, event_deltas, latency_bucket,
+                       latency_summary, percentile)
+
+
+def test_latency_bucket_bounds_are_exclusive():
+    assert latency_bucket(0) == 0
+    assert latency_bucket(49.9) == 0
+    assert latency_bucket(50) == 1
+    assert latency_bucket(10**9) == len(LATENCY_BOUNDS_MS)
+
+
+def test_event_deltas():
+    assert event_deltas("processing", {"stage": "scoring"}, {}) is None
+    assert event_deltas("received", {}, {"status": "pending"})["received"] == 1
+    assert event_deltas("error", {}, {"status": "failed"})["failed"] == 1
+    assert event_deltas("retry_scheduled", {}, {})["retried"] == 1
+
+    done = event_deltas("completed", {"final_score": 7.5},
+                        {"processing_duration_ms": 1200})
+    assert done["completed"] == 1 and done["received"] == 0
+    assert done["duration_sum_ms"] == 1200 and done["duration_count"] == 1
+    assert done["latency_buckets"][latency_bucket(1200)] == 1
+    assert sum(done["latency_buckets"]) == 1
+    assert (done["score_sum"], done["score_count"]) == (7.5, 1)
+
+
+def test_percentiles_interpolate_within_buckets():
+    counts = [0] * (len(LATENCY_BOUNDS_MS) + 1)
+    assert percentile(counts, 0.5) is None
+    counts[latency_bucket(1500)] = 90  # 1000-2500 ms
+    counts[latency_bucket(7000)] = 10  # 5000-10000 ms
+    assert percentile(counts, 0.5) == round(1000 + 1500 * 50 / 90, 1)
+    assert percentile(counts, 0.95) == 7500.0
+    counts[-1] = 1000
+    assert percentile(counts, 0.99) == float(LATENCY_BOUNDS_MS[-1])
+
+
+def test_latency_summary():
+    counts = [0] * (len(LATENCY_BOUNDS_MS) + 1)
+    counts[latency_bucket(300)] = 4
+    summary = latency_summary({
+        "latency_buckets": counts,
+        "duration_sum_ms": 1300,
+        "duration_count": 4
+    })
+    assert summary["avg_processing_time_ms"] == 325.0
+    assert summary["histogram"][-1] == {"lt_ms": None, "count": 0}
+    assert sum(h["count"] for h in summary["histogram"]) == 4
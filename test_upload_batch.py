@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Batched allupload inserts: small batches go through executemany, batches
+of COPY_THRESHOLD rows or more through COPY, both in one transaction with
+the columns in ALLUPLOAD_COLUMNS order.
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+from upload_batch import (ALLUPLOAD_COLUMNS, COPY_THRESHOLD,
+                          insert_upload_records, upload_record)
+
+
+class _Conn:
+
+    def __init__(self):
+        self.calls = []
+        self.transactions = 0
+
+    @asynccontextmanager
+    async def _transaction(self):
+        self.transactions += 1
+        yield
+
+    def transaction(self):
+        return self._transaction()
+
+    async def executemany(self, query, rows):
+        self.calls.append(("executemany", query, list(rows)))
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.calls.append(("copy", table, list(records), columns))
+
+
+def _records(count):
+    return [
+        upload_record(f"deck-{n}.pdf", "application/pdf", 100 + n,
+                      {"text_content": f"page {n}"}, "Acme", "completed",
+                      None, {"n": n}) for n in range(count)
+    ]
+
+
+def test_small_batch_uses_executemany():
+    conn = _Conn()
+    records = _records(COPY_THRESHOLD - 1)
+    asyncio.run(insert_upload_records(conn, records))
+
+    (kind, query, rows), = conn.calls
+    assert kind == "executemany" and conn.transactions == 1
+    assert query.startswith(
+        f"INSERT INTO allupload ({', '.join(ALLUPLOAD_COLUMNS)}) VALUES ($1,")
+    assert f"${len(ALLUPLOAD_COLUMNS)})" in query
+    assert [row[0] for row in rows] == [r["upload_id"] for r in records]
+    assert rows[3][ALLUPLOAD_COLUMNS.index("extracted_text")] == "page 3"
+    assert json.loads(rows[3][ALLUPLOAD_COLUMNS.index("upload_metadata")]) \
+        == {"n": 3}
+
+
+def test_large_batch_uses_copy():
+    conn = _Conn()
+    records = _records(COPY_THRESHOLD)
+    asyncio.run(insert_upload_records(conn, records))
+
+    (kind, table, rows, columns), = conn.calls
+    assert (kind, table, conn.transactions) == ("copy", "allupload", 1)
+    assert columns == list(ALLUPLOAD_COLUMNS)
+    assert rows == [tuple(r[c] for c in ALLUPLOAD_COLUMNS) for r in records]
+
+
+def test_empty_batch_writes_nothing():
+    conn = _Conn()
+    asyncio.run(insert_upload_records(conn, []))
+    assert conn.calls == [] and conn.transactions == 0
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Async upload jobs: reserve() holds queue slots until the rows are
+scheduled, so concurrent requests cannot overshoot max_pending, and
+orphaned rows are resumed only when their spool file is reachable.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import upload_jobs as upload_jobs_module
+from extraction_service import ExtractionQueueFull
+from upload_jobs import UploadJobRunner
+
+
+def _runner(monkeypatch, max_pending=3):
+    runner = UploadJobRunner(concurrency=1, max_pending=max_pending)
+    started = []
+
+    async def run(upload_id, spool, file_type, file_name):
+        started.append(upload_id)
+
+    monkeypatch.setattr(runner, "_run", run)
+    return runner, started
+
+
+def test_reserved_slots_count_against_max_pending(monkeypatch):
+    runner, _ = _runner(monkeypatch)
+
+    async def run():
+        runner.reserve(2)
+        # A second request while the first is still inserting its rows
+        with pytest.raises(ExtractionQueueFull):
+            runner.reserve(2)
+        runner.reserve(1)
+        with pytest.raises(ExtractionQueueFull):
+            runner.reserve(1)
+
+        for n in range(2):
+            runner.schedule(f"u{n}", None, "", "", reserved=True)
+        assert runner.stats()["reserved"] == 1
+        with pytest.raises(ExtractionQueueFull):
+            runner.reserve(1)
+
+        # The third request failed to insert its row
+        runner.release(1)
+        assert runner.stats()["reserved"] == 0
+        with pytest.raises(ExtractionQueueFull):
+            runner.reserve(2)
+        runner.reserve(1)
+
+    asyncio.run(run())
+
+
+class _OrphanConn:
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.args = None
+
+    async def fetch(self, query, *args):
+        self.args = args
+        return self.rows
+
+
+def _orphan(upload_id, spool_path, host):
+    return {
+        "upload_id": upload_id,
+        "file_name": "deck.pdf",
+        "file_type": "application/pdf",
+        "upload_metadata": json.dumps({
+            "spool_path": spool_path,
+            "spool_size": 3,
+            "content_sha256": "abc",
+            "spool_host": host,
+        }),
+    }
+
+
+def test_orphans_resume_only_with_a_reachable_spool(monkeypatch, tmp_path):
+    runner, _ = _runner(monkeypatch)
+    spool = tmp_path / "upload-1.spool"
+    spool.write_bytes(b"pdf")
+    here = upload_jobs_module._SPOOL_HOST
+    conn = _OrphanConn([
+        _orphan("u-1", str(spool), here),
+        _orphan("u-2", str(tmp_path / "gone.spool"), here),
+        _orphan("u-3", "/elsewhere/upload-3.spool", "other-host"),
+    ])
+    scheduled, failed = [], {}
+
+    def schedule(upload_id, spool, file_type, file_name):
+        scheduled.append((upload_id, spool.path))
+
+    async def finish(upload_id, status, error, extracted_data, cache_info):
+        failed[upload_id] = (status, error)
+
+    monkeypatch.setattr(runner, "schedule", schedule)
+    monkeypatch.setattr(runner, "_finish", finish)
+    asyncio.run(runner._reclaim_orphans(conn))
+
+    assert conn.args[1:3] == (here, upload_jobs_module.UPLOAD_SPOOL_SHARED)
+    assert scheduled == [("u-1", str(spool))]
+    assert failed["u-2"] == (
+        "failed", "Upload was interrupted; please upload the file again")
+    assert failed["u-3"][0] == "failed"
+    assert "other-host" in failed["u-3"][1]
+    assert runner.stats()["recovered"] == 1
+    assert runner.stats()["failed"] == 2
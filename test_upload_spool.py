@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Upload spooling: base64 and stream content is written to a spool file
+with its size and SHA-256, oversized files raise UploadTooLarge without
+leaving a spool behind, and /api/files/upload answers 413 for a body over
+UPLOAD_JSON_MAX_BYTES.
+"""
+
+import asyncio
+import base64
+import hashlib
+import io
+import os
+
+import httpx
+import pytest
+
+import upload_spool
+from upload_spool import UploadTooLarge, _copy_stream, spool_base64
+
+
+@pytest.fixture
+def spool_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_spool, "UPLOAD_SPOOL_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_base64_is_spooled_with_size_and_digest(spool_dir):
+    data = os.urandom(3000)
+    encoded = ("data:application/pdf;base64," +
+               base64.encodebytes(data).decode())
+
+    spool = asyncio.run(spool_base64(encoded))
+    try:
+        with open(spool.path, "rb") as f:
+            assert f.read() == data
+        assert spool.size == len(data)
+        assert spool.sha256 == hashlib.sha256(data).hexdigest()
+    finally:
+        spool.cleanup()
+    assert list(spool_dir.iterdir()) == []
+
+
+def test_oversized_base64_leaves_no_spool(spool_dir, monkeypatch):
+    monkeypatch.setattr(upload_spool, "_B64_CHUNK_CHARS", 64)
+    encoded = base64.b64encode(b"x" * 1000).decode()
+
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(spool_base64(encoded, max_bytes=100))
+    # Past the length pre-check: stopped while decoding
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(spool_base64(encoded + " " * 2000, max_bytes=999))
+    assert list(spool_dir.iterdir()) == []
+
+
+def test_oversized_stream_leaves_no_spool(spool_dir, monkeypatch):
+    monkeypatch.setattr(upload_spool, "_CHUNK_BYTES", 64)
+
+    with pytest.raises(UploadTooLarge):
+        _copy_stream(io.BytesIO(b"x" * 1000), 999)
+    assert list(spool_dir.iterdir()) == []
+    spool = _copy_stream(io.BytesIO(b"x" * 1000), 1000)
+    assert spool.size == 1000
+    spool.cleanup()
+
+
+def test_upload_body_over_cap_is_413(monkeypatch):
+    import main
+
+    monkeypatch.setattr(main, "UPLOAD_JSON_MAX_BYTES", 1000)
+    body = b'{"files": [{"name": "a.pdf", "content": "' + b"A" * 50000 + b'"}]}'
+
+    async def post(headers):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport,
+                                     base_url="http://test") as client:
+            return await client.post("/api/files/upload",
+                                     content=body,
+                                     headers=headers)
+
+    chunked = {"content-type": "application/json",
+               "transfer-encoding": "chunked"}
+    for headers in ({"content-type": "application/json"}, chunked):
+        response = asyncio.run(post(headers))
+        assert response.status_code == 413, response.text
+
+    async def post_invalid():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport,
+                                     base_url="http://test") as client:
+            return await client.post("/api/files/upload",
+                                     content=b'{"files": [',
+                                     headers={"content-type":
+                                              "application/json"})
+
+    assert asyncio.run(post_invalid()).status_code == 422
@@ -0,0 +1,130 @@
+"""
+Batched allupload persistence for multi-file uploads.
+
+Data-room uploads carry dozens of files.  Instead of extracting and
+INSERTing them one at a time (one Postgres round-trip each, holding a pool
+connection across every extraction), the upload endpoints
+
+  1. spool every file,
+  2. extract the spools concurrently (extract_spools),
+  3. write all allupload rows in one transaction (insert_upload_records):
+     executemany for small batches, COPY for large ones.
+
+upload_id and created_at are generated here, so the ids come back in input
+order without needing RETURNING.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from extraction_cache import extraction_cache
+from extraction_service import (
+    ExtractionError,
+    ExtractionQueueFull,
+    extraction_config,
+    failed_extraction,
+)
+from upload_spool import SpooledUpload
+
+logger = logging.getLogger(__name__)
+
+# Batches of at least this many rows are written with COPY
+COPY_THRESHOLD = 16
+
+ALLUPLOAD_COLUMNS = (
+    'upload_id', 'source_type', 'file_name', 'file_type', 'file_size',
+    'extracted_text', 'extracted_data', 'company_name', 'processing_status',
+    'processing_error', 'upload_metadata', 'created_at'
+)
+
+
+def upload_record(file_name: str,
+                  file_type: str,
+                  file_size: int,
+                  extracted_data: Optional[dict],
+                  company_name: Optional[str],
+                  processing_status: str,
+                  processing_error: Optional[str],
+                  upload_metadata: dict,
+                  created_at: Optional[datetime] = None,
+                  source_type: str = 'file') -> Dict[str, Any]:
+    """One allupload row (keys = ALLUPLOAD_COLUMNS) with a fresh upload_id"""
+    extracted_data = extracted_data or {}
+    return {
+        'upload_id': uuid.uuid4(),
+        'source_type': source_type,
+        'file_name': file_name,
+        'file_type': file_type,
+        'file_size': file_size,
+        'extracted_text': extracted_data.get('text_content', '')[:65000],
+        'extracted_data': json.dumps(extracted_data),
+        'company_name': company_name,
+        'processing_status': processing_status,
+        'processing_error': processing_error,
+        'upload_metadata': json.dumps(upload_metadata),
+        'created_at': created_at or datetime.now(timezone.utc),
+    }
+
+
+async def insert_upload_records(conn, records: Sequence[Dict[str, Any]]):
+    """Insert ``records`` into allupload in a single transaction"""
+    if not records:
+        return
+    rows = [tuple(r[c] for c in ALLUPLOAD_COLUMNS) for r in records]
+    async with conn.transaction():
+        if len(rows) >= COPY_THRESHOLD:
+            await conn.copy_records_to_table('allupload',
+                                             records=rows,
+                                             columns=list(ALLUPLOAD_COLUMNS))
+        else:
+            placeholders = ", ".join(f"${i}"
+                                     for i in range(1,
+                                                    len(ALLUPLOAD_COLUMNS) + 1))
+            await conn.executemany(
+                f"INSERT INTO allupload ({', '.join(ALLUPLOAD_COLUMNS)}) "
+                f"VALUES ({placeholders})", rows)
+
+
+async def extract_spools(
+    jobs: Sequence[Tuple[Optional[SpooledUpload], str, str]]
+) -> List[Optional[Tuple[dict, str, Optional[str], Dict[str, Any]]]]:
+    """Extract ``(spool, file_type, file_name)`` jobs concurrently.
+
+    Returns, in input order, ``(extracted_data, processing_status,
+    processing_error, cache_info)`` or None where the spool is None.
+    Every spool is removed afterwards.  ExtractionQueueFull is re-raised
+    once all jobs have settled; other extraction errors mark the file
+    'failed'.
+    """
+    # Stay inside the pool's queue even for very large batches
+    slots = asyncio.Semaphore(max(1, extraction_config.workers) * 2)
+
+    async def run(spool, file_type, file_name):
+        if spool is None:
+            return None
+        try:
+            async with slots:
+                extracted_data, cache_info = (
+                    await extraction_cache.extract_spooled(
+                        spool, file_type, file_name))
+            return extracted_data, 'completed', None, cache_info
+        except ExtractionQueueFull:
+            raise
+        except ExtractionError as extraction_error:
+            logger.error(
+                f"Extraction failed for {file_name}: {extraction_error}")
+            error = str(extraction_error)
+            return failed_extraction(error), 'failed', error, {}
+        finally:
+            spool.cleanup()
+
+    results = await asyncio.gather(*(run(*job) for job in jobs),
+                                   return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
@@ -0,0 +1,365 @@
+"""
+Background extraction jobs for asynchronous uploads.
+
+In async mode the upload endpoints spool the file, insert its allupload row
+with processing_status 'queued' and answer 202 straight away.
+UploadJobRunner then extracts each spool through the extraction cache and
+process pool, moving the row through
+
+    queued → extracting → completed | failed
+
+GET /api/uploads/{upload_id} reports the stage plus an estimated percentage
+(elapsed time against the format's average extraction latency).
+
+The spool path, digest and the host that wrote the spool are kept in
+upload_metadata until the job ends.  The runner heartbeats its rows; rows
+whose heartbeat stops (the process died) are reclaimed by a runner on the
+same host, which resumes them when the spool file is still there.  Spools
+live on local disk, so another instance only takes a row over once it has
+been stranded for _STRANDED_AFTER_S (its host is gone, e.g. after a
+redeploy) and fails it with a clear error, unless UPLOAD_SPOOL_SHARED says
+UPLOAD_SPOOL_DIR is storage every instance reaches.
+
+Configuration (environment variables):
+  UPLOAD_ASYNC_DEFAULT      – use async mode unless the request says otherwise
+  UPLOAD_JOB_CONCURRENCY    – uploads extracted at once (default: pool workers)
+  UPLOAD_JOB_MAX_PENDING    – queued uploads accepted before answering 503
+  UPLOAD_SPOOL_SHARED       – spools are on shared storage: any instance may
+                              resume an orphaned upload (default false)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from company_profiles import company_profiles
+from database_config import db_manager
+from extraction_cache import extraction_cache
+from extraction_service import (
+    ExtractionError,
+    ExtractionQueueFull,
+    detect_format,
+    extraction_config,
+    extraction_service,
+    failed_extraction,
+)
+from upload_batch import upload_record
+from upload_spool import SpooledUpload
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_ASYNC_DEFAULT = os.getenv("UPLOAD_ASYNC_DEFAULT",
+                                 "false").lower() in ("1", "true", "yes")
+
+# Heartbeat period and the silence after which a row is considered orphaned
+_HEARTBEAT_S = 30.0
+_ORPHAN_AFTER_S = 120.0
+# Silence after which any instance fails a row whose spool is on another host
+_STRANDED_AFTER_S = 900.0
+
+UPLOAD_SPOOL_SHARED = os.getenv("UPLOAD_SPOOL_SHARED",
+                                "false").lower() in ("1", "true", "yes")
+_SPOOL_HOST = socket.gethostname()
+# Backoff while the extraction pool rejects work (shared with sync uploads)
+_QUEUE_FULL_RETRIES = (1.0, 2.0, 4.0, 8.0)
+
+
+class UploadJobRunner:
+    """Runs queued upload extractions in the background"""
+
+    def __init__(self, concurrency: int, max_pending: int):
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self._slots = asyncio.Semaphore(concurrency)
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        # Slots taken by reserve() for rows not yet scheduled
+        self._reserved = 0
+        self._tasks = set()
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._completed = 0
+        self._failed = 0
+        self._recovered = 0
+
+    # ─── Lifecycle ──────────────────────────────────────────────────────
+
+    def start(self):
+        """Start heartbeating own rows and reclaiming orphaned ones"""
+        if self._heartbeat_task is None:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    async def stop(self):
+        """Cancel running jobs; their rows are reclaimed after restart"""
+        tasks = list(self._tasks)
+        if self._heartbeat_task is not None:
+            tasks.append(self._heartbeat_task)
+            self._heartbeat_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # ─── Submission ─────────────────────────────────────────────────────
+
+    def reserve(self, count: int):
+        """Take ``count`` queue slots or raise ExtractionQueueFull.
+
+        The slots are held until schedule(..., reserved=True) or release(),
+        so requests still inserting their rows count against max_pending.
+        """
+        pending = len(self._jobs) + self._reserved
+        if pending + count > self.max_pending:
+            raise ExtractionQueueFull(
+                f"Upload queue full ({pending} uploads pending)")
+        self._reserved += count
+
+    def release(self, count: int):
+        """Give back reserved slots whose uploads will not be scheduled"""
+        self._reserved = max(0, self._reserved - count)
+
+    def queued_record(self,
+                      spool: SpooledUpload,
+                      file_name: str,
+                      file_type: str,
+                      file_size: int,
+                      company_name: Optional[str],
+                      original_request: str,
+                      created_at: Optional[datetime] = None) -> dict:
+        """allupload row for ``spool`` in the 'queued' state.
+
+        After inserting it (see upload_batch.insert_upload_records) pass it
+        to schedule(); the job then owns the spool.
+        """
+        record = upload_record(file_name, file_type, file_size, None,
+                               company_name, 'queued', None, {
+                                   "original_request": original_request,
+                                   "async": True,
+                                   "content_sha256": spool.sha256,
+                                   "spool_path": spool.path,
+                                   "spool_size": spool.size,
+                                   "spool_host": _SPOOL_HOST,
+                               }, created_at)
+        record['extracted_text'] = None
+        return record
+
+    def schedule(self,
+                 upload_id: str,
+                 spool: SpooledUpload,
+                 file_type: str,
+                 file_name: str,
+                 reserved: bool = False):
+        """Start the background extraction of an inserted 'queued' row,
+        in a slot taken by reserve() when ``reserved``"""
+        if reserved:
+            self.release(1)
+        self._jobs[upload_id] = {
+            "stage": "queued",
+            "format": detect_format(file_type, file_name),
+            "queued_at": time.time(),
+            "started_at": None,
+        }
+        task = asyncio.create_task(
+            self._run(upload_id, spool, file_type, file_name))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # ─── Job execution ──────────────────────────────────────────────────
+
+    async def _run(self, upload_id: str, spool: SpooledUpload,
+                   file_type: str, file_name: str):
+        job = self._jobs[upload_id]
+        try:
+            async with self._slots:
+                job["stage"] = "extracting"
+                job["started_at"] = time.time()
+                await self._set_status(upload_id, 'extracting')
+
+                cache_info = {}
+                try:
+                    extracted_data, cache_info = await self._extract(
+                        spool, file_type, file_name)
+                    status, error = 'completed', None
+                except ExtractionError as e:
+                    logger.error(f"Extraction failed for {file_name}: {e}")
+                    status, error = 'failed', str(e)
+                    extracted_data = failed_extraction(error)
+
+                await self._finish(upload_id, status, error, extracted_data,
+                                   cache_info)
+                if status == 'completed':
+                    self._completed += 1
+                else:
+                    self._failed += 1
+            spool.cleanup()
+        except asyncio.CancelledError:
+            # Shutdown: keep the spool so the row can be resumed
+            raise
+        except Exception as e:
+            logger.error(f"Upload job {upload_id} failed: {e}")
+            self._failed += 1
+            spool.cleanup()
+        finally:
+            self._jobs.pop(upload_id, None)
+
+    async def _extract(self, spool: SpooledUpload, file_type: str,
+                       file_name: str):
+        for delay in _QUEUE_FULL_RETRIES:
+            try:
+                return await extraction_cache.extract_spooled(
+                    spool, file_type, file_name)
+            except ExtractionQueueFull:
+                await asyncio.sleep(delay)
+        return await extraction_cache.extract_spooled(spool, file_type,
+                                                      file_name)
+
+    async def _set_status(self, upload_id: str, status: str):
+        async with db_manager.get_connection() as conn:
+            await conn.execute(
+                """UPDATE allupload
+                   SET processing_status = $1, updated_at = NOW()
+                   WHERE upload_id = $2""", status, uuid.UUID(upload_id))
+
+    async def _finish(self, upload_id: str, status: str, error: Optional[str],
+                      extracted_data: dict, cache_info: dict):
+        async with db_manager.get_connection() as conn:
+            company_name = await conn.fetchval(
+                """UPDATE allupload
+                   SET extracted_text = $1,
+                       extracted_data = $2,
+                       company_name = COALESCE(company_name, $3),
+                       processing_status = $4,
+                       processing_error = $5,
+                       upload_metadata = (upload_metadata - 'spool_path')
+                                         || $6::jsonb,
+                       updated_at = NOW()
+                   WHERE upload_id = $7
+                   RETURNING company_name""",
+                extracted_data.get('text_content', '')[:65000],
+                json.dumps(extracted_data),
+                extracted_data.get('company_info', {}).get('company_name'),
+                status, error,
+                json.dumps({
+                    "extraction_quality":
+                    extracted_data.get('extraction_quality', {}),
+                    **cache_info
+                }), uuid.UUID(upload_id))
+            await company_profiles.on_uploads_changed(conn, [company_name])
+
+    # ─── Heartbeat / recovery ───────────────────────────────────────────
+
+    async def _heartbeat(self):
+        while True:
+            try:
+                async with db_manager.get_connection() as conn:
+                    if self._jobs:
+                        await conn.execute(
+                            """UPDATE allupload SET updated_at = NOW()
+                               WHERE upload_id = ANY($1::uuid[])""",
+                            [uuid.UUID(u) for u in self._jobs])
+                    await self._reclaim_orphans(conn)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Upload job heartbeat failed: {e}")
+            await asyncio.sleep(_HEARTBEAT_S)
+
+    async def _reclaim_orphans(self, conn):
+        # The updated_at predicate is re-checked after the row lock, so two
+        # runners can never claim the same row.  Rows spooled on another
+        # host are left to it until they count as stranded.
+        rows = await conn.fetch(
+            """UPDATE allupload
+               SET processing_status = 'queued', updated_at = NOW()
+               WHERE processing_status IN ('queued', 'extracting')
+                 AND upload_metadata ? 'spool_path'
+                 AND (updated_at < NOW() - make_interval(secs => $4)
+                      OR (updated_at < NOW() - make_interval(secs => $1)
+                          AND ($3 OR COALESCE(
+                                  upload_metadata->>'spool_host', $2) = $2)))
+               RETURNING upload_id, file_name, file_type, upload_metadata""",
+            _ORPHAN_AFTER_S, _SPOOL_HOST, UPLOAD_SPOOL_SHARED,
+            _STRANDED_AFTER_S)
+        for row in rows:
+            upload_id = str(row['upload_id'])
+            if upload_id in self._jobs:
+                continue
+            metadata = row['upload_metadata']
+            if isinstance(metadata, str):
+                metadata = json.loads(metadata)
+            spool = SpooledUpload(metadata['spool_path'],
+                                  metadata.get('spool_size', 0),
+                                  metadata.get('content_sha256', ''))
+            if os.path.exists(spool.path) and spool.sha256:
+                logger.info(f"Resuming orphaned upload job {upload_id}")
+                self._recovered += 1
+                self.schedule(upload_id, spool, row['file_type'] or '',
+                               row['file_name'])
+            else:
+                host = metadata.get('spool_host') or _SPOOL_HOST
+                error = ("Upload was interrupted; please upload the file again"
+                         if host == _SPOOL_HOST else
+                         f"Upload was interrupted: server {host}, which "
+                         f"held the file, stopped before extracting it; "
+                         f"please upload the file again")
+                logger.warning(f"Failing orphaned upload job {upload_id}: "
+                               f"spool {spool.path} is not reachable")
+                await self._finish(upload_id, 'failed', error,
+                                   failed_extraction(error), {})
+                self._failed += 1
+
+    # ─── Reporting ──────────────────────────────────────────────────────
+
+    def progress(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        """Live progress of a job running in this process, else None"""
+        job = self._jobs.get(upload_id)
+        if job is None:
+            return None
+        now = time.time()
+        if job["stage"] == "queued":
+            ahead = sum(1 for j in self._jobs.values()
+                        if j["stage"] == "queued"
+                        and j["queued_at"] < job["queued_at"])
+            return {
+                "stage": "queued",
+                "percent": 0,
+                "queue_position": ahead + 1,
+                "elapsed_s": round(now - job["queued_at"], 1),
+            }
+
+        # No per-page callbacks from the worker processes: estimate from the
+        # running average for the format, capped below 100 until done.
+        elapsed_ms = (now - job["started_at"]) * 1000
+        expected_ms = extraction_service.stats()["formats"].get(
+            job["format"], {}).get("avg_ms", 0.0)
+        percent = min(95, int(100 * elapsed_ms / expected_ms)) \
+            if expected_ms else 50
+        return {
+            "stage": "extracting",
+            "percent": max(5, percent),
+            "elapsed_s": round(now - job["queued_at"], 1),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        stages = [j["stage"] for j in self._jobs.values()]
+        return {
+            "concurrency": self.concurrency,
+            "max_pending": self.max_pending,
+            "reserved": self._reserved,
+            "queued": stages.count("queued"),
+            "extracting": stages.count("extracting"),
+            "completed": self._completed,
+            "failed": self._failed,
+            "recovered": self._recovered,
+        }
+
+
+# Global upload job runner instance
+upload_jobs = UploadJobRunner(
+    concurrency=int(
+        os.getenv("UPLOAD_JOB_CONCURRENCY",
+                  str(max(1, extraction_config.workers)))),
+    max_pending=int(os.getenv("UPLOAD_JOB_MAX_PENDING", "500")))
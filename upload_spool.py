@@ -0,0 +1,150 @@
+"""
+Upload spooling for the TCA IRR backend.
+
+Uploaded documents are copied (multipart) or base64-decoded (JSON uploads)
+in fixed-size chunks into a temporary file instead of being materialised as
+bytes.  The SHA-256 used by the extraction cache is computed on the way
+through, and extraction workers open the spool file by path
+(DocumentExtractor.extract_from_path), so a 50 MB data room costs one copy
+on disk rather than three or four in the API worker's heap.
+
+Configuration (environment variables):
+  UPLOAD_MAX_BYTES   – largest accepted file after decoding (default 100 MB)
+  UPLOAD_SPOOL_DIR   – directory for spool files (default: system temp dir)
+"""
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from typing import BinaryIO, Optional
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(100 * 1024 * 1024)))
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None
+
+# Copy / decode granularity; base64 chunks must be a multiple of 4 chars
+_CHUNK_BYTES = 1024 * 1024
+_B64_CHUNK_CHARS = 4 * 256 * 1024
+_B64_NOISE = re.compile(r'[^A-Za-z0-9+/=]')
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds UPLOAD_MAX_BYTES"""
+
+
+class SpooledUpload:
+    """An upload written to a temporary file, with its size and SHA-256"""
+
+    def __init__(self, path: str, size: int, sha256: str):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    def cleanup(self):
+        """Delete the spool file"""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove upload spool {self.path}: {e}")
+
+    async def __aenter__(self) -> "SpooledUpload":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.cleanup()
+
+
+def _new_spool_file() -> BinaryIO:
+    return tempfile.NamedTemporaryFile(prefix="upload-",
+                                       suffix=".spool",
+                                       dir=UPLOAD_SPOOL_DIR,
+                                       delete=False)
+
+
+def _too_large(max_bytes: int) -> UploadTooLarge:
+    return UploadTooLarge(
+        f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+
+
+def _copy_stream(source: BinaryIO, max_bytes: int) -> SpooledUpload:
+    """Blocking chunked copy of ``source`` into a new spool file"""
+    digest = hashlib.sha256()
+    size = 0
+    with _new_spool_file() as out:
+        try:
+            while True:
+                chunk = source.read(_CHUNK_BYTES)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                digest.update(chunk)
+                out.write(chunk)
+        except BaseException:
+            out.close()
+            os.unlink(out.name)
+            raise
+    return SpooledUpload(out.name, size, digest.hexdigest())
+
+
+def _decode_base64(encoded: str, max_bytes: int) -> SpooledUpload:
+    """Blocking chunked base64 decode of ``encoded`` into a new spool file.
+
+    Accepts the same input as ``base64.b64decode(encoded.split(',')[1])``:
+    an optional ``data:...;base64,`` prefix and embedded whitespace.
+    """
+    start = encoded.find(',') + 1 if ',' in encoded[:256] else 0
+    digest = hashlib.sha256()
+    size = 0
+    carry = ""
+    with _new_spool_file() as out:
+        try:
+            for offset in range(start, len(encoded), _B64_CHUNK_CHARS):
+                piece = carry + encoded[offset:offset + _B64_CHUNK_CHARS]
+                if _B64_NOISE.search(piece):
+                    piece = _B64_NOISE.sub('', piece)
+                cut = len(piece) - len(piece) % 4
+                carry = piece[cut:]
+                chunk = base64.b64decode(piece[:cut])
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                digest.update(chunk)
+                out.write(chunk)
+            if carry:
+                raise binascii.Error("Incorrect padding")
+        except BaseException:
+            out.close()
+            os.unlink(out.name)
+            raise
+    return SpooledUpload(out.name, size, digest.hexdigest())
+
+
+async def spool_upload_file(upload,
+                            max_bytes: Optional[int] = None) -> SpooledUpload:
+    """Spool a Starlette UploadFile (already disk-backed above 1 MB)"""
+    await upload.seek(0)
+    return await asyncio.to_thread(_copy_stream, upload.file, max_bytes
+                                   or UPLOAD_MAX_BYTES)
+
+
+async def spool_base64(encoded: str,
+                       max_bytes: Optional[int] = None) -> SpooledUpload:
+    """Spool base64 (or data URL) file content from a JSON upload body.
+
+    Raises UploadTooLarge, or binascii.Error for malformed input.
+    """
+    # Cheap pre-check: decoded size is ~3/4 of the encoded length
+    limit = max_bytes or UPLOAD_MAX_BYTES
+    if len(encoded) * 3 // 4 > limit + 3:
+        raise _too_large(limit)
+    return await asyncio.to_thread(_decode_base64, encoded, limit)